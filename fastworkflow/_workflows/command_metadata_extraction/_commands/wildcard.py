@@ -97,15 +97,26 @@ class ResponseGenerator:
                 app_workflow.current_command_context
 
             if cnp_output.command_name is None:
-                while not cnp_output.command_name and \
-                    app_workflow.command_context_for_response_generation is not None and \
+                # Escalate through the ancestors. All of them are scored in one round
+                # of inference; the nearest one that yields a command wins.
+                ancestors = []
+                while app_workflow.command_context_for_response_generation is not None and \
                         not app_workflow.is_command_context_for_response_generation_root:
                     app_workflow.command_context_for_response_generation = \
                         app_workflow.get_parent(app_workflow.command_context_for_response_generation)
-                    cnp_output = predictor.predict(
-                        fastworkflow.Workflow.get_command_context_name(app_workflow.command_context_for_response_generation), 
-                        command, nlu_pipeline_stage)
-            
+                    ancestors.append(app_workflow.command_context_for_response_generation)
+
+                if ancestors:
+                    index, cnp_output = predictor.predict_escalation(
+                        [
+                            fastworkflow.Workflow.get_command_context_name(ancestor)
+                            for ancestor in ancestors
+                        ],
+                        command,
+                        nlu_pipeline_stage,
+                    )
+                    app_workflow.command_context_for_response_generation = ancestors[index]
+
                 if cnp_output.command_name is None:
                     if nlu_pipeline_stage == NLUPipelineStage.INTENT_DETECTION:
                         # out of scope commands
@@ -4,18 +4,19 @@ from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from pydantic import BaseModel
-from speedict import Rdict
 
 import fastworkflow
 from fastworkflow.utils.logging import logger
 from fastworkflow import NLUPipelineStage
 from fastworkflow.cache_matching import cache_match, store_utterance_cache
 from fastworkflow.model_pipeline_training import (
-    CommandRouter
+    CommandRouter,
+    predict_across_routers,
 )
 from fastworkflow.nlu_labels import is_escalation, is_non_routable
 
 from fastworkflow.utils.fuzzy_match import find_best_matches
+from fastworkflow.utils.rdict_pool import rdict_pool
 
 
 # A low-confidence top-k prediction containing an escalation label remains an
@@ -39,11 +40,22 @@ class CommandNamePrediction:
         self.cache_path = self._get_cache_path(self.app_workflow_id, self.convo_path)
         self.path = self._get_cache_path_cache(self.convo_path)
 
-    def predict(self, command_context_name: str, command: str, nlu_pipeline_stage: NLUPipelineStage) -> "CommandNamePrediction.Output":
+    def predict(
+        self,
+        command_context_name: str,
+        command: str,
+        nlu_pipeline_stage: NLUPipelineStage,
+        router_predictions: Optional[list[str]] = None,
+    ) -> "CommandNamePrediction.Output":
+        """Predict the command for *command* in *command_context_name*.
+
+        *router_predictions*, when given, is this context's ``CommandRouter.predict``
+        result computed ahead of time (see ``predict_escalation``) and is used in
+        place of running the classifier again.
+        """
         # sourcery skip: extract-duplicate-method
 
-        model_artifact_path = f"{self.app_workflow_folderpath}/___command_info/{command_context_name}"
-        command_router = CommandRouter(model_artifact_path)
+        command_router = CommandRouter(self._model_artifact_path(command_context_name))
 
         # Re-use the already-built ModelPipeline attached to the router
         # instead of instantiating a fresh one.  This avoids reloading HF
@@ -124,7 +136,11 @@ class CommandNamePrediction:
                 if cache_result := cache_match(self.path, command, modelpipeline, 0.85):
                     command_name = cache_result
                 else:
-                    predictions=command_router.predict(command)
+                    predictions = (
+                        router_predictions
+                        if router_predictions is not None
+                        else command_router.predict(command)
+                    )
                     # predictions = majority_vote_predictions(command_router, command)
 
                     if len(predictions)==1:
@@ -186,6 +202,46 @@ class CommandNamePrediction:
             is_cme_command=is_cme_command
         )
 
+    def predict_escalation(
+        self,
+        command_context_names: list[str],
+        command: str,
+        nlu_pipeline_stage: NLUPipelineStage,
+    ) -> tuple[int, "CommandNamePrediction.Output"]:
+        """Find the first context in *command_context_names* that can serve *command*.
+
+        The wildcard escalation walk asks each ancestor context in turn. Here every
+        ancestor's classifier scores the utterance in one round
+        (``predict_across_routers``) before the contexts are consulted in order, so a
+        deep hierarchy pays one inference latency rather than one per level.
+
+        Returns ``(index, output)`` for the first context whose output names a
+        command, or for the last context when none does.
+        """
+        router_predictions: list[Optional[list[str]]] = [None] * len(command_context_names)
+        if nlu_pipeline_stage == NLUPipelineStage.INTENT_DETECTION and len(command_context_names) > 1:
+            routers = []
+            for command_context_name in command_context_names:
+                try:
+                    routers.append(CommandRouter(self._model_artifact_path(command_context_name)))
+                except Exception:  # noqa: BLE001
+                    # predict() loads this router again and reports the failure
+                    # if the walk actually reaches the context.
+                    routers.append(None)
+            router_predictions = predict_across_routers(routers, command)
+
+        output = CommandNamePrediction.Output()
+        for index, command_context_name in enumerate(command_context_names):
+            output = self.predict(
+                command_context_name, command, nlu_pipeline_stage,
+                router_predictions=router_predictions[index])
+            if output.command_name:
+                return index, output
+        return len(command_context_names) - 1, output
+
+    def _model_artifact_path(self, command_context_name: str) -> str:
+        return f"{self.app_workflow_folderpath}/___command_info/{command_context_name}"
+
     @staticmethod
     def _get_cache_path(workflow_id, convo_path):
         """
@@ -217,12 +273,9 @@ class CommandNamePrediction:
             command_list: List of suggested commands
             flag_type: Type of constraint (1=ambiguous, 2=misclassified)
         """
-        db = Rdict(cache_path)
-        try:
+        with rdict_pool.open(cache_path) as db:
             db["suggested_commands"] = command_list
             db["flag_type"] = flag_type
-        finally:
-            db.close()
 
     # Get the suggested commands
     @staticmethod
@@ -230,29 +283,20 @@ class CommandNamePrediction:
         """
         Get the list of suggested commands for the constrained selection
         """
-        db = Rdict(cache_path)
-        try:
+        with rdict_pool.open(cache_path) as db:
             return db.get("suggested_commands", [])
-        finally:
-            db.close()
 
     @staticmethod
     def _get_count(cache_path):
-        db = Rdict(cache_path)
-        try:
+        with rdict_pool.open(cache_path) as db:
             return db.get("utterance_count", 0)  # Default to 0 if key doesn't exist
-        finally:
-            db.close()
 
     @staticmethod
     def _print_db_contents(cache_path):
-        db = Rdict(cache_path)
-        try:
+        with rdict_pool.open(cache_path) as db:
             print("All keys in database:", list(db.keys()))
             for key in db.keys():
                 print(f"Key: {key}, Value: {db[key]}")
-        finally:
-            db.close()
 
     @staticmethod
     def _store_utterance(cache_path, utterance, label):
@@ -261,9 +305,7 @@ class CommandNamePrediction:
         Returns: The utterance count used
         """
         # Open the database (creates if doesn't exist)
-        db = Rdict(cache_path)
-
-        try:
+        with rdict_pool.open(cache_path) as db:
             # Get existing counter or initialize to 0
             utterance_count = db.get("utterance_count", 0)
 
@@ -281,21 +323,14 @@ class CommandNamePrediction:
 
             return utterance_count - 1  # Return the count used for this utterance
 
-        finally:
-            # Always close the database
-            db.close()
-
     # Function to read from database
     @staticmethod
     def _read_utterance(cache_path, utterance_id):
         """
         Read a specific utterance from the database
         """
-        db = Rdict(cache_path)
-        try:
+        with rdict_pool.open(cache_path) as db:
             return db.get(utterance_id)['utterance']
-        finally:
-            db.close()
 
     @staticmethod
     def resolve_fully_qualified_command_name(
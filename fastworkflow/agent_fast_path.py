@@ -0,0 +1,179 @@
+"""Agent-mode fast path for messages the local models resolve on their own.
+
+An agent turn normally costs several LLM round-trips: the planner
+(``build_query_with_next_steps``), at least two ReAct steps, and the
+conversation summary. Many messages are a single command that the context's
+TinyBERT/DistilBERT ``CommandRouter`` classifies confidently and whose
+parameters need no LLM at all -- the command takes none, or every field is
+given as an ``<field>value</field>`` tag. ``match_command`` recognises those
+messages without touching any workflow state, so a miss costs one local
+classification and the turn falls back to the agent unchanged.
+
+The fast path is opt-in and configured per process:
+
+* ``AGENT_FAST_PATH`` -- enable it (default off).
+* ``AGENT_FAST_PATH_MIN_CONFIDENCE`` -- additionally require the deciding
+  model's top confidence to reach this value. ``0`` (the default) trusts the
+  router's own trained ambiguity thresholds.
+
+Hits, misses by reason, and turn latency on either path are recorded in the
+process metrics registry; ``fast_path_stats`` summarises them, including an
+estimate of the latency the hits saved (the mean full-agent turn latency seen
+so far, less each hit's own latency).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from pydantic import BaseModel
+
+import fastworkflow
+from fastworkflow import ModuleType
+from fastworkflow.nlu_labels import is_non_routable
+from fastworkflow.utils.metrics import metrics
+
+MISS_LOW_CONFIDENCE = "low_confidence"
+MISS_NOT_ROUTABLE = "not_routable"
+MISS_PARAMETERS = "parameters"
+MISS_PENDING_CLARIFICATION = "pending_clarification"
+MISS_ERROR = "error"
+
+_TURN_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_TURN_SECONDS = {
+    path: metrics.histogram(
+        "fastworkflow_agent_turn_seconds",
+        "Latency of agent-mode turns by the path that served them",
+        buckets=_TURN_BUCKETS,
+        labels={"path": path},
+    )
+    for path in ("fast", "agent")
+}
+_HITS = metrics.counter(
+    "fastworkflow_agent_fast_path_hits_total",
+    "Agent-mode turns executed directly without the planner and ReAct loop",
+)
+_MISSES = {
+    reason: metrics.counter(
+        "fastworkflow_agent_fast_path_misses_total",
+        "Agent-mode turns the fast path handed to the agent, by reason",
+        labels={"reason": reason},
+    )
+    for reason in (
+        MISS_LOW_CONFIDENCE, MISS_NOT_ROUTABLE, MISS_PARAMETERS,
+        MISS_PENDING_CLARIFICATION, MISS_ERROR,
+    )
+}
+_SAVED_SECONDS = metrics.counter(
+    "fastworkflow_agent_fast_path_saved_seconds_total",
+    "Estimated agent latency avoided by fast-path turns",
+)
+
+
+@dataclass
+class FastPathMatch:
+    """A message fully resolved by local intent detection and parameter extraction."""
+
+    command_name: str
+    parameters: Optional[BaseModel]
+    confidence: float
+
+
+def fast_path_enabled() -> bool:
+    return fastworkflow.get_env_var("AGENT_FAST_PATH", bool, default=False)
+
+
+def match_command(
+    app_workflow: fastworkflow.Workflow,
+    message: str,
+    min_confidence: Optional[float] = None,
+) -> tuple[Optional[FastPathMatch], str]:
+    """Resolve *message* to one command of the current context, or say why not.
+
+    Returns ``(match, "")`` on success and ``(None, reason)`` otherwise. Only
+    the current context's router is consulted: a message that would escalate to
+    an ancestor context, or that names a CME command (``what can i do``,
+    ``abort``, ...), is left to the agent. Reads workflow state but never
+    changes it.
+    """
+    from fastworkflow.model_pipeline_training import CommandRouter
+    from fastworkflow._workflows.command_metadata_extraction.parameter_extraction import (
+        ParameterExtraction,
+    )
+    from fastworkflow.utils.signatures import InputForParamExtraction
+
+    if min_confidence is None:
+        min_confidence = fastworkflow.get_env_var(
+            "AGENT_FAST_PATH_MIN_CONFIDENCE", float, default=0.0)
+    if not message.strip():
+        return None, MISS_NOT_ROUTABLE
+
+    context_name = app_workflow.current_command_context_name
+    command_router = CommandRouter(
+        f"{app_workflow.folderpath}/___command_info/{context_name}")
+    predictions, confidence = command_router.predict_with_confidence(message)
+    if len(predictions) != 1 or confidence < min_confidence:
+        return None, MISS_LOW_CONFIDENCE
+    if is_non_routable(predictions[0]):
+        return None, MISS_NOT_ROUTABLE
+
+    crd = fastworkflow.RoutingRegistry.get_definition(app_workflow.folderpath)
+    cme_crd = fastworkflow.RoutingRegistry.get_definition(
+        fastworkflow.get_internal_workflow_path("command_metadata_extraction"))
+    cme_command_names = (
+        set(cme_crd.get_command_names("IntentDetection"))
+        | set(cme_crd.get_command_names("ErrorCorrection"))
+    )
+    command_names = {
+        command_name.split('/')[-1]: command_name
+        for command_name in crd.get_command_names(context_name)
+        if command_name not in cme_command_names
+    }
+    command_name = command_names.get(predictions[0].split('/')[-1])
+    if command_name is None:
+        return None, MISS_NOT_ROUTABLE
+
+    parameters = None
+    if parameters_class := crd.get_command_class(
+        command_name, ModuleType.COMMAND_PARAMETERS_CLASS
+    ):
+        parameters = ParameterExtraction._extract_parameters_from_xml(message, parameters_class)
+        if parameters is None:
+            return None, MISS_PARAMETERS
+        is_valid, _, _, _ = InputForParamExtraction(command=message).validate_parameters(
+            app_workflow, command_name, parameters)
+        if not is_valid:
+            return None, MISS_PARAMETERS
+
+    return FastPathMatch(command_name, parameters, confidence), ""
+
+
+def record_hit(seconds: float) -> None:
+    """Count a fast-path turn that took *seconds*, and the agent latency it avoided."""
+    agent_turns = _TURN_SECONDS["agent"]
+    if agent_turns.count:
+        _SAVED_SECONDS.inc(max(0.0, agent_turns.sum / agent_turns.count - seconds))
+    _TURN_SECONDS["fast"].observe(seconds)
+    _HITS.inc()
+
+
+def record_miss(reason: str) -> None:
+    _MISSES[reason].inc()
+
+
+def record_agent_turn(seconds: float) -> None:
+    """Record a turn the agent completed, the baseline for the saved-latency estimate."""
+    _TURN_SECONDS["agent"].observe(seconds)
+
+
+def fast_path_stats() -> dict[str, float]:
+    """Hits, misses, hit rate and estimated seconds saved, for this process."""
+    misses = sum(counter.value for counter in _MISSES.values())
+    hits = _HITS.value
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "saved_seconds": _SAVED_SECONDS.value,
+    }
@@ -1,12 +1,17 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 import fastworkflow
-import torch
 from speedict import Rdict
 import mmh3  # mmh33 implementation
 from datetime import datetime
 from functools import lru_cache
 
+from fastworkflow.utils.rdict_pool import rdict_pool
+
 # ---------------------------------------------------------------------
 # In-process memoisation for expensive DistilBERT embeddings.
 # Key = (id(model_pipeline), text).  The cache is deliberately small –
@@ -32,28 +37,307 @@ _MODEL_ID_2_REF: dict[int, weakref.ReferenceType] = {}
 
 def _compute_embedding(text: str, model_pipeline):
     """Actual embedding computation (was body of old get_embedding)."""
-    model = model_pipeline.distil_model
-    tokenizer = model_pipeline.distil_tokenizer
-    device = model_pipeline.device
-    model = model.distilbert
-
-    model.eval()
-    with torch.no_grad():
-        inputs = tokenizer(
-            text,
-            padding=True,
-            truncation=True,
-            max_length=128,
-            return_tensors="pt"
-        ).to(device)
-
-        outputs = model(**inputs)
-        return outputs.last_hidden_state[:, 0, :].cpu().numpy()
+    # Goes through the pipeline's inference backend, so an ONNX deployment
+    # embeds with the exported graph instead of loading torch weights.
+    return model_pipeline.embed_cls([text])
+
+# ---------------------------------------------------------------------
+# Resident embedding index for the clarification cache.
+#
+# Matching used to deserialize the whole "cache" blob and loop over every
+# entry with a 1x768 cosine_similarity call, on every INTENT_DETECTION miss.
+# The index keeps the embeddings as one contiguous, L2-normalised float32
+# matrix per cache path, so a match is a single matrix-vector product.
+#
+# The matrix is persisted beside the Rdict in ``<cache_path>.index/`` as raw
+# float32 rows (``embeddings.f32``) plus one key per line (``keys.txt``), and
+# is memory-mapped on a cold start instead of being rebuilt.  Appends write
+# one row; nothing is rewritten.  ``cache_revision`` in the Rdict is bumped
+# by every store and tells a resident or persisted index that another
+# process has written the cache since it was built.
+#
+# Storage layout inside the Rdict, one record pair per utterance hash:
+#   utt_meta:<hash> -> {"utterance": str, "command_mapping": {label: {...}}}
+#   utt_emb:<hash>  -> raw float32 bytes of the DistilBERT [CLS] embedding
+# Bumping one frequency counter rewrites only the small metadata record, and
+# two sessions clarifying different utterances touch disjoint keys.  The
+# single legacy ``"cache"`` blob is migrated to this layout the first time
+# the process opens the cache (``_open_cache``).
+# ---------------------------------------------------------------------
+
+_INDEX_SUFFIX = ".index"
+_REVISION_KEY = "cache_revision"
+_LEGACY_CACHE_KEY = "cache"
+_META_PREFIX = "utt_meta:"
+_EMBEDDING_PREFIX = "utt_emb:"
+
+
+def _iter_prefix(db: Rdict, prefix: str):
+    """Yield ``(suffix, value)`` for every key starting with *prefix*, in key order."""
+    for key, value in db.items(from_key=prefix):
+        if not isinstance(key, str) or not key.startswith(prefix):
+            break
+        yield key[len(prefix):], value
+
+
+def _iter_embeddings(db: Rdict):
+    """Yield ``(hash_key, float32 vector)`` for every stored embedding."""
+    for hash_key, raw in _iter_prefix(db, _EMBEDDING_PREFIX):
+        yield hash_key, np.frombuffer(raw, dtype=np.float32)
+
+
+def _migrate_legacy_cache(db: Rdict) -> None:
+    """Split a pre-existing monolithic ``"cache"`` dict into per-key records."""
+    if _LEGACY_CACHE_KEY not in db:
+        return
+    for hash_key, entry in db[_LEGACY_CACHE_KEY].items():
+        db[f"{_META_PREFIX}{hash_key}"] = {
+            "utterance": entry.get("utterance", ""),
+            "command_mapping": entry["command_mapping"],
+        }
+        if entry.get("embedding"):
+            db[f"{_EMBEDDING_PREFIX}{hash_key}"] = np.asarray(
+                entry["embedding"], dtype=np.float32).tobytes()
+    del db[_LEGACY_CACHE_KEY]
+    db[_REVISION_KEY] = db.get(_REVISION_KEY, 0) + 1
+
+
+class EmbeddingIndex:
+    """L2-normalised embedding matrix plus label side table for one cache."""
+
+    def __init__(self, cache_path: str):
+        self.index_folderpath = f"{cache_path}{_INDEX_SUFFIX}"
+        self.revision: int = -1
+        self.keys: list[str] = []
+        self.row_of: dict[str, int] = {}
+        # utterance hash -> command_mapping ({label: {frequency, feedback_date}})
+        self.command_mappings: dict[str, dict] = {}
+        self._matrix: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        self._size = 0
+        self._lock = threading.RLock()
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The live ``(rows, dim)`` view of the normalised embeddings."""
+        return self._matrix[:self._size]
+
+    @property
+    def dim(self) -> int:
+        return self._matrix.shape[1]
+
+    @staticmethod
+    def _normalise(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    # -- building ------------------------------------------------------
+
+    def rebuild(self, command_mappings: dict[str, dict], embeddings, revision: int) -> None:
+        """Rebuild from streamed ``(hash, embedding)`` pairs and persist the result."""
+        with self._lock:
+            self.keys, self.row_of = [], {}
+            self.command_mappings = command_mappings
+            rows = []
+            for hash_key, embedding in embeddings:
+                if not len(embedding):
+                    continue
+                self.row_of[hash_key] = len(self.keys)
+                self.keys.append(hash_key)
+                rows.append(self._normalise(embedding))
+            self._matrix = (
+                np.vstack(rows) if rows else np.empty((0, 0), dtype=np.float32)
+            )
+            self._size = len(rows)
+            self.revision = revision
+            self._persist_all()
+
+    def load_persisted(self, command_mappings: dict[str, dict], revision: int) -> bool:
+        """Memory-map the persisted matrix if it was written at *revision*."""
+        keys_path = os.path.join(self.index_folderpath, "keys.txt")
+        matrix_path = os.path.join(self.index_folderpath, "embeddings.f32")
+        revision_path = os.path.join(self.index_folderpath, "revision")
+        try:
+            with open(revision_path, "r") as f:
+                persisted_revision = int(f.read().strip())
+            with open(keys_path, "r") as f:
+                keys = f.read().splitlines()
+            matrix_bytes = os.path.getsize(matrix_path)
+        except (OSError, ValueError):
+            return False
+        if persisted_revision != revision:
+            return False
+
+        with self._lock:
+            if keys:
+                row_bytes, remainder = divmod(matrix_bytes, len(keys))
+                if remainder or row_bytes % 4:
+                    return False  # torn write: the caller rebuilds
+                matrix = np.memmap(
+                    matrix_path, dtype=np.float32, mode="r",
+                    shape=(len(keys), row_bytes // 4),
+                )
+            else:
+                matrix = np.empty((0, 0), dtype=np.float32)
+            self.keys = keys
+            self.row_of = {key: row for row, key in enumerate(keys)}
+            self.command_mappings = command_mappings
+            self._matrix = matrix
+            self._size = len(keys)
+            self.revision = revision
+            return True
+
+    # -- incremental updates -------------------------------------------
+
+    def upsert(self, hash_key: str, embedding, command_mapping: dict, revision: int) -> None:
+        """Add or update one entry, appending to the persisted matrix in place."""
+        with self._lock:
+            self.command_mappings[hash_key] = command_mapping
+            if embedding is not None and len(embedding):
+                vector = self._normalise(embedding)
+                if hash_key in self.row_of:
+                    row = self.row_of[hash_key]
+                    self._ensure_writable(self._size)
+                    self._matrix[row] = vector
+                    self._write_row(row, vector)
+                else:
+                    self._ensure_writable(self._size + 1, dim=vector.shape[0])
+                    row = self._size
+                    self._matrix[row] = vector
+                    self._size += 1
+                    self.row_of[hash_key] = row
+                    self.keys.append(hash_key)
+                    self._append_row(hash_key, vector)
+            self.revision = revision
+            self._write_revision()
+
+    def _ensure_writable(self, rows_needed: int, dim: Optional[int] = None) -> None:
+        """Grow the resident buffer geometrically; copy a memory-map on first write."""
+        dim = dim or self.dim
+        capacity = self._matrix.shape[0] if self._matrix.size else 0
+        if isinstance(self._matrix, np.memmap) or capacity < rows_needed:
+            new_capacity = max(rows_needed, 2 * capacity, 64)
+            grown = np.empty((new_capacity, dim), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+
+    # -- lookups -------------------------------------------------------
+
+    def search(self, query_embedding, k: int = 1) -> list[tuple[str, float]]:
+        """Return the *k* most similar ``(hash_key, cosine_similarity)`` pairs."""
+        with self._lock:
+            if self._size == 0:
+                return []
+            query = self._normalise(query_embedding)
+            if query.shape[0] != self.dim:
+                return []
+            similarities = self.matrix @ query
+            k = min(k, self._size)
+            if k == 1:
+                top_rows = [int(np.argmax(similarities))]
+            else:
+                top_rows = np.argpartition(-similarities, k - 1)[:k]
+                top_rows = sorted(top_rows, key=lambda row: -similarities[row])
+            return [(self.keys[row], float(similarities[row])) for row in top_rows]
+
+    # -- persistence ---------------------------------------------------
+
+    def _persist_all(self) -> None:
+        os.makedirs(self.index_folderpath, exist_ok=True)
+        with open(os.path.join(self.index_folderpath, "embeddings.f32"), "wb") as f:
+            f.write(np.ascontiguousarray(self.matrix, dtype=np.float32).tobytes())
+        with open(os.path.join(self.index_folderpath, "keys.txt"), "w") as f:
+            f.writelines(f"{key}\n" for key in self.keys)
+        self._write_revision()
+
+    def _append_row(self, hash_key: str, vector: np.ndarray) -> None:
+        os.makedirs(self.index_folderpath, exist_ok=True)
+        with open(os.path.join(self.index_folderpath, "embeddings.f32"), "ab") as f:
+            f.write(vector.tobytes())
+        with open(os.path.join(self.index_folderpath, "keys.txt"), "a") as f:
+            f.write(f"{hash_key}\n")
+
+    def _write_row(self, row: int, vector: np.ndarray) -> None:
+        with open(os.path.join(self.index_folderpath, "embeddings.f32"), "r+b") as f:
+            f.seek(row * vector.nbytes)
+            f.write(vector.tobytes())
+
+    def _write_revision(self) -> None:
+        os.makedirs(self.index_folderpath, exist_ok=True)
+        with open(os.path.join(self.index_folderpath, "revision"), "w") as f:
+            f.write(str(self.revision))
+
+
+_INDEXES: dict[str, EmbeddingIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+_STORE_LOCK = threading.Lock()
+# Caches this process has already checked for (and migrated) the legacy blob.
+_MIGRATED: set[str] = set()
+
+
+@contextmanager
+def _open_cache(cache_path: str) -> Iterator[Rdict]:
+    """Borrow the pooled handle for *cache_path*, migrating a legacy cache once."""
+    with rdict_pool.open(cache_path) as db:
+        key = os.path.abspath(cache_path)
+        if key not in _MIGRATED:
+            with _STORE_LOCK:
+                if key not in _MIGRATED:
+                    _migrate_legacy_cache(db)
+                    _MIGRATED.add(key)
+        yield db
+
+
+def get_embedding_index(cache_path: str, db: Rdict) -> EmbeddingIndex:
+    """Return the resident index for *cache_path*, (re)loading it if stale."""
+    revision = db.get(_REVISION_KEY, 0)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(cache_path)
+        if index is None:
+            index = _INDEXES[cache_path] = EmbeddingIndex(cache_path)
+    with index._lock:
+        if index.revision != revision:
+            command_mappings = {
+                hash_key: meta["command_mapping"]
+                for hash_key, meta in _iter_prefix(db, _META_PREFIX)
+            }
+            if not index.load_persisted(command_mappings, revision):
+                index.rebuild(command_mappings, _iter_embeddings(db), revision)
+    return index
+
+
+def _best_label(command_mapping: dict) -> str:
+    """Pick the most frequent label, breaking ties by the most recent feedback."""
+    if len(command_mapping) == 1:
+        return next(iter(command_mapping.keys()))
+
+    max_frequency = 0
+    max_freq_labels = []
+    for label, info in command_mapping.items():
+        freq = info["frequency"]
+        if freq > max_frequency:
+            max_frequency = freq
+            max_freq_labels = [label]
+        elif freq == max_frequency:
+            max_freq_labels.append(label)
+
+    # If multiple labels with same frequency, choose most recent one
+    if len(max_freq_labels) > 1:
+        return max(
+            max_freq_labels,
+            key=lambda l: command_mapping[l]["feedback_date"]
+        )
+    return max_freq_labels[0]
+
 
 def store_utterance_cache(cache_path, utterance, label, model_pipeline=None):
     """
     Store utterance in the new format with mmh3 and command mapping
     
+    Only the ``utt_meta:<hash>`` record (and ``utt_emb:<hash>`` when an
+    embedding is computed) is written, so the cost of a store does not grow
+    with the size of the cache.
+
     Args:
         cache_path (str): Path to the cache database
         utterance (str): The input utterance to store
@@ -63,14 +347,10 @@ def store_utterance_cache(cache_path, utterance, label, model_pipeline=None):
     Returns:
         The hash key of the stored utterance
     """
-    # Open the database
-    db = Rdict(cache_path)
-    try:
+    with _open_cache(cache_path) as db:
         # Generate hash for utterance using mmh3
         utterance_hash = str(mmh3.hash(utterance))
-        
-        # Get the cache or initialize
-        cache = db.get("cache", {})
+        meta_key = f"{_META_PREFIX}{utterance_hash}"
         
         # Get current timestamp for feedback date
         current_time = datetime.now().isoformat()
@@ -78,44 +358,44 @@ def store_utterance_cache(cache_path, utterance, label, model_pipeline=None):
         # Compute embedding if model_pipeline provided
         embedding = None
         if model_pipeline is not None:
-            embedding = get_embedding(utterance, model_pipeline)[0].tolist()
+            embedding = np.asarray(
+                get_embedding(utterance, model_pipeline)[0], dtype=np.float32)
         
-        if utterance_hash in cache:
-            # Update existing entry
-            if embedding is not None:
-                cache[utterance_hash]["embedding"] = embedding
-                
-            if label in cache[utterance_hash]["command_mapping"]:
+        # Read-modify-write of this utterance's records and the revision counter;
+        # the pooled handle is shared by every thread in the process.
+        with _STORE_LOCK:
+            meta = db.get(meta_key) or {
+                "utterance": utterance,  # Store original utterance for reference
+                "command_mapping": {},
+            }
+            command_mapping = meta["command_mapping"]
+            if label in command_mapping:
                 # Increment frequency for this label
-                cache[utterance_hash]["command_mapping"][label]["frequency"] += 1
-                cache[utterance_hash]["command_mapping"][label]["feedback_date"] = current_time
+                command_mapping[label]["frequency"] += 1
+                command_mapping[label]["feedback_date"] = current_time
             else:
                 # Add new label mapping
-                cache[utterance_hash]["command_mapping"][label] = {
+                command_mapping[label] = {
                     "frequency": 1,
                     "feedback_date": current_time
                 }
-        else:
-            # Create new entry
-            cache[utterance_hash] = {
-                "embedding": embedding if embedding is not None else [],
-                "utterance": utterance,  # Store original utterance for reference
-                "command_mapping": {
-                    label: {
-                        "frequency": 1,
-                        "feedback_date": current_time
-                    }
-                }
-            }
-        
-        # Save updated cache to database
-        db["cache"] = cache
-        
+
+            # Save the updated records
+            if embedding is not None:
+                db[f"{_EMBEDDING_PREFIX}{utterance_hash}"] = embedding.tobytes()
+            db[meta_key] = meta
+            revision = db.get(_REVISION_KEY, 0)
+            db[_REVISION_KEY] = revision + 1
+
+            # Keep the resident index in step. If another process wrote since it was
+            # built, it is stale anyway and the next match reloads it.
+            index = _INDEXES.get(cache_path)
+            if index is not None:
+                with index._lock:
+                    if index.revision == revision:
+                        index.upsert(utterance_hash, embedding, command_mapping, revision + 1)
+
         return utterance_hash
-        
-    finally:
-        # Always close the database
-        db.close()
 
 def get_embedding(text: str, model_pipeline):
     """Return (possibly cached) embedding for *text* using *model_pipeline*."""
@@ -144,72 +424,24 @@ def cache_match(cache_path, utterance, model_pipeline, threshold=0.90, return_de
         If match found: true_label or (true_label, similarity) if return_details=True
         If no match: None
     """
-    # Open the database
-    db = Rdict(cache_path)
-    try:
-        # Get the cache dictionary
-        cache = db.get("cache", {})
-
-        # If no entries, return None
-        if not cache:
-            return None
-
-        # Get embedding for the query utterance
-        query_embedding = get_embedding(utterance, model_pipeline)
+    with _open_cache(cache_path) as db:
+        index = get_embedding_index(cache_path, db)
 
-        # Reshape query embedding for cosine_similarity
-        query_embedding = query_embedding.reshape(1, -1)
-
-        # Check cache for similar utterances
-        best_similarity = 0
-        cache_match = None
-
-        # Find the best matching cached utterance
-        for hash_key, entry in cache.items():
-            # Skip entries without embeddings
-            if not entry.get("embedding"):
-                continue
-
-            # Reshape cached embedding for cosine_similarity
-            cached_embedding = np.array(entry["embedding"]).reshape(1, -1)
-            similarity = cosine_similarity(query_embedding, cached_embedding)[0][0]
-
-            if similarity > best_similarity:
-                best_similarity = similarity
-                cache_match = hash_key
-
-        # If good cache match found, determine the best label
-        if best_similarity >= threshold and cache_match is not None:
-            command_mapping = cache[cache_match]["command_mapping"]
+    # If no entries, return None
+    if not index.keys:
+        return None
 
-            # If only one label, return it directly
-            if len(command_mapping) == 1:
-                true_label = next(iter(command_mapping.keys()))
-            else:
-                # Find label with highest frequency
-                max_frequency = 0
-                max_freq_labels = []
-
-                for label, info in command_mapping.items():
-                    freq = info["frequency"]
-                    if freq > max_frequency:
-                        max_frequency = freq
-                        max_freq_labels = [label]
-                    elif freq == max_frequency:
-                        max_freq_labels.append(label)
-
-                # If multiple labels with same frequency, choose most recent one
-                if len(max_freq_labels) > 1:
-                    true_label = max(
-                        max_freq_labels,
-                        key=lambda l: command_mapping[l]["feedback_date"]
-                    )
-                else:
-                    true_label = max_freq_labels[0]
+    # Get embedding for the query utterance
+    query_embedding = get_embedding(utterance, model_pipeline)
 
-            return (true_label, best_similarity) if return_details else true_label
-        # No good match found
+    matches = index.search(query_embedding, k=1)
+    if not matches:
         return None
-    finally:
-        # Always close the database
-        db.close()
\ No newline at end of file
+    cache_match, best_similarity = matches[0]
+
+    # If good cache match found, determine the best label
+    if best_similarity >= threshold:
+        true_label = _best_label(index.command_mappings[cache_match])
+        return (true_label, best_similarity) if return_details else true_label
+    # No good match found
+    return None
@@ -2,8 +2,6 @@ from enum import Enum
 from queue import Empty, Queue
 from threading import Thread
 from typing import Optional
-import contextlib
-from pathlib import Path
 import os
 import time
 
@@ -14,8 +12,7 @@ import fastworkflow
 from fastworkflow import active_workflow
 from fastworkflow.workflow_execution_context import WorkflowExecutionContext
 from fastworkflow.utils.logging import logger
-from fastworkflow.model_pipeline_training import CommandRouter
-from fastworkflow.utils.startup_progress import StartupProgress
+from fastworkflow.intent_preload import preload_intent_models
 
 
 class SessionStatus(Enum):
@@ -205,29 +202,12 @@ class ChatSession:
         # Eager warm-up of CommandRouter / ModelPipeline
         # ------------------------------------------------------------
         # Loading transformer checkpoints and moving them to device is
-        # expensive (~1 s).  We do it here *once* for every model artifact
-        # directory so that the first user message does not pay the cost.
+        # expensive (~1 s per context).  Every trained context is loaded and
+        # warmed up here, in parallel, so that the first user message does
+        # not pay the cost.  Contexts preloaded earlier in this process (the
+        # CLI and the FastAPI server preload at startup) are skipped.
         try:
-            command_info_root = Path(workflow.folderpath) / "___command_info"
-            if command_info_root.is_dir():
-                subdirs = [d for d in command_info_root.iterdir() if d.is_dir()]
-
-                # Tell the progress bar how many extra steps we are going to
-                # perform (one per directory plus one for the wildcard "*").
-                StartupProgress.add_total(len(subdirs) + 1)
-
-                for subdir in subdirs:
-                    # Instantiating CommandRouter triggers ModelPipeline
-                    # construction and caches it process-wide.
-                    with contextlib.suppress(Exception):
-                        CommandRouter(str(subdir))
-                    StartupProgress.advance(f"Warm-up {subdir.name}")
-
-                # Also warm-up the global-context artefacts, which live in a
-                # pseudo-folder named '*' in some workflows.
-                with contextlib.suppress(Exception):
-                    CommandRouter(str(command_info_root / '*'))
-                StartupProgress.advance("Warm-up global")
+            preload_intent_models(workflow.folderpath)
         except Exception as warm_err:  # pragma: no cover – warm-up must never fail
             logger.debug(f"Model warm-up skipped due to error: {warm_err}")
 
@@ -335,7 +315,7 @@ class ChatSession:
 
     @_conversation_history.setter
     def _conversation_history(self, value: dspy.History) -> None:
-        self._core._conversation_history = value
+        self._core._replace_conversation_history(value)
 
     # def clear_conversation_history(self, trace_filename_suffix: Optional[str] = None) -> None:
     def clear_conversation_history(self) -> None:
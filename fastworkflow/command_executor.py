@@ -7,6 +7,7 @@ from fastworkflow.utils.signatures import InputForParamExtraction
 from pathlib import Path
 from fastworkflow.command_routing import RoutingDefinition
 from typing import Optional
+from pydantic import BaseModel
 from fastworkflow.command_context_model import CommandContextModel
 from fastworkflow.command_directory import CommandDirectory
 
@@ -57,6 +58,29 @@ class CommandExecutor(CommandExecutorInterface):
         input_obj = command_output.command_responses[0].artifacts["cmd_parameters"]
 
         workflow = chat_session.get_active_workflow()
+
+        raw_user_message = command
+        if "raw_user_message" in workflow.context:
+            raw_user_message = workflow.context['raw_user_message']
+
+        command_output = cls.execute_resolved_command(
+            workflow, command_name, raw_user_message, input_obj)
+
+        # important to clear the current command mode from the workflow context
+        if "is_assistant_mode_command" in chat_session.cme_workflow._context:
+            del chat_session.cme_workflow._context["is_assistant_mode_command"]
+
+        return command_output
+
+    @classmethod
+    def execute_resolved_command(
+        cls,
+        workflow: fastworkflow.Workflow,
+        command_name: str,
+        raw_user_message: str,
+        input_obj: Optional[BaseModel] = None,
+    ) -> fastworkflow.CommandOutput:
+        """Run *command_name* in *workflow* with parameters that are already extracted."""
         workflow_name = workflow.folderpath.split('/')[-1]
         context = workflow.current_command_context_displayname
 
@@ -74,10 +98,6 @@ class CommandExecutor(CommandExecutorInterface):
             )
         response_generation_object = response_generation_class()
 
-        raw_user_message = command
-        if "raw_user_message" in workflow.context:
-            raw_user_message = workflow.context['raw_user_message']
-
         if command_parameters_class := (
             command_routing_definition.get_command_class(
                 command_name, ModuleType.COMMAND_PARAMETERS_CLASS
@@ -93,10 +113,6 @@ class CommandExecutor(CommandExecutorInterface):
         command_output.command_name = command_name
         command_output.command_parameters = input_obj or None
 
-        # important to clear the current command mode from the workflow context
-        if "is_assistant_mode_command" in chat_session.cme_workflow._context:
-            del chat_session.cme_workflow._context["is_assistant_mode_command"]
-
         return command_output
 
     @classmethod
@@ -5,15 +5,35 @@ including a centralized API for extracting command metadata.
 from __future__ import annotations
 
 import contextlib
+import contextvars
+from dataclasses import dataclass, field
 from typing import Any, Dict, List
 import inspect
 from pathlib import Path
 import json
+import threading
 
 import fastworkflow
 from fastworkflow.command_routing import RoutingDefinition
-from fastworkflow.command_directory import CommandDirectory
+from fastworkflow.command_directory import CommandDirectory, compute_commands_source_fingerprint
 from fastworkflow.utils import python_utils
+from fastworkflow.utils.metrics import metrics
+
+_CATALOG_REQUESTS = {
+    result: metrics.counter(
+        "fastworkflow_command_catalog_requests_total",
+        "Command catalog lookups, by whether the cached catalog was still current",
+        labels={"result": result},
+    )
+    for result in ("hit", "miss")
+}
+
+# Workflow-root files the rendered context header is read from.
+_CONTEXT_INFO_BASENAMES = ("context_inheritance_model.json", "context_containment_model.json")
+
+# Workflow paths -> fingerprint, reused for the rest of a ``catalog_snapshot()`` block.
+_snapshot_fingerprints: contextvars.ContextVar[dict[tuple[str, ...], tuple[str, ...]] | None] = (
+    contextvars.ContextVar("fastworkflow_command_catalog_snapshot", default=None))
 
 def _is_pydantic_undefined(value: Any) -> bool:
     """Return True if value appears to be Pydantic's 'undefined' sentinel.
@@ -27,11 +47,101 @@ def _is_pydantic_undefined(value: Any) -> bool:
     except Exception:
         return False
 
+def _catalog_fingerprint(*workflow_paths: str) -> tuple[str, ...]:
+    """Fingerprint everything a command catalog of these workflows is derived from."""
+    fingerprint: list[str] = []
+    for workflow_path in workflow_paths:
+        fingerprint.append(compute_commands_source_fingerprint(workflow_path))
+        for basename in _CONTEXT_INFO_BASENAMES:
+            with contextlib.suppress(OSError):
+                st = (Path(workflow_path) / basename).stat()
+                fingerprint.append(f"{basename}:{st.st_size}:{st.st_mtime_ns}")
+    return tuple(fingerprint)
+
+
+@dataclass
+class _CommandCatalog:
+    """Command metadata for one workflow context, with its rendered display texts."""
+
+    fingerprint: tuple[str, ...]
+    metadata: Any
+    rendered: Dict[tuple, str] = field(default_factory=dict)
+
+
 class CommandMetadataAPI:
     """
     Provides a centralized API for extracting command metadata.
+
+    Command metadata is memoized per (workflow, context): building it imports
+    every command module and introspects its Signature, and the planner,
+    ``what_can_i_do`` and the MCP server ask for the same catalog on every
+    turn. A catalog is reused for as long as the command sources it was built
+    from keep their fingerprint (see ``compute_commands_source_fingerprint``)
+    and is rebuilt on the next lookup after they change. Cached metadata is
+    shared between callers and must be treated as read-only.
     """
 
+    _catalogs: Dict[tuple, _CommandCatalog] = {}
+    _catalogs_lock = threading.Lock()
+
+    @staticmethod
+    def clear_catalog_cache() -> None:
+        """Drop every memoized command catalog."""
+        with CommandMetadataAPI._catalogs_lock:
+            CommandMetadataAPI._catalogs.clear()
+
+    @staticmethod
+    @contextlib.contextmanager
+    def catalog_snapshot():
+        """Check each workflow's command sources at most once for the duration of the block.
+
+        Fingerprinting walks and stats the workflow trees, so callers that look up
+        many commands in one go (``list_tools``, suggested-command metadata) wrap the
+        loop in this instead of re-checking the sources per command. Nested blocks
+        share the outer snapshot.
+        """
+        if _snapshot_fingerprints.get() is not None:
+            yield
+            return
+        token = _snapshot_fingerprints.set({})
+        try:
+            yield
+        finally:
+            _snapshot_fingerprints.reset(token)
+
+    @staticmethod
+    def _get_catalog(key: tuple, workflow_paths: tuple[str, ...], build) -> _CommandCatalog:
+        """Return the catalog for *key*, rebuilding it with *build* if its sources changed."""
+        snapshot = _snapshot_fingerprints.get()
+        if snapshot is None:
+            fingerprint = _catalog_fingerprint(*workflow_paths)
+        elif (fingerprint := snapshot.get(workflow_paths)) is None:
+            fingerprint = snapshot[workflow_paths] = _catalog_fingerprint(*workflow_paths)
+        with CommandMetadataAPI._catalogs_lock:
+            catalog = CommandMetadataAPI._catalogs.get(key)
+        if catalog is not None and catalog.fingerprint == fingerprint:
+            _CATALOG_REQUESTS["hit"].inc()
+            return catalog
+
+        _CATALOG_REQUESTS["miss"].inc()
+        catalog = _CommandCatalog(fingerprint=fingerprint, metadata=build())
+        with CommandMetadataAPI._catalogs_lock:
+            CommandMetadataAPI._catalogs[key] = catalog
+        return catalog
+
+    @staticmethod
+    def _get_context_catalog(
+        subject_workflow_path: str,
+        cme_workflow_path: str,
+        active_context_name: str,
+    ) -> _CommandCatalog:
+        return CommandMetadataAPI._get_catalog(
+            ("context", subject_workflow_path, cme_workflow_path, active_context_name),
+            (subject_workflow_path, cme_workflow_path),
+            lambda: CommandMetadataAPI._build_enhanced_command_info(
+                subject_workflow_path, cme_workflow_path, active_context_name),
+        )
+
     @staticmethod
     def get_enhanced_command_info(
         subject_workflow_path: str,
@@ -49,6 +159,15 @@ class CommandMetadataAPI:
         Returns:
             Structured dictionary with context and command details
         """
+        return CommandMetadataAPI._get_context_catalog(
+            subject_workflow_path, cme_workflow_path, active_context_name).metadata
+
+    @staticmethod
+    def _build_enhanced_command_info(
+        subject_workflow_path: str,
+        cme_workflow_path: str,
+        active_context_name: str,
+    ) -> Dict[str, Any]:
         subject_crd = fastworkflow.RoutingRegistry.get_definition(subject_workflow_path)
         cme_crd = fastworkflow.RoutingRegistry.get_definition(cme_workflow_path)
 
@@ -546,12 +665,21 @@ class CommandMetadataAPI:
         - Removes empty fields/lists and the 'default' field
         - Includes input 'pattern' only when for_agents=True
         """
-        meta = CommandMetadataAPI.get_enhanced_command_info(
-            subject_workflow_path=subject_workflow_path,
-            cme_workflow_path=cme_workflow_path,
-            active_context_name=active_context_name,
-        )
+        catalog = CommandMetadataAPI._get_context_catalog(
+            subject_workflow_path, cme_workflow_path, active_context_name)
+        key = ("context", for_agents)
+        if (text := catalog.rendered.get(key)) is None:
+            text = catalog.rendered[key] = CommandMetadataAPI._render_command_display_text(
+                catalog.metadata, subject_workflow_path, active_context_name, for_agents)
+        return text
 
+    @staticmethod
+    def _render_command_display_text(
+        meta: Dict[str, Any],
+        subject_workflow_path: str,
+        active_context_name: str,
+        for_agents: bool,
+    ) -> str:
         # Build minimal context info (inheritance/containment if available)
         context_info: Dict[str, Any] = {
             "name": active_context_name,
@@ -589,12 +717,13 @@ class CommandMetadataAPI:
         parts: List[str] = []
         for cmd in cmds:
             fq = cmd.get("qualified_name", "")
-            if part := CommandMetadataAPI.get_command_display_text_for_command(
+            if part := CommandMetadataAPI._render_command_display_text_for_command(
+                meta,
                 subject_workflow_path=subject_workflow_path,
-                cme_workflow_path=cme_workflow_path,
                 active_context_name=active_context_name,
                 qualified_command_name=fq,
                 for_agents=for_agents,
+                omit_command_name=False,
             ):
                 parts.append(part)
 
@@ -638,17 +767,18 @@ class CommandMetadataAPI:
             return "No suggested commands provided."
 
         parts: list[str] = []
-        for suggested_cmd in suggested_command_names:
-            # Try to get metadata for this command
-            # The command name could be qualified (Context/command) or short (command)
-            if part := CommandMetadataAPI.get_command_display_text_for_command(
-                subject_workflow_path=subject_workflow_path,
-                cme_workflow_path=cme_workflow_path,
-                active_context_name=active_context_name,
-                qualified_command_name=suggested_cmd,
-                for_agents=for_agents,
-            ):
-                parts.append(part)
+        with CommandMetadataAPI.catalog_snapshot():
+            for suggested_cmd in suggested_command_names:
+                # Try to get metadata for this command
+                # The command name could be qualified (Context/command) or short (command)
+                if part := CommandMetadataAPI.get_command_display_text_for_command(
+                    subject_workflow_path=subject_workflow_path,
+                    cme_workflow_path=cme_workflow_path,
+                    active_context_name=active_context_name,
+                    qualified_command_name=suggested_cmd,
+                    for_agents=for_agents,
+                ):
+                    parts.append(part)
 
         if not parts:
             return "No metadata available for suggested commands."
@@ -677,12 +807,29 @@ class CommandMetadataAPI:
 
         Mirrors get_command_display_text but filters to a specific command only.
         """
-        meta = CommandMetadataAPI.get_enhanced_command_info(
-            subject_workflow_path=subject_workflow_path,
-            cme_workflow_path=cme_workflow_path,
-            active_context_name=active_context_name,
-        )
+        catalog = CommandMetadataAPI._get_context_catalog(
+            subject_workflow_path, cme_workflow_path, active_context_name)
+        key = ("command", qualified_command_name, for_agents, omit_command_name)
+        if (text := catalog.rendered.get(key)) is None:
+            text = catalog.rendered[key] = CommandMetadataAPI._render_command_display_text_for_command(
+                catalog.metadata,
+                subject_workflow_path=subject_workflow_path,
+                active_context_name=active_context_name,
+                qualified_command_name=qualified_command_name,
+                for_agents=for_agents,
+                omit_command_name=omit_command_name,
+            )
+        return text
 
+    @staticmethod
+    def _render_command_display_text_for_command(
+        meta: Dict[str, Any],
+        subject_workflow_path: str,
+        active_context_name: str,
+        qualified_command_name: str,
+        for_agents: bool,
+        omit_command_name: bool,
+    ) -> str:
         target_cmd: Dict[str, Any] | None = next(
             (
                 cmd
@@ -788,6 +935,14 @@ class CommandMetadataAPI:
         Return a mapping of qualified command name -> {inputs: [...], outputs: [...]} where each param is a dict
         with name, type_str, description, examples.
         """
+        return CommandMetadataAPI._get_catalog(
+            ("params", workflow_path),
+            (workflow_path,),
+            lambda: CommandMetadataAPI._build_params_for_all_commands(workflow_path),
+        ).metadata
+
+    @staticmethod
+    def _build_params_for_all_commands(workflow_path: str) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
         directory = CommandDirectory.load(workflow_path)
 
         params_by_command: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterable
 
 import dspy
 
@@ -20,7 +20,7 @@ def extract_turns_from_history(
     ]
 
 
-def restore_history_from_turns(turns: list[dict[str, Any]]) -> dspy.History:
+def restore_history_from_turns(turns: Iterable[dict[str, Any]]) -> dspy.History:
     messages = [
         {
             "conversation summary": turn.get("conversation summary"),
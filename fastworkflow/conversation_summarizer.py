@@ -0,0 +1,152 @@
+"""Background conversation summarization for agent turns.
+
+Summarizing a finished agent turn is a planner-LM ``ChainOfThought`` call, and
+nothing in the turn's answer depends on it: the summary is only read by later
+turns (``_refine_user_query``, the planner) and by whoever persists the
+conversation. With background summarization enabled the turn records a
+placeholder entry in ``dspy.History`` -- the raw user message, exactly what an
+agent turn without actions records -- and returns at once; a worker replaces the
+placeholder with the summary. ``WorkflowExecutionContext.conversation_history``
+waits for the session's outstanding summaries, so every reader sees the same
+history it would have seen with synchronous summarization.
+
+Ordering is per session: a session's summaries run one after another, in the
+order its turns finished, while different sessions share the worker pool. The
+queue is bounded; a turn that finds it full waits for a slot (backpressure)
+rather than growing it.
+
+Configured per process:
+
+* ``CONVERSATION_SUMMARY_ASYNC`` -- enable background summarization (default off).
+* ``CONVERSATION_SUMMARY_WORKERS`` -- worker threads (default 4).
+* ``CONVERSATION_SUMMARY_MAX_PENDING`` -- summaries queued or running at once,
+  across sessions (default 64).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import fastworkflow
+from fastworkflow.utils.logging import logger
+from fastworkflow.utils.metrics import metrics
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+
+_LAG_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+_SUMMARY_LAG = metrics.histogram(
+    "fastworkflow_conversation_summary_lag_seconds",
+    "Time from a turn finishing to its conversation summary being recorded",
+    buckets=_LAG_BUCKETS,
+)
+_READER_WAIT = metrics.histogram(
+    "fastworkflow_conversation_summary_reader_wait_seconds",
+    "Time a conversation-history reader waited for outstanding summaries",
+    buckets=(0.001, 0.01, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+_BACKPRESSURE_WAIT = metrics.histogram(
+    "fastworkflow_conversation_summary_backpressure_seconds",
+    "Time a finishing turn waited for room in the summary queue",
+    buckets=(0.001, 0.01, 0.1, 0.5, 1, 5, 10, 30),
+)
+_PENDING = metrics.gauge(
+    "fastworkflow_conversation_summary_pending",
+    "Conversation summaries queued or running",
+)
+_FAILURES = metrics.counter(
+    "fastworkflow_conversation_summary_failures_total",
+    "Background conversation summaries that failed; the placeholder was kept",
+)
+
+
+class SummaryQueue:
+    """Bounded worker pool that runs each session's summaries in order."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        self.max_pending = max(1, int(max_pending))
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)),
+            thread_name_prefix="fastworkflow-summary",
+        )
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def submit(
+        self, summarize: Callable[[], None], after: Optional[Future] = None
+    ) -> Future:
+        """Run *summarize* once *after* (the session's previous summary) is done.
+
+        Blocks while ``max_pending`` summaries are outstanding. The returned
+        future never raises: a failed summary is logged and counted, and the
+        turn keeps its placeholder.
+        """
+        wait_started = time.perf_counter()
+        self._slots.acquire()
+        _BACKPRESSURE_WAIT.observe(time.perf_counter() - wait_started)
+        _PENDING.inc()
+
+        submitted_at = time.perf_counter()
+        future: Future = Future()
+
+        def run() -> None:
+            try:
+                summarize()
+            except Exception as exc:  # noqa: BLE001
+                _FAILURES.inc()
+                logger.warning(f"Background conversation summary failed: {exc}")
+            finally:
+                _SUMMARY_LAG.observe(time.perf_counter() - submitted_at)
+                _PENDING.dec()
+                self._slots.release()
+                future.set_result(None)
+
+        if after is None or after.done():
+            self._executor.submit(run)
+        else:
+            after.add_done_callback(lambda _: self._executor.submit(run))
+        return future
+
+
+def wait_for(future: Optional[Future]) -> None:
+    """Block until *future* (a session's latest summary) is done, recording the wait."""
+    if future is None or future.done():
+        return
+    wait_started = time.perf_counter()
+    future.result()
+    _READER_WAIT.observe(time.perf_counter() - wait_started)
+
+
+def async_summaries_enabled() -> bool:
+    return fastworkflow.get_env_var("CONVERSATION_SUMMARY_ASYNC", bool, default=False)
+
+
+_queue_lock = threading.Lock()
+_summary_queue: Optional[SummaryQueue] = None
+
+
+def get_summary_queue() -> SummaryQueue:
+    """Return the process-wide queue, built from the environment on first use."""
+    global _summary_queue
+    with _queue_lock:
+        if _summary_queue is None:
+            _summary_queue = SummaryQueue(
+                max_workers=fastworkflow.get_env_var(
+                    "CONVERSATION_SUMMARY_WORKERS", int, default=DEFAULT_WORKERS),
+                max_pending=fastworkflow.get_env_var(
+                    "CONVERSATION_SUMMARY_MAX_PENDING", int, default=DEFAULT_MAX_PENDING),
+            )
+        return _summary_queue
+
+
+def set_summary_queue(queue: Optional[SummaryQueue]) -> None:
+    """Install *queue*, or None to rebuild it from the environment on next use."""
+    global _summary_queue
+    with _queue_lock:
+        _summary_queue = queue
@@ -0,0 +1,156 @@
+"""Pluggable inference backends for the intent-detection classifiers.
+
+``ModelPipeline`` used to hold two eager-PyTorch
+``AutoModelForSequenceClassification`` models.  Production runs intent
+detection on CPU, where an ONNX Runtime session over the same weights is
+faster and lighter.  A backend wraps one classifier directory (the
+``tinymodel.pth`` / ``largemodel.pth`` folders written by ``save_model``)
+together with its tokenizer and answers two questions for a batch of texts:
+the classification logits and the final-layer [CLS] embedding.
+
+The backend is chosen per process with ``INTENT_DETECTION_BACKEND``:
+
+* ``torch`` (default) -- the saved transformers checkpoint in eager PyTorch.
+* ``onnx`` -- ``model.onnx`` inside the classifier directory.
+* ``onnx-int8`` -- ``model.int8.onnx``, the dynamically quantized graph.
+
+The ONNX graphs are written by ``fastworkflow.train.onnx_export`` when
+``INTENT_DETECTION_ONNX_EXPORT`` is set during training.  A directory that
+was trained without export falls back to torch with a warning, so switching
+the env var on never breaks an older artifact version.  Directories holding a
+per-context head (``INTENT_DETECTION_SHARED_BACKBONE``) are always served by
+``fastworkflow.shared_backbone.HeadClassifier``.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+
+import fastworkflow
+from fastworkflow import shared_backbone
+from fastworkflow.utils.logging import logger
+
+TORCH_BACKEND = "torch"
+ONNX_BACKEND = "onnx"
+ONNX_INT8_BACKEND = "onnx-int8"
+
+ONNX_MODEL_FILENAME = "model.onnx"
+ONNX_INT8_MODEL_FILENAME = "model.int8.onnx"
+
+# Graph outputs shared by the exporter and the ONNX backend. The inputs are the
+# tokenizer's ``model_input_names``, so BERT and DistilBERT graphs differ there.
+ONNX_OUTPUT_NAMES = ("logits", "cls_embedding")
+
+_ONNX_FILENAMES = {
+    ONNX_BACKEND: ONNX_MODEL_FILENAME,
+    ONNX_INT8_BACKEND: ONNX_INT8_MODEL_FILENAME,
+}
+
+_MAX_LENGTH = 128
+
+
+def get_backend_name() -> str:
+    """The backend requested by ``INTENT_DETECTION_BACKEND``."""
+    backend = fastworkflow.get_env_var(
+        "INTENT_DETECTION_BACKEND", default=TORCH_BACKEND).strip().lower()
+    if backend != TORCH_BACKEND and backend not in _ONNX_FILENAMES:
+        raise ValueError(
+            f"Unknown INTENT_DETECTION_BACKEND '{backend}'. "
+            f"Expected one of: {TORCH_BACKEND}, {', '.join(_ONNX_FILENAMES)}"
+        )
+    return backend
+
+
+class TorchClassifier:
+    """A saved transformers classifier run in eager PyTorch."""
+
+    backend = TORCH_BACKEND
+
+    def __init__(self, model_path: str, device: str):
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_path).to(device)
+        self.model.eval()
+        self.num_labels = self.model.config.num_labels
+
+    def _tokenize(self, texts: list[str]):
+        return self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=_MAX_LENGTH,
+            return_tensors="pt"
+        ).to(self.device)
+
+    @torch.no_grad()
+    def logits(self, texts: list[str]) -> torch.Tensor:
+        return self.model(**self._tokenize(texts)).logits
+
+    @torch.no_grad()
+    def embed_cls(self, texts: list[str]) -> np.ndarray:
+        outputs = self.model(**self._tokenize(texts), output_hidden_states=True)
+        return outputs.hidden_states[-1][:, 0, :].cpu().numpy()
+
+
+class OnnxClassifier:
+    """An exported classifier graph run by onnxruntime on CPU."""
+
+    def __init__(self, model_path: str, onnx_filename: str, backend: str, device: str = "cpu"):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError(
+                "The onnxruntime package is required for the ONNX intent-detection backend. "
+                "Install it with: pip install onnxruntime"
+            ) from e
+
+        self.backend = backend
+        # Sessions run on CPU; logits are handed back on the pipeline's device.
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        self.num_labels = AutoConfig.from_pretrained(model_path).num_labels
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_path, onnx_filename),
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = [graph_input.name for graph_input in self.session.get_inputs()]
+
+    def _run(self, texts: list[str], output_name: str) -> np.ndarray:
+        encodings = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=_MAX_LENGTH,
+            return_tensors="np"
+        )
+        feeds = {name: encodings[name].astype(np.int64) for name in self._input_names}
+        return self.session.run([output_name], feeds)[0]
+
+    def logits(self, texts: list[str]) -> torch.Tensor:
+        return torch.from_numpy(self._run(texts, "logits")).to(self.device)
+
+    def embed_cls(self, texts: list[str]) -> np.ndarray:
+        return self._run(texts, "cls_embedding")
+
+
+def load_classifier(model_path: str, device: str, backend: Optional[str] = None):
+    """Load the classifier in *model_path* with *backend* (default: from the env)."""
+    if shared_backbone.is_head_dir(model_path):
+        # A head trained on a shared encoder; the backbone is loaded once per version.
+        return shared_backbone.HeadClassifier(model_path, device)
+    backend = backend or get_backend_name()
+    onnx_filename = _ONNX_FILENAMES.get(backend)
+    if onnx_filename is None:
+        return TorchClassifier(model_path, device)
+    if not os.path.isfile(os.path.join(model_path, onnx_filename)):
+        logger.warning(
+            f"{onnx_filename} not found in {model_path}; using the torch backend. "
+            "Retrain with INTENT_DETECTION_ONNX_EXPORT=true to export it."
+        )
+        return TorchClassifier(model_path, device)
+    return OnnxClassifier(model_path, onnx_filename, backend, device)
@@ -0,0 +1,180 @@
+"""Cross-request micro-batching for intent-detection inference.
+
+Every FastAPI worker thread used to run its own batch-of-one TinyBERT
+forward pass (plus a DistilBERT pass when TinyBERT was unsure), even though
+``ModelPipeline.predict_batch`` handles padded batches and already forwards
+only the low-confidence subset to DistilBERT.  ``PredictionBatcher`` sits in
+front of one pipeline: callers enqueue a single utterance and block on a
+future, while a worker thread gathers whatever arrives within a short window
+(or until the batch is full), runs one ``predict_batch`` call and hands each
+caller its own slice of the result.
+
+Batching is opt-in and configured per process:
+
+* ``INTENT_BATCH_WINDOW_MS`` -- how long the first request in a batch waits
+  for company. ``0`` (the default) disables batching entirely.
+* ``INTENT_BATCH_MAX_SIZE`` -- dispatch as soon as this many are queued.
+
+The worker thread holds the batcher (and through it the pipeline), so it does
+not outlive its use: it exits after ``_IDLE_EXIT_SECONDS`` without work and is
+restarted by the next prediction, and ``close()`` -- called when a pipeline is
+evicted -- stops it for good.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import fastworkflow
+from fastworkflow.utils.logging import logger
+from fastworkflow.utils.metrics import metrics
+
+_BATCH_SIZE = metrics.histogram(
+    "fastworkflow_intent_batch_size",
+    "Utterances classified per batched intent-detection forward pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+_QUEUE_WAIT = metrics.histogram(
+    "fastworkflow_intent_batch_queue_wait_seconds",
+    "Time an utterance waited in the intent batcher before its batch ran",
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+# How long an idle worker waits for work before exiting.
+_IDLE_EXIT_SECONDS = 30.0
+# Queued by ``close()`` to stop the worker once everything ahead of it has run.
+_CLOSE = None
+
+
+@dataclass
+class _PendingPrediction:
+    text: str
+    k_val: Optional[int]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+def _slice_result(results: dict[str, Any], index: int) -> dict[str, Any]:
+    """Cut one sample out of a ``predict_batch`` result, keeping its batch-of-one shape."""
+    return {
+        key: (value[index:index + 1])
+        for key, value in results.items()
+    }
+
+
+class PredictionBatcher:
+    """Coalesces concurrent single-utterance predictions on one pipeline."""
+
+    def __init__(self, pipeline, window_ms: float, max_batch_size: int = 32):
+        self.pipeline = pipeline
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue: "queue.Queue[Optional[_PendingPrediction]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def from_env(cls, pipeline) -> Optional["PredictionBatcher"]:
+        """Build a batcher from the env settings, or None when batching is disabled."""
+        window_ms = fastworkflow.get_env_var("INTENT_BATCH_WINDOW_MS", float, default=0.0)
+        if not window_ms or window_ms <= 0:
+            return None
+        max_batch_size = fastworkflow.get_env_var("INTENT_BATCH_MAX_SIZE", int, default=32)
+        return cls(pipeline, window_ms, max_batch_size)
+
+    def predict(self, text: str, k_val: Optional[int] = None) -> dict[str, Any]:
+        """Queue *text* and block until its batch has run.
+
+        Once the batcher is closed, *text* is classified on its own instead.
+        """
+        pending = _PendingPrediction(text=text, k_val=k_val)
+        # Checking ``_closed``, starting the worker and queueing happen under one
+        # lock, so nothing is queued behind the close sentinel or an exiting worker.
+        with self._worker_lock:
+            closed = self._closed
+            if not closed:
+                self._ensure_worker()
+                self._queue.put(pending)
+        if closed:
+            return self.pipeline.predict_batch([text], batch_size=1, k_val=k_val)
+        return pending.future.result()
+
+    def close(self) -> None:
+        """Stop the worker after it has run everything already queued. Idempotent."""
+        with self._worker_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._worker is not None:
+                self._queue.put(_CLOSE)
+
+    def _ensure_worker(self) -> None:
+        """Start the worker unless one is running. Called with ``_worker_lock`` held."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="intent-batcher", daemon=True
+            )
+            self._worker.start()
+
+    def _collect(self, first: _PendingPrediction) -> tuple[list[_PendingPrediction], bool]:
+        """Gather a batch behind *first*; the flag is set when the close sentinel was reached."""
+        batch = [first]
+        deadline = time.perf_counter() + self.window_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if pending is _CLOSE:
+                return batch, True
+            batch.append(pending)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=_IDLE_EXIT_SECONDS)
+            except queue.Empty:
+                with self._worker_lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+            if first is _CLOSE:
+                return
+            batch, closing = self._collect(first)
+            # Requests with a different top-k cannot share a call.
+            by_k: dict[Optional[int], list[_PendingPrediction]] = {}
+            for pending in batch:
+                by_k.setdefault(pending.k_val, []).append(pending)
+            for k_val, group in by_k.items():
+                self._dispatch(group, k_val)
+            if closing:
+                return
+    def _dispatch(self, group: list[_PendingPrediction], k_val: Optional[int]) -> None:
+        started = time.perf_counter()
+        for pending in group:
+            _QUEUE_WAIT.observe(started - pending.enqueued_at)
+        _BATCH_SIZE.observe(len(group))
+        try:
+            results = self.pipeline.predict_batch(
+                [pending.text for pending in group],
+                batch_size=len(group),
+                k_val=k_val,
+            )
+        except Exception as exc:  # noqa: BLE001 - each caller re-raises its own copy
+            logger.warning(f"Batched intent prediction failed for {len(group)} utterance(s): {exc}")
+            for pending in group:
+                pending.future.set_exception(exc)
+            return
+        for index, pending in enumerate(group):
+            pending.future.set_result(_slice_result(results, index))
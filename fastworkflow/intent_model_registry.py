@@ -0,0 +1,273 @@
+"""Hot-swapping of trained intent-detection model versions in a running process.
+
+``CommandRouter`` and ``ModelPipeline`` are cached by artifact path for the life of
+the process, and ``CommandNamePrediction`` reaches them through the per-context
+compatibility entries (``___command_info/<Context>``). Publishing a new artifact
+version re-points those entries, but a process that already loaded a context keeps
+serving the old router until it restarts -- and then pays the cold load and warm-up
+under traffic.
+
+:func:`watch_workflow` installs an :class:`IntentModelRegistry` for a workflow:
+
+* A watcher thread polls the current-version pointer (``current.json``) every
+  ``INTENT_MODEL_WATCH_INTERVAL_SECONDS`` (default 5; ``0`` disables watching).
+* When a new version is published, the router of every context already loaded from
+  the serving version -- plus the global context -- is built and warmed up in the
+  background. Routers are addressed by the version's own directory
+  (``versions/<id>/<Context>``), so a later publish cannot change what is loading.
+* The new version is then swapped in atomically. A turn pins the version that was
+  serving when it started (:func:`turn_lease`), so every prediction of a turn (an
+  escalation walk scores several contexts) uses one version and a swap takes effect
+  between turns.
+* The old version's routers, pipelines and shared backbones are evicted from the
+  process-wide caches once the last turn holding it has finished.
+
+A version that fails to load is not swapped in; the serving version stays live and
+the failed one is retried only once a different version is published. Without a
+registry (the CLI, training, tests) routers are addressed by the compatibility path
+exactly as before.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterator, Optional
+
+import fastworkflow
+from fastworkflow.train import artifact_versioning
+from fastworkflow.utils.logging import logger
+from fastworkflow.utils.metrics import metrics
+
+DEFAULT_WATCH_INTERVAL_SECONDS = 5.0
+
+_SWAPS = metrics.counter(
+    "fastworkflow_intent_model_swaps_total",
+    "Intent model versions swapped into a running process",
+)
+_SWAP_FAILURES = metrics.counter(
+    "fastworkflow_intent_model_swap_failures_total",
+    "Published intent model versions that failed to load and were not swapped in",
+)
+_SWAP_LOAD_SECONDS = metrics.histogram(
+    "fastworkflow_intent_model_swap_load_seconds",
+    "Background load and warm-up time of an intent model version before its swap",
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+_RETIRING = metrics.gauge(
+    "fastworkflow_intent_model_retiring_versions",
+    "Swapped-out intent model versions still held by in-flight turns",
+)
+
+# Workflow key -> version pinned by the turn running in this context.
+_pinned_versions: contextvars.ContextVar[dict[str, str]] = contextvars.ContextVar(
+    "fastworkflow_pinned_intent_model_versions", default={})
+
+_registries: dict[str, "IntentModelRegistry"] = {}
+# Workflow path as callers spell it -> resolved registry key (or None).
+_workflow_keys: dict[str, Optional[str]] = {}
+_registries_lock = threading.Lock()
+
+
+class IntentModelRegistry:
+    """Serves one workflow's routers from a single artifact version at a time."""
+
+    def __init__(self, workflow_folderpath: str, interval_seconds: float):
+        self.workflow_folderpath = str(Path(workflow_folderpath).resolve())
+        self.interval_seconds = interval_seconds
+        self.serving: Optional[str] = artifact_versioning.resolve_current_version(
+            self.workflow_folderpath)
+        self._lock = threading.Lock()
+        self._leases: Counter = Counter()
+        self._retiring: set[str] = set()
+        self._loaded_folders: set[str] = set()
+        self._failed: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def artifact_path(self, context_folder: str, version_id: Optional[str] = None) -> Optional[str]:
+        """The folder *context_folder* loads from in *version_id* (default: serving)."""
+        version_id = version_id or self.serving
+        if version_id is None:
+            return None
+        if context_folder not in self._loaded_folders:
+            with self._lock:
+                self._loaded_folders.add(context_folder)
+        return str(artifact_versioning.version_dir(self.workflow_folderpath, version_id) / context_folder)
+
+    def acquire(self) -> Optional[str]:
+        """Pin the serving version for one turn; pair with :meth:`release`."""
+        with self._lock:
+            version_id = self.serving
+            if version_id is not None:
+                self._leases[version_id] += 1
+            return version_id
+
+    def release(self, version_id: Optional[str]) -> None:
+        if version_id is None:
+            return
+        with self._lock:
+            self._leases[version_id] -= 1
+            if self._leases[version_id] > 0:
+                return
+            del self._leases[version_id]
+            if version_id not in self._retiring:
+                return
+            self._retiring.discard(version_id)
+            _RETIRING.set(len(self._retiring))
+        self._evict(version_id)
+
+    def poll(self) -> bool:
+        """Swap in the published version if it differs from the serving one."""
+        candidate = artifact_versioning.resolve_current_version(self.workflow_folderpath)
+        if candidate is None or candidate in (self.serving, self._failed):
+            return False
+
+        started = time.perf_counter()
+        try:
+            self._warm_up(candidate)
+        except Exception as e:  # noqa: BLE001 - keep serving the loaded version
+            self._failed = candidate
+            _SWAP_FAILURES.inc()
+            logger.warning(
+                f"Could not load intent model version {candidate} for "
+                f"{self.workflow_folderpath}; still serving {self.serving}: {e}")
+            return False
+        _SWAP_LOAD_SECONDS.observe(time.perf_counter() - started)
+        self._swap(candidate)
+        return True
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval_seconds <= 0:
+            return
+        self._thread = threading.Thread(
+            target=self._watch, name="fastworkflow-intent-model-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 1)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.poll()
+            except Exception as e:  # noqa: BLE001 - the watcher must outlive a bad poll
+                logger.warning(f"Intent model version watch failed: {e}")
+
+    def _warm_up(self, version_id: str) -> None:
+        from fastworkflow.intent_preload import _load_and_warm_up
+
+        available = set(artifact_versioning.version_context_names(
+            self.workflow_folderpath, version_id))
+        with self._lock:
+            wanted = self._loaded_folders | {artifact_versioning.GLOBAL_CONTEXT_FOLDER}
+        for folder in sorted(wanted & available):
+            _load_and_warm_up(self.artifact_path(folder, version_id))
+
+    def _swap(self, version_id: str) -> None:
+        with self._lock:
+            previous, self.serving = self.serving, version_id
+            idle = previous is not None and self._leases[previous] == 0
+            if previous is not None and not idle:
+                self._retiring.add(previous)
+            _RETIRING.set(len(self._retiring))
+        _SWAPS.inc()
+        logger.info(
+            f"Serving intent model version {version_id} for {self.workflow_folderpath} "
+            f"(was {previous})")
+        if idle:
+            self._evict(previous)
+
+    def _evict(self, version_id: str) -> None:
+        from fastworkflow.model_pipeline_training import evict_cached_models
+
+        evicted = evict_cached_models(
+            artifact_versioning.version_dir(self.workflow_folderpath, version_id))
+        logger.info(f"Retired intent model version {version_id} ({evicted} cached model(s))")
+
+
+def _registry_for(workflow_folderpath: str) -> Optional[IntentModelRegistry]:
+    if not _registries:
+        return None
+    try:
+        key = _workflow_keys[workflow_folderpath]
+    except KeyError:
+        key = _workflow_keys[workflow_folderpath] = str(Path(workflow_folderpath).resolve())
+    return _registries.get(key)
+
+
+def resolve_artifact_path(model_artifacts_folderpath: str) -> str:
+    """Where a router for *model_artifacts_folderpath* should load from right now.
+
+    A compatibility path (``<workflow>/___command_info/<Context>``) of a watched
+    workflow maps into the version pinned by the current turn, or else the serving
+    version. Every other path is returned unchanged.
+    """
+    if not _registries:
+        return model_artifacts_folderpath
+    info_dir, context_folder = os.path.split(model_artifacts_folderpath)
+    workflow_folderpath, info_name = os.path.split(info_dir)
+    if info_name != artifact_versioning.COMMAND_INFO_FOLDERNAME:
+        return model_artifacts_folderpath
+    registry = _registry_for(workflow_folderpath)
+    if registry is None:
+        return model_artifacts_folderpath
+    pinned = _pinned_versions.get().get(registry.workflow_folderpath)
+    return registry.artifact_path(context_folder, pinned) or model_artifacts_folderpath
+
+
+@contextlib.contextmanager
+def turn_lease(workflow_folderpath: Optional[str]) -> Iterator[None]:
+    """Pin the serving model version of *workflow_folderpath* for one turn."""
+    registry = _registry_for(workflow_folderpath) if workflow_folderpath else None
+    if registry is None or registry.workflow_folderpath in _pinned_versions.get():
+        yield
+        return
+    version_id = registry.acquire()
+    token = _pinned_versions.set(
+        {**_pinned_versions.get(), registry.workflow_folderpath: version_id})
+    try:
+        yield
+    finally:
+        _pinned_versions.reset(token)
+        registry.release(version_id)
+
+
+def watch_workflow(
+    workflow_folderpath: str, interval_seconds: Optional[float] = None
+) -> IntentModelRegistry:
+    """Serve *workflow_folderpath*'s routers through a version-aware registry.
+
+    Call before anything loads a router for the workflow, so every router is cached
+    under its version. Idempotent per workflow.
+    """
+    if interval_seconds is None:
+        interval_seconds = fastworkflow.get_env_var(
+            "INTENT_MODEL_WATCH_INTERVAL_SECONDS", float,
+            default=DEFAULT_WATCH_INTERVAL_SECONDS)
+    key = str(Path(workflow_folderpath).resolve())
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = IntentModelRegistry(key, interval_seconds)
+            _workflow_keys.clear()
+    registry.start()
+    return registry
+
+
+def stop_watching() -> None:
+    """Stop every watcher and route routers by compatibility path again."""
+    with _registries_lock:
+        registries = list(_registries.values())
+        _registries.clear()
+        _workflow_keys.clear()
+    for registry in registries:
+        registry.stop()
@@ -0,0 +1,209 @@
+"""Startup preloading of the intent-detection models.
+
+``CommandRouter`` and ``ModelPipeline`` are otherwise built the first time a
+context sees a message, so checkpoint loading and the first forward pass
+(kernel selection, allocator warm-up) land on an unlucky user's request.
+:func:`preload_intent_models` does that work up front: it enumerates the
+trained contexts of the workflow's current artifact version, builds their
+routers on a small thread pool, runs one dummy utterance through both
+classifiers, and reports each context through ``StartupProgress``.
+
+Configured per process:
+
+* ``INTENT_PRELOAD_WORKERS`` -- threads used to load contexts (default 4).
+* ``INTENT_PRELOAD_MEMORY_BUDGET_MB`` -- stop preloading once the estimated
+  weight size of the loaded contexts would exceed this many MB. The global
+  context is loaded first, the rest alphabetically; contexts over the budget
+  stay lazy. ``0`` (the default) preloads everything.
+
+Routers are built with the same artifact path string ``CommandNamePrediction``
+uses, so the process-wide router cache serves the preloaded instances.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import fastworkflow
+from fastworkflow import shared_backbone
+from fastworkflow.intent_backends import (
+    ONNX_BACKEND,
+    ONNX_INT8_BACKEND,
+    ONNX_INT8_MODEL_FILENAME,
+    ONNX_MODEL_FILENAME,
+    TORCH_BACKEND,
+    get_backend_name,
+)
+from fastworkflow.model_pipeline_training import CommandRouter
+from fastworkflow.train import artifact_versioning
+from fastworkflow.train.selective_training import REQUIRED_CONTEXT_ARTIFACTS
+from fastworkflow.utils.logging import logger
+from fastworkflow.utils.startup_progress import StartupProgress
+
+_WARM_UP_UTTERANCE = "what can i do"
+_TORCH_WEIGHT_FILENAMES = (
+    "model.safetensors",
+    "pytorch_model.bin",
+    shared_backbone.HEAD_WEIGHTS_FILENAME,
+)
+_ONNX_WEIGHT_FILENAMES = {
+    ONNX_BACKEND: ONNX_MODEL_FILENAME,
+    ONNX_INT8_BACKEND: ONNX_INT8_MODEL_FILENAME,
+}
+
+# Artifact paths already preloaded in this process, so a second caller (the CLI
+# preloads before ChatSession starts the workflow) does not warm them up again.
+_preloaded: set[str] = set()
+_preloaded_lock = threading.Lock()
+
+
+@dataclass
+class PreloadReport:
+    """What :func:`preload_intent_models` did, for logging and the readiness probe."""
+
+    loaded: list[str] = field(default_factory=list)
+    over_budget: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    estimated_mb: float = 0.0
+    seconds: float = 0.0
+
+
+def trained_context_folders(workflow_folderpath: str) -> list[str]:
+    """Context folders under ``___command_info`` holding a complete artifact set.
+
+    Enumerated from the current artifact version when there is one (falling back to
+    the legacy flat layout), global context first.
+    """
+    root = artifact_versioning.command_info_root(workflow_folderpath)
+    if version_id := artifact_versioning.resolve_current_version(workflow_folderpath):
+        candidates = artifact_versioning.version_context_names(workflow_folderpath, version_id)
+    elif root.is_dir():
+        candidates = sorted(
+            entry.name for entry in root.iterdir()
+            if entry.is_dir() and entry.name not in artifact_versioning.RESERVED_TOPLEVEL_NAMES
+        )
+    else:
+        candidates = []
+
+    folders = [
+        name for name in candidates
+        if all((root / name / artifact).exists() for artifact in REQUIRED_CONTEXT_ARTIFACTS)
+    ]
+    return sorted(folders, key=lambda name: (name != artifact_versioning.GLOBAL_CONTEXT_FOLDER, name))
+
+
+def _weight_files(model_dir: str, backend: str) -> list[str]:
+    """The files whose bytes *model_dir* occupies in memory once loaded."""
+    if shared_backbone.is_head_dir(model_dir):
+        backbone_dir = shared_backbone.resolve_backbone_path(model_dir)
+        return [
+            os.path.join(model_dir, shared_backbone.HEAD_WEIGHTS_FILENAME),
+            *_weight_files(backbone_dir, TORCH_BACKEND),
+        ]
+    onnx_filename = _ONNX_WEIGHT_FILENAMES.get(backend)
+    if onnx_filename and os.path.isfile(os.path.join(model_dir, onnx_filename)):
+        return [os.path.join(model_dir, onnx_filename)]
+    return [
+        os.path.join(model_dir, filename)
+        for filename in _TORCH_WEIGHT_FILENAMES
+        if os.path.isfile(os.path.join(model_dir, filename))
+    ]
+
+
+def _weight_sizes(artifact_path: str, backend: str) -> dict[str, int]:
+    """Bytes of each weight file the context at *artifact_path* loads, by real path.
+
+    Keyed by real path so a backbone shared by several heads is counted once.
+    """
+    sizes: dict[str, int] = {}
+    for model_name in ("tinymodel.pth", "largemodel.pth"):
+        for path in _weight_files(os.path.join(artifact_path, model_name), backend):
+            real_path = os.path.realpath(path)
+            sizes[real_path] = os.path.getsize(real_path)
+    return sizes
+
+
+def _load_and_warm_up(artifact_path: str) -> None:
+    router = CommandRouter(artifact_path)
+    pipeline = router.modelpipeline
+    pipeline.tiny_classifier.logits([_WARM_UP_UTTERANCE])
+    pipeline.distil_classifier.logits([_WARM_UP_UTTERANCE])
+
+
+def preload_intent_models(
+    workflow_folderpath: str,
+    max_workers: Optional[int] = None,
+    memory_budget_mb: Optional[float] = None,
+) -> PreloadReport:
+    """Build and warm up the router of every trained context of *workflow_folderpath*.
+
+    Never raises for a context that fails to load; the failure is logged, reported,
+    and left for the first request to that context to surface.
+    """
+    started = time.perf_counter()
+    report = PreloadReport()
+    if max_workers is None:
+        max_workers = fastworkflow.get_env_var("INTENT_PRELOAD_WORKERS", int, default=4)
+    if memory_budget_mb is None:
+        memory_budget_mb = fastworkflow.get_env_var(
+            "INTENT_PRELOAD_MEMORY_BUDGET_MB", float, default=0.0)
+
+    backend = get_backend_name()
+    budget_bytes = memory_budget_mb * 2**20 if memory_budget_mb and memory_budget_mb > 0 else None
+    # Workflow.folderpath is resolved, and the router cache is keyed on the path string.
+    workflow_folderpath = str(Path(workflow_folderpath).resolve())
+    counted: dict[str, int] = {}
+    selected: list[tuple[str, str]] = []
+    for folder in trained_context_folders(workflow_folderpath):
+        artifact_path = f"{workflow_folderpath}/{artifact_versioning.COMMAND_INFO_FOLDERNAME}/{folder}"
+        try:
+            sizes = _weight_sizes(artifact_path, backend)
+        except OSError as e:
+            report.failed[folder] = str(e)
+            continue
+        added = sum(size for path, size in sizes.items() if path not in counted)
+        if budget_bytes is not None and sum(counted.values()) + added > budget_bytes:
+            report.over_budget.append(folder)
+            continue
+        counted.update(sizes)
+        selected.append((folder, artifact_path))
+    report.estimated_mb = sum(counted.values()) / 2**20
+
+    with _preloaded_lock:
+        pending = [(folder, path) for folder, path in selected if path not in _preloaded]
+    report.loaded.extend(folder for folder, path in selected if (folder, path) not in pending)
+
+    StartupProgress.add_total(len(pending))
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+            futures = {
+                executor.submit(_load_and_warm_up, path): (folder, path)
+                for folder, path in pending
+            }
+            for future in as_completed(futures):
+                folder, path = futures[future]
+                try:
+                    future.result()
+                except Exception as e:  # noqa: BLE001 - preloading must never block startup
+                    logger.warning(f"Could not preload intent models for context '{folder}': {e}")
+                    report.failed[folder] = str(e)
+                else:
+                    with _preloaded_lock:
+                        _preloaded.add(path)
+                    report.loaded.append(folder)
+                StartupProgress.advance(f"Loaded intent models for {folder}")
+
+    report.seconds = time.perf_counter() - started
+    logger.info(
+        f"Preloaded intent models for {len(report.loaded)} context(s) "
+        f"(~{report.estimated_mb:.0f} MB) in {report.seconds:.1f}s"
+        + (f"; over budget, left lazy: {', '.join(report.over_budget)}" if report.over_budget else "")
+        + (f"; failed: {', '.join(report.failed)}" if report.failed else "")
+    )
+    return report
@@ -67,82 +67,84 @@ class FastWorkflowMCPServer:
         active_ctx = active_ctx_name if active_ctx_name in routing.contexts else '*'
         command_names = routing.get_command_names(active_ctx)
 
-        # Centralized command metadata (docstrings, inputs, plain_utterances)
-        cme_path = fastworkflow.get_internal_workflow_path("command_metadata_extraction")
-        enhanced_meta = CommandMetadataAPI.get_enhanced_command_info(
-            subject_workflow_path=workflow_folderpath,
-            cme_workflow_path=cme_path,
-            active_context_name=active_ctx_name,
-        )
-        meta_by_fq = {m.get("qualified_name"): m for m in enhanced_meta.get("commands", [])}
-
-        # Centralized parameters for building schemas
-        params_by_cmd = CommandMetadataAPI.get_params_for_all_commands(workflow_folderpath)
-
-        tools = []
-        for command_name in command_names:
-            # Centralized metadata for this command (if any)
-            meta_for_cmd = meta_by_fq.get(command_name)
-            # Build JSON schema from centralized API params
-            input_schema = {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-
-            # Build input schema and required fields
-            field_descriptions = []
-            for param in params_by_cmd.get(command_name, {}).get("inputs", []):
-                field_name = param.get("name") or "param"
-                prop = {"type": "string"}
-                if desc := param.get("description"):
-                    prop["description"] = desc
-                    field_descriptions.append(desc)
-                else:
-                    field_descriptions.append(field_name)
-                if (default := param.get("default")) is not None:
-                    if default == NOT_FOUND:
-                        input_schema["required"].append(field_name)
-                input_schema["properties"][field_name] = prop
-
-            # Use centralized display generator for a single command for rich description
-            description = CommandMetadataAPI.get_command_display_text_for_command(
+        # One check of the command sources covers every lookup below.
+        with CommandMetadataAPI.catalog_snapshot():
+            # Centralized command metadata (docstrings, inputs, plain_utterances)
+            cme_path = fastworkflow.get_internal_workflow_path("command_metadata_extraction")
+            enhanced_meta = CommandMetadataAPI.get_enhanced_command_info(
                 subject_workflow_path=workflow_folderpath,
                 cme_workflow_path=cme_path,
                 active_context_name=active_ctx_name,
-                qualified_command_name=command_name,
-                for_agents=True,
-                omit_command_name=True,
             )
+            meta_by_fq = {m.get("qualified_name"): m for m in enhanced_meta.get("commands", [])}
 
-            # Add standard FastWorkflow parameters
-            # input_schema["properties"]["command"] = {
-            #     "type": "string",
-            #     "description": "Natural language command or query"
-            # }
+            # Centralized parameters for building schemas
+            params_by_cmd = CommandMetadataAPI.get_params_for_all_commands(workflow_folderpath)
 
-            # input_schema["properties"]["workitem_path"] = {
-            #     "type": "string",
-            #     "description": "Command context (optional)",
-            #     "default": active_ctx
-            # }
+            tools = []
+            for command_name in command_names:
+                # Centralized metadata for this command (if any)
+                meta_for_cmd = meta_by_fq.get(command_name)
+                # Build JSON schema from centralized API params
+                input_schema = {
+                    "type": "object",
+                    "properties": {},
+                    "required": []
+                }
 
-            tool_def = {
-                "name": command_name.split("/")[-1],
-                "description": description,
-                "inputSchema": input_schema,
-                "annotations": {
-                    "title": command_name.replace("_", " ").title(),
-                    "readOnlyHint": False,  # Assume tools can modify state
-                    "destructiveHint": False,  # Conservative default
-                    "idempotentHint": False,
-                    "openWorldHint": True  # FastWorkflow can interact with external systems
+                # Build input schema and required fields
+                field_descriptions = []
+                for param in params_by_cmd.get(command_name, {}).get("inputs", []):
+                    field_name = param.get("name") or "param"
+                    prop = {"type": "string"}
+                    if desc := param.get("description"):
+                        prop["description"] = desc
+                        field_descriptions.append(desc)
+                    else:
+                        field_descriptions.append(field_name)
+                    if (default := param.get("default")) is not None:
+                        if default == NOT_FOUND:
+                            input_schema["required"].append(field_name)
+                    input_schema["properties"][field_name] = prop
+
+                # Use centralized display generator for a single command for rich description
+                description = CommandMetadataAPI.get_command_display_text_for_command(
+                    subject_workflow_path=workflow_folderpath,
+                    cme_workflow_path=cme_path,
+                    active_context_name=active_ctx_name,
+                    qualified_command_name=command_name,
+                    for_agents=True,
+                    omit_command_name=True,
+                )
+
+                # Add standard FastWorkflow parameters
+                # input_schema["properties"]["command"] = {
+                #     "type": "string",
+                #     "description": "Natural language command or query"
+                # }
+
+                # input_schema["properties"]["workitem_path"] = {
+                #     "type": "string",
+                #     "description": "Command context (optional)",
+                #     "default": active_ctx
+                # }
+
+                tool_def = {
+                    "name": command_name.split("/")[-1],
+                    "description": description,
+                    "inputSchema": input_schema,
+                    "annotations": {
+                        "title": command_name.replace("_", " ").title(),
+                        "readOnlyHint": False,  # Assume tools can modify state
+                        "destructiveHint": False,  # Conservative default
+                        "idempotentHint": False,
+                        "openWorldHint": True  # FastWorkflow can interact with external systems
+                    }
                 }
-            }
-            # Attach plain_utterances from centralized metadata if present
-            if meta_for_cmd and meta_for_cmd.get("plain_utterances"):
-                tool_def["annotations"]["plain_utterances"] = meta_for_cmd["plain_utterances"]
-            tools.append(tool_def)
+                # Attach plain_utterances from centralized metadata if present
+                if meta_for_cmd and meta_for_cmd.get("plain_utterances"):
+                    tool_def["annotations"]["plain_utterances"] = meta_for_cmd["plain_utterances"]
+                tools.append(tool_def)
 
         return tools
     
@@ -20,15 +20,24 @@ from typing import List, Dict, Optional, Tuple,Union
 import pickle
 from pathlib import Path
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import multiprocessing
 
 from fastworkflow.command_routing import RoutingDefinition
+from fastworkflow.intent_backends import get_backend_name, load_classifier
+from fastworkflow.intent_batching import PredictionBatcher
+from fastworkflow import shared_backbone
 from fastworkflow.train import heldout_evaluation
 from fastworkflow.train.determinism import (
     ContextTrainingStatus,
+    derived_seed,
     get_provenance_recorder,
+    seed_everything,
 )
 from fastworkflow.train.selective_training import contexts_for_training
 from fastworkflow.train import class_balance
+from fastworkflow.train import onnx_export
 from fastworkflow.utils.logging import logger
 from fastworkflow.nlu_labels import (
     PARAMETER_VALUE_LABEL,
@@ -48,7 +57,6 @@ except Exception:  # noqa: BLE001 - older transformers may not expose this
     pass
 
 dataset=None
-label_encoder=LabelEncoder()
 
 
 class TrainingDataError(ValueError):
@@ -89,18 +97,62 @@ def split_training_data(
     return list(train_data), list(test_data)
 
 
-def save_label_encoder(filepath):
-    global label_encoder
+def save_label_encoder(filepath, label_encoder: LabelEncoder):
     with open(filepath, 'wb') as f:
         pickle.dump(label_encoder, f)
 
-def load_label_encoder(filepath):
-    global label_encoder
+def load_label_encoder(filepath) -> LabelEncoder:
     with open(filepath, 'rb') as f:
-        label_encoder = pickle.load(f)
+        return pickle.load(f)
 
 
-def find_optimal_confidence_threshold(model, test_loader, device, min_threshold=0.5129, max_top3_usage=0.3, step_size=0.01, k_val=3):
+def collect_model_outputs(model, test_loader, device, desc="Scoring") -> Tuple[torch.Tensor, torch.Tensor]:
+    """Run *model* over *test_loader* once.
+
+    Returns the logits and labels of every sample, on the CPU and in loader order, so
+    confidence analysis and threshold sweeps can share one forward pass instead of
+    re-running the model per threshold.
+    """
+    model.eval()
+    all_logits = []
+    all_labels = []
+    with torch.no_grad():
+        for encodings, labels, _ in tqdm(test_loader, desc=desc):
+            input_ids = encodings['input_ids'].to(device)
+            attention_mask = encodings['attention_mask'].to(device)
+            outputs = model(input_ids, attention_mask=attention_mask)
+            all_logits.append(outputs.logits.cpu())
+            all_labels.append(labels.cpu())
+    return torch.cat(all_logits, dim=0), torch.cat(all_labels, dim=0)
+
+
+def _weighted_f1_scores(predictions: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Weighted F1 of each row of *predictions* (thresholds x samples) against *labels*.
+
+    Matches ``f1_score(labels, row, average='weighted')``: per-class F1 averaged by
+    the support of each true class, with 0 for classes that are never predicted.
+    """
+    num_rows = predictions.shape[0]
+    num_classes = int(max(predictions.max(initial=0), labels.max(initial=0))) + 1
+    row_offsets = (np.arange(num_rows) * num_classes)[:, None]
+    predicted_counts = np.bincount(
+        (predictions + row_offsets).ravel(), minlength=num_rows * num_classes
+    ).reshape(num_rows, num_classes)
+    hits = predictions == labels[None, :]
+    true_positives = np.bincount(
+        (predictions + row_offsets)[hits], minlength=num_rows * num_classes
+    ).reshape(num_rows, num_classes)
+    support = np.bincount(labels, minlength=num_classes)
+
+    denominator = predicted_counts + support[None, :]
+    per_class_f1 = np.divide(
+        2 * true_positives, denominator,
+        out=np.zeros(denominator.shape, dtype=np.float64), where=denominator > 0,
+    )
+    return per_class_f1 @ support / support.sum()
+
+
+def find_optimal_confidence_threshold(model, test_loader, device, min_threshold=0.5129, max_top3_usage=0.3, step_size=0.01, k_val=3, model_outputs=None):
     """
     Find optimal confidence threshold above the escalation threshold while limiting top@3 usage.
     
@@ -111,150 +163,106 @@ def find_optimal_confidence_threshold(model, test_loader, device, min_threshold=
         min_threshold: Minimum threshold (escalation threshold)
         max_top3_usage: Maximum allowed top@3 usage (default 0.3 or 30%)
         step_size: Step size for threshold search
+        model_outputs: Result of ``collect_model_outputs`` for *model* and *test_loader*,
+            when the caller already has it
     """
+    if model_outputs is None:
+        model_outputs = collect_model_outputs(model, test_loader, device)
+    logits, labels = model_outputs
+
     # Get confidence statistics
-    stats, confidences, predictions, labels, failed_cases = analyze_model_confidence(
-        model, test_loader, device
+    stats, confidences, predictions, _, failed_cases = analyze_model_confidence(
+        model, test_loader, device, model_outputs=model_outputs
     )
     
     # Set search range starting from escalation threshold
     start_threshold = min_threshold
     end_threshold = min(stats['successful']['max'], 0.95)
-    
-    best_metrics = None
-    optimal_threshold = None
-    best_score = 0
-    
-    # Store results for all thresholds
-    thresholds = []
-    f1_scores = []
-    top3_usages = []
-    combined_scores = []
-    
-    def calculate_score(f1, top3_usage):
-        """
-        Scoring function that:
-        1. Prioritizes F1 score
-        2. Heavily penalizes exceeding max_top3_usage
-        """
-        if top3_usage > max_top3_usage:
-            return f1 * (1 - 2 * (top3_usage - max_top3_usage))  # Strong penalty for exceeding limit
-        return f1
-    
-    # Test different correct thresholds 
-    model.eval()
-    with torch.no_grad():
-        for threshold in tqdm(np.arange(start_threshold, end_threshold, step_size), 
-                            desc="Finding optimal threshold"):
-            true_labels = []
-            predicted_labels = []
-            top3_count = 0
-            total = 0
-            correct_top1 = 0
-            correct_top3 = 0
-            
-            for encodings, labels, _ in test_loader:
-                input_ids = encodings['input_ids'].to(device)
-                attention_mask = encodings['attention_mask'].to(device)
-                labels = labels.to(device)
-                
-                outputs = model(input_ids, attention_mask=attention_mask)
-                logits = outputs.logits
-                probs = torch.softmax(logits, dim=1)
-                
-                top_probs, top_preds = torch.topk(probs, k=k_val, dim=1) #TODO remove the hardcode k value set it based on len of y
-                max_confidences = top_probs[:, 0]
-                
-                batch_size = labels.size(0)
-                total += batch_size
-                
-                for i in range(batch_size):
-                    if max_confidences[i] >= threshold:
-                        # Use top-1 prediction
-                        pred = top_preds[i, 0]
-                        if pred == labels[i]:
-                            correct_top1 += 1
-                    else:
-                        # Use top-3 predictions
-                        top3_count += 1
-                        if labels[i] in top_preds[i]:
-                            pred = labels[i]
-                            correct_top3 += 1
-                        else:
-                            pred = top_preds[i, 0]
-                    
-                    true_labels.append(labels[i].cpu().item())
-                    predicted_labels.append(pred.cpu().item())
-            
-            # Calculate metrics
-            f1 = f1_score(true_labels, predicted_labels, average='weighted')
-            top3_usage = top3_count / total
-            top1_accuracy = correct_top1 / (total - top3_count) if (total - top3_count) > 0 else 0
-            top3_accuracy = correct_top3 / top3_count if top3_count > 0 else 0
-            
-            # Calculate combined score
-            combined_score = calculate_score(f1, top3_usage)
-            
-            thresholds.append(threshold)
-            f1_scores.append(f1)
-            top3_usages.append(top3_usage)
-            combined_scores.append(combined_score)
-            
-            # Update best threshold if current score is better and top3 usage is within limit
-            if combined_score > best_score and top3_usage <= max_top3_usage:
-                best_score = combined_score
-                optimal_threshold = threshold
-                best_metrics = {
-                    'threshold': threshold,
-                    'f1_score': f1,
-                    'top3_usage': top3_usage,
-                    'top1_accuracy': top1_accuracy,
-                    'top3_accuracy': top3_accuracy,
-                    'combined_score': combined_score
-                }
-    return optimal_threshold, best_metrics
-
+    thresholds = np.arange(start_threshold, end_threshold, step_size)
+    if len(thresholds) == 0:
+        return None, None
 
+    probs = torch.softmax(logits, dim=1)
+    top_probs, top_preds = torch.topk(probs, k=k_val, dim=1) #TODO remove the hardcode k value set it based on len of y
+    max_confidences = top_probs[:, 0].numpy()
+    top_preds = top_preds.numpy()
+    labels = labels.numpy()
+    top1_correct = top_preds[:, 0] == labels
+    in_top_k = (top_preds == labels[:, None]).any(axis=1)
+
+    # Every threshold at once: row t marks the samples answered from top-1 at thresholds[t].
+    # Compared in float32, like the confidences themselves.
+    use_top1 = max_confidences[None, :] >= thresholds.astype(np.float32)[:, None]
+    top_k_pred = np.where(in_top_k, labels, top_preds[:, 0])
+    predicted_labels = np.where(use_top1, top_preds[:, 0][None, :], top_k_pred[None, :])
+
+    total = len(labels)
+    top3_counts = (~use_top1).sum(axis=1)
+    correct_top1 = (use_top1 & top1_correct[None, :]).sum(axis=1)
+    correct_top3 = (~use_top1 & in_top_k[None, :]).sum(axis=1)
+
+    f1_scores = _weighted_f1_scores(predicted_labels, labels)
+    top3_usages = top3_counts / total
+    top1_accuracies = np.divide(
+        correct_top1, total - top3_counts,
+        out=np.zeros(len(thresholds)), where=(total - top3_counts) > 0)
+    top3_accuracies = np.divide(
+        correct_top3, top3_counts, out=np.zeros(len(thresholds)), where=top3_counts > 0)
+
+    # Prioritize F1 and heavily penalize exceeding max_top3_usage
+    over_limit = top3_usages > max_top3_usage
+    combined_scores = np.where(
+        over_limit, f1_scores * (1 - 2 * (top3_usages - max_top3_usage)), f1_scores)
+
+    # Best score within the top-3 usage limit; the first threshold wins ties.
+    eligible = np.where(~over_limit & (combined_scores > 0), combined_scores, -np.inf)
+    best = int(np.argmax(eligible))
+    if not np.isfinite(eligible[best]):
+        return None, None
+
+    optimal_threshold = thresholds[best]
+    best_metrics = {
+        'threshold': optimal_threshold,
+        'f1_score': f1_scores[best],
+        'top3_usage': top3_usages[best],
+        'top1_accuracy': top1_accuracies[best],
+        'top3_accuracy': top3_accuracies[best],
+        'combined_score': combined_scores[best]
+    }
+    return optimal_threshold, best_metrics
 
-def analyze_model_confidence(model, test_loader, device, model_name=""):
-    model.eval()
-    failed_cases = []
-    failed_confidences = []
-    successful_confidences = []
-    all_confidences = []
-    all_predictions = []
-    all_labels = []
-    
-    with torch.no_grad():
-        for encodings, labels, _ in tqdm(test_loader, desc=f"Analyzing {model_name} confidence"):
-            input_ids = encodings['input_ids'].to(device)
-            attention_mask = encodings['attention_mask'].to(device)
-            labels = labels.to(device)
-
-            outputs = model(input_ids, attention_mask=attention_mask)
-            logits = outputs.logits
-            probs = torch.softmax(logits, dim=1)
-            predictions = torch.argmax(logits, dim=1)
-            confidence = torch.max(probs, dim=1).values
-
-            # Store all results
-            all_confidences.extend(confidence.cpu().numpy())
-            all_predictions.extend(predictions.cpu().numpy())
-            all_labels.extend(labels.cpu().numpy())
 
-            # Analyze correct and incorrect predictions
-            correct_mask = (predictions == labels)
-            incorrect_mask = ~correct_mask
 
-            for idx in torch.where(incorrect_mask)[0]:
-                failed_confidences.append(confidence[idx].item())
-                failed_cases.append({
-                    'true_label': labels[idx].item(),
-                    'predicted_label': predictions[idx].item(),
-                    'confidence': confidence[idx].item()
-                })
+def analyze_model_confidence(model, test_loader, device, model_name="", model_outputs=None):
+    if model_outputs is None:
+        model_outputs = collect_model_outputs(
+            model, test_loader, device, desc=f"Analyzing {model_name} confidence")
+    logits, labels = model_outputs
 
-            successful_confidences.extend(confidence[correct_mask].cpu().numpy())
+    probs = torch.softmax(logits, dim=1)
+    predictions = torch.argmax(logits, dim=1)
+    confidence = torch.max(probs, dim=1).values
+
+    all_confidences = list(confidence.numpy())
+    all_predictions = list(predictions.numpy())
+    all_labels = list(labels.numpy())
+
+    # Analyze correct and incorrect predictions
+    correct_mask = (predictions == labels)
+    failed_confidences = confidence[~correct_mask].tolist()
+    failed_cases = [
+        {
+            'true_label': true_label,
+            'predicted_label': predicted_label,
+            'confidence': conf,
+        }
+        for true_label, predicted_label, conf in zip(
+            labels[~correct_mask].tolist(),
+            predictions[~correct_mask].tolist(),
+            failed_confidences,
+        )
+    ]
+    successful_confidences = confidence[correct_mask].numpy()
 
     stats = {
         'failed': {
@@ -264,10 +272,10 @@ def analyze_model_confidence(model, test_loader, device, model_name=""):
             'median': np.median(failed_confidences) if failed_confidences else None
         },
         'successful': {
-            'min': np.min(successful_confidences) if successful_confidences else None,
-            'max': np.max(successful_confidences) if successful_confidences else None,
-            'mean': np.mean(successful_confidences) if successful_confidences else None,
-            'median': np.median(successful_confidences) if successful_confidences else None
+            'min': np.min(successful_confidences) if len(successful_confidences) else None,
+            'max': np.max(successful_confidences) if len(successful_confidences) else None,
+            'mean': np.mean(successful_confidences) if len(successful_confidences) else None,
+            'median': np.median(successful_confidences) if len(successful_confidences) else None
         }
     }
     return stats, all_confidences, all_predictions, all_labels, failed_cases
@@ -293,16 +301,51 @@ def find_optimal_threshold(tiny_stats, test_loader, pipeline):
             }]
         )
 
-    results = []
-    for threshold in tqdm(thresholds, desc="Finding optimal threshold"):
-        pipeline.confidence_threshold = threshold
-        f1, ndcg, stats = pipeline.evaluate(test_loader)
-        results.append({
+    # Both models score every evaluation text once; each threshold then only decides
+    # which of the two answers ModelPipeline.evaluate would have used per sample.
+    k = pipeline.k_val
+    tiny_confidences, tiny_top_k, distil_top_k, labels, batch_ids = [], [], [], [], []
+    with torch.no_grad():
+        for batch_index, (_, batch_labels, texts) in enumerate(
+            tqdm(test_loader, desc="Scoring threshold candidates")
+        ):
+            tiny_probs = torch.softmax(pipeline.tiny_classifier.logits(texts), dim=1).cpu()
+            distil_probs = torch.softmax(pipeline.distil_classifier.logits(texts), dim=1).cpu()
+            tiny_confidences.append(tiny_probs.max(dim=1).values)
+            tiny_top_k.append(torch.topk(tiny_probs, k=k, dim=1).indices)
+            distil_top_k.append(torch.topk(distil_probs, k=k, dim=1).indices)
+            labels.append(batch_labels.cpu())
+            batch_ids.append(torch.full((len(texts),), batch_index))
+    tiny_confidences = torch.cat(tiny_confidences).numpy()
+    tiny_top_k = torch.cat(tiny_top_k).numpy()
+    distil_top_k = torch.cat(distil_top_k).numpy()
+    labels = torch.cat(labels).numpy()
+    batch_ids = torch.cat(batch_ids).numpy()
+    num_batches = len(test_loader)
+
+    # Row t marks the samples that fall through to DistilBERT at thresholds[t],
+    # compared in float32 like the pipeline does.
+    need_distil = tiny_confidences[None, :] < thresholds.astype(np.float32)[:, None]
+    top_k = np.where(need_distil[:, :, None], distil_top_k[None, :, :], tiny_top_k[None, :, :])
+
+    f1_scores = _weighted_f1_scores(top_k[:, :, 0], labels)
+    # One relevant label per sample, so NDCG@k is 1/log2(rank + 2) when it is ranked.
+    discounts = 1 / np.log2(np.arange(2, k + 2, dtype=np.float32))
+    sample_ndcg = ((top_k == labels[None, :, None]) * discounts).sum(axis=2)
+    in_batch = batch_ids[:, None] == np.arange(num_batches)[None, :]
+    ndcg_scores = (sample_ndcg @ in_batch / in_batch.sum(axis=0)).mean(axis=1)
+    distil_usages = need_distil.mean(axis=1) * 100
+
+    results = [
+        {
             'threshold': threshold,
             'f1': f1,
             'ndcg': ndcg,
-            'distil_usage': stats['distil_percentage']
-        })
+            'distil_usage': distil_usage
+        }
+        for threshold, f1, ndcg, distil_usage in zip(
+            thresholds, f1_scores, ndcg_scores, distil_usages)
+    ]
     
     # Find threshold with best balance of performance and efficiency
     alpha = 0.15
@@ -329,13 +372,21 @@ class CommandRouter:
         The path is normalised (the '*' replacement) so logically identical paths map to the same key.
         This avoids re-reading JSON threshold files **and**, more importantly, re-building the underlying
         ModelPipeline with expensive model loading.
+
+        For a workflow served through ``intent_model_registry`` the compatibility path is first
+        mapped into the artifact version the current turn is pinned to, so each version has its
+        own cache entry and a newly published version never reuses (or replaces) a loaded one.
         """
+        from fastworkflow.intent_model_registry import resolve_artifact_path
+
         # Normalise the path in the same way __init__ will do so that the cache key matches.
-        normalised_path = model_artifacts_folderpath.replace('*', GLOBAL_CONTEXT_FOLDER)
+        normalised_path = resolve_artifact_path(
+            model_artifacts_folderpath.replace('*', GLOBAL_CONTEXT_FOLDER))
         cached = cls._instances_cache.get(normalised_path)
         if cached is not None:
             return cached
         instance = super().__new__(cls)
+        instance._artifacts_folderpath = normalised_path
         cls._instances_cache[normalised_path] = instance
         return instance
 
@@ -343,8 +394,8 @@ class CommandRouter:
         # Avoid re-initialising if we are returning a cached instance.
         if getattr(self, "_initialised", False):
             return
-        if '*' in model_artifacts_folderpath:
-            model_artifacts_folderpath = model_artifacts_folderpath.replace('*', GLOBAL_CONTEXT_FOLDER)
+        # The path __new__ resolved and cached this instance under.
+        model_artifacts_folderpath = self._artifacts_folderpath
             
         self.tiny_path = f"{model_artifacts_folderpath}/tinymodel.pth"
         self.large_path = f"{model_artifacts_folderpath}/largemodel.pth"
@@ -352,6 +403,9 @@ class CommandRouter:
         tiny_ambiguous_threshold_path = f"{model_artifacts_folderpath}/tiny_ambiguous_threshold.json"
         large_ambiguous_threshold_path = f"{model_artifacts_folderpath}/large_ambiguous_threshold.json"
         self.label_encoder_path = f"{model_artifacts_folderpath}/label_encoder.pkl"
+        # Decoded once: prediction is an index into this array, with no per-call
+        # unpickling and no module-level encoder shared across contexts/threads.
+        self.labels: np.ndarray = load_label_encoder(self.label_encoder_path).classes_
         with open(threshold_path, 'r') as f:
             data = json.load(f)
             self.confidence_threshold = data['confidence_threshold']
@@ -375,30 +429,108 @@ class CommandRouter:
         """
         if we are confident we will return a single label otherwise we will return a list
         """
-        results = predict_single_sentence(self.modelpipeline, command, self.label_encoder_path)
+        return self.predict_with_confidence(command)[0]
+
+    def predict_with_confidence(self, command: str) -> tuple[list[str], float]:
+        """``predict`` plus the confidence of the top label from the model that decided."""
+        results = predict_single_sentence(self.modelpipeline, command, self.labels)
+        confidence = float(results['confidence'])
         if (
             results['used_distil']
             and results['confidence'] > self.large_ambiguous_confidence_threshold
             or not results['used_distil']
             and results['confidence'] > self.tiny_ambiguous_confidence_threshold
         ):
-            return [results['label']]
+            return [results['label']], confidence
         else:
-            return results['topk_labels']
-            
-        
+            return results['topk_labels'], confidence
+
+
+# Upper bound on routers evaluated at once for one escalation; hierarchies are shallow.
+_ESCALATION_MAX_WORKERS = 8
+
+
+def predict_across_routers(
+    routers: List[Optional[CommandRouter]], command: str
+) -> List[Optional[list[str]]]:
+    """``router.predict(command)`` for every router, as one round of inference.
+
+    Used by the wildcard escalation walk, which needs the same utterance scored by
+    every ancestor context. Routers whose heads share one encoder
+    (``INTENT_DETECTION_SHARED_BACKBONE``) are run in turn: the first encodes the
+    utterance and the rest read its memoised embedding. Otherwise each router has
+    its own models, so they run concurrently on a thread pool (torch and
+    onnxruntime release the GIL during inference).
+
+    A ``None`` router, or one whose prediction raises, yields ``None``; the caller
+    then predicts that context itself, so an error surfaces exactly where it would
+    have without the look-ahead.
+    """
+    def predict(router: Optional[CommandRouter]) -> Optional[list[str]]:
+        if router is None:
+            return None
+        try:
+            return router.predict(command)
+        except Exception as e:  # noqa: BLE001
+            logger.debug(f"Escalation look-ahead failed for {router.tiny_path}: {e}")
+            return None
+
+    live = [router for router in routers if router is not None]
+    if len(live) <= 1 or all(
+        isinstance(router.modelpipeline.tiny_classifier, shared_backbone.HeadClassifier)
+        for router in live
+    ):
+        return [predict(router) for router in routers]
+
+    with ThreadPoolExecutor(max_workers=min(len(live), _ESCALATION_MAX_WORKERS)) as executor:
+        return list(executor.map(predict, routers))
+
+
+def evict_cached_models(artifacts_root: Union[str, Path]) -> int:
+    """Drop every cached router, pipeline and shared backbone loaded from under *artifacts_root*.
+
+    Used to retire a swapped-out artifact version (see ``intent_model_registry``). Evicted
+    pipelines have their batcher closed; callers still holding an evicted instance keep
+    using it, unbatched, and it is freed once they let go.
+    Returns how many cache entries were removed.
+    """
+    prefixes = tuple({
+        os.path.join(str(artifacts_root), ""),
+        os.path.join(os.path.realpath(artifacts_root), ""),
+    })
+    evicted = 0
+    for key in [key for key in CommandRouter._instances_cache if key.startswith(prefixes)]:
+        router = CommandRouter._instances_cache.pop(key, None)
+        if router is not None:
+            evicted += 1
+            if getattr(router, "modelpipeline", None) is not None:
+                router.modelpipeline.close()
+    for key in [key for key in ModelPipeline._instances_cache if key[0].startswith(prefixes)]:
+        pipeline = ModelPipeline._instances_cache.pop(key, None)
+        if pipeline is not None:
+            evicted += 1
+            pipeline.close()
+    with shared_backbone.SharedBackbone._instances_lock:
+        backbones = shared_backbone.SharedBackbone._instances
+        for key in [key for key in backbones if key[0].startswith(prefixes)]:
+            evicted += backbones.pop(key, None) is not None
+    return evicted
+
+
 class ModelPipeline:
     # ------------------------------------------------------------------
     # Singleton-like caching ------------------------------------------------
     # ------------------------------------------------------------------
-    _instances_cache: ClassVar[dict[tuple[str, str, float, str], "ModelPipeline"]] = {}
+    _instances_cache: ClassVar[dict[tuple[str, str, float, str, str], "ModelPipeline"]] = {}
 
     def __new__(cls,
                 tiny_model_path: str,
                 distil_model_path: str,
                 confidence_threshold: float = 0.65,
-                device: str = 'cuda' if torch.cuda.is_available() else 'cpu'):
-        key = (tiny_model_path, distil_model_path, confidence_threshold, device)
+                device: str = 'cuda' if torch.cuda.is_available() else 'cpu',
+                backend: Optional[str] = None):
+        key = (tiny_model_path, distil_model_path, confidence_threshold, device,
+               backend or get_backend_name())
         existing = cls._instances_cache.get(key)
         if existing is not None:
             return existing
@@ -411,7 +543,8 @@ class ModelPipeline:
         tiny_model_path: str,
         distil_model_path: str,
         confidence_threshold: float = 0.65,
-        device: str = 'cuda' if torch.cuda.is_available() else 'cpu'
+        device: str = 'cuda' if torch.cuda.is_available() else 'cpu',
+        backend: Optional[str] = None
     ):
         # __init__ will be called every time __new__ returns an instance – including
         # when we served a cached instance.  Guard against double-initialisation.
@@ -421,28 +554,26 @@ class ModelPipeline:
         self.device = device
         self.confidence_threshold = confidence_threshold
 
-        # Load TinyBERT
-        self.tiny_tokenizer = AutoTokenizer.from_pretrained(tiny_model_path)
-        self.tiny_model = AutoModelForSequenceClassification.from_pretrained(
-            tiny_model_path
-        ).to(device)
-
-        # Load DistilBERT
-        self.distil_tokenizer = AutoTokenizer.from_pretrained(distil_model_path)
-        self.distil_model = AutoModelForSequenceClassification.from_pretrained(
-            distil_model_path
-        ).to(device)
-
-        # Set models to evaluation mode
-        self.tiny_model.eval()
-        self.distil_model.eval()
+        # TinyBERT and DistilBERT, each through the backend selected by
+        # INTENT_DETECTION_BACKEND (eager torch unless ONNX graphs were exported).
+        backend = backend or get_backend_name()
+        self.tiny_classifier = load_classifier(tiny_model_path, device, backend)
+        self.distil_classifier = load_classifier(distil_model_path, device, backend)
 
         # Determine top-k value once for this pipeline (≤3, but never > num_labels)
-        num_labels = self.tiny_model.config.num_labels
+        num_labels = self.tiny_classifier.num_labels
         self.k_val = min(3, num_labels)
 
+        # Coalesces concurrent single-utterance predictions into shared batches
+        # when INTENT_BATCH_WINDOW_MS is set; None means call predict_batch directly.
+        self.batcher = PredictionBatcher.from_env(self)
+
         self._initialised = True
 
+    def embed_cls(self, texts: List[str]) -> np.ndarray:
+        """DistilBERT final-layer [CLS] embeddings, one row per text."""
+        return self.distil_classifier.embed_cls(texts)
+
     def calculate_ndcg_at_k(self, batch_top_k_preds: List[List[int]], batch_top_k_scores: List[List[float]], true_labels: List[int], k: int = 3) -> float:
         batch_ndcg = 0.0
         
@@ -466,6 +597,21 @@ class ModelPipeline:
         # Return average NDCG for the batch
         return batch_ndcg / len(true_labels)
 
+    def predict_single(self, text: str, k_val: int | None = None) -> Dict:
+        """Classify one utterance, through the micro-batcher when one is configured.
+
+        The result has the same shape as ``predict_batch([text])``.
+        """
+        if self.batcher is None:
+            return self.predict_batch([text], k_val=k_val)
+        return self.batcher.predict(text, k_val)
+
+    def close(self) -> None:
+        """Stop the micro-batcher's worker thread so the pipeline can be freed."""
+        batcher = getattr(self, "batcher", None)
+        if batcher is not None:
+            batcher.close()
+
     @torch.no_grad()
     def predict_batch(
         self,
@@ -485,16 +631,7 @@ class ModelPipeline:
             batch_texts = texts[i:i + batch_size]
 
             # Predict with TinyBERT
-            tiny_inputs = self.tiny_tokenizer(
-                batch_texts,
-                padding=True,
-                truncation=True,
-                max_length=128,
-                return_tensors="pt"
-            ).to(self.device)
-
-            tiny_outputs = self.tiny_model(**tiny_inputs)
-            tiny_logits = tiny_outputs.logits
+            tiny_logits = self.tiny_classifier.logits(batch_texts)
             tiny_probs = torch.softmax(tiny_logits, dim=1)
             tiny_confidence, tiny_predictions = torch.max(tiny_probs, dim=1)
 
@@ -516,16 +653,7 @@ class ModelPipeline:
             if need_distil.any():
                 distil_texts = [text for text, flag in zip(batch_texts, need_distil) if flag]
 
-                distil_inputs = self.distil_tokenizer(
-                    distil_texts,
-                    padding=True,
-                    truncation=True,
-                    max_length=128,
-                    return_tensors="pt"
-                ).to(self.device)
-
-                distil_outputs = self.distil_model(**distil_inputs)
-                distil_logits = distil_outputs.logits
+                distil_logits = self.distil_classifier.logits(distil_texts)
                 distil_probs = torch.softmax(distil_logits, dim=1)
                 distil_confidence, distil_predictions = torch.max(distil_probs, dim=1)
 
@@ -617,9 +745,9 @@ class ModelPipeline:
 def predict_single_sentence(
     pipeline: ModelPipeline,
     text: str,
-    path: str,
-    #label_encoder: LabelEncoder
+    labels: np.ndarray,
 ) -> Dict[str, Union[int, str, float, bool]]:
+    """Classify *text*; *labels* is the fitted encoder's ``classes_`` array."""
 
     # Input validation
     if not isinstance(text, str):
@@ -628,20 +756,16 @@ def predict_single_sentence(
         raise ValueError("Input text cannot be empty")
 
 
-    # `path` is expected to be the absolute path to the label_encoder artefact
-    global label_encoder
-    load_label_encoder(path)
-    k_val=len(label_encoder.classes_)
-    k_val = 3 if k_val>2 else 2
+    k_val = 3 if len(labels) > 2 else 2
     # Make prediction using the pipeline's batch prediction method
-    results = pipeline.predict_batch([text],k_val=k_val)
+    results = pipeline.predict_single(text, k_val=k_val)
     # Get the numeric prediction
     numeric_prediction = results["predictions"][0]
 
-    label_names = label_encoder.inverse_transform(results['top_k_predictions'][0])
+    label_names = labels[results['top_k_predictions'][0]]
 
     # Convert numeric prediction back to original label name
-    label_name = label_encoder.inverse_transform([numeric_prediction])[0]
+    label_name = labels[numeric_prediction]
 
     return {
         "prediction": numeric_prediction,
@@ -666,8 +790,9 @@ def set_active_artifact_version(workflow_folderpath: str, version_id: Optional[s
 
     Pass ``None`` to clear. The trainer installs this for the duration of a run so a
     retrain assembles a NEW version instead of overwriting the live one in place (R4 /
-    finding F5). Keeping it here rather than threading a parameter through means the six
-    existing `get_artifact_path` call sites need no changes.
+    finding F5). Keeping it here rather than threading a parameter through means the
+    `get_artifact_path` call sites need no changes. Training worker processes never
+    see it: ``train`` resolves each context's folder before handing the job out.
     """
     key = str(Path(workflow_folderpath).resolve())
     if version_id is None:
@@ -713,6 +838,17 @@ def get_artifact_path(workflow_folderpath: str, context_name: str, filename: str
     )
 
 
+def get_shared_backbone_path(workflow_folderpath: str, filename: str) -> str:
+    """Return the path of a shared encoder backbone (``tinymodel.pth`` / ``largemodel.pth``).
+
+    Backbones sit beside the context folders, in the same version, under
+    ``SHARED_BACKBONE_FOLDERNAME``; see ``fastworkflow.shared_backbone``.
+    """
+    from fastworkflow.train.artifact_versioning import SHARED_BACKBONE_FOLDERNAME
+
+    return get_artifact_path(workflow_folderpath, SHARED_BACKBONE_FOLDERNAME, filename)
+
+
 def is_workflow_trained(workflow_folderpath: str) -> Tuple[bool, List[str]]:
     """Return ``(is_trained, missing_context_folders)`` for *workflow_folderpath*.
 
@@ -879,6 +1015,107 @@ def _get_cached_command_utterances(
     return command_cache[cmd]
 
 
+def _prefetch_command_utterances(
+    workflow: fastworkflow.Workflow,
+    workflow_folderpath: str,
+    cmd_dir: object,
+    commands: list[str],
+    command_cache: dict[str, list[str]],
+    max_workers: int,
+) -> None:
+    """Generate the utterances of every command in *commands* concurrently.
+
+    Fills *command_cache* exactly as calling ``_get_cached_command_utterances`` on each
+    command in turn would, so the context loop then only reads from it. Generation is
+    keyed by command and each command's result is independent of the others, and the
+    LLM requests themselves stay bounded by the process-wide generation limiter.
+    """
+    pending = [cmd for cmd in commands if cmd not in command_cache]
+    if max_workers <= 1 or len(pending) <= 1:
+        return
+    print(f"Generating utterances for {len(pending)} commands, {max_workers} at a time ...\n")
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+        futures = {
+            cmd: executor.submit(_get_utterances, workflow, workflow_folderpath, cmd_dir, cmd)
+            for cmd in pending
+        }
+        for cmd in pending:
+            command_cache[cmd] = futures[cmd].result()
+
+
+def _train_shared_backbones(
+    workflow: fastworkflow.Workflow,
+    crd: RoutingDefinition,
+    context_names: set[str],
+    core_cmds: set[str],
+    command_cache: dict[str, list[str]],
+    tiny_model_name: str,
+    large_model_name: str,
+    seed: int,
+) -> tuple[str, str, set[str]]:
+    """Fine-tune one TinyBERT and one DistilBERT encoder on every context's commands.
+
+    Rows are ``(utterance, fully-qualified command)`` over the union of all contexts,
+    so the backbone learns the whole workflow's command space once. The reserved
+    labels are left out: the same utterance is a command in one context and an
+    escalation in its children, and only the per-context heads can express that.
+    Personas held out from this union are kept out of the backbone.
+
+    Returns the two backbone paths and the utterances the backbone was trained on.
+    Each context holds out its own personas afterwards, so ``train`` drops these
+    utterances from a context's held-out rows to keep them unseen by the encoder.
+    """
+    workflow_folderpath = workflow.folderpath
+    cmd_dir = crd.command_directory
+    rows: set[tuple[str, str]] = set()
+    for ctx_name in sorted(context_names):
+        for cmd_name in sorted(set(crd.contexts[ctx_name]) | core_cmds):
+            if cmd_name.split('/')[-1] == WILDCARD_LABEL:
+                continue
+            utterances = _get_cached_command_utterances(
+                workflow, workflow_folderpath, cmd_dir, cmd_name, command_cache)
+            rows.update((utterance, cmd_name) for utterance in utterances)
+    backbone_rows = sorted(rows)
+
+    if (recorder := get_provenance_recorder()) is not None:
+        persona_by_utterance: dict[str, str] = {}
+        for provenance in recorder.records.values():
+            persona_by_utterance.update(provenance.utterance_personas)
+        split = heldout_evaluation.split_by_persona(
+            [
+                heldout_evaluation.LabeledUtterance(
+                    utterance=utterance,
+                    label=label,
+                    persona=persona_by_utterance.get(
+                        utterance, heldout_evaluation.SEED_PERSONA_ID),
+                )
+                for utterance, label in backbone_rows
+            ],
+            seed=seed,
+        )
+        backbone_rows = [(record.utterance, record.label) for record in split.train]
+
+    print(f"\n=== Fine-tuning shared encoder backbones on {len(backbone_rows)} utterances "
+          f"across {len(context_names)} contexts ===\n")
+    tiny_path = shared_backbone.fine_tune_backbone(
+        tiny_model_name,
+        backbone_rows,
+        get_shared_backbone_path(workflow_folderpath, "tinymodel.pth"),
+        device,
+        epochs=12,
+        lr=1e-4,
+    )
+    large_path = shared_backbone.fine_tune_backbone(
+        large_model_name,
+        backbone_rows,
+        get_shared_backbone_path(workflow_folderpath, "largemodel.pth"),
+        device,
+        epochs=5,
+        lr=5e-5,
+    )
+    return tiny_path, large_path, {utterance for utterance, _ in backbone_rows}
+
+
 def _record_context_training(
     context_name: str,
     command_name: str,
@@ -1075,6 +1312,499 @@ def _score_heldout_context(
         )
 
 
+@dataclass
+class ContextFitJob:
+    """Everything fitting one context's models needs, picklable for a worker process.
+
+    Built by ``train`` once the context's labelled rows and held-out split are final.
+    ``artifact_dir`` is resolved in the training process, so workers never consult the
+    routing registry or the active artifact version.
+    """
+
+    context_name: str
+    artifact_dir: str
+    utterance_command_tuples: list[tuple[str, str]]
+    seed: int
+    tiny_model_name: str
+    large_model_name: str
+    heldout_records: list[heldout_evaluation.LabeledUtterance] = field(default_factory=list)
+    heldout_personas: list[str] = field(default_factory=list)
+    split_notes: list[str] = field(default_factory=list)
+    benchmark_cases: list[heldout_evaluation.BenchmarkCase] = field(default_factory=list)
+    shared_tiny_path: Optional[str] = None
+    shared_large_path: Optional[str] = None
+
+
+def _init_training_worker(env_vars: dict, torch_threads: int) -> None:
+    fastworkflow.init(env_vars=env_vars)
+    torch.set_num_threads(torch_threads)
+
+
+def fit_contexts(
+    jobs: list[ContextFitJob],
+    max_workers: Optional[int] = None,
+    torch_threads: Optional[int] = None,
+) -> list[heldout_evaluation.HeldoutReport]:
+    """Fit every job's models and return their held-out reports, in job order.
+
+    ``INTENT_TRAINING_WORKERS`` (default 1) sets how many contexts train at once; above
+    1 each runs in a spawned worker process limited to ``INTENT_TRAINING_TORCH_THREADS``
+    torch threads (default: the CPU count divided among the workers). Every context
+    writes only its own artifact folder and is seeded from its own name, so the
+    artifacts do not depend on the worker count or on which context finishes first.
+    The first failing context's exception is re-raised once the running ones finish.
+    """
+    if max_workers is None:
+        max_workers = fastworkflow.get_env_var("INTENT_TRAINING_WORKERS", int, default=1)
+    max_workers = max(1, min(max_workers, len(jobs)))
+    if max_workers == 1:
+        return [_fit_context(job) for job in jobs]
+
+    if torch_threads is None:
+        torch_threads = fastworkflow.get_env_var(
+            "INTENT_TRAINING_TORCH_THREADS", int, default=0)
+    if torch_threads <= 0:
+        torch_threads = max(1, (os.cpu_count() or 1) // max_workers)
+    print(f"Training {len(jobs)} contexts on {max_workers} worker processes "
+          f"with {torch_threads} torch thread(s) each")
+
+    # spawn, not fork: the parent has already started torch and tokenizer threads.
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_training_worker,
+        initargs=(dict(fastworkflow._env_vars), torch_threads),
+    ) as executor:
+        futures = [executor.submit(_fit_context, job) for job in jobs]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+
+
+def _fit_context(job: ContextFitJob) -> heldout_evaluation.HeldoutReport:
+    """Fit, calibrate and score the two classifiers of one context from *job*.
+
+    Runs in the training process or in a worker of ``fit_contexts``. Torch is
+    reseeded from a seed derived from the run seed and the context name, so a
+    context trains to the same weights whichever process fits it and whatever
+    was fitted before it.
+    """
+    seed_everything(derived_seed(job.seed, "context", job.context_name))
+
+    ctx_name = job.context_name
+    seed = job.seed
+    utterance_command_tuples = job.utterance_command_tuples
+    heldout_records = job.heldout_records
+    heldout_personas = job.heldout_personas
+    split_notes = job.split_notes
+    benchmark_cases = job.benchmark_cases
+    tiny_model_name = job.tiny_model_name
+    large_model_name = job.large_model_name
+    shared_tiny_path = job.shared_tiny_path
+    shared_large_path = job.shared_large_path
+    shared_backbone_mode = shared_tiny_path is not None
+    os.makedirs(job.artifact_dir, exist_ok=True)
+
+    # ==================================================================================
+    # Original training procedure below, with only artefact paths changed to per-context
+    # ==================================================================================
+
+    # unpack the test data and train data
+    X, y = zip(*utterance_command_tuples)
+    num= len(set(y))
+    k_val = 3 if num>2 else 2
+    if shared_backbone_mode:
+        # Only a linear head per model size is trained here; the frozen encoders
+        # were fine-tuned once for every context by _train_shared_backbones.
+        tiny_tokenizer = AutoTokenizer.from_pretrained(shared_tiny_path)
+        tiny_model = shared_backbone.HeadModel(shared_tiny_path, num, device).to(device)
+        distil_tokenizer = AutoTokenizer.from_pretrained(shared_large_path)
+        large_model = shared_backbone.HeadModel(shared_large_path, num, device).to(device)
+    else:
+        model_name = tiny_model_name
+        print(f"\nLoading {model_name}...")
+        tiny_tokenizer = AutoTokenizer.from_pretrained(model_name)
+        tiny_model = AutoModelForSequenceClassification.from_pretrained(model_name, num_labels=num).to(device)
+
+        model_name = large_model_name
+        print(f"Loading {model_name}...")
+        distil_tokenizer = AutoTokenizer.from_pretrained(model_name)
+        #large_model = AutoModel.from_pretrained(model_name).to(device)
+        large_model = AutoModelForSequenceClassification.from_pretrained(model_name, num_labels=num).to(device)
+    # A lone linear head needs a far larger step than a full fine-tune.
+    head_lr = 1e-3
+    dataset = list(zip(X, y))
+    label_encoder = LabelEncoder()
+    y_encoded = label_encoder.fit_transform(y)
+
+    # Now create the dataset with encoded labels
+    dataset = list(zip(X, y_encoded))
+    train_data, test_data = split_training_data(dataset)
+
+    # ---------------------------------------------------------------
+    # Collate fn that keeps raw *texts* so we can avoid decode→encode
+    # later during evaluation / fallback inference.
+    # ---------------------------------------------------------------
+    def make_collate_fn(tok):
+        def _fn(batch):
+            texts = [item[0] for item in batch]
+            labels_tensor = torch.tensor([item[1] for item in batch], dtype=torch.long)
+            encodings = tok(
+                texts,
+                padding=True,
+                truncation=True,
+                max_length=128,
+                return_tensors='pt'
+            )
+            return encodings, labels_tensor, texts
+        return _fn
+
+    train_loader = DataLoader(
+        train_data,
+        batch_size=10,
+        shuffle=True,
+        collate_fn=make_collate_fn(tiny_tokenizer)
+    )
+
+    test_loader = DataLoader(
+        test_data,
+        batch_size=10,
+        shuffle=False,
+        collate_fn=make_collate_fn(tiny_tokenizer)
+    )
+
+    # -----------------------------------------------------------------
+    # Preserve the Tiny-BERT test loader before we overwrite *test_loader*
+    # for Distil-BERT.  All Tiny-BERT analysis & threshold-tuning should
+    # continue to use this cached version to avoid tokenizer mismatch.
+    # -----------------------------------------------------------------
+    tiny_test_loader = test_loader
+
+    #batch_size = 64  # Increased batch size
+    optimizer = AdamW(tiny_model.parameters(), lr=head_lr if shared_backbone_mode else 1e-4)  # Slightly higher learning rate
+    num_epochs = 12
+
+    from time import time
+    print("Starting training...")
+    tiny_model.train()
+    best_ndcg = 0
+    best_f1 = 0
+    training_start_time = time()
+    training_losses = []  # Store training loss for each epoch
+    test_losses = []
+    for epoch in range(num_epochs):
+        epoch_start_time = time()
+        print(f"\nEpoch {epoch + 1}/{num_epochs}")
+        total_loss = 0
+        progress_bar = tqdm(train_loader, desc="Training")
+
+        for batch_idx, (encodings, labels, _) in enumerate(progress_bar):
+            input_ids = encodings['input_ids'].to(device)
+            attention_mask = encodings['attention_mask'].to(device)
+            labels = labels.to(device)
+
+            optimizer.zero_grad()
+            outputs = tiny_model(input_ids, attention_mask=attention_mask, labels=labels)
+            loss = outputs.loss
+            loss.backward()
+            optimizer.step()
+
+            total_loss += loss.item()
+            progress_bar.set_postfix({'loss': total_loss / (batch_idx + 1)})
+
+        avg_train_loss = total_loss / len(train_loader)
+        training_losses.append(avg_train_loss)  # Append training loss for the epoch
+
+        # Evaluate after each epoch
+        f1, ndcg, avg_test_loss = evaluate_model(tiny_model, test_loader, device, k_val)
+        test_losses.append(avg_test_loss)
+        epoch_time = time() - epoch_start_time
+        print(f"Epoch {epoch + 1} Results:")
+        print(f"F1 Score: {f1:.4f}")
+        print(f"NDCG@3: {ndcg:.4f}")
+        print(f"Epoch Time: {epoch_time:.2f} seconds")
+
+    # Save paths updated to use context-specific folders
+    tiny_path = os.path.join(job.artifact_dir, "tinymodel.pth")
+    save_model(tiny_model, tiny_tokenizer, tiny_path)
+    total_training_time = time() - training_start_time
+
+
+    train_loader = DataLoader(
+        train_data,
+        batch_size=10,
+        shuffle=True,
+        collate_fn=make_collate_fn(distil_tokenizer)
+    )
+
+    test_loader = DataLoader(
+        test_data,
+        batch_size=10,
+        shuffle=False,
+        collate_fn=make_collate_fn(distil_tokenizer)
+    )
+
+    optimizer = AdamW(large_model.parameters(), lr=head_lr if shared_backbone_mode else 5e-5)
+    num_epochs = 5
+
+    print("Started training distilBert...")
+    large_model.train()
+    best_ndcg = 0
+    best_f1 = 0
+    num_epochs=5
+    for epoch in range(num_epochs):
+        print(f"\nEpoch {epoch + 1}/{num_epochs}")
+        total_loss = 0
+        progress_bar = tqdm(train_loader, desc="Training")
+
+        for batch_idx, (encodings, labels, _) in enumerate(progress_bar):
+            input_ids = encodings['input_ids'].to(device)
+            attention_mask = encodings['attention_mask'].to(device)
+            labels = labels.to(device)
+
+            optimizer.zero_grad()
+            outputs = large_model(input_ids, attention_mask=attention_mask, labels=labels)
+            loss = outputs.loss
+            loss.backward()
+            optimizer.step()
+
+            total_loss += loss.item()
+            progress_bar.set_postfix({'loss': total_loss / (batch_idx + 1)})
+
+        # Evaluate after each epoch
+        f1, ndcg, avg_loss = evaluate_model(large_model, test_loader, device, k_val)
+        print(f"Epoch {epoch + 1} Results:")
+        print(f"F1 Score: {f1:.4f}")
+        print(f"NDCG@3: {ndcg:.4f}")
+
+    # Save paths updated to use context-specific folders
+    large_path = os.path.join(job.artifact_dir, "largemodel.pth")
+    save_model(large_model, distil_tokenizer, large_path)
+
+    # Optional ONNX graphs for INTENT_DETECTION_BACKEND=onnx / onnx-int8. They are
+    # written inside the model directories, so versioning carries them along.
+    onnx_exported = fastworkflow.get_env_var(
+        "INTENT_DETECTION_ONNX_EXPORT", bool, default=False)
+    if onnx_exported and shared_backbone_mode:
+        print("Skipping ONNX export: shared-backbone heads are served by the "
+              "shared encoder, not by a per-context graph")
+        onnx_exported = False
+    if onnx_exported:
+        quantize = fastworkflow.get_env_var(
+            "INTENT_DETECTION_ONNX_QUANTIZE", bool, default=False)
+        for model_dir in (tiny_path, large_path):
+            for onnx_path in onnx_export.export_classifier(model_dir, quantize=quantize):
+                print(f"Exported {onnx_path}")
+
+    pipeline = ModelPipeline(
+        tiny_model_path=tiny_path,  
+        distil_model_path=large_path,
+        confidence_threshold=0.65
+    )
+
+    # Save paths updated to use context-specific folders
+    label_path = os.path.join(job.artifact_dir, "label_encoder.pkl")
+    save_label_encoder(label_path, label_encoder)
+
+    print("\nAnalyzing TinyBERT confidence patterns...")
+    tiny_stats, tiny_confidences, tiny_predictions, tiny_labels, tiny_failed = analyze_model_confidence(tiny_model, tiny_test_loader, device, "TinyBERT")
+
+    print("\nTinyBERT Confidence Statistics:")
+    print("\nFalse Classifications:")
+    if tiny_stats['failed']['min'] is not None:
+        print(f"Minimum Confidence: {tiny_stats['failed']['min']:.4f}")
+    else:
+        print("Minimum Confidence: N/A")
+    if tiny_stats['failed']['max'] is not None:
+        print(f"Maximum Confidence: {tiny_stats['failed']['max']:.4f}")
+    else:
+        print("Maximum Confidence: N/A")
+    if tiny_stats['failed']['mean'] is not None:
+        print(f"Mean Confidence: {tiny_stats['failed']['mean']:.4f}")
+    else:
+        print("Mean Confidence: N/A")
+    if tiny_stats['failed']['median'] is not None:
+        print(f"Median Confidence: {tiny_stats['failed']['median']:.4f}")
+    else:
+        print("Median Confidence: N/A")
+
+    print("\nTrue Classifications:")
+    if tiny_stats['successful']['min'] is not None:
+        print(f"Minimum Confidence: {tiny_stats['successful']['min']:.4f}")
+    else:
+        print("Minimum Confidence: N/A")
+    if tiny_stats['successful']['max'] is not None:
+        print(f"Maximum Confidence: {tiny_stats['successful']['max']:.4f}")
+    else:
+        print("Maximum Confidence: N/A")
+    if tiny_stats['successful']['mean'] is not None:
+        print(f"Mean Confidence: {tiny_stats['successful']['mean']:.4f}")
+    else:
+        print("Mean Confidence: N/A")
+    if tiny_stats['successful']['median'] is not None:
+        print(f"Median Confidence: {tiny_stats['successful']['median']:.4f}")
+    else:
+        print("Median Confidence: N/A")
+
+    print("\nAnalyzing DistilBERT confidence patterns...")
+    large_stats, large_confidences, large_predictions, large_labels, large_failed = analyze_model_confidence(large_model, tiny_test_loader, device, "DistilBERT")
+
+    print("\nTinyBERT Confidence Statistics:")
+    print("\nFalse Classifications:")
+    if large_stats['failed']['min'] is not None:
+        print(f"Minimum Confidence: {large_stats['failed']['min']:.4f}")
+    else:
+        print("Minimum Confidence: N/A")
+    if large_stats['failed']['max'] is not None:
+        print(f"Maximum Confidence: {large_stats['failed']['max']:.4f}")
+    else:
+        print("Maximum Confidence: N/A")
+    if large_stats['failed']['mean'] is not None:
+        print(f"Mean Confidence: {large_stats['failed']['mean']:.4f}")
+    else:
+        print("Mean Confidence: N/A")
+    if large_stats['failed']['median'] is not None:
+        print(f"Median Confidence: {large_stats['failed']['median']:.4f}")
+    else:
+        print("Median Confidence: N/A")
+
+    print("\nTrue Classifications:")
+    if large_stats['successful']['min'] is not None:
+        print(f"Minimum Confidence: {large_stats['successful']['min']:.4f}")
+    else:
+        print("Minimum Confidence: N/A")
+    if large_stats['successful']['max'] is not None:
+        print(f"Maximum Confidence: {large_stats['successful']['max']:.4f}")
+    else:
+        print("Maximum Confidence: N/A")
+    if large_stats['successful']['mean'] is not None:
+        print(f"Mean Confidence: {large_stats['successful']['mean']:.4f}")
+    else:
+        print("Mean Confidence: N/A")
+    if large_stats['successful']['median'] is not None:
+        print(f"Median Confidence: {large_stats['successful']['median']:.4f}")
+    else:
+        print("Median Confidence: N/A")
+
+    print("\nFinding optimal threshold...")
+    best_result, all_results = find_optimal_threshold(tiny_stats, tiny_test_loader, pipeline)
+    print("\nOptimal Threshold Results:")
+    print(f"Threshold: {best_result['threshold']:.4f}")
+    print(f"F1 Score: {best_result['f1']:.4f}")
+    print(f"NDCG@3: {best_result['ndcg']:.4f}")
+    print(f"DistilBERT Usage: {best_result['distil_usage']:.2f}%")
+
+    pipeline.confidence_threshold = best_result['threshold']
+
+    threshold = best_result['threshold']
+    # Save paths updated to use context-specific folders
+    threshold_path = os.path.join(job.artifact_dir, "threshold.json")
+    with open(threshold_path, 'w') as f:
+        json.dump({'confidence_threshold': threshold}, f)
+
+    if onnx_exported:
+        # The exported graph must route exactly like the weights it came from.
+        # Held-out rows and this context's benchmark are the closest thing to
+        # production traffic; the evaluation split stands in when neither exists.
+        parity_utterances = [record.utterance for record in heldout_records] + [
+            case.utterance for case in benchmark_cases if case.context == ctx_name
+        ] or [text for text, _ in test_data]
+        mismatches = onnx_export.compare_backends(
+            tiny_path, large_path, parity_utterances, threshold)
+        print(f"ONNX parity: {len(parity_utterances) - len(mismatches)}"
+              f"/{len(parity_utterances)} utterances with identical top-k labels")
+        for mismatch in mismatches:
+            logger.warning(f"ONNX parity [{ctx_name}]: {mismatch}")
+
+    f1, ndcg, stats = pipeline.evaluate(tiny_test_loader)
+
+    print("\nEvaluation Results:")
+    print(f"F1 Score: {f1:.4f}")
+    print(f"NDCG@3: {ndcg:.4f}")
+    print("\nModel Usage Statistics:")
+    print(f"Total Samples: {stats['total_samples']}")
+    print(f"DistilBERT Usage: {stats['distil_percentage']:.2f}%")
+    print(f"TinyBERT Usage: {stats['tiny_percentage']:.2f}%")
+
+
+
+    if large_stats['failed']['mean'] is not None:
+        large_ambiguous_threshold = large_stats['failed']['mean']
+    else:
+        large_ambiguous_threshold = 0.0
+    # Save paths updated to use context-specific folders
+    large_ambiguous_threshold_path = os.path.join(job.artifact_dir, "large_ambiguous_threshold.json")
+    with open(large_ambiguous_threshold_path, 'w') as f:
+        json.dump({'confidence_threshold': large_ambiguous_threshold}, f)
+
+    if tiny_stats['failed']['mean'] is not None:
+        tiny_ambiguous_threshold = tiny_stats['failed']['mean']
+    else:
+        tiny_ambiguous_threshold = 0.0
+    # Save paths updated to use context-specific folders
+    tiny_ambiguous_threshold_path = os.path.join(job.artifact_dir, "tiny_ambiguous_threshold.json")
+    with open(tiny_ambiguous_threshold_path, 'w') as f:
+        json.dump({'confidence_threshold': tiny_ambiguous_threshold}, f)
+
+
+    text = "list commands"
+    result = predict_single_sentence(pipeline, text, label_encoder.classes_)
+    print(f"Predicted label: {result['label']}")
+    print(f"Confidence: {result['confidence']:.4f}")
+    print(f"Used DistilBERT: {'Yes' if result['used_distil'] else 'No'}")
+
+    # ------------------------------------------------------------------
+    # R1a/R1b: score the reserved personas through the REAL runtime path.
+    # CommandRouter.predict is what intent detection actually calls, thresholds
+    # and all, so this measures what a user would experience rather than what the
+    # raw classifier head emits. Every artifact it needs was written above; the
+    # model directory is taken from the threshold path so this keeps working
+    # whether or not artifacts are being routed into a version.
+    # ------------------------------------------------------------------
+    report = heldout_evaluation.HeldoutReport(
+        context=ctx_name,
+        in_distribution_f1=f1,
+        seed=seed,
+        heldout_personas=heldout_personas,
+        notes=split_notes,
+    )
+    try:
+        has_context_benchmark = any(
+            case.context == ctx_name
+            and case.kind in {"routing", "escalation"}
+            for case in benchmark_cases
+        )
+        predict_labels = None
+        if heldout_records or has_context_benchmark:
+            router = CommandRouter(os.path.dirname(threshold_path))
+
+            def predict_labels(utterance: str, _router=router) -> list[str]:
+                """Adapt `CommandRouter.predict` to the scorer's contract.
+
+                `predict` returns either a one-element list holding a numpy string or
+                the raw numpy top-k array. The scorer needs a plain `list[str]`: a
+                numpy array raises "truth value of an array is ambiguous" the moment
+                anything tests it for emptiness.
+                """
+                return [str(label) for label in _router.predict(utterance)]
+
+        # `kind` is required. Omitting it raised a TypeError that the guard
+        # below turned into a note on the report, so escalation silently
+        # never scored while routing kept working -- the failure looked like
+        # "this workflow has no escalation cases" (bd fix-588).
+        _score_heldout_context(
+            report, heldout_records, benchmark_cases, predict_labels)
+    except Exception as exc:
+        # A scoring failure must never destroy a completed training run: the
+        # models are already on disk and usable. Record it and move on.
+        report.notes.append(f"held-out evaluation failed: {exc}")
+        logger.error(
+            f"Held-out evaluation failed for context '{ctx_name}': {exc}")
+    return report
+
+
 def train(workflow: fastworkflow.Workflow,
           contexts_to_train: Optional[set[str]] = None):
     """Train intent-classification models **per command context**.
@@ -1091,7 +1821,8 @@ def train(workflow: fastworkflow.Workflow,
 
     import time
 
-    from fastworkflow.train.determinism import get_training_seed, seed_everything
+    from fastworkflow.train.determinism import get_training_seed
+    from fastworkflow.train.generate_synthetic import get_generation_limiter
 
     # Seed before anything samples: utterance generation picks personas, torch initialises
     # classifier heads, and the train/test split shuffles. Seeding is necessary but NOT
@@ -1100,7 +1831,8 @@ def train(workflow: fastworkflow.Workflow,
     seed = seed_everything(get_training_seed())
     print(f"Training seed: {seed}")
 
-    heldout_reports: list[heldout_evaluation.HeldoutReport] = []
+    # Filled per context below and fitted together after the loop; see fit_contexts.
+    fit_jobs: list[ContextFitJob] = []
 
     workflow_folderpath = workflow.folderpath
     crd = fastworkflow.RoutingRegistry.get_definition(workflow_folderpath, load_cached=False)
@@ -1169,6 +1901,23 @@ def train(workflow: fastworkflow.Workflow,
     # presents as part of a workflow silently becoming untrained.
     context_set_for_training = contexts_for_training(workflow_folderpath)
 
+    # Base models are configurable so downstream apps can swap them without
+    # code changes. The defaults are transformers 5.x-compatible BERT/DistilBERT
+    # checkpoints that ship a `model_type` and a loadable tokenizer.
+    tiny_model_name = fastworkflow.get_env_var(
+        "INTENT_DETECTION_TINY_MODEL", default="google/bert_uncased_L-4_H-128_A-2")
+    large_model_name = fastworkflow.get_env_var(
+        "INTENT_DETECTION_LARGE_MODEL", default="distilbert-base-uncased")
+
+    # Every head is fitted on the backbone trained in THIS run, so no context's
+    # artifacts can be carried forward from an earlier one.
+    shared_backbone_mode = fastworkflow.get_env_var(
+        "INTENT_DETECTION_SHARED_BACKBONE", bool, default=False)
+    if shared_backbone_mode and contexts_to_train is not None:
+        print("Shared backbone mode: training every context, because the backbone "
+              "all heads share is retrained")
+        contexts_to_train = None
+
     if contexts_to_train is not None:
         requested = set(contexts_to_train)
         skipped = sorted(context_set_for_training - requested)
@@ -1180,6 +1929,35 @@ def train(workflow: fastworkflow.Workflow,
     wildcard_utterances = set(_get_utterances(
         workflow, workflow.folderpath, crd.command_directory, 'wildcard'))
 
+    # Uncached generation is dominated by LLM round-trips, so every command the loop
+    # below will ask for is generated up front, as many at a time as the generation
+    # limiter lets requests be in flight.
+    _prefetch_command_utterances(
+        workflow,
+        workflow_folderpath,
+        cmd_dir,
+        sorted({
+            cmd_name
+            for ctx_name in context_set_for_training
+            for cmd_name in set(crd.contexts[ctx_name]) | core_cmds
+            if cmd_name.split('/')[-1] != WILDCARD_LABEL
+        }),
+        command_utterance_cache,
+        max_workers=get_generation_limiter().max_concurrent,
+    )
+
+    if shared_backbone_mode:
+        shared_tiny_path, shared_large_path, backbone_utterances = _train_shared_backbones(
+            workflow,
+            crd,
+            context_set_for_training,
+            core_cmds,
+            command_utterance_cache,
+            tiny_model_name,
+            large_model_name,
+            seed,
+        )
+
     # Only iterate through contexts defined in this specific workflow.
     # sorted(): context_set_for_training is a set, and a context visited first as an
     # ANCESTOR gets its cache populated from context_model.commands(), which excludes the
@@ -1380,378 +2158,50 @@ def train(workflow: fastworkflow.Workflow,
                     "No held-out personas available for this context; "
                     "only the in-distribution score will be reported"
                 )
-
-        print("Utterances generation complete! Beginning model pipeline training\n")
-
-        # ==================================================================================
-        # Original training procedure below, with only artefact paths changed to per-context
-        # ==================================================================================
-
-        # unpack the test data and train data
-        X, y = zip(*utterance_command_tuples)
-        num= len(set(y))
-        k_val = 3 if num>2 else 2
-        # Base models are configurable so downstream apps can swap them without
-        # code changes. The defaults are transformers 5.x-compatible BERT/DistilBERT
-        # checkpoints that ship a `model_type` and a loadable tokenizer.
-        tiny_model_name = fastworkflow.get_env_var(
-            "INTENT_DETECTION_TINY_MODEL", default="google/bert_uncased_L-4_H-128_A-2")
-        large_model_name = fastworkflow.get_env_var(
-            "INTENT_DETECTION_LARGE_MODEL", default="distilbert-base-uncased")
-
-        model_name = tiny_model_name
-        print(f"\nLoading {model_name}...")
-        tiny_tokenizer = AutoTokenizer.from_pretrained(model_name)
-        tiny_model = AutoModelForSequenceClassification.from_pretrained(model_name, num_labels=num).to(device)
-
-        model_name = large_model_name
-        print(f"Loading {model_name}...")
-        distil_tokenizer = AutoTokenizer.from_pretrained(model_name)
-        #large_model = AutoModel.from_pretrained(model_name).to(device)
-        large_model = AutoModelForSequenceClassification.from_pretrained(model_name, num_labels=num).to(device)
-        global label_encoder
-        dataset = list(zip(X, y))
-        #label_encoder = LabelEncoder()
-        y_encoded = label_encoder.fit_transform(y)
-
-        # Now create the dataset with encoded labels
-        dataset = list(zip(X, y_encoded))
-        train_data, test_data = split_training_data(dataset)
-
-        # ---------------------------------------------------------------
-        # Collate fn that keeps raw *texts* so we can avoid decode→encode
-        # later during evaluation / fallback inference.
-        # ---------------------------------------------------------------
-        def make_collate_fn(tok):
-            def _fn(batch):
-                texts = [item[0] for item in batch]
-                labels_tensor = torch.tensor([item[1] for item in batch], dtype=torch.long)
-                encodings = tok(
-                    texts,
-                    padding=True,
-                    truncation=True,
-                    max_length=128,
-                    return_tensors='pt'
-                )
-                return encodings, labels_tensor, texts
-            return _fn
-
-        train_loader = DataLoader(
-            train_data,
-            batch_size=10,
-            shuffle=True,
-            collate_fn=make_collate_fn(tiny_tokenizer)
-        )
-
-        test_loader = DataLoader(
-            test_data,
-            batch_size=10,
-            shuffle=False,
-            collate_fn=make_collate_fn(tiny_tokenizer)
-        )
-
-        # -----------------------------------------------------------------
-        # Preserve the Tiny-BERT test loader before we overwrite *test_loader*
-        # for Distil-BERT.  All Tiny-BERT analysis & threshold-tuning should
-        # continue to use this cached version to avoid tokenizer mismatch.
-        # -----------------------------------------------------------------
-        tiny_test_loader = test_loader
-
-        #batch_size = 64  # Increased batch size
-        optimizer = AdamW(tiny_model.parameters(), lr=1e-4)  # Slightly higher learning rate
-        num_epochs = 12
-        
-        from time import time
-        print("Starting training...")
-        tiny_model.train()
-        best_ndcg = 0
-        best_f1 = 0
-        training_start_time = time()
-        training_losses = []  # Store training loss for each epoch
-        test_losses = []
-        for epoch in range(num_epochs):
-            epoch_start_time = time()
-            print(f"\nEpoch {epoch + 1}/{num_epochs}")
-            total_loss = 0
-            progress_bar = tqdm(train_loader, desc="Training")
-
-            for batch_idx, (encodings, labels, _) in enumerate(progress_bar):
-                input_ids = encodings['input_ids'].to(device)
-                attention_mask = encodings['attention_mask'].to(device)
-                labels = labels.to(device)
-
-                optimizer.zero_grad()
-                outputs = tiny_model(input_ids, attention_mask=attention_mask, labels=labels)
-                loss = outputs.loss
-                loss.backward()
-                optimizer.step()
-
-                total_loss += loss.item()
-                progress_bar.set_postfix({'loss': total_loss / (batch_idx + 1)})
-
-            avg_train_loss = total_loss / len(train_loader)
-            training_losses.append(avg_train_loss)  # Append training loss for the epoch
-
-            # Evaluate after each epoch
-            f1, ndcg, avg_test_loss = evaluate_model(tiny_model, test_loader, device, k_val)
-            test_losses.append(avg_test_loss)
-            epoch_time = time() - epoch_start_time
-            print(f"Epoch {epoch + 1} Results:")
-            print(f"F1 Score: {f1:.4f}")
-            print(f"NDCG@3: {ndcg:.4f}")
-            print(f"Epoch Time: {epoch_time:.2f} seconds")
-
-        # Save paths updated to use context-specific folders
-        tiny_path = get_artifact_path(workflow_folderpath, ctx_name, "tinymodel.pth")
-        save_model(tiny_model, tiny_tokenizer, tiny_path)
-        total_training_time = time() - training_start_time
-
-
-        train_loader = DataLoader(
-            train_data,
-            batch_size=10,
-            shuffle=True,
-            collate_fn=make_collate_fn(distil_tokenizer)
-        )
-
-        test_loader = DataLoader(
-            test_data,
-            batch_size=10,
-            shuffle=False,
-            collate_fn=make_collate_fn(distil_tokenizer)
-        )
-
-        optimizer = AdamW(large_model.parameters(), lr=5e-5)
-        num_epochs = 5
-
-        print("Started training distilBert...")
-        large_model.train()
-        best_ndcg = 0
-        best_f1 = 0
-        num_epochs=5
-        for epoch in range(num_epochs):
-            print(f"\nEpoch {epoch + 1}/{num_epochs}")
-            total_loss = 0
-            progress_bar = tqdm(train_loader, desc="Training")
-
-            for batch_idx, (encodings, labels, _) in enumerate(progress_bar):
-                input_ids = encodings['input_ids'].to(device)
-                attention_mask = encodings['attention_mask'].to(device)
-                labels = labels.to(device)
-
-                optimizer.zero_grad()
-                outputs = large_model(input_ids, attention_mask=attention_mask, labels=labels)
-                loss = outputs.loss
-                loss.backward()
-                optimizer.step()
-
-                total_loss += loss.item()
-                progress_bar.set_postfix({'loss': total_loss / (batch_idx + 1)})
-
-            # Evaluate after each epoch
-            f1, ndcg, avg_loss = evaluate_model(large_model, test_loader, device, k_val)
-            print(f"Epoch {epoch + 1} Results:")
-            print(f"F1 Score: {f1:.4f}")
-            print(f"NDCG@3: {ndcg:.4f}")
-
-        # Save paths updated to use context-specific folders
-        large_path = get_artifact_path(workflow_folderpath, ctx_name, "largemodel.pth")
-        save_model(large_model, distil_tokenizer, large_path)
-
-        pipeline = ModelPipeline(
-            tiny_model_path=tiny_path,  
-            distil_model_path=large_path,
-            confidence_threshold=0.65
-        )
-        
-        # Save paths updated to use context-specific folders
-        label_path = get_artifact_path(workflow_folderpath, ctx_name, "label_encoder.pkl")
-        save_label_encoder(label_path)
-
-        print("\nAnalyzing TinyBERT confidence patterns...")
-        tiny_stats, tiny_confidences, tiny_predictions, tiny_labels, tiny_failed = analyze_model_confidence(tiny_model, tiny_test_loader, device, "TinyBERT")
-
-        print("\nTinyBERT Confidence Statistics:")
-        print("\nFalse Classifications:")
-        if tiny_stats['failed']['min'] is not None:
-            print(f"Minimum Confidence: {tiny_stats['failed']['min']:.4f}")
-        else:
-            print("Minimum Confidence: N/A")
-        if tiny_stats['failed']['max'] is not None:
-            print(f"Maximum Confidence: {tiny_stats['failed']['max']:.4f}")
-        else:
-            print("Maximum Confidence: N/A")
-        if tiny_stats['failed']['mean'] is not None:
-            print(f"Mean Confidence: {tiny_stats['failed']['mean']:.4f}")
-        else:
-            print("Mean Confidence: N/A")
-        if tiny_stats['failed']['median'] is not None:
-            print(f"Median Confidence: {tiny_stats['failed']['median']:.4f}")
-        else:
-            print("Median Confidence: N/A")
-
-        print("\nTrue Classifications:")
-        if tiny_stats['successful']['min'] is not None:
-            print(f"Minimum Confidence: {tiny_stats['successful']['min']:.4f}")
-        else:
-            print("Minimum Confidence: N/A")
-        if tiny_stats['successful']['max'] is not None:
-            print(f"Maximum Confidence: {tiny_stats['successful']['max']:.4f}")
-        else:
-            print("Maximum Confidence: N/A")
-        if tiny_stats['successful']['mean'] is not None:
-            print(f"Mean Confidence: {tiny_stats['successful']['mean']:.4f}")
-        else:
-            print("Mean Confidence: N/A")
-        if tiny_stats['successful']['median'] is not None:
-            print(f"Median Confidence: {tiny_stats['successful']['median']:.4f}")
-        else:
-            print("Median Confidence: N/A")
-
-        print("\nAnalyzing DistilBERT confidence patterns...")
-        large_stats, large_confidences, large_predictions, large_labels, large_failed = analyze_model_confidence(large_model, tiny_test_loader, device, "DistilBERT")
-
-        print("\nTinyBERT Confidence Statistics:")
-        print("\nFalse Classifications:")
-        if large_stats['failed']['min'] is not None:
-            print(f"Minimum Confidence: {large_stats['failed']['min']:.4f}")
-        else:
-            print("Minimum Confidence: N/A")
-        if large_stats['failed']['max'] is not None:
-            print(f"Maximum Confidence: {large_stats['failed']['max']:.4f}")
-        else:
-            print("Maximum Confidence: N/A")
-        if large_stats['failed']['mean'] is not None:
-            print(f"Mean Confidence: {large_stats['failed']['mean']:.4f}")
-        else:
-            print("Mean Confidence: N/A")
-        if large_stats['failed']['median'] is not None:
-            print(f"Median Confidence: {large_stats['failed']['median']:.4f}")
-        else:
-            print("Median Confidence: N/A")
-
-        print("\nTrue Classifications:")
-        if large_stats['successful']['min'] is not None:
-            print(f"Minimum Confidence: {large_stats['successful']['min']:.4f}")
-        else:
-            print("Minimum Confidence: N/A")
-        if large_stats['successful']['max'] is not None:
-            print(f"Maximum Confidence: {large_stats['successful']['max']:.4f}")
-        else:
-            print("Maximum Confidence: N/A")
-        if large_stats['successful']['mean'] is not None:
-            print(f"Mean Confidence: {large_stats['successful']['mean']:.4f}")
-        else:
-            print("Mean Confidence: N/A")
-        if large_stats['successful']['median'] is not None:
-            print(f"Median Confidence: {large_stats['successful']['median']:.4f}")
-        else:
-            print("Median Confidence: N/A")
-
-        print("\nFinding optimal threshold...")
-        best_result, all_results = find_optimal_threshold(tiny_stats, tiny_test_loader, pipeline)
-        print("\nOptimal Threshold Results:")
-        print(f"Threshold: {best_result['threshold']:.4f}")
-        print(f"F1 Score: {best_result['f1']:.4f}")
-        print(f"NDCG@3: {best_result['ndcg']:.4f}")
-        print(f"DistilBERT Usage: {best_result['distil_usage']:.2f}%")
-
-        pipeline.confidence_threshold = best_result['threshold']
-
-        threshold = best_result['threshold']
-        # Save paths updated to use context-specific folders
-        threshold_path = get_artifact_path(workflow_folderpath, ctx_name, "threshold.json")
-        with open(threshold_path, 'w') as f:
-            json.dump({'confidence_threshold': threshold}, f)
-
-        f1, ndcg, stats = pipeline.evaluate(tiny_test_loader)
-
-        print("\nEvaluation Results:")
-        print(f"F1 Score: {f1:.4f}")
-        print(f"NDCG@3: {ndcg:.4f}")
-        print("\nModel Usage Statistics:")
-        print(f"Total Samples: {stats['total_samples']}")
-        print(f"DistilBERT Usage: {stats['distil_percentage']:.2f}%")
-        print(f"TinyBERT Usage: {stats['tiny_percentage']:.2f}%")
-
-
-        
-        if large_stats['failed']['mean'] is not None:
-            large_ambiguous_threshold = large_stats['failed']['mean']
-        else:
-            large_ambiguous_threshold = 0.0
-        # Save paths updated to use context-specific folders
-        large_ambiguous_threshold_path = get_artifact_path(workflow_folderpath, ctx_name, "large_ambiguous_threshold.json")
-        with open(large_ambiguous_threshold_path, 'w') as f:
-            json.dump({'confidence_threshold': large_ambiguous_threshold}, f)
-        
-        if tiny_stats['failed']['mean'] is not None:
-            tiny_ambiguous_threshold = tiny_stats['failed']['mean']
-        else:
-            tiny_ambiguous_threshold = 0.0
-        # Save paths updated to use context-specific folders
-        tiny_ambiguous_threshold_path = get_artifact_path(workflow_folderpath, ctx_name, "tiny_ambiguous_threshold.json")
-        with open(tiny_ambiguous_threshold_path, 'w') as f:
-            json.dump({'confidence_threshold': tiny_ambiguous_threshold}, f)
-
-    
-        text = "list commands"
-        result = predict_single_sentence(pipeline, text, label_path)
-        print(f"Predicted label: {result['label']}")
-        print(f"Confidence: {result['confidence']:.4f}")
-        print(f"Used DistilBERT: {'Yes' if result['used_distil'] else 'No'}")
-
-        # ------------------------------------------------------------------
-        # R1a/R1b: score the reserved personas through the REAL runtime path.
-        # CommandRouter.predict is what intent detection actually calls, thresholds
-        # and all, so this measures what a user would experience rather than what the
-        # raw classifier head emits. Every artifact it needs was written above; the
-        # model directory is taken from the threshold path so this keeps working
-        # whether or not artifacts are being routed into a version.
-        # ------------------------------------------------------------------
-        report = heldout_evaluation.HeldoutReport(
-            context=ctx_name,
-            in_distribution_f1=f1,
+            if shared_backbone_mode and heldout_records:
+                # The backbone held out personas over the union of all contexts, so
+                # some of this context's held-out rows trained the encoder its head
+                # runs on. Those are not evaluation data.
+                unseen = [
+                    record for record in heldout_records
+                    if record.utterance not in backbone_utterances
+                ]
+                if seen := len(heldout_records) - len(unseen):
+                    utterance_command_tuples.extend(
+                        (record.utterance, record.label) for record in heldout_records
+                        if record.utterance in backbone_utterances
+                    )
+                    heldout_records = unseen
+                    split_notes.append(
+                        f"Shared backbone: {seen} held-out utterances had trained the "
+                        "shared encoder; they were returned to training and are not scored."
+                    )
+
+        print(f"Utterances generation complete for context: {ctx_name}\n")
+
+        fit_jobs.append(ContextFitJob(
+            context_name=ctx_name,
+            artifact_dir=os.path.dirname(
+                get_artifact_path(workflow_folderpath, ctx_name, "threshold.json")),
+            utterance_command_tuples=utterance_command_tuples,
             seed=seed,
+            tiny_model_name=tiny_model_name,
+            large_model_name=large_model_name,
+            heldout_records=heldout_records,
             heldout_personas=heldout_personas,
-            notes=split_notes,
-        )
-        try:
-            has_context_benchmark = any(
-                case.context == ctx_name
-                and case.kind in {"routing", "escalation"}
-                for case in benchmark_cases
-            )
-            predict_labels = None
-            if heldout_records or has_context_benchmark:
-                router = CommandRouter(os.path.dirname(threshold_path))
-
-                def predict_labels(utterance: str, _router=router) -> list[str]:
-                    """Adapt `CommandRouter.predict` to the scorer's contract.
-
-                    `predict` returns either a one-element list holding a numpy string or
-                    the raw numpy top-k array. The scorer needs a plain `list[str]`: a
-                    numpy array raises "truth value of an array is ambiguous" the moment
-                    anything tests it for emptiness.
-                    """
-                    return [str(label) for label in _router.predict(utterance)]
-
-            # `kind` is required. Omitting it raised a TypeError that the guard
-            # below turned into a note on the report, so escalation silently
-            # never scored while routing kept working -- the failure looked like
-            # "this workflow has no escalation cases" (bd fix-588).
-            _score_heldout_context(
-                report, heldout_records, benchmark_cases, predict_labels)
-        except Exception as exc:
-            # A scoring failure must never destroy a completed training run: the
-            # models are already on disk and usable. Record it and move on.
-            report.notes.append(f"held-out evaluation failed: {exc}")
-            logger.error(
-                f"Held-out evaluation failed for context '{ctx_name}': {exc}")
-        heldout_reports.append(report)
+            split_notes=split_notes,
+            benchmark_cases=[case for case in benchmark_cases if case.context == ctx_name],
+            shared_tiny_path=shared_tiny_path if shared_backbone_mode else None,
+            shared_large_path=shared_large_path if shared_backbone_mode else None,
+        ))
 
     # End of context loop
 
+    # Utterance generation above shares caches and the provenance recorder, so it stays
+    # in this process; fitting only needs each job's rows and writes only its own
+    # context folder, so that part can run in worker processes.
+    heldout_reports = fit_contexts(fit_jobs)
+
     if heldout_reports:
         print(heldout_evaluation.format_report(heldout_reports))
         with contextlib.suppress(OSError):
@@ -143,7 +143,7 @@ def run_main(args):
     # Startup progress bar ------------------------------------------------
     # ------------------------------------------------------------------
 
-    # 3 coarse CLI steps + per-directory warm-up (handled inside ChatSession) + 1 global warm-up
+    # 3 coarse CLI steps + one step per preloaded context (added by the preloader)
     StartupProgress.begin(total=3)
 
     # Heavy import – counted as first step once completed
@@ -171,6 +171,11 @@ def run_main(args):
         )
         exit(1)
 
+    # Load and warm up every context's intent models before the first command,
+    # rather than on it. ChatSession skips the contexts preloaded here.
+    from fastworkflow.intent_preload import preload_intent_models
+    preload_intent_models(args.workflow_path)
+
     startup_action: Optional[fastworkflow.Action] = None
     if args.startup_action:
         with open(args.startup_action, 'r') as file:
@@ -34,11 +34,15 @@ from jwt.exceptions import PyJWTError as JWTError
 from dotenv import dotenv_values
 
 import fastworkflow
+from fastworkflow import intent_model_registry
+from fastworkflow.intent_preload import preload_intent_models
 from fastworkflow.utils.logging import logger
+from fastworkflow.utils.metrics import metrics
+from fastworkflow.utils.rdict_pool import rdict_pool
 
 from fastapi import FastAPI, HTTPException, status, Depends, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from .mcp_specific import setup_mcp
@@ -68,6 +72,13 @@ from .turns import (
     render_turn_response,
     compute_idempotency_key,
 )
+from .turn_executor import (
+    TurnPoolClosedError,
+    TurnPoolFullError,
+    set_turn_pools,
+    shutdown_turn_pools,
+    turn_pool_http_exception,
+)
 from .jwt_manager import (
     create_access_token,
     create_refresh_token,
@@ -150,6 +161,7 @@ class ReadinessState:
         # Debug attributes - do not control readiness, used for diagnostics
         self._is_initialized = False
         self._workflow_path_valid = False
+        self._intent_models_preloaded = False
     
     def set_ready(self, value: bool = True):
         """Set the main readiness state. Called after successful initialization."""
@@ -163,6 +175,10 @@ class ReadinessState:
         """Mark workflow path as validated (for debugging/diagnostics)."""
         self._workflow_path_valid = value
     
+    def set_intent_models_preloaded(self, value: bool = True):
+        """Mark the startup intent-model preload as finished (for debugging/diagnostics)."""
+        self._intent_models_preloaded = value
+
     def is_ready(self) -> bool:
         """Check if the application is ready to serve traffic."""
         return self._is_ready
@@ -172,7 +188,8 @@ class ReadinessState:
         return {
             "ready": self._is_ready,
             "fastworkflow_initialized": self._is_initialized,
-            "workflow_path_valid": self._workflow_path_valid
+            "workflow_path_valid": self._workflow_path_valid,
+            "intent_models_preloaded": self._intent_models_preloaded
         }
 
 
@@ -278,6 +295,19 @@ async def lifespan(_app: FastAPI):
             logger.warning(f"Workflow path not valid or not found: {ARGS.workflow_path}")
             readiness_state.set_workflow_path_valid(False)
 
+    async def preload_intent_models_then_mark_ready() -> None:
+        # Runs after startup so liveness probes are answered while models load;
+        # readiness only flips once every context in the budget is warm.
+        if readiness_state.get_status()["workflow_path_valid"]:
+            try:
+                await asyncio.to_thread(preload_intent_models, ARGS.workflow_path)
+            except Exception as e:  # noqa: BLE001 - contexts then load on first use
+                logger.error(f"Intent model preload failed: {e}")
+        readiness_state.set_intent_models_preloaded(True)
+        # Mark application as ready to accept traffic
+        readiness_state.set_ready(True)
+        logger.info("Application ready to accept traffic")
+
     async def _active_turn_channel_ids() -> list[str]:
         active: list[str] = []
         for channel_id in list(session_manager._sessions.keys()):
@@ -326,20 +356,32 @@ async def lifespan(_app: FastAPI):
             if runtime:
                 runtime.execution_context.close()
 
+    preload_task = None
     try:
+        # Fresh pools: a previous lifespan in this process left its pools shut down.
+        set_turn_pools(None)
         initialize_fastworkflow_on_startup()
         # Log startup info AFTER init() so log level from env file is respected
         logger.info("FastWorkflow FastAPI service starting...")
         logger.info(f"Startup with CLI params: workflow_path={ARGS.workflow_path}, env_file_path={ARGS.env_file_path}, passwords_file_path={ARGS.passwords_file_path}")
-        # Mark application as ready to accept traffic
-        readiness_state.set_ready(True)
-        logger.info("Application ready to accept traffic")
+        if readiness_state.get_status()["workflow_path_valid"]:
+            # Installed before the preload so every router is cached under its artifact
+            # version; a newly published version is then swapped in without a restart.
+            intent_model_registry.watch_workflow(ARGS.workflow_path)
+        preload_task = asyncio.create_task(preload_intent_models_then_mark_ready())
         yield
     finally:
+        if preload_task is not None:
+            preload_task.cancel()
         logger.info("FastWorkflow FastAPI service shutting down...")
+        # New turns get 503 from here on; admitted ones run to completion.
+        shutdown_turn_pools()
         await wait_for_active_turns_to_complete(max_wait_seconds=30)
         await finalize_conversations_on_shutdown()
         await stop_all_chat_sessions()
+        intent_model_registry.stop_watching()
+        # Flush the pooled RocksDB handles (conversation stores, NLU caches).
+        rdict_pool.close_all()
         logger.info("FastWorkflow FastAPI service shutdown complete")
 
 
@@ -478,6 +520,17 @@ async def liveness_probe() -> dict:
     return {"status": "alive"}
 
 
+@app.get(
+    "/metrics",
+    operation_id="metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+async def metrics_endpoint() -> str:
+    """Process metrics (turn pools, caches, NLU) in the Prometheus text format."""
+    return metrics.render()
+
+
 @app.get(
     "/probes/readyz",
     operation_id="readiness_probe",
@@ -588,7 +641,8 @@ async def _submit_turn_endpoint(
 
     Single-flight is keyed off the registry's active-execution pointer (NOT
     runtime.lock.locked()): a retry with the same args rejoins the SAME
-    execution; a *different* concurrent turn yields 409.
+    execution; a *different* concurrent turn yields 409. A turn the turn pool
+    cannot admit is shed with 429 (pool full) or 503 (shutting down).
     """
     idempotency_key = compute_idempotency_key(
         runtime.channel_id, kind, *idempotency_args
@@ -612,6 +666,8 @@ async def _submit_turn_endpoint(
                 f"(active turn {busy.execution.turn_key})"
             ),
         ) from busy
+    except (TurnPoolFullError, TurnPoolClosedError) as shed:
+        raise turn_pool_http_exception(shed) from shed
 
 
 def _reject_if_busy(channel_id: str) -> None:
@@ -639,6 +695,8 @@ def _turn_json_response(execn, channel_id: str) -> JSONResponse:
             ),
         )
     code, body = render_turn_response(execn)
+    # The response carries the trace events; the replay record keeps the digest.
+    turn_registry.release_traces(execn)
     return JSONResponse(content=body, status_code=code)
 
 
@@ -765,6 +823,8 @@ async def initialize(
         except ChannelBusyError as busy:
             # A different turn is already active on this channel; report its key.
             execn = busy.execution
+        except (TurnPoolFullError, TurnPoolClosedError) as shed:
+            raise turn_pool_http_exception(shed) from shed
 
         runtime.startup_turn_key = execn.turn_key
         code, resp = _initialize_response_from_execution(channel_id, user_id, execn)
@@ -1394,15 +1454,17 @@ async def post_feedback(
         # Serialize ctx mutation with turns; reject if a turn is active (§3.4).
         _reject_if_busy(channel_id)
         async with runtime.lock:
-            # Check if there are any in-memory turns to give feedback on
-            if not runtime.execution_context.conversation_history.messages:
+            # Check if there are any in-memory turns to give feedback on. Feedback
+            # and a pending summary set different keys, so don't wait for it.
+            history = runtime.execution_context.recorded_conversation_history
+            if not history.messages:
                 raise HTTPException(
                     status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                     detail=f"No turns available to give feedback on for user: {channel_id}"
                 )
 
             # Update feedback on the last turn in the in-memory conversation history
-            last_turn = runtime.execution_context.conversation_history.messages[-1]
+            last_turn = history.messages[-1]
             last_turn["feedback"] = {
                 "binary_or_numeric_score": request.binary_or_numeric_score,
                 "nl_feedback": request.nl_feedback,
@@ -1455,7 +1517,7 @@ async def activate_conversation(
             )
 
         # Get conversation by ID
-        conv = runtime.conversation_store.get_conversation(request.conversation_id)
+        conv = runtime.conversation_store.get_conversation_header(request.conversation_id)
         if not conv:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1468,8 +1530,10 @@ async def activate_conversation(
             runtime.active_conversation_id = request.conversation_id
 
             # Restore conversation history to chat_session
-            restored_history = restore_history_from_turns(conv["turns"])
-            runtime.execution_context._conversation_history = restored_history
+            restored_history = restore_history_from_turns(
+                runtime.conversation_store.iter_conversation_turns(request.conversation_id)
+            )
+            runtime.execution_context._replace_conversation_history(restored_history)
             logger.info(f"Activated conversation {request.conversation_id} for session {channel_id}")
 
             return {"status": "ok"}
@@ -1,20 +1,31 @@
 """
 Conversation persistence layer for FastWorkflow
 Provides Rdict-backed storage for multi-turn conversations with AI-generated topics/summaries
+
+Layout of a channel's database:
+  * ``meta``                 -- {"last_conversation_id": n}
+  * ``conv:<id>``            -- header: topic, summary, created_at, updated_at, turn_count
+  * ``conv:<id>:turn:<n>``   -- turn n (1-based) of the conversation
+
+Turns are an append-only log, so saving turn N writes a constant number of keys
+instead of rewriting the whole conversation. Conversations saved before the log
+existed keep their turns in the header (``"turns"``); they are read as-is and
+converted to the log on their next save.
 """
 
 import json
 import os
-from re import I
+import threading
 import time
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 import dspy
 from pydantic import BaseModel
-from speedict import Rdict
+from speedict import Rdict, WriteBatch
 
 from fastworkflow.utils.logging import logger
 from fastworkflow.utils.dspy_utils import get_lm
+from fastworkflow.utils.rdict_pool import rdict_pool
 
 
 from fastworkflow.conversation_history_io import (
@@ -23,6 +34,24 @@ from fastworkflow.conversation_history_io import (
 )
 
 
+# Turns fetched per multi-get when reading a conversation lazily.
+TURN_PAGE_SIZE = 50
+
+
+def _conv_key(conv_id: int) -> str:
+    return f"conv:{conv_id}"
+
+
+def _turn_key(conv_id: int, turn_number: int) -> str:
+    return f"conv:{conv_id}:turn:{turn_number}"
+
+
+def _turn_count(header: dict[str, Any]) -> int:
+    if "turns" in header:  # conversation saved before the turn log
+        return len(header["turns"])
+    return header.get("turn_count", 0)
+
+
 class ConversationSummary(BaseModel):
     """Summary of a conversation"""
     conversation_id: int
@@ -39,19 +68,18 @@ class ConversationStore:
         self.channel_id = channel_id
         self.db_path = os.path.join(base_folder, f"{channel_id}.rdb")
         os.makedirs(base_folder, exist_ok=True)
+        # Incremental saves come from turns and from background summary workers.
+        self._save_lock = threading.Lock()
     
-    def _get_db(self) -> Rdict:
-        """Get Rdict instance"""
-        return Rdict(self.db_path)
+    def _get_db(self):
+        """Borrow the pooled Rdict handle for this channel (context manager)"""
+        return rdict_pool.open(self.db_path)
     
     def get_last_conversation_id(self) -> Optional[int]:
         """Get the last conversation ID for this user"""
-        try:
-            db = self._get_db()
+        with self._get_db() as db:
             meta = db.get("meta", {})
             return meta.get("last_conversation_id")
-        finally:
-            db.close()
     
     def _increment_conversation_id(self, db: Rdict) -> int:
         """Increment and return new conversation ID"""
@@ -63,11 +91,8 @@ class ConversationStore:
     
     def reserve_next_conversation_id(self) -> int:
         """Reserve the next conversation ID by incrementing the counter without creating a conversation"""
-        db = self._get_db()
-        try:
+        with self._get_db() as db:
             return self._increment_conversation_id(db)
-        finally:
-            db.close()
     
     def _ensure_unique_topic(self, db: Rdict, candidate_topic: str) -> str:
         """Ensure topic is unique per user with case/whitespace insensitive comparison"""
@@ -111,8 +136,7 @@ class ConversationStore:
         Returns:
             The conversation ID used
         """
-        db = self._get_db()
-        try:
+        with self._get_db() as db:
             if conversation_id is not None:
                 # Use the specified ID (assumes it's valid and reserved)
                 conv_id = conversation_id
@@ -122,30 +146,97 @@ class ConversationStore:
             
             unique_topic = self._ensure_unique_topic(db, topic)
             
-            conversation = {
+            header = {
                 "topic": unique_topic,
                 "summary": summary,
                 "created_at": int(time.time() * 1000),
                 "updated_at": int(time.time() * 1000),
-                "turns": turns
             }
-            db[f"conv:{conv_id}"] = conversation
+            self._write_turns(db, conv_id, db.get(_conv_key(conv_id)), header, turns, 0)
             return conv_id
-        finally:
-            db.close()
+    
+    def _write_turns(
+        self,
+        db: Rdict,
+        conv_id: int,
+        previous: Optional[dict[str, Any]],
+        header: dict[str, Any],
+        turns: list[dict[str, Any]],
+        start: int
+    ) -> None:
+        """
+        Write turns[start:] and the header in one batch.
+        
+        Turn keys past the end of *turns* left by the previous header are deleted.
+        A header still holding its turns inline is converted to the turn log.
+        """
+        written = 0 if previous is None else _turn_count(previous)
+        if previous is not None and "turns" in previous:
+            start, written = 0, 0
+        header.pop("turns", None)
+        header["turn_count"] = len(turns)
+        
+        batch = WriteBatch()
+        for index in range(start, len(turns)):
+            batch.put(_turn_key(conv_id, index + 1), turns[index])
+        for turn_number in range(len(turns) + 1, written + 1):
+            batch.delete(_turn_key(conv_id, turn_number))
+        batch.put(_conv_key(conv_id), header)
+        db.write(batch)
+    
+    def get_conversation_header(self, conv_id: int) -> Optional[dict[str, Any]]:
+        """Get a conversation's topic, summary, timestamps and turn_count, without its turns"""
+        with self._get_db() as db:
+            header = db.get(_conv_key(conv_id))
+        if header is None:
+            return None
+        header["turn_count"] = _turn_count(header)
+        header.pop("turns", None)
+        return header
+    
+    def get_conversation_turns(
+        self,
+        conv_id: int,
+        offset: int = 0,
+        limit: int = TURN_PAGE_SIZE
+    ) -> list[dict[str, Any]]:
+        """Get up to *limit* turns of a conversation, starting at turn index *offset*"""
+        with self._get_db() as db:
+            header = db.get(_conv_key(conv_id))
+            if header is None:
+                return []
+            if "turns" in header:
+                return header["turns"][offset:offset + limit]
+            stop = min(offset + limit, header.get("turn_count", 0))
+            if stop <= offset:
+                return []
+            return db.get([_turn_key(conv_id, n) for n in range(offset + 1, stop + 1)])
+    
+    def iter_conversation_turns(
+        self,
+        conv_id: int,
+        page_size: int = TURN_PAGE_SIZE
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily yield a conversation's turns in order, fetching one page at a time"""
+        offset = 0
+        while page := self.get_conversation_turns(conv_id, offset, page_size):
+            yield from page
+            offset += len(page)
+            if len(page) < page_size:
+                return
     
     def get_conversation(self, conv_id: int) -> Optional[dict[str, Any]]:
-        """Get a conversation by ID"""
-        db = self._get_db()
-        try:
-            return db.get(f"conv:{conv_id}")
-        finally:
-            db.close()
+        """Get a conversation by ID, with all of its turns"""
+        header = self.get_conversation_header(conv_id)
+        if header is None:
+            return None
+        header.pop("turn_count")
+        header["turns"] = list(self.iter_conversation_turns(conv_id))
+        return header
     
     def get_conversation_by_topic(self, topic: str) -> Optional[tuple[int, dict[str, Any]]]:
         """Get conversation ID and data by topic (case/whitespace insensitive)"""
-        db = self._get_db()
-        try:
+        with self._get_db() as db:
             meta = db.get("meta", {"last_conversation_id": 0})
             normalized_topic = topic.lower().strip()
             
@@ -156,13 +247,10 @@ class ConversationStore:
                     if conv.get("topic", "").lower().strip() == normalized_topic:
                         return i, conv
             return None
-        finally:
-            db.close()
     
     def list_conversations(self, limit: int) -> list[ConversationSummary]:
         """List conversations ordered by updated_at desc, up to limit"""
-        db = self._get_db()
-        try:
+        with self._get_db() as db:
             meta = db.get("meta", {"last_conversation_id": 0})
             conversations = []
             
@@ -183,8 +271,6 @@ class ConversationStore:
             # Sort by updated_at desc and limit
             conversations.sort(key=lambda c: c.updated_at, reverse=True)
             return conversations[:limit]
-        finally:
-            db.close()
     
     def update_conversation(
         self,
@@ -194,24 +280,21 @@ class ConversationStore:
         turns: list[dict[str, Any]]
     ) -> None:
         """Update an existing conversation with new topic, summary, and turns"""
-        db = self._get_db()
-        try:
+        with self._get_db() as db:
             conv_key = f"conv:{conv_id}"
             if conv_key not in db:
                 raise ValueError(f"Conversation {conv_id} not found")
             
-            conv = db[conv_key]
+            previous = db[conv_key]
             unique_topic = self._ensure_unique_topic(db, topic)
             
             # Preserve created_at, update other fields
+            conv = dict(previous)
             conv["topic"] = unique_topic
             conv["summary"] = summary
             conv["updated_at"] = int(time.time() * 1000)
-            conv["turns"] = turns
             
-            db[conv_key] = conv
-        finally:
-            db.close()
+            self._write_turns(db, conv_id, previous, conv, turns, 0)
     
     def update_conversation_topic_summary(
         self,
@@ -223,8 +306,7 @@ class ConversationStore:
         Update only the topic and summary of an existing conversation.
         Used when finalizing a conversation (turns already saved incrementally).
         """
-        db = self._get_db()
-        try:
+        with self._get_db() as db:
             conv_key = f"conv:{conv_id}"
             if conv_key not in db:
                 raise ValueError(f"Conversation {conv_id} not found")
@@ -238,73 +320,74 @@ class ConversationStore:
             conv["updated_at"] = int(time.time() * 1000)
             
             db[conv_key] = conv
-        finally:
-            db.close()
     
     def save_conversation_turns(
         self,
         conversation_id: int,
-        turns: list[dict[str, Any]]
+        turns: list[dict[str, Any]],
+        rewrite_from: Optional[int] = None
     ) -> int:
         """
         Create a new conversation with placeholder topic/summary, or update existing turns.
         Used for incremental saves without generating topic/summary.
         
+        *turns* is the conversation's full turn list. Only the turns added since the
+        last save are written, plus the previously last turn, which may have been
+        edited in place since (feedback, a summary filled in late). Earlier turns are
+        final unless *rewrite_from* says otherwise. A list shorter than the saved one
+        replaces the conversation's turns.
+        
         Args:
             conversation_id: The conversation ID to use
             turns: List of conversation turns
+            rewrite_from: Also rewrite the turns from this index on (e.g. summaries
+                recorded since they were saved)
         
         Returns:
             The conversation ID used
         """
-        db = self._get_db()
-        try:
-            conv_key = f"conv:{conversation_id}"
+        with self._save_lock, self._get_db() as db:
+            previous = db.get(_conv_key(conversation_id))
             
-            if conv_key in db:
-                # Conversation exists, just update turns
-                conv = db[conv_key]
+            if previous is not None:
+                # Conversation exists, append the new turns
+                conv = dict(previous)
                 conv["updated_at"] = int(time.time() * 1000)
-                conv["turns"] = turns
-                db[conv_key] = conv
+                written = _turn_count(previous)
+                start = max(written - 1, 0) if len(turns) >= written else 0
+                if rewrite_from is not None:
+                    start = min(start, rewrite_from)
             else:
                 # Create new conversation with placeholder topic/summary
-                conversation = {
+                conv = {
                     "topic": "",  # Will be generated later
                     "summary": "",  # Will be generated later
                     "created_at": int(time.time() * 1000),
                     "updated_at": int(time.time() * 1000),
-                    "turns": turns
                 }
-                db[conv_key] = conversation
+                start = 0
             
+            self._write_turns(db, conversation_id, previous, conv, turns, start)
             return conversation_id
-        finally:
-            db.close()
     
     # NOTE: update_turn_feedback() removed - feedback is now saved via save_conversation_turns()
     # in the incremental save flow after modifying conversation_history in memory
     
     def get_all_conversations_for_dump(self) -> list[dict[str, Any]]:
         """Get all conversations for admin dump"""
-        db = self._get_db()
-        try:
+        with self._get_db() as db:
             meta = db.get("meta", {"last_conversation_id": 0})
-            conversations = []
-            
-            for i in range(1, meta.get("last_conversation_id", 0) + 1):
-                conv_key = f"conv:{i}"
-                if conv_key in db:
-                    conv = db[conv_key]
-                    conversations.append({
-                        "channel_id": self.channel_id,
-                        "conversation_id": i,
-                        **conv
-                    })
-            
-            return conversations
-        finally:
-            db.close()
+        conversations = []
+        
+        for i in range(1, meta.get("last_conversation_id", 0) + 1):
+            if conv := self.get_conversation(i):
+                conversations.append({
+                    "channel_id": self.channel_id,
+                    "conversation_id": i,
+                    **conv
+                })
+        
+        return conversations
 
 
 def generate_topic_and_summary(turns: list[dict[str, Any]]) -> tuple[str, str]:
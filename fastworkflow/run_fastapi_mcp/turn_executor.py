@@ -0,0 +1,280 @@
+"""
+Dedicated, bounded thread pools for turn execution in the run_fastapi_mcp server.
+
+Turn work is synchronous and blocking, so it runs on worker threads. It used to
+share asyncio's default executor with everything else in the process, where a
+burst of long LLM-bound agent turns could occupy every thread and starve short
+assistant/action turns, with no visibility into the backlog. Turns now run on
+two dedicated pools:
+
+  * ``agent`` — ``invoke_agent`` turns and plain messages (LLM-bound, slow).
+  * ``fast``  — assistant commands, direct actions and startup (local, fast).
+
+Each pool admits at most ``workers + max_queued`` turns. A turn is admitted
+before its execution is created; when the pool is full the request is shed
+with **429** (retry later) instead of queueing without bound, and with **503**
+once the pool has been shut down: the server shuts its pools down as soon as
+it starts shutting down, and the closed pools stay installed. Admission
+reserves the slot until the work finishes, so timed-out requests whose thread
+is still running keep counting.
+
+Gauges (``fastworkflow_turn_pool_active`` / ``_queued``), the admission-to-start
+wait histogram and the rejection counter are labelled by pool and exposed on
+``GET /metrics``.
+
+Configured per process (read on first use, after ``fastworkflow.init``):
+
+  * ``TURN_AGENT_WORKERS`` / ``TURN_AGENT_MAX_QUEUED`` (default 8 / 32)
+  * ``TURN_FAST_WORKERS`` / ``TURN_FAST_MAX_QUEUED`` (default 8 / 64)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+import fastworkflow
+from fastworkflow.utils.metrics import metrics
+
+T = TypeVar("T")
+
+AGENT_POOL = "agent"
+FAST_POOL = "fast"
+
+DEFAULT_AGENT_WORKERS = 8
+DEFAULT_AGENT_MAX_QUEUED = 32
+DEFAULT_FAST_WORKERS = 8
+DEFAULT_FAST_MAX_QUEUED = 64
+
+# Seconds a shed client is told to wait before retrying.
+RETRY_AFTER_SECONDS = 1
+
+# Turn kinds that are LLM-bound; every other kind runs on the fast pool.
+_AGENT_KINDS = frozenset({"invoke_agent"})
+
+_WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class TurnPoolFullError(Exception):
+    """The pool's workers and admission queue are all taken (HTTP 429)."""
+
+    def __init__(self, pool_name: str):
+        self.pool_name = pool_name
+        super().__init__(f"turn pool '{pool_name}' is at capacity")
+
+
+class TurnPoolClosedError(Exception):
+    """The pool no longer accepts turns, e.g. during shutdown (HTTP 503)."""
+
+    def __init__(self, pool_name: str):
+        self.pool_name = pool_name
+        super().__init__(f"turn pool '{pool_name}' is shut down")
+
+
+class TurnTicket:
+    """An admitted turn's slot in a pool: queued, then active, then released."""
+
+    def __init__(self, pool: "TurnPool"):
+        self._pool = pool
+        self._admitted_at = time.perf_counter()
+        self._state = "queued"
+
+    async def run(self, fn: Callable[[], T]) -> T:
+        """Run *fn* on the pool's workers and return its result.
+
+        Raises ``TurnPoolClosedError`` if the pool shut down after admitting the turn.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._pool._executor, self._run_on_worker, fn)
+        except RuntimeError as e:  # cannot schedule new futures after shutdown
+            raise TurnPoolClosedError(self._pool.name) from e
+        return await future
+
+    def _run_on_worker(self, fn: Callable[[], T]) -> T:
+        self._pool._start(self)
+        try:
+            return fn()
+        finally:
+            self._pool._finish(self)
+
+    def release(self) -> None:
+        """Give the slot back if the work never reached a worker (no-op otherwise)."""
+        self._pool._withdraw(self)
+
+
+class TurnPool:
+    """A fixed-size worker pool with a bounded admission queue."""
+
+    def __init__(self, name: str, workers: int, max_queued: int):
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.max_queued = max(0, int(max_queued))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix=f"fastworkflow-turn-{name}",
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._closed = False
+
+        labels = {"pool": name}
+        self._active_gauge = metrics.gauge(
+            "fastworkflow_turn_pool_active", "Turns running on a turn pool worker", labels=labels)
+        self._queued_gauge = metrics.gauge(
+            "fastworkflow_turn_pool_queued", "Admitted turns waiting for a turn pool worker",
+            labels=labels)
+        self._wait = metrics.histogram(
+            "fastworkflow_turn_pool_wait_seconds",
+            "Time from a turn's admission to a worker starting it",
+            buckets=_WAIT_BUCKETS, labels=labels)
+        self._rejected = {
+            reason: metrics.counter(
+                "fastworkflow_turn_pool_rejected_total",
+                "Turns shed at admission",
+                labels={"pool": name, "reason": reason},
+            )
+            for reason in ("full", "closed")
+        }
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queued
+
+    def admit(self) -> TurnTicket:
+        """Reserve a slot for one turn, or raise if the pool cannot take it."""
+        with self._lock:
+            if self._closed:
+                self._rejected["closed"].inc()
+                raise TurnPoolClosedError(self.name)
+            if self._active + self._queued >= self.capacity:
+                self._rejected["full"].inc()
+                raise TurnPoolFullError(self.name)
+            self._queued += 1
+            self._publish_locked()
+        return TurnTicket(self)
+
+    async def run(self, fn: Callable[[], T]) -> T:
+        """Admit and run one turn's work, returning its result."""
+        ticket = self.admit()
+        try:
+            return await ticket.run(fn)
+        finally:
+            ticket.release()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"active": self._active, "queued": self._queued, "capacity": self.capacity}
+
+    def shutdown(self) -> None:
+        """Refuse new turns and let the running ones finish in the background."""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False)
+
+    # Ticket transitions. A released ticket's work may still start (its executor
+    # future was already running), so it is counted active without re-queueing.
+    def _start(self, ticket: TurnTicket) -> None:
+        with self._lock:
+            if ticket._state == "queued":
+                self._queued -= 1
+            ticket._state = "active"
+            self._active += 1
+            self._publish_locked()
+        self._wait.observe(time.perf_counter() - ticket._admitted_at)
+
+    def _finish(self, ticket: TurnTicket) -> None:
+        with self._lock:
+            ticket._state = "done"
+            self._active -= 1
+            self._publish_locked()
+
+    def _withdraw(self, ticket: TurnTicket) -> None:
+        with self._lock:
+            if ticket._state != "queued":
+                return
+            ticket._state = "released"
+            self._queued -= 1
+            self._publish_locked()
+
+    def _publish_locked(self) -> None:
+        self._active_gauge.set(self._active)
+        self._queued_gauge.set(self._queued)
+
+
+def turn_pool_http_exception(exc: Exception) -> HTTPException:
+    """Map a shed turn to its HTTP response: 429 when full, 503 when shut down."""
+    if isinstance(exc, TurnPoolClosedError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Turn execution is shutting down ({exc.pool_name} pool)",
+        )
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Too many turns in progress ({exc.pool_name} pool); retry later",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
+@dataclass
+class TurnPools:
+    agent: TurnPool
+    fast: TurnPool
+
+    def for_kind(self, kind: str) -> TurnPool:
+        return self.agent if kind in _AGENT_KINDS else self.fast
+
+    def shutdown(self) -> None:
+        self.agent.shutdown()
+        self.fast.shutdown()
+
+
+_pools_lock = threading.Lock()
+_pools: Optional[TurnPools] = None
+
+
+def get_turn_pools() -> TurnPools:
+    """Return the process-wide turn pools, built from the environment on first use."""
+    global _pools
+    with _pools_lock:
+        if _pools is None:
+            _pools = TurnPools(
+                agent=TurnPool(
+                    AGENT_POOL,
+                    fastworkflow.get_env_var(
+                        "TURN_AGENT_WORKERS", int, default=DEFAULT_AGENT_WORKERS),
+                    fastworkflow.get_env_var(
+                        "TURN_AGENT_MAX_QUEUED", int, default=DEFAULT_AGENT_MAX_QUEUED),
+                ),
+                fast=TurnPool(
+                    FAST_POOL,
+                    fastworkflow.get_env_var(
+                        "TURN_FAST_WORKERS", int, default=DEFAULT_FAST_WORKERS),
+                    fastworkflow.get_env_var(
+                        "TURN_FAST_MAX_QUEUED", int, default=DEFAULT_FAST_MAX_QUEUED),
+                ),
+            )
+        return _pools
+
+
+def set_turn_pools(pools: Optional[TurnPools]) -> None:
+    """Install *pools*, or None to rebuild them from the environment on next use."""
+    global _pools
+    with _pools_lock:
+        _pools = pools
+
+
+def shutdown_turn_pools() -> None:
+    """Shut the process-wide pools down.
+
+    The closed pools stay installed, so turns submitted afterwards are shed with
+    503. ``set_turn_pools(None)`` discards them.
+    """
+    get_turn_pools().shutdown()
@@ -26,6 +26,12 @@ Key invariants (do not break these):
     execution (mint ``turn_key`` + ``done_event``) and inserts the pointer
     BEFORE launching the task, so no waiter can ever observe a half-built
     execution.
+  * **bounded retention** — a finished execution is kept only as a compact
+    replay record (final result + trace digest; the trace events are dropped
+    once a response has carried them), for ``TURN_REGISTRY_TTL_SECONDS`` after
+    it finished and within an LRU cap of ``TURN_REGISTRY_MAX_COMPLETED`` records
+    and ``TURN_REGISTRY_MAX_BYTES`` approximate bytes. Live (QUEUED/RUNNING)
+    executions are never evicted.
 """
 
 
@@ -37,14 +43,17 @@ import enum
 import hashlib
 import json
 import traceback
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any, Callable, Optional
 
 import fastworkflow
 from fastworkflow.utils.logging import logger
+from fastworkflow.utils.metrics import metrics
 
 from .conversation_store import extract_turns_from_history
+from .turn_executor import TurnTicket, get_turn_pools
 from .utils import (
     collect_trace_events,
     save_conversation_incremental,
@@ -76,11 +85,56 @@ class ExecState(str, enum.Enum):
 
 _TERMINAL_STATES = (ExecState.DONE, ExecState.LOST)
 
+DEFAULT_TTL_SECONDS = 600.0
+DEFAULT_MAX_COMPLETED = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Fixed per-record overhead added to the serialized size (dataclass, keys, event).
+_RECORD_OVERHEAD_BYTES = 512
+
+_LIVE = metrics.gauge(
+    "fastworkflow_turn_registry_live",
+    "Turn executions queued or running",
+)
+_COMPLETED = metrics.gauge(
+    "fastworkflow_turn_registry_completed",
+    "Finished turn executions retained as replay records",
+)
+_COMPLETED_BYTES = metrics.gauge(
+    "fastworkflow_turn_registry_completed_bytes",
+    "Approximate size of the retained replay records",
+)
+_EVICTED = {
+    reason: metrics.counter(
+        "fastworkflow_turn_registry_evicted_total",
+        "Replay records evicted from the turn registry",
+        labels={"reason": reason},
+    )
+    for reason in ("ttl", "count", "bytes")
+}
+
 
 def _now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+@dataclass(frozen=True)
+class TraceDigest:
+    """What a replay record keeps of a turn's trace events."""
+
+    count: int
+    sha256: str
+
+    @classmethod
+    def of(cls, traces: list[dict[str, Any]]) -> "TraceDigest":
+        payload = json.dumps(traces, sort_keys=True, default=str)
+        return cls(len(traces), hashlib.sha256(payload.encode("utf-8")).hexdigest())
+
+
 def compute_idempotency_key(channel_id: str, kind: str, *args: Any) -> str:
     """Stable key deduping retried submissions of the same logical turn.
 
@@ -108,6 +162,7 @@ class TurnExecution:
     result: Optional["fastworkflow.TurnOutput"] = None
     error: Optional[str] = None
     traces: list[dict[str, Any]] = field(default_factory=list)
+    trace_digest: Optional[TraceDigest] = None
     user_id: Optional[str] = None
     task: Optional[asyncio.Task] = None
     done_event: asyncio.Event = field(default_factory=asyncio.Event)
@@ -115,11 +170,24 @@ class TurnExecution:
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
     ttl_expires_at: Optional[datetime] = None
+    approx_bytes: int = 0
 
     @property
     def is_terminal(self) -> bool:
         return self.exec_state in _TERMINAL_STATES
 
+    def _measure(self) -> int:
+        """Approximate retained size: serialized result, error and trace events."""
+        size = _RECORD_OVERHEAD_BYTES + len(self.error or "")
+        if self.result is not None:
+            try:
+                size += _json_size(self.result.model_dump(mode="json"))
+            except Exception:  # best-effort estimate; never fail a turn on it
+                size += _json_size(self.result.answer)
+        if self.traces:
+            size += _json_size(self.traces)
+        return size
+
 
 class ChannelBusyError(Exception):
     """Raised when a channel already has a *different* active execution.
@@ -137,12 +205,37 @@ class ChannelBusyError(Exception):
 
 
 class TurnRegistry:
-    """In-process registry of turn executions, single-flight per channel."""
+    """In-process registry of turn executions, single-flight per channel.
+
+    A live (QUEUED/RUNNING) execution is kept until it finishes. It then becomes a
+    replay record for re-fetching by ``turn_key``. The record is evicted
+    ``ttl_seconds`` after the turn finished, or earlier, least recently fetched
+    first, once more than ``max_completed`` records or ``max_bytes`` approximate
+    bytes are retained. Limits left as None are read from
+    ``TURN_REGISTRY_TTL_SECONDS`` / ``TURN_REGISTRY_MAX_COMPLETED`` /
+    ``TURN_REGISTRY_MAX_BYTES`` when the first turn finishes, because the server
+    builds its registry at import, before ``fastworkflow.init``.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: Optional[float] = None,
+        max_completed: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
         self._by_key: dict[str, TurnExecution] = {}
         # channel_id -> turn_key of the live (non-terminal) execution.
         self._active_by_channel: dict[str, str] = {}
+        # turn_keys of replay records, least recently used first.
+        self._completed: OrderedDict[str, None] = OrderedDict()
+        # (ttl_expires_at, turn_key) in completion order, which is expiry order
+        # because the TTL is fixed. May hold keys already evicted by the LRU caps.
+        self._expiries: deque[tuple[datetime, str]] = deque()
+        self._completed_bytes = 0
+        self._ttl_seconds = ttl_seconds
+        self._max_completed = max_completed
+        self._max_bytes = max_bytes
         self._lock = asyncio.Lock()
 
     def _active_execution(self, channel_id: str) -> Optional[TurnExecution]:
@@ -166,7 +259,23 @@ class TurnRegistry:
         return execn.turn_key if execn else None
 
     def get(self, turn_key: str) -> Optional[TurnExecution]:
-        return self._by_key.get(turn_key)
+        """The execution for ``turn_key``; fetching a replay record refreshes its LRU slot."""
+        execn = self._by_key.get(turn_key)
+        if execn is None or turn_key not in self._completed:
+            return execn
+        if execn.ttl_expires_at is not None and execn.ttl_expires_at <= _now():
+            self._drop(turn_key, "ttl")
+            self._publish()
+            return None
+        self._completed.move_to_end(turn_key)
+        return execn
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "live": len(self._by_key) - len(self._completed),
+            "completed": len(self._completed),
+            "completed_bytes": self._completed_bytes,
+        }
 
     async def start_or_get_active(
         self,
@@ -187,12 +296,15 @@ class TurnRegistry:
              done_event, QUEUED) and insert it into ``_by_key`` +
              ``_active_by_channel`` BEFORE launching any task.
           3. Only then call ``run_turn(execn)`` to create the asyncio.Task with
-             the fully-built execution, and store it on ``execn.task``.
+             the fully-built execution, and store it on ``execn.task``. If it
+             raises (e.g. the turn pool sheds the turn), the execution is removed
+             again and the error propagates.
 
         This guarantees a concurrent waiter that observes the pointer always
         sees an execution with a valid ``done_event``.
         """
         async with self._lock:
+            self._evict_expired(_now())
             existing = self._active_execution(channel_id)
             if existing is not None:
                 if existing.idempotency_key == idempotency_key:
@@ -210,37 +322,112 @@ class TurnRegistry:
             self._active_by_channel[channel_id] = execn.turn_key
             # Launch the task only after the execution is fully built and the
             # pointer is in place (construction-order contract).
-            execn.task = run_turn(execn)
+            try:
+                execn.task = run_turn(execn)
+            except BaseException:
+                self._by_key.pop(execn.turn_key, None)
+                self._active_by_channel.pop(channel_id, None)
+                raise
+            finally:
+                self._publish()
             return execn
 
     async def clear_active(self, channel_id: str, turn_key: str) -> None:
-        """Clear the active pointer if it still points at ``turn_key``.
-
-        Called when an execution reaches a terminal state. The execution remains
-        in ``_by_key`` for polling/recovery (TTL eviction is Step 2).
-        """
+        """Clear the active pointer if it still points at ``turn_key``."""
         async with self._lock:
             if self._active_by_channel.get(channel_id) == turn_key:
                 self._active_by_channel.pop(channel_id, None)
 
+    async def complete(self, execn: TurnExecution) -> None:
+        """Turn a finished execution into a replay record.
+
+        Clears the channel's active pointer, starts the record's TTL and applies
+        the LRU caps. Called once the execution is terminal, before its
+        ``done_event`` fires.
+        """
+        async with self._lock:
+            if self._active_by_channel.get(execn.channel_id) == execn.turn_key:
+                self._active_by_channel.pop(execn.channel_id, None)
+            if self._by_key.get(execn.turn_key) is not execn:
+                return
+            self._resolve_limits()
+            finished_at = execn.finished_at or _now()
+            execn.ttl_expires_at = finished_at + timedelta(seconds=self._ttl_seconds)
+            execn.approx_bytes = execn._measure()
+            self._completed[execn.turn_key] = None
+            self._expiries.append((execn.ttl_expires_at, execn.turn_key))
+            self._completed_bytes += execn.approx_bytes
+            self._evict_expired(_now())
+            self._evict_over_caps()
+            self._publish()
+
+    def release_traces(self, execn: TurnExecution) -> None:
+        """Drop a finished execution's trace events once a response has carried them.
+
+        The replay record keeps ``trace_digest``; a later re-fetch renders that
+        instead of the events.
+        """
+        if not execn.is_terminal or not execn.traces:
+            return
+        freed = _json_size(execn.traces)
+        execn.traces = []
+        if execn.turn_key in self._completed:
+            execn.approx_bytes -= freed
+            self._completed_bytes -= freed
+            self._publish()
+
     def evict_terminal(self, now: Optional[datetime] = None) -> int:
-        """TTL eviction of terminal (DONE/LOST) executions. Step 2 hook.
+        """TTL eviction of replay records; returns the number evicted.
 
-        Returns the number of evicted entries. ``ttl_expires_at`` is unset in
-        Step 1, so this is a no-op until Step 2 wires TTLs; included so the API
-        surface is stable.
+        Runs on every submission and completion as well, so calling it is only
+        needed to release memory on an otherwise idle registry.
         """
-        now = now or _now()
-        evict_keys = [
-            key
-            for key, execn in self._by_key.items()
-            if execn.is_terminal
-            and execn.ttl_expires_at is not None
-            and execn.ttl_expires_at <= now
-        ]
-        for key in evict_keys:
-            self._by_key.pop(key, None)
-        return len(evict_keys)
+        evicted = self._evict_expired(now or _now())
+        self._publish()
+        return evicted
+
+    def _resolve_limits(self) -> None:
+        if self._ttl_seconds is None:
+            self._ttl_seconds = fastworkflow.get_env_var(
+                "TURN_REGISTRY_TTL_SECONDS", float, default=DEFAULT_TTL_SECONDS)
+        if self._max_completed is None:
+            self._max_completed = fastworkflow.get_env_var(
+                "TURN_REGISTRY_MAX_COMPLETED", int, default=DEFAULT_MAX_COMPLETED)
+        if self._max_bytes is None:
+            self._max_bytes = fastworkflow.get_env_var(
+                "TURN_REGISTRY_MAX_BYTES", int, default=DEFAULT_MAX_BYTES)
+
+    def _evict_expired(self, now: datetime) -> int:
+        evicted = 0
+        while self._expiries and self._expiries[0][0] <= now:
+            _, turn_key = self._expiries.popleft()
+            evicted += self._drop(turn_key, "ttl")
+        # Keys evicted by the caps linger in the expiry queue until they expire;
+        # rebuild it before they outnumber the live records.
+        if len(self._expiries) > 2 * len(self._completed) + 64:
+            self._expiries = deque(sorted(
+                (self._by_key[key].ttl_expires_at, key) for key in self._completed))
+        return evicted
+
+    def _evict_over_caps(self) -> None:
+        while len(self._completed) > self._max_completed:
+            self._drop(next(iter(self._completed)), "count")
+        while self._completed and self._completed_bytes > self._max_bytes:
+            self._drop(next(iter(self._completed)), "bytes")
+
+    def _drop(self, turn_key: str, reason: str) -> bool:
+        if turn_key not in self._completed:
+            return False
+        del self._completed[turn_key]
+        execn = self._by_key.pop(turn_key)
+        self._completed_bytes -= execn.approx_bytes
+        _EVICTED[reason].inc()
+        return True
+
+    def _publish(self) -> None:
+        _LIVE.set(len(self._by_key) - len(self._completed))
+        _COMPLETED.set(len(self._completed))
+        _COMPLETED_BYTES.set(self._completed_bytes)
 
 
 def _persist_after_turn(
@@ -272,28 +459,30 @@ async def _run_turn(
     execn: TurnExecution,
     work_fn: WorkFn,
     session_manager: "ChannelSessionManager",
+    ticket: TurnTicket,
 ) -> None:
     """The only place that touches ``ctx`` for a turn.
 
-    Acquire ``runtime.lock`` per attempt, run the blocking ``work_fn`` in the
-    executor, collect traces, run persistence BEFORE marking DONE, then set
+    Acquire ``runtime.lock`` per attempt, run the blocking ``work_fn`` on the
+    turn pool that admitted it (``ticket``), collect traces, run persistence BEFORE marking DONE, then set
     ``exec_state=DONE`` and fire ``done_event``. The lock is released (by exiting
     the ``async with``) on a terminal TurnStatus OR on AWAITING_USER — never held
     across suspension (the registry pointer, not the lock, carries the execution).
     """
-    loop = asyncio.get_running_loop()
     try:
         async with runtime.lock:
             execn.exec_state = ExecState.RUNNING
             execn.started_at = _now()
 
-            result = await loop.run_in_executor(None, work_fn)
+            result = await ticket.run(work_fn)
             execn.result = result
 
-            # Destructive trace drain (Step 1). Step 2 replaces this with a
-            # non-destructive per-execution replay buffer.
+            # The queue drain is destructive: the events live on the execution
+            # until a response carries them (``TurnRegistry.release_traces``); the
+            # replay record keeps only their digest.
             try:
                 execn.traces = collect_trace_events(runtime, user_id=execn.user_id)
+                execn.trace_digest = TraceDigest.of(execn.traces)
             except Exception as trace_exc:  # best-effort; never fail the turn
                 logger.warning(
                     f"Failed to collect traces for turn {execn.turn_key}: {trace_exc}"
@@ -312,9 +501,10 @@ async def _run_turn(
         )
         traceback.print_exc()
     finally:
+        ticket.release()
         execn.finished_at = _now()
         execn.exec_state = ExecState.DONE
-        await registry.clear_active(execn.channel_id, execn.turn_key)
+        await registry.complete(execn)
         execn.done_event.set()
 
 
@@ -336,8 +526,17 @@ async def submit_turn(
     execution; the execution is owned by the registry and keeps running.
 
     Raises ``ChannelBusyError`` if the channel already has a *different* active
-    execution.
+    execution, and ``TurnPoolFullError`` / ``TurnPoolClosedError`` if the turn
+    pool for ``kind`` cannot admit a new execution (a rejoin is never shed).
     """
+    pool = get_turn_pools().for_kind(kind)
+
+    def run_turn(execn: TurnExecution) -> asyncio.Task:
+        ticket = pool.admit()
+        return asyncio.create_task(
+            _run_turn(runtime, registry, execn, work_fn, session_manager, ticket)
+        )
+
     # The REGISTRY owns TurnExecution creation and task launch. The factory
     # receives the fully-built execution, so there is no caller-side forward
     # reference and no half-built-execution race (see construction-order
@@ -347,9 +546,7 @@ async def submit_turn(
         kind=kind,
         idempotency_key=idempotency_key,
         user_id=user_id,
-        run_turn=lambda execn: asyncio.create_task(
-            _run_turn(runtime, registry, execn, work_fn, session_manager)
-        ),
+        run_turn=run_turn,
     )
     with contextlib.suppress(asyncio.TimeoutError):
         # shield: the request's wait window timing out must NEVER cancel the
@@ -390,7 +587,7 @@ def render_turn_response(execn: TurnExecution) -> tuple[int, dict[str, Any]]:
     * Done with error          -> 200 {..., error} (caller may raise 500).
     * Done with result         -> 200 {turn_key, exec_state, status, success,
                                         answer, command_responses, command_outputs,
-                                        traces?}.
+                                        traces? | trace_digest?}.
     """
     if not execn.is_terminal:
         return 202, {
@@ -421,4 +618,10 @@ def render_turn_response(execn: TurnExecution) -> tuple[int, dict[str, Any]]:
     }
     if execn.traces:
         body["traces"] = execn.traces
+    elif execn.trace_digest is not None and execn.trace_digest.count:
+        # Replay of a turn whose events an earlier response already carried.
+        body["trace_digest"] = {
+            "count": execn.trace_digest.count,
+            "sha256": execn.trace_digest.sha256,
+        }
     return 200, body
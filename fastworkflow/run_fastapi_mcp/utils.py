@@ -19,6 +19,12 @@ from fastworkflow.utils.logging import logger
 
 from .conversation_store import ConversationStore, restore_history_from_turns
 from .jwt_manager import verify_token
+from .turn_executor import (
+    TurnPoolClosedError,
+    TurnPoolFullError,
+    get_turn_pools,
+    turn_pool_http_exception,
+)
 
 
 # ============================================================================
@@ -348,21 +354,21 @@ async def _create_user_runtime(
 
     conv_id_to_restore = None
     if conv_id_to_restore := conversation_store.get_last_conversation_id():
-        conversation = conversation_store.get_conversation(conv_id_to_restore)
+        conversation = conversation_store.get_conversation_header(conv_id_to_restore)
         if not conversation:
             conv_id_to_restore = conv_id_to_restore - 1
-            conversation = conversation_store.get_conversation(conv_id_to_restore)
+            conversation = conversation_store.get_conversation_header(conv_id_to_restore)
         if conversation:
-            ctx._conversation_history = restore_history_from_turns(conversation["turns"])
+            ctx._replace_conversation_history(restore_history_from_turns(
+                conversation_store.iter_conversation_turns(conv_id_to_restore)
+            ))
             logger.info(f"Restored conversation {conv_id_to_restore} for user {channel_id}")
         else:
             conv_id_to_restore = None
 
-    loop = asyncio.get_running_loop()
     startup_ran = False
     if run_startup and (startup_command or startup_action):
-        await loop.run_in_executor(
-            None,
+        await get_turn_pools().fast.run(
             lambda: _run_startup_sync(ctx, startup_command, startup_action),
         )
         startup_ran = True
@@ -430,8 +436,7 @@ async def run_process_message(
     timeout_seconds: int,
     session_manager: "ChannelSessionManager",
 ) -> fastworkflow.CommandOutput:
-    """Run process_message in a thread pool with timeout (Topology B)."""
-    loop = asyncio.get_running_loop()
+    """Run process_message on the agent turn pool with timeout (Topology B)."""
     ctx = runtime.execution_context
 
     def _run() -> fastworkflow.CommandOutput:
@@ -441,9 +446,11 @@ async def run_process_message(
 
     try:
         output = await asyncio.wait_for(
-            loop.run_in_executor(None, _run),
+            get_turn_pools().agent.run(_run),
             timeout=timeout_seconds,
         )
+    except (TurnPoolFullError, TurnPoolClosedError) as exc:
+        raise turn_pool_http_exception(exc) from exc
     except asyncio.TimeoutError as exc:
         logger.error(
             f"Command execution timed out after {timeout_seconds}s "
@@ -464,7 +471,6 @@ async def run_process_action(
     timeout_seconds: int,
     session_manager: "ChannelSessionManager",
 ) -> fastworkflow.CommandOutput:
-    loop = asyncio.get_running_loop()
     ctx = runtime.execution_context
 
     def _run() -> fastworkflow.CommandOutput:
@@ -472,9 +478,11 @@ async def run_process_action(
 
     try:
         output = await asyncio.wait_for(
-            loop.run_in_executor(None, _run),
+            get_turn_pools().fast.run(_run),
             timeout=timeout_seconds,
         )
+    except (TurnPoolFullError, TurnPoolClosedError) as exc:
+        raise turn_pool_http_exception(exc) from exc
     except asyncio.TimeoutError as exc:
         raise HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
@@ -519,9 +527,8 @@ async def run_process_message_with_trace_stream(
     user_id: Optional[str] = None,
 ) -> fastworkflow.CommandOutput:
     """
-    Run process_message in an executor while draining command_trace_queue concurrently.
+    Run process_message on the agent turn pool while draining command_trace_queue concurrently.
     """
-    loop = asyncio.get_running_loop()
     ctx = runtime.execution_context
     trace_queue = ctx.command_trace_queue
     if trace_queue is None:
@@ -529,9 +536,14 @@ async def run_process_message_with_trace_stream(
             runtime, message, timeout_seconds, session_manager
         )
 
-    exec_future = loop.run_in_executor(
-        None, lambda: ctx._execute_message(message)
+    try:
+        ticket = get_turn_pools().agent.admit()
+    except (TurnPoolFullError, TurnPoolClosedError) as exc:
+        raise turn_pool_http_exception(exc) from exc
+    exec_future = asyncio.ensure_future(
+        ticket.run(lambda: ctx._execute_message(message))
     )
+    exec_future.add_done_callback(lambda _: ticket.release())
     start = time.time()
 
     while not exec_future.done() and time.time() - start < timeout_seconds:
@@ -793,9 +805,47 @@ def save_conversation_incremental(runtime: ChannelRuntime, extract_turns_func, l
     """
     Save conversation turns incrementally after each turn (without generating topic/summary).
     This provides crash protection - all turns except the last will be preserved.
+    The store appends only the new turns, so the cost does not grow with the conversation.
+
+    Never waits for background conversation summaries: a turn whose summary is
+    still outstanding is saved with its raw message and saved again, from the
+    summary worker, once the summary is recorded.
     """
-    # Extract turns from conversation history
-    if turns := extract_turns_func(runtime.execution_context.conversation_history):
+    ctx = runtime.execution_context
+    history = ctx.recorded_conversation_history
+    pending = ctx.pending_summaries()
+    _save_turns(runtime, extract_turns_func(history), logger)
+    if pending is None:
+        return
+
+    first_pending, summarized = pending
+    conversation_id = runtime.active_conversation_id
+
+    def save_summaries(_) -> None:
+        if (
+            ctx.recorded_conversation_history is not history
+            or runtime.active_conversation_id != conversation_id
+        ):
+            return  # the conversation was replaced in the meantime
+        try:
+            _save_turns(
+                runtime, extract_turns_func(history), logger, rewrite_from=first_pending
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to save conversation summaries for user {runtime.channel_id}: {e}"
+            )
+
+    summarized.add_done_callback(save_summaries)
+
+
+def _save_turns(
+    runtime: ChannelRuntime,
+    turns: list[dict[str, Any]],
+    logger,
+    rewrite_from: Optional[int] = None,
+) -> None:
+    if turns:
         # Initialize conversation ID for first conversation if needed
         if runtime.active_conversation_id == 0:
             # This is the first conversation for this session
@@ -805,7 +855,7 @@ def save_conversation_incremental(runtime: ChannelRuntime, extract_turns_func, l
         
         # Save turns using the active conversation ID
         runtime.conversation_store.save_conversation_turns(
-            runtime.active_conversation_id, turns
+            runtime.active_conversation_id, turns, rewrite_from=rewrite_from
         )
         logger.debug(f"Incrementally saved {len(turns)} turn(s) to conversation {runtime.active_conversation_id}")
 
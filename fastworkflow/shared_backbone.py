@@ -0,0 +1,255 @@
+"""Shared encoder backbones with lightweight per-context classification heads.
+
+By default every trained context owns a full TinyBERT and a full DistilBERT,
+so a workflow with 30 contexts keeps 60 transformer models resident and
+cold-loads two of them on the first message in each context.  With
+``INTENT_DETECTION_SHARED_BACKBONE=true`` training instead fine-tunes ONE
+encoder per model size on the commands of every context, freezes it, and
+fits only a linear head per context on its ``[CLS]`` embedding.
+
+Artifact layout inside a version (see ``artifact_versioning``)::
+
+    ___shared_backbone/
+        tinymodel.pth/   <- fine-tuned base encoder + tokenizer (save_pretrained)
+        largemodel.pth/
+    <Context>/
+        tinymodel.pth/   <- head.safetensors + head_config.json (+ tokenizer files)
+        largemodel.pth/
+        label_encoder.pkl, threshold.json, ...   <- unchanged
+
+The per-context directories keep their names, so everything that checks for
+or carries artifacts by name works unchanged.  A head names its backbone by
+model size only; the backbone is found next to the context directories of
+the version the head actually lives in.
+
+At runtime the backbone is loaded once per version and memoises the
+embedding of recent utterances, so the wildcard parent-chain walk scores the
+heads of every ancestor context against a single encoder pass.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import ClassVar, Sequence
+
+import numpy as np
+import torch
+from safetensors.torch import load_file, save_file
+from torch.utils.data import DataLoader
+from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer
+from transformers.modeling_outputs import SequenceClassifierOutput
+
+from fastworkflow.train.artifact_versioning import SHARED_BACKBONE_FOLDERNAME
+from fastworkflow.utils.logging import logger
+
+HEAD_CONFIG_FILENAME = "head_config.json"
+HEAD_WEIGHTS_FILENAME = "head.safetensors"
+
+_MAX_LENGTH = 128
+_EMBEDDING_CACHE_SIZE = 256
+
+
+def is_head_dir(model_path: str) -> bool:
+    """True when *model_path* holds a per-context head rather than a full model."""
+    return os.path.isfile(os.path.join(model_path, HEAD_CONFIG_FILENAME))
+
+
+def resolve_backbone_path(head_path: str) -> str:
+    """The shared backbone a head directory was trained against.
+
+    Resolved through ``realpath`` so a head reached via a compatibility entry finds
+    the backbone of the version it belongs to, not of whatever is current.
+    """
+    with open(os.path.join(head_path, HEAD_CONFIG_FILENAME)) as f:
+        backbone_name = json.load(f)["backbone"]
+    context_dir = os.path.dirname(os.path.realpath(head_path))
+    return os.path.join(
+        os.path.dirname(context_dir), SHARED_BACKBONE_FOLDERNAME, backbone_name)
+
+
+class SharedBackbone:
+    """A frozen encoder plus tokenizer, loaded once per path and device."""
+
+    _instances: ClassVar[dict[tuple[str, str], "SharedBackbone"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, backbone_path: str, device: str):
+        self.path = backbone_path
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(backbone_path)
+        self.encoder = AutoModel.from_pretrained(backbone_path).to(device)
+        self.encoder.eval()
+        self.hidden_size = self.encoder.config.hidden_size
+        # utterance -> [CLS] embedding, most recently used last
+        self._embeddings: OrderedDict[str, torch.Tensor] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, backbone_path: str, device: str) -> "SharedBackbone":
+        key = (os.path.realpath(backbone_path), device)
+        with cls._instances_lock:
+            backbone = cls._instances.get(key)
+            if backbone is None:
+                backbone = cls._instances[key] = cls(key[0], device)
+            return backbone
+
+    @torch.no_grad()
+    def embed_encoded(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        outputs = self.encoder(input_ids=input_ids, attention_mask=attention_mask)
+        return outputs.last_hidden_state[:, 0, :]
+
+    def embed(self, texts: Sequence[str]) -> torch.Tensor:
+        """``[CLS]`` embeddings for *texts*, encoding only the ones not seen recently."""
+        with self._lock:
+            known = {text: self._embeddings[text] for text in texts if text in self._embeddings}
+            for text in known:
+                self._embeddings.move_to_end(text)
+        missing = [text for text in dict.fromkeys(texts) if text not in known]
+        if missing:
+            encodings = self.tokenizer(
+                missing,
+                padding=True,
+                truncation=True,
+                max_length=_MAX_LENGTH,
+                return_tensors="pt"
+            ).to(self.device)
+            fresh = self.embed_encoded(encodings["input_ids"], encodings["attention_mask"])
+            with self._lock:
+                for text, embedding in zip(missing, fresh):
+                    known[text] = self._embeddings[text] = embedding
+                while len(self._embeddings) > _EMBEDDING_CACHE_SIZE:
+                    self._embeddings.popitem(last=False)
+        return torch.stack([known[text] for text in texts])
+
+
+def _new_head(hidden_size: int, num_labels: int) -> torch.nn.Linear:
+    return torch.nn.Linear(hidden_size, num_labels)
+
+
+def _save_head(head: torch.nn.Linear, backbone_name: str, save_path: str) -> None:
+    os.makedirs(save_path, exist_ok=True)
+    save_file(
+        {"weight": head.weight.detach().cpu().contiguous(),
+         "bias": head.bias.detach().cpu().contiguous()},
+        os.path.join(save_path, HEAD_WEIGHTS_FILENAME),
+    )
+    with open(os.path.join(save_path, HEAD_CONFIG_FILENAME), "w") as f:
+        json.dump({
+            "backbone": backbone_name,
+            "hidden_size": head.in_features,
+            "num_labels": head.out_features,
+        }, f, indent=2)
+
+
+class HeadModel(torch.nn.Module):
+    """Training-time stand-in for ``AutoModelForSequenceClassification``.
+
+    Presents the calls the trainer makes on a classifier -- ``model(input_ids,
+    attention_mask=..., labels=...)`` returning ``.logits``/``.loss``, and
+    ``save_pretrained`` -- while only the linear head has parameters. The backbone is
+    frozen and shared by every context's head.
+    """
+
+    def __init__(self, backbone_path: str, num_labels: int, device: str):
+        super().__init__()
+        # A plain attribute, not a submodule: the backbone is not this head's to train.
+        self.backbone = SharedBackbone.get(backbone_path, device)
+        self.backbone_name = os.path.basename(os.path.normpath(backbone_path))
+        self.head = _new_head(self.backbone.hidden_size, num_labels)
+        self.num_labels = num_labels
+
+    def forward(self, input_ids, attention_mask=None, labels=None):
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        logits = self.head(self.backbone.embed_encoded(input_ids, attention_mask))
+        loss = torch.nn.functional.cross_entropy(logits, labels) if labels is not None else None
+        return SequenceClassifierOutput(loss=loss, logits=logits)
+
+    def save_pretrained(self, save_path: str) -> None:
+        _save_head(self.head, self.backbone_name, save_path)
+
+
+class HeadClassifier:
+    """Inference backend for a head directory; see ``fastworkflow.intent_backends``."""
+
+    backend = "shared-backbone"
+
+    def __init__(self, head_path: str, device: str):
+        self.device = device
+        self.backbone = SharedBackbone.get(resolve_backbone_path(head_path), device)
+        weights = load_file(os.path.join(head_path, HEAD_WEIGHTS_FILENAME))
+        self.num_labels = weights["weight"].shape[0]
+        self.head = _new_head(weights["weight"].shape[1], self.num_labels)
+        self.head.load_state_dict(weights)
+        self.head.to(device).eval()
+        self.tokenizer = self.backbone.tokenizer
+
+    @torch.no_grad()
+    def logits(self, texts: list[str]) -> torch.Tensor:
+        return self.head(self.backbone.embed(texts))
+
+    def embed_cls(self, texts: list[str]) -> np.ndarray:
+        return self.backbone.embed(texts).cpu().numpy()
+
+
+def score_heads(text: str, classifiers: Sequence[HeadClassifier]) -> list[torch.Tensor]:
+    """Logits of *text* under every head, encoding the utterance once per backbone."""
+    return [classifier.logits([text])[0] for classifier in classifiers]
+
+
+def fine_tune_backbone(
+    model_name: str,
+    rows: list[tuple[str, str]],
+    save_path: str,
+    device: str,
+    epochs: int,
+    lr: float,
+    batch_size: int = 16,
+) -> str:
+    """Fine-tune *model_name* on ``(utterance, command)`` *rows* and save its encoder.
+
+    The classification layer is only scaffolding for the fine-tune and is discarded:
+    every context fits its own head on the saved encoder afterwards.
+    """
+    labels = sorted({label for _, label in rows})
+    label_ids = {label: index for index, label in enumerate(labels)}
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        model_name, num_labels=max(2, len(labels))).to(device)
+
+    def collate(batch):
+        encodings = tokenizer(
+            [text for text, _ in batch],
+            padding=True,
+            truncation=True,
+            max_length=_MAX_LENGTH,
+            return_tensors="pt"
+        )
+        return encodings, torch.tensor([label_ids[label] for _, label in batch])
+
+    loader = DataLoader(rows, batch_size=batch_size, shuffle=True, collate_fn=collate)
+    optimizer = torch.optim.AdamW(model.parameters(), lr=lr)
+    model.train()
+    for epoch in range(epochs):
+        total_loss = 0.0
+        for encodings, batch_labels in loader:
+            optimizer.zero_grad()
+            outputs = model(
+                input_ids=encodings["input_ids"].to(device),
+                attention_mask=encodings["attention_mask"].to(device),
+                labels=batch_labels.to(device),
+            )
+            outputs.loss.backward()
+            optimizer.step()
+            total_loss += outputs.loss.item()
+        logger.info(
+            f"Shared backbone {model_name} epoch {epoch + 1}/{epochs}: "
+            f"loss {total_loss / max(1, len(loader)):.4f}")
+
+    model.eval()
+    model.base_model.save_pretrained(save_path)
+    tokenizer.save_pretrained(save_path)
+    return save_path
@@ -5,6 +5,9 @@ import os
 import json
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import dotenv_values
 import importlib.util
 
@@ -21,10 +24,14 @@ from fastworkflow.model_pipeline_training import (
     set_active_artifact_version,
     GLOBAL_CONTEXT_FOLDER,
 )
-from fastworkflow.utils.generate_param_examples import generate_dspy_examples
+from fastworkflow.utils.generate_param_examples import (
+    generate_dspy_examples,
+    param_example_fingerprint,
+)
 from fastworkflow.command_directory import CommandDirectory, get_cached_command_directory
 from fastworkflow.command_routing import RoutingDefinition, RoutingRegistry
 from fastworkflow.command_context_model import CommandContextModel
+from fastworkflow.train.generate_synthetic import get_generation_limiter
 from fastworkflow.train import (
     artifact_versioning,
     determinism,
@@ -353,10 +360,43 @@ def train_workflow(workflow_path: str, regenerate_utterances: bool = False):
     # previous, complete ___command_info intact and runnable.
     _prune_stale_artifacts(workflow_path)
 
-def _generate_dspy_examples_helper(workflow):
+# What every parameterised command is asked for. Both are fingerprint inputs of the
+# parameter-example cache, so the up-front cache check must use the same values.
+_DSPY_NUM_EXAMPLES = 15
+_DSPY_VALIDATION_THRESHOLD = 0.3  # You can adjust this threshold as needed
+
+
+@dataclass
+class _ParamExampleTiming:
+    """How long one command's parameter examples took, and whether they were cached."""
+
+    command_name: str
+    seconds: float
+    cached: bool
+
+
+def _format_param_example_timings(timings: list[_ParamExampleTiming], wall_seconds: float) -> str:
+    """One line summarising a parameter-example stage: cache hits and generation latency."""
+    generated = sorted(timing.seconds for timing in timings if not timing.cached)
+    summary = (
+        f"DSPy parameter examples for {len(timings)} command(s) in {wall_seconds:.1f}s: "
+        f"{len(timings) - len(generated)} cached, {len(generated)} generated"
+    )
+    if generated:
+        slowest = max(
+            (timing for timing in timings if not timing.cached), key=lambda t: t.seconds)
+        summary += (
+            f" (latency p50 {generated[(len(generated) - 1) // 2]:.1f}s, "
+            f"slowest {slowest.seconds:.1f}s for '{slowest.command_name}')"
+        )
+    return summary
+
+
+def _get_parameter_models(workflow) -> dict[str, object]:
+    """Parameter model of every parameterised command whose module can be loaded."""
     json_path=get_route_layer_filepath_model(workflow.folderpath,"command_directory.json")
-    # json_path = "./examples/sample_workflow/___command_info/command_directory.json"
     commands = _get_commands_with_parameters(json_path)
+    parameter_models = {}
     for command_name in commands.keys():
         command_metadata = commands[command_name]
         module_file_path = command_metadata["parameter_path"]
@@ -368,32 +408,103 @@ def _generate_dspy_examples_helper(workflow):
             if "." in module_class_name:
                 (outer, inner) = module_class_name.split(".")
                 outer_cls = getattr(module, outer)
-                fields = getattr(outer_cls, inner)
+                parameter_models[command_name] = getattr(outer_cls, inner)
             else:
-                fields = getattr(module, module_class_name)
+                parameter_models[command_name] = getattr(module, module_class_name)
+    return parameter_models
+
+
+def _generate_dspy_examples_helper(workflow, max_workers: Optional[int] = None):
+    """Write ``<command>_param_labeled.json`` for every parameterised command.
 
-            examples, rejected_examples = generate_dspy_examples(
-            field_annotations=fields.model_fields,
+    Commands the installed parameter-example cache already holds are resolved first, on
+    this thread. The rest are generated on up to *max_workers* threads (default: the
+    concurrency of the synthetic-generation limiter), and every generation goes through
+    that same limiter, so utterance and parameter-example requests share one budget.
+    Each file is written as soon as its command is resolved; the first failure cancels
+    the generations that have not started and is re-raised.
+    """
+    parameter_models = _get_parameter_models(workflow)
+    if not parameter_models:
+        return
+
+    limiter = get_generation_limiter()
+    cache = param_example_cache.get_param_example_cache()
+    seed = determinism.get_training_seed()
+    model = fastworkflow.get_env_var("LLM_SYNDATA_GEN")
+
+    def generate(command_name: str):
+        started = time.monotonic()
+        examples, rejected_examples = generate_dspy_examples(
+            field_annotations=parameter_models[command_name].model_fields,
             command_name=command_name,
-            num_examples=15,
-            validation_threshold=0.3  # You can adjust this threshold as needed
-            )
-            output_dir = os.path.join(workflow.folderpath, "___command_info")
-            os.makedirs(output_dir, exist_ok=True)
-
-            # Format the examples for JSON
-            examples_data = {
-                "command_name": command_name,
-                "valid_examples": examples,
-                "rejected_examples": rejected_examples
-            }
+            num_examples=_DSPY_NUM_EXAMPLES,
+            validation_threshold=_DSPY_VALIDATION_THRESHOLD,
+        )
+        return examples, rejected_examples, time.monotonic() - started
+
+    def is_cached(command_name: str) -> bool:
+        return cache is not None and cache.contains(
+            param_example_fingerprint(
+                parameter_models[command_name].model_fields,
+                command_name,
+                _DSPY_NUM_EXAMPLES,
+                _DSPY_VALIDATION_THRESHOLD,
+                model,
+            ),
+            seed,
+        )
 
-            # Save to JSON file
-            output_file = os.path.join(output_dir, f"{command_name}_param_labeled.json")
-            with open(output_file, 'w') as f:
-                json.dump(examples_data, f, indent=2)
+    output_dir = os.path.join(workflow.folderpath, "___command_info")
+    os.makedirs(output_dir, exist_ok=True)
+
+    def write(command_name: str, examples, rejected_examples) -> None:
+        # Format the examples for JSON
+        examples_data = {
+            "command_name": command_name,
+            "valid_examples": examples,
+            "rejected_examples": rejected_examples
+        }
+
+        # Save to JSON file
+        output_file = os.path.join(output_dir, f"{command_name}_param_labeled.json")
+        with open(output_file, 'w') as f:
+            json.dump(examples_data, f, indent=2)
+
+    stage_started = time.monotonic()
+    timings = {}
+    pending = []
+    for command_name in parameter_models:
+        if is_cached(command_name):
+            examples, rejected_examples, seconds = generate(command_name)
+            write(command_name, examples, rejected_examples)
+            timings[command_name] = _ParamExampleTiming(command_name, seconds, cached=True)
         else:
-            None
+            pending.append(command_name)
+
+    if max_workers is None:
+        max_workers = limiter.max_concurrent
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+            futures = [
+                executor.submit(limiter.call, functools.partial(generate, command_name))
+                for command_name in pending
+            ]
+            try:
+                for command_name, future in zip(pending, futures):
+                    examples, rejected_examples, seconds = future.result()
+                    write(command_name, examples, rejected_examples)
+                    timings[command_name] = _ParamExampleTiming(command_name, seconds, cached=False)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    print(_format_param_example_timings(
+        [timings[command_name] for command_name in parameter_models],
+        time.monotonic() - stage_started,
+    ))
+
 
 def _prune_stale_artifacts(workflow_path: str):
     """Remove orphaned per-command and per-context training artifacts.
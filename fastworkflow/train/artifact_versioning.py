@@ -15,12 +15,14 @@ Layout
         routing_definition.json         <- workflow-scoped, NOT versioned
         <command>_param_labeled.json    <- workflow-scoped, NOT versioned
         current.json                    <- authoritative pointer (this module)
+        blobs/<ab>/<sha256>             <- content-addressed artifact files
         versions/
             README.md                   <- "these cost hours to rebuild" warning
             <version_id>/
-                manifest.json
+                manifest.json           <- includes `files`: path -> sha256 + size
                 global/{tinymodel.pth, largemodel.pth, threshold.json, ...}
                 <Context>/...
+                ___shared_backbone/{tinymodel.pth, largemodel.pth}   <- shared mode only
         current    -> versions/<version_id>              (symlink, best effort)
         <Context>  -> versions/<version_id>/<Context>    (compatibility entry)
         global     -> versions/<version_id>/global       (compatibility entry)
@@ -51,19 +53,43 @@ path, so it is the publication commit point: any earlier failure leaves the
 authoritative pointer on the old version. During that preparation window,
 `prune_versions` also protects versions referenced by compatibility entries or the
 convenience link.
+
+Content-addressed storage
+-------------------------
+Most of a retrain is unchanged weights: a selective run carries every untouched
+context forward, and a full run at the same seed often reproduces files bit for bit.
+`publish_version` therefore *seals* a version first: each artifact file is stored
+once under `blobs/` by its sha256, the version's file becomes a hardlink to that
+blob, and the manifest's `files` map records `path -> {sha256, size}`. Readers keep
+opening `versions/<id>/<Context>/...` exactly as before.
+
+* Sealing hashes only files the manifest does not already record, so creating a
+  version costs O(changed files). `carry_forward_context` links a carried context
+  straight from the blobs its source manifest names and records those entries,
+  so carried weights are never re-read.
+* A version's size is the sum of its manifest entries, not an `os.walk`.
+  `stored_size_bytes` counts each blob once, which is what the disk actually holds.
+* Blobs are reference counted by the manifests that name them. `prune_versions`
+  removes a blob once no remaining version references it, so with automatic
+  retention disk use stays flat across repeated retrains.
+
+Versions that predate sealing have no `files` map; they are sized by a walk and are
+sealed the next time they are published.
 """
 
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import json
 import os
 import re
 import shutil
 import uuid
 from datetime import datetime, timezone
+from collections import Counter
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from pydantic import BaseModel
 
@@ -75,6 +101,7 @@ CURRENT_LINK_NAME: str = "current"
 CURRENT_POINTER_FILENAME: str = "current.json"
 MANIFEST_FILENAME: str = "manifest.json"
 VERSIONS_README_FILENAME: str = "README.md"
+BLOBS_DIRNAME: str = "blobs"
 
 # Dropped inside a compatibility entry that had to be materialised as a real
 # directory (hardlink farm or copy) because symlinks were unavailable. It is the only
@@ -100,6 +127,13 @@ UTTERANCE_CACHE_DIRNAME: str = "utterance_cache"
 # `TRAINING_SEED` cannot reach.
 PARAM_EXAMPLE_CACHE_DIRNAME: str = "param_example_cache"
 
+# Holds the fine-tuned encoders that every context's classification head shares when
+# training with INTENT_DETECTION_SHARED_BACKBONE (see fastworkflow.shared_backbone).
+# It is versioned and routed exactly like a context folder -- a head must find the
+# backbone of its own version -- but it has no threshold.json, so nothing that
+# enumerates TRAINED contexts mistakes it for one.
+SHARED_BACKBONE_FOLDERNAME: str = "___shared_backbone"
+
 # Top-level names inside ___command_info that are never a context. Anything listed
 # here is skipped by `publish_version`'s stale-entry sweep, by
 # `migrate_legacy_to_version`, and by `_prune_stale_artifacts` in `train/__main__.py`
@@ -110,6 +144,7 @@ RESERVED_TOPLEVEL_NAMES: frozenset[str] = frozenset(
     {
         VERSIONS_DIRNAME,
         CURRENT_LINK_NAME,
+        BLOBS_DIRNAME,
         UTTERANCE_CACHE_DIRNAME,
         PARAM_EXAMPLE_CACHE_DIRNAME,
         "__pycache__",
@@ -132,12 +167,14 @@ MODEL_ARTIFACT_MARKERS: frozenset[str] = frozenset(
     }
 )
 
-# Hardlinks make `carry_forward_context` free instead of copying 276 MB per context.
+# Hardlinks make `carry_forward_context` free instead of copying 276 MB per context,
+# and are how a sealed version's files share one copy with `blobs/`.
 # The trade-off: a hardlinked file edited *in place* (`open(path, "w")` truncates the
-# shared inode) would mutate every version that shares it. Training never does that —
-# it writes into a fresh version directory via `save_pretrained` — but a human poking
-# at `threshold.json` under a compatibility entry would. Flip this to False to force
-# copies if that ever becomes a real workflow.
+# shared inode) would mutate every version that shares it, and the blob under it.
+# Training never does that — it writes into a fresh version directory via
+# `save_pretrained` — but a human poking at `threshold.json` under a compatibility
+# entry would. Flip this to False to force copies (blobs then still dedupe by
+# content, but every version keeps its own bytes) if that ever becomes a real workflow.
 USE_HARDLINKS_FOR_CARRY_FORWARD: bool = True
 
 _VERSION_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
@@ -468,7 +505,7 @@ def version_context_names(workflow_folderpath: str, version_id: str) -> list[str
 
 
 def _dir_size_bytes(path: Path) -> int:
-    """Apparent size of *path*.
+    """Apparent size of *path*, for versions whose manifest has no `files` map.
 
     Hardlinked carry-forwards are counted in every version that shares them, so the
     sum over versions overstates real disk usage. That bias is the safe direction:
@@ -508,12 +545,15 @@ def write_manifest(workflow_folderpath: str, version_id: str, **fields) -> str:
     manifest["updated_at"] = _utc_now()
     if not manifest.get("contexts"):
         manifest["contexts"] = version_context_names(workflow_folderpath, version_id)
+    return str(_replace_manifest(vdir, manifest))
 
+
+def _replace_manifest(vdir: Path, manifest: dict) -> Path:
     path = vdir / MANIFEST_FILENAME
     tmp = vdir / f".{MANIFEST_FILENAME}.tmp-{uuid.uuid4().hex[:8]}"
     tmp.write_text(json.dumps(manifest, indent=2, default=str), encoding="utf-8")
     os.replace(os.fspath(tmp), os.fspath(path))
-    return str(path)
+    return path
 
 
 def read_manifest(workflow_folderpath: str, version_id: str) -> dict:
@@ -530,6 +570,254 @@ def read_manifest(workflow_folderpath: str, version_id: str) -> dict:
     return data if isinstance(data, dict) else {}
 
 
+def manifest_files(manifest: dict) -> Optional[dict[str, dict]]:
+    """Return a manifest's `files` map, or None for a version that was never sealed.
+
+    Entries that are not a `{sha256, size}` pair are dropped, so a hand-edited
+    manifest costs a re-hash of those files rather than a wrong size or blob.
+    """
+    files = manifest.get("files")
+    if not isinstance(files, dict):
+        return None
+    return {
+        str(relative): entry
+        for relative, entry in files.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get("sha256"), str)
+        and _coerce_int(entry.get("size")) is not None
+    }
+
+
+def _update_manifest_files(
+    workflow_folderpath: str, version_id: str, entries: dict[str, dict]
+) -> None:
+    """Merge *entries* into *version_id*'s `files` map, leaving every other field alone.
+
+    Not `write_manifest`: that defaults `contexts` from disk, and a version that is
+    still being assembled would have its context list frozen half-way.
+    """
+    vdir = version_dir(workflow_folderpath, version_id)
+    vdir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(workflow_folderpath, version_id)
+    manifest["files"] = {**(manifest_files(manifest) or {}), **entries}
+    _replace_manifest(vdir, manifest)
+
+
+# ---------------------------------------------------------------------
+# Content-addressed blob store
+# ---------------------------------------------------------------------
+
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def blobs_root(workflow_folderpath: str) -> Path:
+    """Return `<workflow>/___command_info/blobs` without creating it."""
+    return command_info_root(workflow_folderpath) / BLOBS_DIRNAME
+
+
+def blob_path(workflow_folderpath: str, sha256: str) -> Path:
+    """Return where the blob with digest *sha256* lives. Does not create it."""
+    if not re.fullmatch(r"[0-9a-f]{64}", sha256):
+        raise ValueError(f"Invalid blob digest: {sha256!r}")
+    return blobs_root(workflow_folderpath) / sha256[:2] / sha256
+
+
+def _sha256_path(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _version_files(vdir: Path) -> Iterator[tuple[str, Path]]:
+    """Yield `(relative posix path, path)` for every file in *vdir*'s context folders.
+
+    Top-level files (the manifest, the training signature, provenance) are
+    kilobytes and rewritten per version; they are not artifacts and are not stored.
+    """
+    for context in sorted(vdir.iterdir()):
+        if not context.is_dir() or context.is_symlink() or context.name.startswith("."):
+            continue
+        for root, dirnames, filenames in os.walk(context, followlinks=False):
+            dirnames[:] = sorted(
+                d for d in dirnames if not os.path.islink(os.path.join(root, d))
+            )
+            for name in sorted(filenames):
+                path = Path(root) / name
+                yield path.relative_to(vdir).as_posix(), path
+
+
+def _link_or_copy(source: Path, dest: Path) -> None:
+    if USE_HARDLINKS_FOR_CARRY_FORWARD:
+        try:
+            os.link(os.fspath(source), os.fspath(dest))
+            return
+        except OSError:
+            pass
+    shutil.copy2(source, dest)
+
+
+def _ingest_blob(workflow_folderpath: str, path: Path, sha256: str) -> None:
+    """Store *path* as blob *sha256*, or share the existing blob's bytes with it."""
+    blob = blob_path(workflow_folderpath, sha256)
+    if blob.is_file():
+        if not USE_HARDLINKS_FOR_CARRY_FORWARD:
+            return
+        # Identical bytes are already stored: swap the version's file for a link to
+        # them. Where that link cannot be made the file simply keeps its own copy.
+        tmp = path.parent / f".{path.name}.tmp-{uuid.uuid4().hex[:8]}"
+        with contextlib.suppress(OSError):
+            os.link(os.fspath(blob), os.fspath(tmp))
+            os.replace(os.fspath(tmp), os.fspath(path))
+        _unlink_any(tmp)
+        return
+
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    tmp = blob.parent / f".{sha256}.tmp-{uuid.uuid4().hex[:8]}"
+    try:
+        _link_or_copy(path, tmp)
+        os.replace(os.fspath(tmp), os.fspath(blob))
+    finally:
+        _unlink_any(tmp)
+
+
+def _is_stored(workflow_folderpath: str, path: Path, entry: dict) -> bool:
+    """True when *path* is still the file its manifest *entry* says it is.
+
+    A hardlink to the entry's blob proves it outright. A copy (hardlinks disabled or
+    unavailable) is trusted while its size and mtime match what sealing recorded.
+    """
+    try:
+        blob = blob_path(workflow_folderpath, entry["sha256"])
+        if not blob.is_file():
+            return False
+        if os.path.samefile(path, blob):
+            return True
+        stat_result = path.stat()
+    except (OSError, ValueError):
+        return False
+    return (
+        stat_result.st_size == _coerce_int(entry.get("size"))
+        and stat_result.st_mtime_ns == _coerce_int(entry.get("mtime_ns"))
+    )
+
+
+def seal_version(workflow_folderpath: str, version_id: str) -> int:
+    """Store *version_id*'s artifact files as blobs and record them in its manifest.
+
+    Files the manifest already records (carried forward, or sealed by an earlier
+    publish) are checked with a `stat` and not read. Returns how many files had to
+    be hashed. Idempotent.
+    """
+    _validate_version_id(version_id)
+    vdir = version_dir(workflow_folderpath, version_id)
+    recorded = manifest_files(read_manifest(workflow_folderpath, version_id)) or {}
+
+    files: dict[str, dict] = {}
+    hashed = 0
+    for relative, path in _version_files(vdir):
+        entry = recorded.get(relative)
+        if entry is not None and _is_stored(workflow_folderpath, path, entry):
+            files[relative] = entry
+            continue
+        sha256 = _sha256_path(path)
+        hashed += 1
+        _ingest_blob(workflow_folderpath, path, sha256)
+        stat_result = path.stat()
+        files[relative] = {
+            "sha256": sha256,
+            "size": stat_result.st_size,
+            "mtime_ns": stat_result.st_mtime_ns,
+        }
+
+    if files != recorded:
+        manifest = read_manifest(workflow_folderpath, version_id)
+        manifest["files"] = files
+        _replace_manifest(vdir, manifest)
+    if hashed:
+        logger.info(f"Sealed artifact version {version_id}: stored {hashed} new file(s)")
+    return hashed
+
+
+def _version_ids_on_disk(workflow_folderpath: str) -> list[str]:
+    root = versions_root(workflow_folderpath)
+    if not root.is_dir():
+        return []
+    ids = []
+    for entry in sorted(root.iterdir()):
+        if not entry.is_dir() or entry.is_symlink() or entry.name.startswith("."):
+            continue
+        with contextlib.suppress(ValueError):
+            _validate_version_id(entry.name)
+            ids.append(entry.name)
+    return ids
+
+
+def blob_refcounts(workflow_folderpath: str) -> Counter:
+    """Count, per blob digest, how many file entries across all manifests name it."""
+    counts: Counter = Counter()
+    for version_id in _version_ids_on_disk(workflow_folderpath):
+        files = manifest_files(read_manifest(workflow_folderpath, version_id)) or {}
+        counts.update(entry["sha256"] for entry in files.values())
+    return counts
+
+
+def collect_unreferenced_blobs(workflow_folderpath: str) -> list[str]:
+    """Delete every blob no manifest references and return their digests.
+
+    A version whose files were linked to a blob but whose manifest was not written
+    yet keeps its bytes: removing a blob only drops one link, and the next seal of
+    that version stores the file again.
+    """
+    root = blobs_root(workflow_folderpath)
+    if not root.is_dir():
+        return []
+    refcounts = blob_refcounts(workflow_folderpath)
+    removed: list[str] = []
+    freed = 0
+    for shard in sorted(root.iterdir()):
+        if not shard.is_dir():
+            continue
+        for blob in sorted(shard.iterdir()):
+            if blob.name.startswith(".") or refcounts[blob.name] > 0:
+                continue
+            with contextlib.suppress(OSError):
+                size = blob.stat().st_size
+                blob.unlink()
+                removed.append(blob.name)
+                freed += size
+        with contextlib.suppress(OSError):
+            shard.rmdir()
+    if removed:
+        logger.info(
+            f"Removed {len(removed)} unreferenced artifact blob(s), {human_size(freed)}"
+        )
+    return removed
+
+
+def version_size_bytes(workflow_folderpath: str, version_id: str) -> int:
+    """Size of *version_id*: the sum of its manifest entries, or a walk if unsealed."""
+    files = manifest_files(read_manifest(workflow_folderpath, version_id))
+    if files is None:
+        return _dir_size_bytes(version_dir(workflow_folderpath, version_id))
+    return sum(_coerce_int(entry["size"]) for entry in files.values())
+
+
+def stored_size_bytes(workflow_folderpath: str) -> int:
+    """Bytes all versions occupy, counting each blob once (unsealed ones by a walk)."""
+    unique: dict[str, int] = {}
+    unsealed = 0
+    for version_id in _version_ids_on_disk(workflow_folderpath):
+        files = manifest_files(read_manifest(workflow_folderpath, version_id))
+        if files is None:
+            unsealed += _dir_size_bytes(version_dir(workflow_folderpath, version_id))
+            continue
+        for entry in files.values():
+            unique[entry["sha256"]] = _coerce_int(entry["size"])
+    return sum(unique.values()) + unsealed
+
+
 # ---------------------------------------------------------------------
 # current pointer
 # ---------------------------------------------------------------------
@@ -641,6 +929,8 @@ def publish_version(workflow_folderpath: str, version_id: str) -> None:
     earlier failure leaves `current.json` naming the old version. `prune_versions`
     protects the prepared reader targets during this pre-commit window.
 
+    The version is sealed into the blob store before anything is routed to it.
+
     Idempotent: safe to call repeatedly with the same version id.
 
     Raises `LegacyArtifactsPresentError` if a real, unversioned context directory
@@ -670,6 +960,7 @@ def publish_version(workflow_folderpath: str, version_id: str) -> None:
             f"migrate_legacy_to_version() first — they are not deleted implicitly."
         )
 
+    seal_version(workflow_folderpath, version_id)
     layout = "symlink" if _symlinks_supported(info) else "hardlink"
 
     for name in contexts:
@@ -716,13 +1007,8 @@ def list_versions(workflow_folderpath: str) -> list[VersionInfo]:
 
     current = resolve_current_version(workflow_folderpath)
     infos: list[VersionInfo] = []
-    for entry in sorted(root.iterdir()):
-        if not entry.is_dir() or entry.is_symlink() or entry.name.startswith("."):
-            continue
-        try:
-            _validate_version_id(entry.name)
-        except ValueError:
-            continue
+    for version_id in _version_ids_on_disk(workflow_folderpath):
+        entry = root / version_id
         manifest = read_manifest(workflow_folderpath, entry.name)
         contexts = manifest.get("contexts") or version_context_names(
             workflow_folderpath, entry.name
@@ -739,7 +1025,7 @@ def list_versions(workflow_folderpath: str) -> list[VersionInfo]:
                 created_at=str(created_at),
                 is_current=(entry.name == current),
                 contexts=[str(c) for c in contexts],
-                size_bytes=_dir_size_bytes(entry),
+                size_bytes=version_size_bytes(workflow_folderpath, entry.name),
                 seed=_coerce_int(manifest.get("seed")),
                 notes=manifest.get("notes"),
                 train_duration_seconds=(
@@ -768,6 +1054,8 @@ def prune_versions(
     an explicit request to delete it raises `ValueError`. Versions referenced by
     prepared compatibility entries or the convenience link are protected as well,
     preserving safety while publication has not yet flipped `current.json`.
+
+    Blobs left unreferenced by the removed versions are deleted with them.
     """
     if (keep is None) == (version_ids is None):
         raise ValueError(
@@ -815,6 +1103,8 @@ def prune_versions(
             continue
         removed.append(vid)
         logger.info(f"Pruned artifact version {vid} ({target})")
+    if removed:
+        collect_unreferenced_blobs(workflow_folderpath)
     return removed
 
 
@@ -963,7 +1253,9 @@ def carry_forward_context(
 
     Hardlinks each file where the filesystem allows it, so carrying a context
     forward costs inodes rather than the 276 MB a copy would, and falls back to a
-    per-file copy otherwise. Returns False when the source context is absent.
+    per-file copy otherwise. A sealed source is linked from the blobs its manifest
+    names, and those entries are recorded for *to_version*, so sealing it later does
+    not re-read a single carried byte. Returns False when the source context is absent.
 
     Idempotent: a destination that already has content is left untouched and True is
     returned, so a resumed training run does not re-link work it already did.
@@ -988,6 +1280,8 @@ def carry_forward_context(
         return True
 
     destination.parent.mkdir(parents=True, exist_ok=True)
+    if _carry_forward_blobs(workflow_folderpath, from_version, to_version, folder):
+        return True
     if USE_HARDLINKS_FOR_CARRY_FORWARD:
         _link_tree(source, destination)
     else:
@@ -995,6 +1289,37 @@ def carry_forward_context(
     return True
 
 
+def _carry_forward_blobs(
+    workflow_folderpath: str, from_version: str, to_version: str, folder: str
+) -> bool:
+    """Materialise *folder* in *to_version* from *from_version*'s manifest entries.
+
+    Returns False, having written nothing, when the source is unsealed or any blob
+    it names is missing; the caller then links the source tree instead.
+    """
+    files = manifest_files(read_manifest(workflow_folderpath, from_version)) or {}
+    prefix = f"{folder}/"
+    entries = {rel: entry for rel, entry in files.items() if rel.startswith(prefix)}
+    if not entries:
+        return False
+    try:
+        blobs = {rel: blob_path(workflow_folderpath, e["sha256"]) for rel, e in entries.items()}
+    except ValueError:
+        return False
+    if not all(blob.is_file() for blob in blobs.values()):
+        return False
+
+    destination_root = version_dir(workflow_folderpath, to_version)
+    carried: dict[str, dict] = {}
+    for relative, blob in blobs.items():
+        destination = destination_root / relative
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        _link_or_copy(blob, destination)
+        carried[relative] = entries[relative]
+    _update_manifest_files(workflow_folderpath, to_version, carried)
+    return True
+
+
 # ---------------------------------------------------------------------
 # Human-facing formatting (R4: make the cost obvious)
 # ---------------------------------------------------------------------
@@ -1085,7 +1410,8 @@ def format_versions_table(workflow_folderpath: str) -> str:
 
     lines.append("")
     lines.append(
-        f"  * = current  |  {len(infos)} version(s), {human_size(total)} total"
+        f"  * = current  |  {len(infos)} version(s), {human_size(total)} total, "
+        f"{human_size(stored_size_bytes(workflow_folderpath))} stored"
     )
     lines.append(
         "  These artifacts cost hours of LLM and model-training time to rebuild and "
@@ -1108,11 +1434,11 @@ def describe_version(workflow_folderpath: str, version_id: str) -> str:
     lines = [
         f"version    : {version_id}{'  (current)' if version_id == current else ''}",
         f"path       : {vdir}",
-        f"size       : {human_size(_dir_size_bytes(vdir))}",
+        f"size       : {human_size(version_size_bytes(workflow_folderpath, version_id))}",
         f"contexts   : {len(contexts)}",
     ]
     for key in sorted(manifest):
-        if key in {"version_id", "contexts"}:
+        if key in {"version_id", "contexts", "files"}:
             continue
         lines.append(f"{key:11s}: {manifest[key]}")
     lines.append("")
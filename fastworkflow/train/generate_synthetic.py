@@ -1,6 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, List, Optional
 import random
 import re
+import threading
 import time
 
 import fastworkflow
@@ -43,6 +45,7 @@ except ImportError:
 
 DEFAULT_MAX_RETRIES = 5
 DEFAULT_RETRY_BASE_SECONDS = 2.0
+DEFAULT_MAX_CONCURRENT_REQUESTS = 1
 
 # Transient failures worth retrying. Deliberately enumerated rather than catching
 # litellm.exceptions.APIError, which is the base class of AuthenticationError and
@@ -111,6 +114,88 @@ def call_with_retries(
     raise last_exception
 
 
+class GenerationRateLimiter:
+    """Process-wide bound on synthetic-generation LLM requests.
+
+    At most *max_concurrent* requests are in flight at once, however many commands
+    and persona batches are generating. With *requests_per_minute* > 0 a token bucket
+    of *max_concurrent* tokens, refilled at that rate, additionally spaces out request
+    starts. Each retry attempt takes its own token; the backoff sleep between attempts
+    holds neither a token nor a concurrency slot.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        requests_per_minute: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.requests_per_minute = max(0.0, float(requests_per_minute))
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.max_concurrent)
+        self._refilled_at = clock()
+
+    def _take_token(self) -> None:
+        if self.requests_per_minute <= 0:
+            return
+        rate = self.requests_per_minute / 60.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(
+                    float(self.max_concurrent),
+                    self._tokens + (now - self._refilled_at) * rate,
+                )
+                self._refilled_at = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / rate
+            self._sleep(wait)
+
+    def call(self, operation: Callable):
+        """Run *operation* once a token and a concurrency slot are available."""
+        self._take_token()
+        with self._slots:
+            return operation()
+
+
+_limiter_lock = threading.Lock()
+_generation_limiter: Optional[GenerationRateLimiter] = None
+
+
+def get_generation_limiter() -> GenerationRateLimiter:
+    """Return the process-wide limiter, built from the environment on first use.
+
+    ``SYNTHETIC_UTTERANCE_GEN_MAX_CONCURRENCY`` bounds requests in flight (default 1,
+    i.e. one request at a time, as before); ``SYNTHETIC_UTTERANCE_GEN_REQUESTS_PER_MINUTE``
+    caps their rate (default 0, unlimited).
+    """
+    global _generation_limiter
+    with _limiter_lock:
+        if _generation_limiter is None:
+            _generation_limiter = GenerationRateLimiter(
+                max_concurrent=fastworkflow.get_env_var(
+                    "SYNTHETIC_UTTERANCE_GEN_MAX_CONCURRENCY", int,
+                    default=DEFAULT_MAX_CONCURRENT_REQUESTS),
+                requests_per_minute=fastworkflow.get_env_var(
+                    "SYNTHETIC_UTTERANCE_GEN_REQUESTS_PER_MINUTE", float, default=0.0),
+            )
+        return _generation_limiter
+
+
+def set_generation_limiter(limiter: Optional[GenerationRateLimiter]) -> None:
+    """Install *limiter*, or None to rebuild it from the environment on next use."""
+    global _generation_limiter
+    with _limiter_lock:
+        _generation_limiter = limiter
+
+
 def select_persona_indices(
     dataset_size: int,
     num_personas: int,
@@ -323,10 +408,8 @@ def generate_utterances_for_personas(
     utterance_patterns = sorted(keywords)
     utterance_string = "\n".join(seed_utterances)
 
-    # Jitter source for retries, derived so backoff never touches global RNG state.
-    retry_rng = random.Random(derived_seed(seed, str(command_name), "retry-jitter"))
-
-    # Process personas in batches
+    # Every batch's prompt is built up front so the requests can be in flight together.
+    batches = []
     for batch_start in range(0, len(selected_personas), personas_per_batch):
         batch_end = min(batch_start + personas_per_batch, len(selected_personas))
         batch_personas = selected_personas[batch_start:batch_end]
@@ -383,17 +466,34 @@ def generate_utterances_for_personas(
                 "content": f"Generate {utterances_per_persona} natural utterances for each persona listed above."
             }
         ]
-
+        batches.append((batch_start, batch_end, batch_persona_ids, batch_name_to_id, messages))
+
+    limiter = get_generation_limiter()
+    # Index of the first batch that exhausted its retries. Later batches that have not
+    # started yet are skipped, as the sequential loop would never have sent them.
+    first_failed = len(batches)
+    failure_lock = threading.Lock()
+
+    def request_batch(index: int):
+        nonlocal first_failed
+        batch_start, batch_end, _, _, messages = batches[index]
+        with failure_lock:
+            if index > first_failed:
+                return None
+        # Jitter source for retries, derived per batch so backoff never touches global
+        # RNG state and does not depend on which batch happened to retry first.
+        retry_rng = random.Random(derived_seed(
+            seed, str(command_name), "retry-jitter", str(batch_start)))
         try:
-            response = call_with_retries(
-                lambda: completion_fn(
+            return call_with_retries(
+                lambda: limiter.call(lambda: completion_fn(
                     model=model,  # Corrected model name
                     messages=messages,
                     max_tokens=1000,
                     temperature=1.0,
                     top_p=0.9,
                     stop=["<|end_of_text|>"]
-                ),
+                )),
                 description=(
                     f"Utterance generation for '{command_name}' "
                     f"(personas {batch_start + 1}-{batch_end})"
@@ -402,49 +502,66 @@ def generate_utterances_for_personas(
                 base_delay=_retry_base_seconds,
                 rng=retry_rng,
             )
-        except RETRYABLE_LLM_EXCEPTIONS as exc:
-            # Partial-batch policy: keep everything the earlier batches produced and
-            # abandon the remaining ones. The retry budget has already spent tens of
-            # seconds against a limit that is account-wide and time-windowed, so the
-            # next batch is overwhelmingly likely to fail the same way; continuing
-            # multiplies wall clock for near-zero expected yield. What matters is
-            # that the command still contributes rows - its label enters the
-            # classifier either way, which is precisely what returning [] destroyed.
-            provenance.fell_back = True
-            provenance.fallback_reason = (
-                f"{type(exc).__name__} after {_max_retries} retries on personas "
-                f"{batch_start + 1}-{batch_end} of {len(selected_personas)}; "
-                f"remaining batches abandoned"
-            )
-            break
-
-        # Process responses
-        content = response.choices[0].message.content.strip()
-
-        # Split by persona sections
-        sections = content.split('[')
-        for section in sections[1:]:  # Skip first empty section
+        except RETRYABLE_LLM_EXCEPTIONS:
+            with failure_lock:
+                first_failed = min(first_failed, index)
+            raise
+
+    # Responses are consumed in batch order whatever order they arrive in, so the
+    # utterance list and persona attribution match the sequential loop exactly.
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(limiter.max_concurrent, len(batches)))
+    ) as executor:
+        futures = [executor.submit(request_batch, index) for index in range(len(batches))]
+        for index, future in enumerate(futures):
+            batch_start, batch_end, batch_persona_ids, batch_name_to_id, _ = batches[index]
             try:
-                # Extract persona name and utterances
-                persona_name = section.split(']')[0].strip()
-                utterances = section.split(']')[1].strip().split('\n')
-
-                # Clean up utterances
-                utterances = [u.strip() for u in utterances if u.strip()]
-                utterances = [u for u in utterances if len(u) > 3 and not u.startswith('[')]
-                utterances = [u for u in utterances if not _is_template_echo(u)]
-
-                persona_id = _resolve_persona_id(
-                    persona_name, batch_name_to_id, batch_persona_ids)
-                for resp in utterances:
-                    _attribute_utterance(
-                        provenance.utterance_personas, resp, persona_id)
-
-                all_generated_responses.extend([
-                    {"utterance": resp, "persona": persona_name} for resp in utterances
-                ])
-            except IndexError:
-                continue
+                response = future.result()
+            except RETRYABLE_LLM_EXCEPTIONS as exc:
+                # Partial-batch policy: keep everything the earlier batches produced and
+                # abandon the remaining ones. The retry budget has already spent tens of
+                # seconds against a limit that is account-wide and time-windowed, so the
+                # next batch is overwhelmingly likely to fail the same way; continuing
+                # multiplies wall clock for near-zero expected yield. What matters is
+                # that the command still contributes rows - its label enters the
+                # classifier either way, which is precisely what returning [] destroyed.
+                provenance.fell_back = True
+                provenance.fallback_reason = (
+                    f"{type(exc).__name__} after {_max_retries} retries on personas "
+                    f"{batch_start + 1}-{batch_end} of {len(selected_personas)}; "
+                    f"remaining batches abandoned"
+                )
+                for pending in futures[index + 1:]:
+                    pending.cancel()
+                break
+
+            # Process responses
+            content = response.choices[0].message.content.strip()
+
+            # Split by persona sections
+            sections = content.split('[')
+            for section in sections[1:]:  # Skip first empty section
+                try:
+                    # Extract persona name and utterances
+                    persona_name = section.split(']')[0].strip()
+                    utterances = section.split(']')[1].strip().split('\n')
+
+                    # Clean up utterances
+                    utterances = [u.strip() for u in utterances if u.strip()]
+                    utterances = [u for u in utterances if len(u) > 3 and not u.startswith('[')]
+                    utterances = [u for u in utterances if not _is_template_echo(u)]
+
+                    persona_id = _resolve_persona_id(
+                        persona_name, batch_name_to_id, batch_persona_ids)
+                    for resp in utterances:
+                        _attribute_utterance(
+                            provenance.utterance_personas, resp, persona_id)
+
+                    all_generated_responses.extend([
+                        {"utterance": resp, "persona": persona_name} for resp in utterances
+                    ])
+                except IndexError:
+                    continue
 
     # Structure the output
     result = {
@@ -0,0 +1,253 @@
+"""Export the intent classifiers to ONNX, check parity and benchmark backends.
+
+Training writes each classifier as a transformers checkpoint directory
+(``tinymodel.pth`` / ``largemodel.pth``).  When ``INTENT_DETECTION_ONNX_EXPORT``
+is true the trainer also calls :func:`export_classifier` on both, which
+writes ``model.onnx`` into the same directory -- and, when
+``INTENT_DETECTION_ONNX_QUANTIZE`` is true, an int8 dynamically quantized
+``model.int8.onnx`` next to it.  Because the graphs live inside the model
+directories they are versioned, carried forward and published exactly like
+the weights they were exported from.
+
+The graph takes the tokenizer's inputs with dynamic batch and sequence axes
+and returns both the logits and the final-layer [CLS] embedding, so the
+clarification cache can embed through the same session.  See
+``fastworkflow.intent_backends`` for the runtime side.
+
+Comparing backends on an already trained context::
+
+    python -m fastworkflow.train.onnx_export <workflow>/___command_info/<context> \\
+        --export --quantize --benchmark <workflow>/intent_benchmark.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from typing import Iterable, Optional
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from fastworkflow.intent_backends import (
+    ONNX_BACKEND,
+    ONNX_INT8_BACKEND,
+    ONNX_INT8_MODEL_FILENAME,
+    ONNX_MODEL_FILENAME,
+    ONNX_OUTPUT_NAMES,
+    TORCH_BACKEND,
+)
+from fastworkflow.utils.logging import logger
+
+_OPSET_VERSION = 17
+_SAMPLE_TEXTS = ["list commands", "what can you do for me today"]
+
+
+class _ExportWrapper(torch.nn.Module):
+    """Positional-argument front for tracing; returns (logits, [CLS] embedding)."""
+
+    def __init__(self, model, input_names: list[str]):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        outputs = self.model(
+            **dict(zip(self.input_names, inputs)), output_hidden_states=True)
+        return outputs.logits, outputs.hidden_states[-1][:, 0, :]
+
+
+def export_classifier(model_dir: str, quantize: bool = False) -> list[str]:
+    """Write ``model.onnx`` (and optionally ``model.int8.onnx``) into *model_dir*.
+
+    Returns the paths written.
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir).to("cpu")
+    model.eval()
+
+    sample = tokenizer(_SAMPLE_TEXTS, padding=True, return_tensors="pt")
+    input_names = [name for name in tokenizer.model_input_names if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes.update({name: {0: "batch"} for name in ONNX_OUTPUT_NAMES})
+
+    onnx_path = os.path.join(model_dir, ONNX_MODEL_FILENAME)
+    with torch.no_grad():
+        torch.onnx.export(
+            _ExportWrapper(model, input_names),
+            tuple(sample[name] for name in input_names),
+            onnx_path,
+            input_names=input_names,
+            output_names=list(ONNX_OUTPUT_NAMES),
+            dynamic_axes=dynamic_axes,
+            opset_version=_OPSET_VERSION,
+            dynamo=False,
+        )
+    written = [onnx_path]
+
+    if quantize:
+        try:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+        except ImportError as e:
+            raise ImportError(
+                "The onnxruntime package is required to quantize the intent-detection models. "
+                "Install it with: pip install onnxruntime"
+            ) from e
+        int8_path = os.path.join(model_dir, ONNX_INT8_MODEL_FILENAME)
+        quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8)
+        written.append(int8_path)
+
+    return written
+
+
+def compare_backends(
+    tiny_model_path: str,
+    distil_model_path: str,
+    utterances: Iterable[str],
+    confidence_threshold: float,
+    backend: str = ONNX_BACKEND,
+) -> list[str]:
+    """Classify *utterances* with torch and *backend*; describe every top-k disagreement.
+
+    An empty list means the two backends produced identical top-k label indices.
+    """
+    from fastworkflow.model_pipeline_training import ModelPipeline
+
+    utterances = list(utterances)
+    if not utterances:
+        return []
+    results = {}
+    for name in (TORCH_BACKEND, backend):
+        pipeline = ModelPipeline(
+            tiny_model_path=tiny_model_path,
+            distil_model_path=distil_model_path,
+            confidence_threshold=confidence_threshold,
+            device="cpu",
+            backend=name,
+        )
+        results[name] = pipeline.predict_batch(utterances)["top_k_predictions"]
+
+    return [
+        f"{utterance!r}: torch {expected} != {backend} {actual}"
+        for utterance, expected, actual in zip(
+            utterances, results[TORCH_BACKEND], results[backend])
+        if expected != actual
+    ]
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process (peak RSS when psutil is unavailable)."""
+    try:
+        import psutil
+    except ImportError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return psutil.Process().memory_info().rss
+
+
+def benchmark_backends(
+    tiny_model_path: str,
+    distil_model_path: str,
+    utterances: list[str],
+    confidence_threshold: float,
+    backends: Iterable[str] = (TORCH_BACKEND, ONNX_BACKEND, ONNX_INT8_BACKEND),
+    repeats: int = 3,
+) -> dict[str, dict[str, float]]:
+    """Per-utterance latency and RSS growth of each backend, loaded one after another.
+
+    RSS deltas are measured in this process, so the first backend also pays for
+    any library it imports; run the CLI once per backend for isolated numbers.
+    """
+    from fastworkflow.model_pipeline_training import ModelPipeline
+
+    report: dict[str, dict[str, float]] = {}
+    for backend in backends:
+        rss_before = _rss_bytes()
+        pipeline = ModelPipeline(
+            tiny_model_path=tiny_model_path,
+            distil_model_path=distil_model_path,
+            confidence_threshold=confidence_threshold,
+            device="cpu",
+            backend=backend,
+        )
+        rss_loaded = _rss_bytes()
+        pipeline.predict_batch(utterances[:1])  # warm-up
+
+        latencies = []
+        for _ in range(repeats):
+            for utterance in utterances:
+                started = time.perf_counter()
+                pipeline.predict_batch([utterance])
+                latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        report[backend] = {
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+            "load_rss_mb": (rss_loaded - rss_before) / 2**20,
+            "rss_mb": (_rss_bytes() - rss_before) / 2**20,
+        }
+    return report
+
+
+def _benchmark_utterances(benchmark_path: Optional[str], context_folder: str) -> list[str]:
+    if not benchmark_path:
+        return list(_SAMPLE_TEXTS)
+    from fastworkflow.model_pipeline_training import GLOBAL_CONTEXT_FOLDER
+    from fastworkflow.train import heldout_evaluation
+
+    context = os.path.basename(os.path.normpath(context_folder))
+    if context == GLOBAL_CONTEXT_FOLDER:
+        context = "*"
+    cases = heldout_evaluation.load_benchmark_file(benchmark_path)
+    return [case.utterance for case in cases if case.context == context] or list(_SAMPLE_TEXTS)
+
+
+if __name__ == "__main__":
+    import json
+
+    parser = argparse.ArgumentParser(
+        description="Export a trained context's intent classifiers to ONNX and compare backends")
+    parser.add_argument("context_folder", help="Model artifacts folder of one context")
+    parser.add_argument("--export", action="store_true", help="(Re-)export model.onnx first")
+    parser.add_argument("--quantize", action="store_true", help="Also write model.int8.onnx")
+    parser.add_argument("--benchmark", metavar="BENCHMARK_JSON", nargs="?", const="",
+                        help="Report latency/RSS per backend, using this benchmark's utterances")
+    parser.add_argument("--backends", default=",".join(
+        (TORCH_BACKEND, ONNX_BACKEND, ONNX_INT8_BACKEND)))
+    args = parser.parse_args()
+
+    tiny_path = os.path.join(args.context_folder, "tinymodel.pth")
+    large_path = os.path.join(args.context_folder, "largemodel.pth")
+    with open(os.path.join(args.context_folder, "threshold.json")) as f:
+        threshold = json.load(f)["confidence_threshold"]
+
+    if args.export:
+        for model_dir in (tiny_path, large_path):
+            for path in export_classifier(model_dir, quantize=args.quantize):
+                print(f"Wrote {path}")
+
+    utterances = _benchmark_utterances(args.benchmark, args.context_folder)
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    # Benchmark first: ModelPipeline caches instances, so loading a backend for the
+    # parity check beforehand would hide its RSS cost.
+    if args.benchmark is not None:
+        report = benchmark_backends(tiny_path, large_path, utterances, threshold, backends)
+        baseline = report.get(TORCH_BACKEND)
+        for backend, row in report.items():
+            line = (f"{backend:>10}: p50 {row['p50_ms']:.2f} ms, p95 {row['p95_ms']:.2f} ms, "
+                    f"+{row['load_rss_mb']:.1f} MB RSS to load")
+            if baseline and backend != TORCH_BACKEND:
+                line += f" (p50 {row['p50_ms'] - baseline['p50_ms']:+.2f} ms vs torch)"
+            print(line)
+
+    for backend in backends:
+        if backend == TORCH_BACKEND:
+            continue
+        mismatches = compare_backends(tiny_path, large_path, utterances, threshold, backend)
+        print(f"{backend}: {len(utterances) - len(mismatches)}/{len(utterances)} "
+              "utterances with identical top-k labels")
+        for mismatch in mismatches:
+            logger.warning(mismatch)
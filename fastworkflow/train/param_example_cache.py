@@ -279,6 +279,7 @@ class ParamExampleCache:
         self.workflow_folderpath = workflow_folderpath
         self.mode = normalize_mode(mode) if mode is not None else resolve_cache_mode()
         self._lock = threading.Lock()
+        self._counters_lock = threading.Lock()
         self._counters: dict[str, int] = {
             "hit": 0,
             "miss": 0,
@@ -372,6 +373,20 @@ class ParamExampleCache:
         self._bump("hit")
         return entry
 
+    def contains(self, fingerprint: Fingerprint, seed: int) -> bool:
+        """Whether `lookup` would hit, without counting a hit or a miss.
+
+        Lets the trainer sort commands into cached and to-generate before any LLM call;
+        the `lookup` that `generate_dspy_examples` then makes is the one that counts.
+        """
+        if not self.reads_enabled:
+            return False
+        cached = self._read_file(fingerprint)
+        if cached is None:
+            return False
+        entry = cached.entries.get(str(int(seed)))
+        return entry is not None and entry.is_usable()
+
     # -- writing -------------------------------------------------------
 
     def store(
@@ -446,12 +461,14 @@ class ParamExampleCache:
     # -- reporting -----------------------------------------------------
 
     def _bump(self, counter: str) -> None:
-        self._counters[counter] = self._counters.get(counter, 0) + 1
+        with self._counters_lock:
+            self._counters[counter] = self._counters.get(counter, 0) + 1
 
     @property
     def stats(self) -> dict[str, int]:
         """Counts of hits, misses, stores and failures for this run."""
-        return dict(self._counters)
+        with self._counters_lock:
+            return dict(self._counters)
 
     def format_summary(self) -> str:
         """One line for the end of a training run.
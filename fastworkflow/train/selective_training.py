@@ -77,6 +77,7 @@ import hashlib
 import importlib.util
 import json
 import os
+import time
 import uuid
 from pathlib import Path
 from typing import Iterable, Optional
@@ -93,6 +94,17 @@ from fastworkflow.utils.logging import logger
 
 FINGERPRINT_FILENAME = "command_fingerprints.json"
 
+# Persistent source-file digests, keyed on stat identity, so an unchanged file is not
+# re-read every time training starts. Lives beside the fingerprints and, like them, is
+# a plain top-level file that nothing prunes. See `SourceDigestCache`.
+SOURCE_DIGEST_CACHE_FILENAME = "source_digests.json"
+SOURCE_DIGEST_CACHE_VERSION = 1
+
+# A file whose mtime is this close to the moment it was hashed can still be rewritten
+# within the same filesystem timestamp tick, keeping size, mtime and inode identical.
+# Such "racy" digests are used for this run but never persisted.
+_RACY_MTIME_WINDOW_NS = 2_000_000_000
+
 # Written into each artifact version; read from the CURRENT version to obtain the
 # baseline the next automatic incremental run diffs against.
 SIGNATURE_FILENAME = "training_signature.json"
@@ -218,6 +230,7 @@ class TrainingSignature(BaseModel):
     trainer_source_digest: Optional[str] = None
     class_balance_source_digest: Optional[str] = None
     parameter_value_placeholders_sha256: Optional[str] = None
+    shared_backbone: bool = False
     command_fingerprints: dict[str, CommandFingerprint] = {}
     contexts: dict[str, ContextSignature] = {}
 
@@ -235,6 +248,7 @@ class TrainingSignature(BaseModel):
             "class_balance_source_digest": self.class_balance_source_digest,
             "parameter_value_placeholders_sha256":
                 self.parameter_value_placeholders_sha256,
+            "shared_backbone": self.shared_backbone,
         }
 
 
@@ -265,6 +279,113 @@ def _sha256_file(path: str) -> Optional[str]:
         return None
 
 
+class SourceDigestCache:
+    """sha256 digests of source files, reused while a file's stat identity is unchanged.
+
+    An entry is keyed on ``(path, size, mtime_ns, inode)`` and only reused when all
+    four match the file as it is now; anything else -- an edit, a truncation, an
+    atomic rename-over, a restored backup with a different inode -- re-hashes it. A
+    missing, unreadable or corrupt cache file is an empty cache, so losing it costs
+    one cold run and never a wrong fingerprint.
+
+    Two cases are not trusted even when the key matches, and both fall back to
+    hashing (the safe direction, as everywhere in this module):
+
+    * the file changed while it was being read (its stat differs before and after),
+    * the file was modified within ``_RACY_MTIME_WINDOW_NS`` of being hashed, so a
+      second write in the same timestamp tick would be invisible to the key.
+
+    ``save`` keeps only the entries looked up since ``load``, so digests of deleted or
+    renamed sources do not accumulate.
+    """
+
+    def __init__(self, path: Optional[str], entries: Optional[dict[str, dict]] = None):
+        self.path = path
+        self._stored = entries or {}
+        self._seen: dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, workflow_folderpath: str) -> "SourceDigestCache":
+        path = os.path.join(
+            CommandDirectory.get_commandinfo_folderpath(workflow_folderpath),
+            SOURCE_DIGEST_CACHE_FILENAME,
+        )
+        try:
+            payload = json.loads(Path(path).read_text())
+        except (OSError, ValueError):
+            return cls(path)
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != SOURCE_DIGEST_CACHE_VERSION
+            or not isinstance(payload.get("entries"), dict)
+        ):
+            return cls(path)
+        return cls(path, payload["entries"])
+
+    @staticmethod
+    def _stat_key(stat_result: os.stat_result) -> dict:
+        return {
+            "size": stat_result.st_size,
+            "mtime_ns": stat_result.st_mtime_ns,
+            "inode": stat_result.st_ino,
+        }
+
+    def digest(self, source_path: str) -> Optional[str]:
+        """The sha256 of *source_path*, or None when it cannot be read."""
+        key_path = os.path.abspath(source_path)
+        try:
+            stat_key = self._stat_key(os.stat(key_path))
+        except OSError:
+            return None
+
+        entry = self._seen.get(key_path) or self._stored.get(key_path)
+        if (
+            isinstance(entry, dict)
+            and isinstance(entry.get("sha256"), str)
+            and all(entry.get(field) == value for field, value in stat_key.items())
+        ):
+            self.hits += 1
+            self._seen[key_path] = entry
+            return entry["sha256"]
+
+        self.misses += 1
+        sha = _sha256_file(key_path)
+        if sha is None:
+            return None
+        try:
+            stat_after = os.stat(key_path)
+        except OSError:
+            return sha
+        if (
+            self._stat_key(stat_after) == stat_key
+            and time.time_ns() - stat_after.st_mtime_ns > _RACY_MTIME_WINDOW_NS
+        ):
+            self._seen[key_path] = {**stat_key, "sha256": sha}
+        return sha
+
+    def save(self) -> None:
+        """Persist the entries looked up since ``load``; failures only lose the cache."""
+        if self.path is None or self._seen == self._stored:
+            return
+        path = Path(self.path)
+        temporary_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        payload = {
+            "version": SOURCE_DIGEST_CACHE_VERSION,
+            "entries": dict(sorted(self._seen.items())),
+        }
+        try:
+            temporary_path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+            os.replace(temporary_path, path)
+        except OSError as exc:
+            with contextlib.suppress(OSError):
+                temporary_path.unlink(missing_ok=True)
+            logger.warning(f"Could not write the source digest cache {path} ({exc})")
+            return
+        self._stored = dict(self._seen)
+
+
 def _sha256_strings(values: Iterable[str]) -> str:
     # Sorted so that a reordering of the seed list is not reported as a change:
     # the trainer consumes the seeds as a set-like collection.
@@ -338,9 +459,13 @@ def compute_command_fingerprints(workflow_folderpath: str) -> dict[str, CommandF
     and two runs that both left a command un-hydrated would agree, so an edited
     command would be reported unchanged. Hydration order is not a property anything
     else guarantees, so this cannot be left to luck.
+
+    Source files are digested through ``SourceDigestCache``, so a run in which nothing
+    changed stats every source but reads none of them.
     """
     crd = fastworkflow.RoutingRegistry.get_definition(workflow_folderpath)
     cmd_dir = crd.command_directory
+    digests = SourceDigestCache.load(workflow_folderpath)
 
     fingerprints: dict[str, CommandFingerprint] = {}
     for command_name in cmd_dir.get_commands():
@@ -379,7 +504,7 @@ def compute_command_fingerprints(workflow_folderpath: str) -> dict[str, CommandF
                 command_name, "command metadata declares no source path")
             continue
 
-        source_sha = _sha256_file(source_path)
+        source_sha = digests.digest(source_path)
         if source_sha is None:
             # The file is named but unreadable. Treating that as "no change" would be
             # the unsafe direction, so it is an unresolved fingerprint instead.
@@ -394,6 +519,7 @@ def compute_command_fingerprints(workflow_folderpath: str) -> dict[str, CommandF
             seed_utterances_sha256=seed_hash,
         )
 
+    digests.save()
     return fingerprints
 
 
@@ -672,6 +798,7 @@ def compute_training_signature(
         # context's training data without touching a single workflow file.
         parameter_value_placeholders_sha256=_sha256_strings(
             PARAMETER_VALUE_PLACEHOLDERS),
+        shared_backbone=shared_backbone_enabled(),
         command_fingerprints=compute_command_fingerprints(workflow_folderpath),
         contexts=compute_context_signatures(
             context_commands, context_ancestors, contexts),
@@ -679,6 +806,15 @@ def compute_training_signature(
     return signature, unresolved
 
 
+def shared_backbone_enabled() -> bool:
+    """Whether ``INTENT_DETECTION_SHARED_BACKBONE`` puts every context on one encoder."""
+    try:
+        return bool(fastworkflow.get_env_var(
+            "INTENT_DETECTION_SHARED_BACKBONE", bool, default=False))
+    except Exception:  # noqa: BLE001
+        return False
+
+
 def _global_int(getter) -> Optional[int]:
     try:
         return int(getter())
@@ -889,6 +1025,15 @@ def compute_training_plan(
             f"{_MODE_REUSE!r} can carry a context forward safely)")
         return plan, current_signature
 
+    # Every head is fitted on the backbone retrained in this run, so a head carried
+    # forward would sit on an encoder it was never trained against.
+    if current_signature.shared_backbone:
+        plan = _full_retrain(
+            candidates,
+            "full retrain (INTENT_DETECTION_SHARED_BACKBONE retrains the encoder "
+            "every context shares)")
+        return plan, current_signature
+
     if global_differences := _diff_global_inputs(
         previous_signature, current_signature
     ):
@@ -261,4 +261,6 @@ class TurnResult(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     suspended_ms: int = 0
+    # Wall time per agent-turn stage (see turn_setup.STAGES); empty otherwise.
+    stage_timings_ms: dict[str, int] = {}
     metadata: dict[str, Any] = {}
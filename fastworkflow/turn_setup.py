@@ -0,0 +1,101 @@
+"""Overlapped setup of agent turns, and per-stage turn timings.
+
+Before the ReAct loop of an agent turn can start it needs the planner's next
+steps -- refining the user message and planning are two LLM calls, one after the
+other -- and the rendered catalog of commands available in the current context.
+The catalog depends on neither LLM call, so it is rendered on a worker thread
+while they run, and the agent starts as soon as the planner returns. A catalog
+still waiting for a worker when the planner returns is rendered inline instead.
+
+The wall time of every stage of a turn (``STAGES``) is added to the turn's
+``TurnResult.stage_timings_ms`` and observed in the
+``fastworkflow_agent_turn_stage_seconds`` histogram. The catalog runs alongside
+refine and plan, so the stages of a turn can add up to more than its duration.
+
+Configured per process:
+
+* ``TURN_SETUP_WORKERS`` -- worker threads shared by all sessions (default 4).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, Optional, TypeVar
+
+import fastworkflow
+from fastworkflow.utils.metrics import metrics
+
+DEFAULT_WORKERS = 4
+
+STAGES = ("refine", "plan", "catalog", "agent", "summarize")
+
+_STAGE_SECONDS = {
+    stage: metrics.histogram(
+        "fastworkflow_agent_turn_stage_seconds",
+        "Wall time of each stage of an agent turn",
+        buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+        labels={"stage": stage},
+    )
+    for stage in STAGES
+}
+
+T = TypeVar("T")
+
+
+@contextlib.contextmanager
+def timed_stage(timings: dict[str, int], stage: str) -> Iterator[None]:
+    """Add the wall time of the block to ``timings[stage]`` (milliseconds).
+
+    Times accumulate, so a stage that runs again later in the same logical turn
+    (the agent, resumed after ask_user) reports its total.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        timings[stage] = timings.get(stage, 0) + int(elapsed * 1000)
+        _STAGE_SECONDS[stage].observe(elapsed)
+
+
+class StagedCall:
+    """A timed stage started on a turn-setup worker; ``result()`` joins it."""
+
+    def __init__(self, timings: dict[str, int], stage: str, fn: Callable[[], T]) -> None:
+        # Run in a copy of the caller's context so the worker sees the session's
+        # active workflow (a ContextVar).
+        context = contextvars.copy_context()
+        self._run = lambda: context.run(self._timed, timings, stage, fn)
+        self._future: Future = get_executor().submit(self._run)
+
+    @staticmethod
+    def _timed(timings: dict[str, int], stage: str, fn: Callable[[], T]) -> T:
+        with timed_stage(timings, stage):
+            return fn()
+
+    def result(self) -> T:
+        """Return the stage's result, running it here if no worker has picked it up."""
+        if self._future.cancel():
+            return self._run()
+        return self._future.result()
+
+
+_executor_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide turn-setup pool, built from the environment on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, fastworkflow.get_env_var(
+                    "TURN_SETUP_WORKERS", int, default=DEFAULT_WORKERS)),
+                thread_name_prefix="fastworkflow-turn-setup",
+            )
+        return _executor
@@ -0,0 +1,173 @@
+"""Minimal in-process metrics: counters, gauges and histograms.
+
+fastWorkflow has no hard dependency on a metrics client, so the runtime
+records into this tiny registry and renders it in the Prometheus text
+exposition format on demand.  Metrics are declared where they are used and
+the registry hands back the same object for the same name and labels, so a
+module can declare its metrics at import time:
+
+    _BATCH_SIZE = metrics.histogram(
+        "fastworkflow_intent_batch_size", "Utterances per batch", buckets=(1, 2, 4, 8))
+    _BATCH_SIZE.observe(3)
+
+All operations are thread-safe.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Optional, Sequence
+
+
+def _label_text(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return "{" + inner + "}"
+
+
+class Counter:
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Optional[dict[str, str]] = None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        return [(self.name, self.labels, self._value)]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+
+class Histogram:
+    """Cumulative bucketed distribution with a running count and sum."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float],
+        labels: Optional[dict[str, str]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts = [0] * len(self.buckets)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._count += 1
+            self._sum += value
+            for index, upper in enumerate(self.buckets):
+                if value <= upper:
+                    self._counts[index] += 1
+                    break
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def snapshot(self) -> dict:
+        """``{"count", "sum", "buckets": {upper_bound: cumulative_count}}``."""
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for upper, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[upper] = cumulative
+            return {"count": self._count, "sum": self._sum, "buckets": buckets}
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        snapshot = self.snapshot()
+        samples = []
+        for upper, cumulative in snapshot["buckets"].items():
+            le = "+Inf" if math.isinf(upper) else repr(float(upper))
+            samples.append((f"{self.name}_bucket", {**self.labels, "le": le}, cumulative))
+        samples.append((f"{self.name}_count", self.labels, snapshot["count"]))
+        samples.append((f"{self.name}_sum", self.labels, snapshot["sum"]))
+        return samples
+
+
+class MetricsRegistry:
+    """Get-or-create registry keyed by metric name and labels."""
+
+    def __init__(self):
+        self._metrics: dict[tuple[str, tuple], object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, labels, **kwargs):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = self._metrics[key] = cls(name, description, labels=labels, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, description: str, labels: Optional[dict[str, str]] = None) -> Counter:
+        return self._get_or_create(Counter, name, description, labels)
+
+    def gauge(self, name: str, description: str, labels: Optional[dict[str, str]] = None) -> Gauge:
+        return self._get_or_create(Gauge, name, description, labels)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float],
+        labels: Optional[dict[str, str]] = None,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, description, labels, buckets=buckets)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: (m.name, sorted(m.labels.items())))
+        lines: list[str] = []
+        described: set[str] = set()
+        for metric in metrics:
+            if metric.name not in described:
+                described.add(metric.name)
+                lines.append(f"# HELP {metric.name} {metric.description}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample_name, labels, value in metric.samples():
+                lines.append(f"{sample_name}{_label_text(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
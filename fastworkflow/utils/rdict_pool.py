@@ -0,0 +1,179 @@
+"""Process-wide pool of long-lived speedict ``Rdict`` handles.
+
+Opening an ``Rdict`` replays the RocksDB write-ahead log and takes the
+database's file lock; closing it flushes memtables and releases the lock.
+The NLU hot path used to pay that cycle several times per turn (suggested
+commands, the clarification cache, the ``enablecache`` decorator, the
+conversation store).  The pool keeps one handle per database path open and
+hands it to every caller in the process:
+
+    with rdict_pool.open(path) as db:
+        db["key"] = value
+
+Handles are reference counted.  A handle whose count drops to zero is not
+closed immediately; it is parked on an LRU list and reused by the next
+caller.  When more than ``RDICT_POOL_MAX_IDLE_HANDLES`` handles are idle the
+least recently used ones are closed.  Setting the limit to ``0`` restores
+the historical open/close-per-call behaviour, which is what a deployment
+needs when several *processes* share the same database folders (RocksDB only
+allows one process to hold a database open).
+
+All handles are flushed and closed at interpreter exit.  Open/close/reuse
+counts are available from :meth:`RdictPool.metrics`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from speedict import Rdict
+
+from fastworkflow.utils.logging import logger
+
+_DEFAULT_MAX_IDLE_HANDLES = 64
+
+
+@dataclass
+class _PooledHandle:
+    db: Rdict
+    refcount: int = 0
+
+
+class RdictPool:
+    """Thread-safe, reference-counted pool of ``Rdict`` handles keyed by path."""
+
+    def __init__(self, max_idle_handles: Optional[int] = None):
+        self._max_idle_handles = max_idle_handles
+        self._lock = threading.RLock()
+        self._handles: dict[str, _PooledHandle] = {}
+        # path -> None, least recently released first
+        self._idle: OrderedDict[str, None] = OrderedDict()
+        # path -> lock held while that path's Rdict is being opened
+        self._opening: dict[str, threading.Lock] = {}
+        self._opens = 0
+        self._closes = 0
+        self._reuses = 0
+
+    @property
+    def max_idle_handles(self) -> int:
+        """Idle-handle limit, resolved lazily so it honours ``fastworkflow.init`` env vars."""
+        if self._max_idle_handles is None:
+            import fastworkflow
+
+            self._max_idle_handles = fastworkflow.get_env_var(
+                "RDICT_POOL_MAX_IDLE_HANDLES", int, default=_DEFAULT_MAX_IDLE_HANDLES
+            )
+        return self._max_idle_handles
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def acquire(self, path: str) -> Rdict:
+        """Return an open handle for *path*; pair every call with :meth:`release`."""
+        key = self._key(path)
+        with self._lock:
+            if (db := self._checkout_locked(key)) is not None:
+                return db
+            opening = self._opening.setdefault(key, threading.Lock())
+
+        # Open outside the pool lock so a slow RocksDB open (WAL replay) only
+        # blocks callers of the same path; they wait on its opening lock.
+        with opening:
+            with self._lock:
+                if (db := self._checkout_locked(key)) is not None:
+                    return db
+            db = Rdict(key)
+            with self._lock:
+                self._handles[key] = _PooledHandle(db=db, refcount=1)
+                self._opening.pop(key, None)
+                self._opens += 1
+                return db
+
+    def _checkout_locked(self, key: str) -> Optional[Rdict]:
+        """Take a reference to an already open handle for *key*, if there is one."""
+        handle = self._handles.get(key)
+        if handle is None:
+            return None
+        self._reuses += 1
+        handle.refcount += 1
+        self._idle.pop(key, None)
+        return handle.db
+
+    def release(self, path: str) -> None:
+        """Drop one reference to *path*; idle handles beyond the limit are closed."""
+        key = self._key(path)
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                return
+            handle.refcount -= 1
+            if handle.refcount > 0:
+                return
+            self._idle[key] = None
+            while len(self._idle) > self.max_idle_handles:
+                lru_key, _ = self._idle.popitem(last=False)
+                self._close_locked(lru_key)
+
+    @contextmanager
+    def open(self, path: str) -> Iterator[Rdict]:
+        """Context manager form of :meth:`acquire` / :meth:`release`."""
+        db = self.acquire(path)
+        try:
+            yield db
+        finally:
+            self.release(path)
+
+    def close(self, path: str) -> bool:
+        """Close *path* now if nobody holds it, e.g. before deleting its folder.
+
+        Returns False when the handle is still in use and was left open.
+        """
+        key = self._key(path)
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                return True
+            if handle.refcount > 0:
+                return False
+            self._idle.pop(key, None)
+            self._close_locked(key)
+            return True
+
+    def close_all(self) -> None:
+        """Flush and close every handle. Called at interpreter exit."""
+        with self._lock:
+            for key in list(self._handles):
+                self._close_locked(key)
+            self._idle.clear()
+
+    def _close_locked(self, key: str) -> None:
+        handle = self._handles.pop(key, None)
+        if handle is None:
+            return
+        try:
+            handle.db.close()
+        except Exception as exc:  # noqa: BLE001 - a failed close must not strand the pool
+            logger.warning(f"Failed to close Rdict at {key}: {exc}")
+        self._closes += 1
+
+    def metrics(self) -> dict[str, int]:
+        """Counters for dashboards and tests."""
+        with self._lock:
+            return {
+                "opens": self._opens,
+                "closes": self._closes,
+                "reuses": self._reuses,
+                "open_handles": len(self._handles),
+                "idle_handles": len(self._idle),
+            }
+
+
+rdict_pool = RdictPool()
+atexit.register(rdict_pool.close_all)
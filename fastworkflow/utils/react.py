@@ -9,6 +9,8 @@ from dspy.adapters.types.tool import Tool
 from dspy.primitives.module import Module
 from dspy.signatures.signature import ensure_signature
 
+from fastworkflow.utils.trajectory_compaction import TrajectoryCompactor
+
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
@@ -30,7 +32,8 @@ class AskUserSuspend(BaseException):
 
 class fastWorkflowReAct(Module):
     def __init__(self, signature: type["Signature"], tools: list[Callable], max_iters: int = 10,
-                 on_step_complete: Callable[[int, dict], bool] | None = None):
+                 on_step_complete: Callable[[int, dict], bool] | None = None,
+                 trajectory_token_budget: int = 0):
         """
         ReAct stands for "Reasoning and Acting," a popular paradigm for building tool-using agents.
         In this approach, the language model is iteratively provided with a list of tools and has
@@ -42,6 +45,9 @@ class fastWorkflowReAct(Module):
             signature: The signature of the module, which defines the input and output of the react module.
             tools (list[Callable]): A list of functions, callable objects, or `dspy.Tool` instances.
             max_iters (Optional[int]): The maximum number of iterations to run. Defaults to 10.
+            trajectory_token_budget (int): Compact the trajectory sent to the LM to at most this
+                many tokens before each call (see trajectory_compaction). 0, the default, sends it
+                in full and only truncates after the LM rejects it.
 
         Example:
 
@@ -110,6 +116,9 @@ class fastWorkflowReAct(Module):
         self.inputs = {}
         self.current_trajectory = {}
         self._on_step_complete = on_step_complete
+        self._compactor = (
+            TrajectoryCompactor(trajectory_token_budget) if trajectory_token_budget > 0 else None
+        )
         self._suspended: dict[str, Any] | None = None
         # True when the most recent _run_loop ended because max_iters was
         # reached without the agent selecting the `finish` tool.
@@ -144,6 +153,9 @@ class fastWorkflowReAct(Module):
         self.iteration_counter = data.get("iteration_counter", 0)
 
     def _format_trajectory(self, trajectory: dict[str, Any]):
+        # getattr guard: instances built via __new__ (test helpers) have no compactor.
+        if compactor := getattr(self, "_compactor", None):
+            return compactor.format(trajectory)
         adapter = dspy.settings.adapter or dspy.ChatAdapter()
         trajectory_signature = dspy.Signature(f"{', '.join(trajectory.keys())} -> x")
         return adapter.format_user_message_content(trajectory_signature, trajectory)
@@ -158,24 +170,17 @@ class fastWorkflowReAct(Module):
         # working `trajectory` below (which is what gets stashed in _suspended),
         # so mirroring into it never corrupts suspend/resume bookkeeping.
         self.current_trajectory = {}
+        if compactor := getattr(self, "_compactor", None):
+            compactor.reset()
 
         trajectory: dict[str, Any] = {}
         max_iters = input_args.pop("max_iters", self.max_iters)
         idx = 0
         exception_count = 0
 
-        suspended = self._run_loop(
+        return self._run_to_completion(
             trajectory, idx, input_args, max_iters, exception_count
         )
-        if suspended is not None:
-            return suspended
-
-        extract = self._call_with_potential_trajectory_truncation(
-            self.extract, trajectory, **input_args
-        )
-        return dspy.Prediction(
-            trajectory=trajectory, exhausted=self._exhausted_last_run, **extract
-        )
 
     def resume(self, observation: str):
         """Resume a suspended run after the user answered an ask_user clarification."""
@@ -198,16 +203,33 @@ class fastWorkflowReAct(Module):
         self.iteration_counter += 1
         self._suspended = None
 
-        suspended = self._run_loop(trajectory, idx, input_args, max_iters, 0)
-        if suspended is not None:
-            return suspended
+        return self._run_to_completion(trajectory, idx, input_args, max_iters, 0)
 
-        extract = self._call_with_potential_trajectory_truncation(
-            self.extract, trajectory, **input_args
-        )
-        return dspy.Prediction(
-            trajectory=trajectory, exhausted=self._exhausted_last_run, **extract
-        )
+    def _run_to_completion(
+        self,
+        trajectory: dict[str, Any],
+        idx: int,
+        input_args: dict[str, Any],
+        max_iters: int,
+        exception_count: int,
+    ):
+        """Run the tool loop, then extract the outputs unless the run suspended."""
+        try:
+            suspended = self._run_loop(
+                trajectory, idx, input_args, max_iters, exception_count
+            )
+            if suspended is not None:
+                return suspended
+
+            extract = self._call_with_potential_trajectory_truncation(
+                self.extract, trajectory, **input_args
+            )
+            return dspy.Prediction(
+                trajectory=trajectory, exhausted=self._exhausted_last_run, **extract
+            )
+        finally:
+            if compactor := getattr(self, "_compactor", None):
+                compactor.record_run()
 
     def _run_loop(
         self,
@@ -1,5 +1,6 @@
 import sys
 import ast
+import threading
 import dspy
 import os
 from contextlib import suppress
@@ -64,6 +65,90 @@ def get_trainset(subject_command_name,workflow_folderpath) -> List[Dict[str, Any
         return trainset
 
 
+class _ParamExtractor(dspy.Module):
+    def __init__(self, signature):
+        super().__init__()
+        self.predictor = dspy.ChainOfThought(signature)
+
+    def forward(self, command=None):
+        return self.predictor(statement=command)
+
+
+# Compiled few-shot extractors, keyed by (workflow, command, parameter model) and
+# valid while the trainset file fingerprint and the signature's date are unchanged.
+# `<command>_param_labeled.json` is workflow-scoped rather than versioned (see
+# artifact_versioning), so its fingerprint is what a retrain changes.
+_param_extractor_cache: Dict[Tuple[str, str, type], Tuple[Tuple[Any, ...], dspy.Module]] = {}
+_param_extraction_lms: Dict[Tuple[Optional[str], Optional[str]], dspy.LM] = {}
+_param_extractor_lock = threading.Lock()
+
+
+def _trainset_fingerprint(subject_command_name: str, workflow_folderpath: str) -> Optional[Tuple[Any, ...]]:
+    """Identify the on-disk state of the command's trainset file without reading it.
+
+    Returns None when the trainset location cannot be resolved; like get_trainset,
+    callers then carry on without it (and without caching).
+    """
+    if not subject_command_name:
+        return ()
+    try:
+        trainset_path = get_route_layer_filepath_model(
+            workflow_folderpath, f"{subject_command_name}_param_labeled.json")
+    except Exception as e:
+        logger.warning(f"Error locating trainset for {subject_command_name}: {e}")
+        return None
+    try:
+        stat = os.stat(trainset_path)
+    except OSError:
+        return (trainset_path, None)
+    return (trainset_path, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _get_param_extraction_lm() -> dspy.LM:
+    """The parameter-extraction LM client, built once per configured model and key."""
+    key = (LLM_PARAM_EXTRACTION, LITELLM_API_KEY_PARAM_EXTRACTION)
+    with _param_extractor_lock:
+        lm = _param_extraction_lms.get(key)
+    if lm is None:
+        lm = dspy_utils.get_lm("LLM_PARAM_EXTRACTION", "LITELLM_API_KEY_PARAM_EXTRACTION")
+        with _param_extractor_lock:
+            lm = _param_extraction_lms.setdefault(key, lm)
+    return lm
+
+
+def _get_param_extractor(
+    signature_factory: "InputForParamExtraction",
+    model_class: Type[BaseModel],
+    subject_command_name: str,
+    workflow_folderpath: str,
+) -> dspy.Module:
+    """Return the LabeledFewShot-compiled extractor for a command, compiling it on a miss.
+
+    The compiled module is shared by concurrent extractions; BestOfN deep-copies it
+    for every attempt, so callers never mutate it.
+    """
+    key = (workflow_folderpath, subject_command_name, model_class)
+    # The signature's instructions embed today's date.
+    trainset_fingerprint = _trainset_fingerprint(subject_command_name, workflow_folderpath)
+    fingerprint = (date.today(), trainset_fingerprint)
+    with _param_extractor_lock:
+        cached = _param_extractor_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    params_signature = signature_factory.create_signature_from_pydantic_model(model_class)
+    trainset = get_trainset(subject_command_name, workflow_folderpath)
+    optimizer = dspy.LabeledFewShot(k=len(trainset))
+    compiled_model = optimizer.compile(
+        student=_ParamExtractor(params_signature),
+        trainset=trainset
+    )
+    if trainset_fingerprint is not None:
+        with _param_extractor_lock:
+            _param_extractor_cache[key] = (fingerprint, compiled_model)
+    return compiled_model
+
+
 class DatabaseValidator:
     """Generic validator for database lookups with fuzzy matching"""
     
@@ -254,36 +339,18 @@ Today's date is {today}.
             LLM_PARAM_EXTRACTION = fastworkflow.get_env_var("LLM_PARAM_EXTRACTION")
             LITELLM_API_KEY_PARAM_EXTRACTION = fastworkflow.get_env_var("LITELLM_API_KEY_PARAM_EXTRACTION")
 
-        lm = dspy_utils.get_lm("LLM_PARAM_EXTRACTION", "LITELLM_API_KEY_PARAM_EXTRACTION")
+        lm = _get_param_extraction_lm()
         
         model_class = CommandParameters 
         if model_class is None:
             raise ValueError("No model class provided")
         
-        params_signature = self.create_signature_from_pydantic_model(model_class)
-        
-        class ParamExtractor(dspy.Module):
-            def __init__(self, signature):
-                super().__init__()
-                self.predictor = dspy.ChainOfThought(signature)
-                
-            def forward(self, command=None):
-                return self.predictor(statement=command)
-        
-        param_extractor = ParamExtractor(params_signature)
-        
-        trainset = get_trainset(subject_command_name,workflow_folderpath)
-        length = len(trainset)
+        compiled_model = _get_param_extractor(
+            self, model_class, subject_command_name, workflow_folderpath)
 
         param_dict = {}
         field_names = list(model_class.model_fields.keys())
         with dspy.context(lm=lm, adapter=dspy.JSONAdapter()):
-            optimizer = dspy.LabeledFewShot(k=length)
-            compiled_model = optimizer.compile(
-                student=param_extractor,
-                trainset=trainset
-            )
-
             def basic_checks(args, pred):
                 for field_name in field_names:
                     # return 0 if it extracts an example value instead of correct value | None
@@ -293,7 +360,8 @@ Today's date is {today}.
                         return 0.0
                 return 1.0
 
-            # Create a refined module that tries up to 3 times
+            # Create a refined module that tries up to 3 times. Built per call:
+            # BestOfN keeps a failure budget that its calls use up.
             best_of_3 = dspy.BestOfN(
                 module=compiled_model, 
                 N=3, 
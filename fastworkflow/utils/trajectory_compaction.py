@@ -0,0 +1,146 @@
+"""Token-budgeted compaction of fastWorkflowReAct trajectories.
+
+Without a budget the whole trajectory goes to the LM on every ReAct step, and
+only a provider's context-window error makes fastWorkflowReAct drop its oldest
+steps and retry -- after the rejected request has been paid for. With a token
+budget (``AGENT_TRAJECTORY_TOKEN_BUDGET``) the trajectory is compacted before
+each call instead:
+
+1. Observations of older steps -- typically large tool outputs -- are elided to
+   a short preview, oldest first, until the trajectory fits.
+2. If it still does not fit, the oldest steps are dropped whole.
+
+The ``keep_recent_steps`` latest steps are never compacted. Compaction only
+changes the text sent to the LM; the trajectory itself (what is suspended,
+returned and mirrored into ``current_trajectory``) stays complete.
+
+Tokens are counted locally with the LM's tokenizer (``litellm.token_counter``).
+Each entry is formatted and counted once, when it first appears, so a ReAct
+step joins cached pieces instead of re-formatting the whole trajectory.
+"""
+
+from __future__ import annotations
+
+import contextlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import dspy
+import litellm
+
+from fastworkflow.utils.metrics import metrics
+
+ELIDED_PREVIEW_CHARS = 200
+
+_TOKENS_SAVED = metrics.histogram(
+    "fastworkflow_agent_trajectory_tokens_saved",
+    "Prompt tokens trajectory compaction saved per agent run, across its LM calls",
+    buckets=(0, 100, 500, 1000, 5000, 10000, 50000, 100000, 500000),
+)
+_COMPACTED_CALLS = metrics.counter(
+    "fastworkflow_agent_trajectory_compactions_total",
+    "Agent LM calls whose trajectory was compacted to fit the token budget",
+)
+
+
+def count_tokens(model: Optional[str], text: str) -> int:
+    """Count *text* with *model*'s tokenizer, or estimate it when that is unavailable."""
+    if model:
+        with contextlib.suppress(Exception):
+            return litellm.token_counter(model=model, text=text)
+    return len(text) // 4 + 1
+
+
+@dataclass
+class _Entry:
+    value: Any
+    text: str
+    tokens: int
+
+
+class TrajectoryCompactor:
+    """Formats a ReAct trajectory for the LM within a token budget."""
+
+    def __init__(self, budget_tokens: int, keep_recent_steps: int = 2) -> None:
+        self.budget_tokens = budget_tokens
+        self.keep_recent_steps = keep_recent_steps
+        self.tokens_saved = 0
+        self._adapter_type: Optional[type] = None
+        self._entries: dict[str, _Entry] = {}
+        self._elided: dict[str, _Entry] = {}
+
+    def reset(self) -> None:
+        """Forget the formatted entries of the previous trajectory."""
+        self._entries.clear()
+        self._elided.clear()
+        self.tokens_saved = 0
+
+    def record_run(self) -> None:
+        """Report the tokens saved since the last report (one agent run)."""
+        _TOKENS_SAVED.observe(self.tokens_saved)
+        self.tokens_saved = 0
+
+    def format(self, trajectory: dict[str, Any]) -> str:
+        adapter = dspy.settings.adapter or dspy.ChatAdapter()
+        if type(adapter) is not self._adapter_type:
+            self._entries.clear()
+            self._elided.clear()
+            self._adapter_type = type(adapter)
+        model = getattr(dspy.settings.lm, "model", None)
+
+        texts: dict[str, str] = {}
+        tokens: dict[str, int] = {}
+        for key, value in trajectory.items():
+            entry = self._entries.get(key)
+            if entry is None or entry.value is not value:
+                entry = self._entries[key] = self._format_entry(adapter, model, key, value)
+                self._elided.pop(key, None)
+            texts[key], tokens[key] = entry.text, entry.tokens
+
+        full = total = sum(tokens.values())
+        if total > self.budget_tokens:
+            _COMPACTED_CALLS.inc()
+            older_steps = self._steps(trajectory)[:-self.keep_recent_steps or None]
+
+            for step_keys in older_steps:
+                if total <= self.budget_tokens:
+                    break
+                for key in step_keys:
+                    if not key.startswith("observation_"):
+                        continue
+                    elided = self._elided_entry(adapter, model, key)
+                    if elided.tokens < tokens[key]:
+                        total -= tokens[key] - elided.tokens
+                        texts[key], tokens[key] = elided.text, elided.tokens
+
+            for step_keys in older_steps:
+                if total <= self.budget_tokens:
+                    break
+                for key in step_keys:
+                    total -= tokens.pop(key)
+                    del texts[key]
+
+        self.tokens_saved += full - total
+        return "\n\n".join(texts.values())
+
+    def _format_entry(self, adapter, model: Optional[str], key: str, value: Any) -> _Entry:
+        text = adapter.format_user_message_content(dspy.Signature(f"{key} -> x"), {key: value})
+        return _Entry(value=value, text=text, tokens=count_tokens(model, text))
+
+    def _elided_entry(self, adapter, model: Optional[str], key: str) -> _Entry:
+        if (elided := self._elided.get(key)) is None:
+            entry = self._entries[key]
+            preview = str(entry.value)[:ELIDED_PREVIEW_CHARS]
+            elided = self._elided[key] = self._format_entry(
+                adapter, model, key,
+                f"{preview}... [elided to fit the token budget; {entry.tokens} tokens]",
+            )
+        return elided
+
+    @staticmethod
+    def _steps(trajectory: dict[str, Any]) -> list[list[str]]:
+        """Group trajectory keys (``thought_3``, ``observation_3``, ...) by step, oldest first."""
+        steps: dict[str, list[str]] = {}
+        for key in trajectory:
+            steps.setdefault(key.rsplit("_", 1)[-1], []).append(key)
+        return list(steps.values())
@@ -5,10 +5,9 @@ import weakref
 from functools import wraps
 from typing import Optional
 
-from speedict import Rdict
-
 import fastworkflow
 from fastworkflow.utils.logging import logger
+from fastworkflow.utils.rdict_pool import rdict_pool
 
 
 # ----------------------------------------------------------------------
@@ -36,7 +35,7 @@ from fastworkflow.utils.logging import logger
 #
 # speedict is still used elsewhere (the enablecache decorator below,
 # ConversationStore, and the NLU clarification cache) and is intentionally
-# left in place there.
+# left in place there; those handles are kept open by utils.rdict_pool.
 # ----------------------------------------------------------------------
 _STATE_LOCK = threading.RLock()
 # workflow_id -> live Workflow (weak, so abandoned sessions auto-evict)
@@ -54,16 +53,14 @@ def enablecache(func):
 
         # Get the cache database
         cache_db_path = self.get_cachedb_folderpath(func.__name__)
-        cache_db = Rdict(cache_db_path)
-
-        if key not in cache_db:
-            # If the result is not in the cache, call the function and store the result
-            result = func(self, *args, **kwargs)
-            cache_db[key] = result
-        else:
-            result = cache_db[key]
+        with rdict_pool.open(cache_db_path) as cache_db:
+            if key not in cache_db:
+                # If the result is not in the cache, call the function and store the result
+                result = func(self, *args, **kwargs)
+                cache_db[key] = result
+            else:
+                result = cache_db[key]
 
-        cache_db.close()
         return result
 
     return wrapper
@@ -505,6 +505,8 @@ def initialize_workflow_tool_agent(chat_session: fastworkflow.ChatSession, max_i
         tools=tools,
         max_iters=max_iters,
         on_step_complete=on_step_complete,
+        trajectory_token_budget=fastworkflow.get_env_var(
+            "AGENT_TRAJECTORY_TOKEN_BUDGET", int, default=0),
     )
 
 
@@ -24,6 +24,7 @@ import os
 import time
 import uuid
 import warnings
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from queue import Queue
 from typing import Any, Optional
@@ -32,7 +33,13 @@ import dspy
 
 import fastworkflow
 import fastworkflow.turn
-from fastworkflow import active_workflow
+from fastworkflow import (
+    active_workflow,
+    agent_fast_path,
+    conversation_summarizer,
+    intent_model_registry,
+    turn_setup,
+)
 from fastworkflow.session_state_store import SCHEMA_VERSION
 from fastworkflow.turn import TurnResult, TurnStatus, mint_turn_key
 from fastworkflow.utils.logging import logger
@@ -83,6 +90,11 @@ class WorkflowExecutionContext:
         self._command_trace_queue: Optional[Queue] = None
 
         self._conversation_history: dspy.History = dspy.History(messages=[])
+        # Latest background conversation summary of this session; readers of
+        # conversation_history wait for it (see conversation_summarizer).
+        self._summary_tail: Optional[Future] = None
+        # First history index whose summary was outstanding when _summary_tail was set.
+        self._summary_pending_from: Optional[int] = None
         self._action_log: list[dict[str, Any]] = []
 
         from fastworkflow.command_executor import CommandExecutor
@@ -112,6 +124,7 @@ class WorkflowExecutionContext:
         self._turn_entry_workflow_name: str = ""
         self._turn_entry_context: str = ""
         self._turn_agent_result: Any = None
+        self._turn_stage_timings_ms: dict[str, int] = {}
 
         cme_id = (
             f"cme_{session_key}"
@@ -165,6 +178,7 @@ class WorkflowExecutionContext:
         self._turn_suspended_ms = 0
         self._suspend_began_at = None
         self._turn_agent_result = None
+        self._turn_stage_timings_ms = {}
 
         self._turn_entry_workflow_name = ""
         self._turn_entry_context = ""
@@ -311,8 +325,29 @@ class WorkflowExecutionContext:
 
     @property
     def conversation_history(self) -> dspy.History:
+        conversation_summarizer.wait_for(self._summary_tail)
         return self._conversation_history
 
+    @property
+    def recorded_conversation_history(self) -> dspy.History:
+        """The conversation history without waiting for background summaries.
+
+        A turn whose summary is still outstanding holds its raw message; see
+        pending_summaries().
+        """
+        return self._conversation_history
+
+    def pending_summaries(self) -> Optional[tuple[int, Future]]:
+        """Outstanding background summaries, or None if every turn is summarized.
+
+        Returns the first history index still awaiting its summary and a future
+        that is done once all of them are recorded.
+        """
+        tail = self._summary_tail
+        if tail is None or tail.done():
+            return None
+        return self._summary_pending_from, tail
+
     @property
     def awaiting_user(self) -> bool:
         """True when the agent suspended on ask_user and awaits the next process_message."""
@@ -382,7 +417,7 @@ class WorkflowExecutionContext:
         if turns := state.get("conversation_history_turns") or []:
             from fastworkflow.conversation_history_io import restore_history_from_turns
 
-            self._conversation_history = restore_history_from_turns(turns)
+            self._replace_conversation_history(restore_history_from_turns(turns))
 
         nlu_stage = state.get("nlu_stage")
         if nlu_stage is not None:
@@ -432,7 +467,14 @@ class WorkflowExecutionContext:
         return True
 
     def clear_conversation_history(self) -> None:
-        self._conversation_history = dspy.History(messages=[])
+        self._replace_conversation_history(dspy.History(messages=[]))
+
+    def _replace_conversation_history(self, history: dspy.History) -> None:
+        # A summary still pending for the old history writes into an entry that is
+        # no longer part of it; readers of the new history must not wait for it.
+        self._conversation_history = history
+        self._summary_tail = None
+        self._summary_pending_from = None
 
     def append_conversation_turn(
         self,
@@ -468,6 +510,33 @@ class WorkflowExecutionContext:
         self.append_conversation_turn(conversation_summary, conversation_traces)
         return conversation_summary, conversation_traces
 
+    def summarize_and_record_turn_in_background(
+        self, message: str, actions: list, result_text: str
+    ) -> None:
+        """Record the turn with the raw message now; a worker fills in the summary.
+
+        The entry ends up as summarize_and_record_turn would have left it.
+        Summaries of this session are applied in turn order, and
+        conversation_history waits for them, so no reader sees a placeholder.
+        """
+        self.append_conversation_turn(message)
+        if not actions:
+            return
+        entry = self._conversation_history.messages[-1]
+        # The next turn clears the action log in place.
+        actions = list(actions)
+        if self._summary_tail is None or self._summary_tail.done():
+            self._summary_pending_from = len(self._conversation_history.messages) - 1
+
+        def summarize() -> None:
+            entry["conversation summary"], entry["conversation_traces"] = (
+                self._extract_conversation_summary(message, actions, result_text)
+            )
+
+        self._summary_tail = conversation_summarizer.get_summary_queue().submit(
+            summarize, after=self._summary_tail
+        )
+
     def bind_app_workflow(self, workflow: fastworkflow.Workflow) -> None:
         """Bind the app workflow for NLU (Path 1) and execution (Path 2)."""
         self._app_workflow = workflow
@@ -550,12 +619,15 @@ class WorkflowExecutionContext:
 
         self.push_active_workflow(self._app_workflow)
         try:
-            self._prepare_message_routing(message)
-            if self._should_run_agent_for_message(message):
-                if self._awaiting_user:
-                    return self._resume_agent_message(message)
-                return self._process_agent_message(message)
-            return self._process_message(message)
+            # Every prediction of the message uses one intent model version, even if
+            # a newer one is swapped in meanwhile (see intent_model_registry).
+            with intent_model_registry.turn_lease(self._app_workflow.folderpath):
+                self._prepare_message_routing(message)
+                if self._should_run_agent_for_message(message):
+                    if self._awaiting_user:
+                        return self._resume_agent_message(message)
+                    return self._process_agent_message(message)
+                return self._process_message(message)
         except CommandCancelledError as exc:
             self._reset_agent_suspension()
             return self._command_cancelled_output(str(exc))
@@ -616,6 +688,7 @@ class WorkflowExecutionContext:
             started_at=self._turn_started_at,
             completed_at=completed_at,
             suspended_ms=self._turn_suspended_ms,
+            stage_timings_ms=dict(self._turn_stage_timings_ms),
         )
 
     def process_action(self, action: fastworkflow.Action) -> fastworkflow.CommandOutput:
@@ -629,7 +702,8 @@ class WorkflowExecutionContext:
 
         self.push_active_workflow(self._app_workflow)
         try:
-            return self._process_action(action)
+            with intent_model_registry.turn_lease(self._app_workflow.folderpath):
+                return self._process_action(action)
         finally:
             self.pop_active_workflow()
             if self._app_workflow:
@@ -770,7 +844,11 @@ class WorkflowExecutionContext:
                     raise
 
     def _run_agent(self, message: str):
-        """Fresh agent turn setup and ReAct forward call."""
+        """Fresh agent turn setup and ReAct forward call.
+
+        The command catalog is rendered on a turn-setup worker while the message
+        is refined and planned (see turn_setup).
+        """
         self.clear_action_log()
         if self._mirror_action_log_to_file and os.path.exists("action.jsonl"):
             os.remove("action.jsonl")
@@ -778,35 +856,44 @@ class WorkflowExecutionContext:
         if self._app_workflow:
             self._app_workflow.context["raw_user_message"] = message
 
-        refined_user_query = self._refine_user_query(message, self.conversation_history)
-        self._turn_refined_message = refined_user_query
-
         from fastworkflow.workflow_agent import build_query_with_next_steps, _what_can_i_do
 
+        timings = self._turn_stage_timings_ms
+        available_commands = turn_setup.StagedCall(
+            timings, "catalog", lambda: _what_can_i_do(self)
+        )
+
+        with turn_setup.timed_stage(timings, "refine"):
+            refined_user_query = self._refine_user_query(message, self.conversation_history)
+        self._turn_refined_message = refined_user_query
+
         # When there is prior conversation history, pass the agent trajectory and
         # inputs to the planner so it does not re-plan steps already completed in
         # earlier turns (uses TaskPlannerWithTrajectoryAndAgentInputsSignature).
         has_history = bool(self.conversation_history.messages)
-        command_info_and_refined_message_with_todolist = build_query_with_next_steps(
-            refined_user_query,
-            self,
-            with_agent_inputs_and_trajectory=has_history,
-            planning_insights=self._planning_insights,
-            planner_lm=getattr(self, "_current_planner_lm", None),
-        )
-        available_commands = _what_can_i_do(self)
+        with turn_setup.timed_stage(timings, "plan"):
+            command_info_and_refined_message_with_todolist = build_query_with_next_steps(
+                refined_user_query,
+                self,
+                with_agent_inputs_and_trajectory=has_history,
+                planning_insights=self._planning_insights,
+                planner_lm=getattr(self, "_current_planner_lm", None),
+            )
+        available_commands = available_commands.result()
 
-        return self._call_agent_with_retry(
-            lambda: self._workflow_tool_agent(
-                user_query=command_info_and_refined_message_with_todolist,
-                available_commands=available_commands,
+        with turn_setup.timed_stage(timings, "agent"):
+            return self._call_agent_with_retry(
+                lambda: self._workflow_tool_agent(
+                    user_query=command_info_and_refined_message_with_todolist,
+                    available_commands=available_commands,
+                )
             )
-        )
 
     def _call_agent_resume(self, observation: str):
-        return self._call_agent_with_retry(
-            lambda: self._workflow_tool_agent.resume(observation)
-        )
+        with turn_setup.timed_stage(self._turn_stage_timings_ms, "agent"):
+            return self._call_agent_with_retry(
+                lambda: self._workflow_tool_agent.resume(observation)
+            )
 
     def _awaiting_user_output(self, clarification: str) -> fastworkflow.CommandOutput:
         command_response = fastworkflow.CommandResponse(response=clarification)
@@ -831,11 +918,18 @@ class WorkflowExecutionContext:
 
         command_response = fastworkflow.CommandResponse(response=result_text)
 
-        conversation_summary, _ = self.summarize_and_record_turn(
-            original_message, self._action_log, result_text
-        )
-        if self._action_log:
-            command_response.artifacts["conversation_summary"] = conversation_summary
+        with turn_setup.timed_stage(self._turn_stage_timings_ms, "summarize"):
+            if conversation_summarizer.async_summaries_enabled():
+                # Off the critical path; the summary is not available as an artifact.
+                self.summarize_and_record_turn_in_background(
+                    original_message, self._action_log, result_text
+                )
+            else:
+                conversation_summary, _ = self.summarize_and_record_turn(
+                    original_message, self._action_log, result_text
+                )
+                if self._action_log:
+                    command_response.artifacts["conversation_summary"] = conversation_summary
 
         # Topic 5: the synthesized agent answer carries only its own artifacts (e.g.
         # conversation_summary), so structured outputs from tool calls during the turn
@@ -876,6 +970,11 @@ class WorkflowExecutionContext:
             self._maybe_enqueue_trace_sentinel()
             return result.command_output
 
+        if agent_fast_path.fast_path_enabled():
+            if (command_output := self._try_agent_fast_path(message)) is not None:
+                return command_output
+
+        agent_started = time.perf_counter()
         agent_result = self._run_agent(message)
         self._turn_agent_result = agent_result
         if getattr(agent_result, "suspended", None) is True:
@@ -885,7 +984,106 @@ class WorkflowExecutionContext:
             self._note_agent_suspension(agent_result.clarification)
             return self._awaiting_user_output(agent_result.clarification)
         self._reset_agent_suspension()
-        return self._finalize_agent_output(message, agent_result)
+        command_output = self._finalize_agent_output(message, agent_result)
+        agent_fast_path.record_agent_turn(time.perf_counter() - agent_started)
+        return command_output
+
+    def _try_agent_fast_path(self, message: str) -> Optional[fastworkflow.CommandOutput]:
+        """Execute *message* directly when the local models fully resolve it.
+
+        Skips the planner, the ReAct loop and the LLM conversation summary; the
+        command's own output is the turn's answer. Returns None, having changed
+        nothing, when the message needs the agent (see agent_fast_path).
+        """
+        started = time.perf_counter()
+        cme_context = self._cme_workflow.context
+        if (
+            cme_context.get("NLU_Pipeline_Stage", fastworkflow.NLUPipelineStage.INTENT_DETECTION)
+            != fastworkflow.NLUPipelineStage.INTENT_DETECTION
+            or "stored_parameters" in cme_context
+        ):
+            agent_fast_path.record_miss(agent_fast_path.MISS_PENDING_CLARIFICATION)
+            return None
+
+        workflow = self.get_active_workflow() or self._app_workflow
+        try:
+            match, reason = agent_fast_path.match_command(workflow, message)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"Agent fast path skipped for '{message}': {exc}")
+            match, reason = None, agent_fast_path.MISS_ERROR
+        if match is None:
+            agent_fast_path.record_miss(reason)
+            return None
+
+        self.clear_action_log()
+        if self._mirror_action_log_to_file and os.path.exists("action.jsonl"):
+            os.remove("action.jsonl")
+        workflow.context["raw_user_message"] = message
+
+        if self._command_trace_queue is not None:
+            self._command_trace_queue.put(
+                fastworkflow.CommandTraceEvent(
+                    direction=fastworkflow.CommandTraceEventDirection.AGENT_TO_WORKFLOW,
+                    raw_command=message,
+                    command_name=None,
+                    parameters=None,
+                    response_text=None,
+                    success=None,
+                    timestamp_ms=int(time.time() * 1000),
+                )
+            )
+
+        workflow.command_context_for_response_generation = workflow.current_command_context
+        invoke_started_at = datetime.now(timezone.utc)
+        command_output = self._CommandExecutor.execute_resolved_command(
+            workflow, match.command_name, message, match.parameters)
+        command_output.started_at = invoke_started_at
+        command_output.duration_ms = int(
+            (datetime.now(timezone.utc) - invoke_started_at).total_seconds() * 1000
+        )
+        self.append_turn_output(command_output)
+
+        response_text = ""
+        if command_output.command_responses:
+            response_text = command_output.command_responses[0].response or ""
+        params_dict = match.parameters.model_dump() if match.parameters else None
+
+        if self._command_trace_queue is not None:
+            self._command_trace_queue.put(
+                fastworkflow.CommandTraceEvent(
+                    direction=fastworkflow.CommandTraceEventDirection.WORKFLOW_TO_AGENT,
+                    raw_command=None,
+                    command_name=command_output.command_name or "",
+                    parameters=params_dict,
+                    response_text=response_text,
+                    success=bool(command_output.success),
+                    timestamp_ms=int(time.time() * 1000),
+                )
+            )
+
+        record = {
+            "command": message,
+            "command_name": command_output.command_name or "",
+            "parameters": params_dict,
+            "response": response_text,
+        }
+        self.append_action_log(record)
+        # The raw message stands in for the LLM summary, as it does for an agent
+        # turn without actions; the traces keep the agent path's shape.
+        self.append_conversation_turn(
+            message,
+            json.dumps({
+                "user_query": message,
+                "agent_workflow_interactions": [record],
+                "final_agent_response": response_text,
+            }),
+        )
+
+        self._maybe_enqueue_output(command_output)
+        self._maybe_enqueue_trace_sentinel()
+
+        agent_fast_path.record_hit(time.perf_counter() - started)
+        return command_output
 
     def _resume_agent_message(self, user_answer: str) -> fastworkflow.CommandOutput:
         self._ensure_agent_initialized()
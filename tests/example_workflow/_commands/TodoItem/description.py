@@ -0,0 +1,55 @@
+
+import fastworkflow
+from fastworkflow import CommandOutput, CommandResponse
+from fastworkflow.workflow import Workflow
+from fastworkflow.utils.signatures import InputForParamExtraction
+from fastworkflow.train.generate_synthetic import generate_diverse_utterances
+from fastworkflow.utils.context_utils import list_context_names
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, Field
+from ...application.todo_item import TodoItem
+
+class Signature:
+    class Input(BaseModel):
+        description: str
+    class Output(BaseModel):
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+        success: bool
+
+    plain_utterances = [
+
+    ]
+
+    template_utterances = []
+
+    @staticmethod
+    def generate_utterances(workflow: Workflow, command_name: str) -> list[str]:
+        return [
+            command_name.split('/')[-1].lower().replace('_', ' ')
+        ] + generate_diverse_utterances(Signature.plain_utterances, command_name)
+
+    def validate_extracted_parameters(self, workflow: fastworkflow.Workflow, command: str, cmd_parameters: "Signature.Input") -> None:
+        pass
+
+class ResponseGenerator:
+    def _process_command(self, workflow: Workflow, input: Signature.Input) -> Signature.Output:
+        """Set the description of the todo item.
+
+Args:
+    value (str): The new description.
+
+Raises:
+    ValueError: If the description is empty.
+    TypeError: If the description is not a string."""
+        app_instance = workflow.command_context_for_response_generation  # type: TodoItem
+        # Set property using attribute assignment
+        app_instance.description = input.description
+        return Signature.Output(success=True)
+
+    def __call__(self, workflow: Workflow, command: str, command_parameters: Signature.Input) -> CommandOutput:
+        output = self._process_command(workflow, command_parameters)
+        return CommandOutput(
+            command_response=CommandResponse(response=output.model_dump_json())
+        )
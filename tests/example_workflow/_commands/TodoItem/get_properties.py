@@ -0,0 +1,52 @@
+
+import fastworkflow
+from fastworkflow import CommandOutput, CommandResponse
+from fastworkflow.workflow import Workflow
+from fastworkflow.utils.signatures import InputForParamExtraction
+from fastworkflow.train.generate_synthetic import generate_diverse_utterances
+from fastworkflow.utils.context_utils import list_context_names
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, Field
+from ...application.todo_item import TodoItem
+
+class Signature:
+    class Output(BaseModel):
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+        INCOMPLETE: str
+        COMPLETE: str
+        description: str
+        assign_to: str
+        status: str
+
+    plain_utterances = [
+
+    ]
+
+    template_utterances = []
+
+    @staticmethod
+    def generate_utterances(workflow: Workflow, command_name: str) -> list[str]:
+        return [
+            command_name.split('/')[-1].lower().replace('_', ' ')
+        ] + generate_diverse_utterances(Signature.plain_utterances, command_name)
+
+    def validate_extracted_parameters(self, workflow: fastworkflow.Workflow, command: str, cmd_parameters: None) -> None:
+        pass
+
+class ResponseGenerator:
+    def _process_command(self, workflow: Workflow) -> Signature.Output:
+        """Get all properties of the TodoItem class."""
+        app_instance = workflow.command_context_for_response_generation  # type: TodoItem
+        # For get_properties, the primary logic is to gather attribute values,
+        # which is handled by constructing the output_return string that references app_instance attributes directly.
+        # No additional complex processing steps are typically needed in this block.
+        pass # Placeholder if no other pre-return logic is needed
+        return Signature.Output(INCOMPLETE=app_instance.INCOMPLETE, COMPLETE=app_instance.COMPLETE, description=app_instance.description, assign_to=app_instance.assign_to, status=app_instance.status)
+
+    def __call__(self, workflow: Workflow, command: str) -> CommandOutput:
+        output = self._process_command(workflow)
+        return CommandOutput(
+            command_response=CommandResponse(response=output.model_dump_json())
+        )
@@ -0,0 +1,58 @@
+
+import fastworkflow
+from fastworkflow import CommandOutput, CommandResponse
+from fastworkflow.workflow import Workflow
+from fastworkflow.utils.signatures import InputForParamExtraction
+from fastworkflow.train.generate_synthetic import generate_diverse_utterances
+from fastworkflow.utils.context_utils import list_context_names
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, Field
+from ...application.todo_list import TodoList
+from ...application.todo_item import TodoItem
+
+class Signature:
+    class Input(BaseModel):
+        description: str
+        assign_to: str
+        status: str
+    class Output(BaseModel):
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+        result: TodoItem
+
+    plain_utterances = [
+
+    ]
+
+    template_utterances = []
+
+    @staticmethod
+    def generate_utterances(workflow: Workflow, command_name: str) -> list[str]:
+        return [
+            command_name.split('/')[-1].lower().replace('_', ' ')
+        ] + generate_diverse_utterances(Signature.plain_utterances, command_name)
+
+    def validate_extracted_parameters(self, workflow: fastworkflow.Workflow, command: str, cmd_parameters: "Signature.Input") -> None:
+        pass
+
+class ResponseGenerator:
+    def _process_command(self, workflow: Workflow, input: Signature.Input) -> Signature.Output:
+        """Add a new TodoItem as a child to this TodoList.
+Args:
+    description (str): Description of the todo item.
+    assign_to (str): Person assigned to the todo item.
+    status (str): Status of the todo item.
+Returns:
+    TodoItem: The newly created child TodoItem.
+Raises:
+    ValueError: If a child with the generated id already exists."""
+        app_instance = workflow.command_context_for_response_generation  # type: TodoList
+        result_val = app_instance.add_child_todoitem(description=input.description, assign_to=input.assign_to, status=input.status)
+        return Signature.Output(result=result_val)
+
+    def __call__(self, workflow: Workflow, command: str, command_parameters: Signature.Input) -> CommandOutput:
+        output = self._process_command(workflow, command_parameters)
+        return CommandOutput(
+            command_response=CommandResponse(response=output.model_dump_json())
+        )
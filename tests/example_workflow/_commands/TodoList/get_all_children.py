@@ -0,0 +1,48 @@
+
+import fastworkflow
+from fastworkflow import CommandOutput, CommandResponse
+from fastworkflow.workflow import Workflow
+from fastworkflow.utils.signatures import InputForParamExtraction
+from fastworkflow.train.generate_synthetic import generate_diverse_utterances
+from fastworkflow.utils.context_utils import list_context_names
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, Field
+from ...application.todo_list import TodoList
+from ...application.todo_item import TodoItem
+
+class Signature:
+    class Output(BaseModel):
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+        result: List[Union[TodoItem, 'TodoList']]
+
+    plain_utterances = [
+
+    ]
+
+    template_utterances = []
+
+    @staticmethod
+    def generate_utterances(workflow: Workflow, command_name: str) -> list[str]:
+        return [
+            command_name.split('/')[-1].lower().replace('_', ' ')
+        ] + generate_diverse_utterances(Signature.plain_utterances, command_name)
+
+    def validate_extracted_parameters(self, workflow: fastworkflow.Workflow, command: str, cmd_parameters: None) -> None:
+        pass
+
+class ResponseGenerator:
+    def _process_command(self, workflow: Workflow) -> Signature.Output:
+        """Get all children of this TodoList.
+Returns:
+    List of all children"""
+        app_instance = workflow.command_context_for_response_generation  # type: TodoList
+        result_val = app_instance.get_all_children()
+        return Signature.Output(result=result_val)
+
+    def __call__(self, workflow: Workflow, command: str) -> CommandOutput:
+        output = self._process_command(workflow)
+        return CommandOutput(
+            command_response=CommandResponse(response=output.model_dump_json())
+        )
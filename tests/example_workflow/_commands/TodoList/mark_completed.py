@@ -0,0 +1,46 @@
+
+import fastworkflow
+from fastworkflow import CommandOutput, CommandResponse
+from fastworkflow.workflow import Workflow
+from fastworkflow.utils.signatures import InputForParamExtraction
+from fastworkflow.train.generate_synthetic import generate_diverse_utterances
+from fastworkflow.utils.context_utils import list_context_names
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, Field
+from ...application.todo_list import TodoList
+from ...application.todo_item import TodoItem
+
+class Signature:
+    class Output(BaseModel):
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+        success: bool
+
+    plain_utterances = [
+
+    ]
+
+    template_utterances = []
+
+    @staticmethod
+    def generate_utterances(workflow: Workflow, command_name: str) -> list[str]:
+        return [
+            command_name.split('/')[-1].lower().replace('_', ' ')
+        ] + generate_diverse_utterances(Signature.plain_utterances, command_name)
+
+    def validate_extracted_parameters(self, workflow: fastworkflow.Workflow, command: str, cmd_parameters: None) -> None:
+        pass
+
+class ResponseGenerator:
+    def _process_command(self, workflow: Workflow) -> Signature.Output:
+        """Mark this TodoList and all children as complete."""
+        app_instance = workflow.command_context_for_response_generation  # type: TodoList
+        app_instance.mark_completed()
+        return Signature.Output(success=True)
+
+    def __call__(self, workflow: Workflow, command: str) -> CommandOutput:
+        output = self._process_command(workflow)
+        return CommandOutput(
+            command_response=CommandResponse(response=output.model_dump_json())
+        )
@@ -0,0 +1,65 @@
+
+import fastworkflow
+from fastworkflow import CommandOutput, CommandResponse
+from fastworkflow.workflow import Workflow
+from fastworkflow.utils.signatures import InputForParamExtraction
+from fastworkflow.train.generate_synthetic import generate_diverse_utterances
+from fastworkflow.utils.context_utils import list_context_names
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, Field
+from ...application.todo_manager import TodoListManager
+from ...application.todo_list import TodoList
+
+class Signature:
+    class Input(BaseModel):
+        description: str
+    class Output(BaseModel):
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+        result: TodoList
+
+    plain_utterances = [
+
+    ]
+
+    template_utterances = []
+
+    @staticmethod
+    def generate_utterances(workflow: Workflow, command_name: str) -> list[str]:
+        return [
+            command_name.split('/')[-1].lower().replace('_', ' ')
+        ] + generate_diverse_utterances(Signature.plain_utterances, command_name)
+
+    def validate_extracted_parameters(self, workflow: fastworkflow.Workflow, command: str, cmd_parameters: "Signature.Input") -> None:
+        pass
+
+class ResponseGenerator:
+    def _process_command(self, workflow: Workflow, input: Signature.Input) -> Signature.Output:
+        """Create a new todo list.
+
+Args:
+    description (str): Description of the todo list.
+
+Returns:
+    TodoList: The newly created TodoList.
+
+Raises:
+    ValueError: If description is empty.
+
+Example:
+    >>> manager = TodoListManager()
+    >>> list = manager.create_todo_list("Groceries")
+    >>> list.id
+    1
+    >>> list.name
+    'Groceries'"""
+        app_instance = workflow.command_context_for_response_generation  # type: TodoListManager
+        result_val = app_instance.create_todo_list(description=input.description)
+        return Signature.Output(result=result_val)
+
+    def __call__(self, workflow: Workflow, command: str, command_parameters: Signature.Input) -> CommandOutput:
+        output = self._process_command(workflow, command_parameters)
+        return CommandOutput(
+            command_response=CommandResponse(response=output.model_dump_json())
+        )
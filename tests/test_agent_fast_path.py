@@ -0,0 +1,115 @@
+"""The agent-mode fast path executes confidently-routed commands without the LLM."""
+
+from __future__ import annotations
+
+import json
+import uuid
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+import fastworkflow
+from fastworkflow import agent_fast_path, model_pipeline_training
+from fastworkflow.workflow_execution_context import WorkflowExecutionContext
+
+
+class _FakeRouter:
+    """Routes every utterance to one label with a fixed confidence."""
+
+    predictions = ["add_two_numbers"]
+    confidence = 0.97
+
+    def __init__(self, model_artifacts_folderpath: str):
+        self.path = model_artifacts_folderpath
+
+    def predict_with_confidence(self, command: str):
+        return list(self.predictions), self.confidence
+
+
+@pytest.fixture
+def ctx(monkeypatch):
+    fastworkflow.init({
+        "SPEEDDICT_FOLDERNAME": "___workflow_contexts",
+        "AGENT_FAST_PATH": "true",
+        "NOT_FOUND": "NOT_FOUND",
+        "MISSING_INFORMATION_ERRMSG": "Missing parameter values: ",
+        "INVALID_INFORMATION_ERRMSG": "Invalid parameter values: ",
+    })
+    from fastworkflow.command_routing import RoutingRegistry
+
+    RoutingRegistry.clear_registry()
+    monkeypatch.setattr(model_pipeline_training, "CommandRouter", _FakeRouter)
+
+    context = WorkflowExecutionContext(run_as_agent=True)
+    workflow = fastworkflow.Workflow.create(
+        str(Path(__file__).parent.joinpath("hello_world_workflow").resolve()),
+        workflow_id_str=f"fast-path-{uuid.uuid4().hex}",
+    )
+    context.bind_app_workflow(workflow)
+    monkeypatch.setattr(context, "_ensure_agent_initialized", lambda: None)
+    context._workflow_tool_agent = MagicMock()
+    yield context
+    context.close()
+    RoutingRegistry.clear_registry()
+
+
+def _agent_answers(ctx, monkeypatch, answer="Agent answer"):
+    monkeypatch.setattr(
+        "fastworkflow.workflow_agent.build_query_with_next_steps",
+        lambda user_query, session, **kwargs: user_query,
+    )
+    monkeypatch.setattr("fastworkflow.workflow_agent._what_can_i_do", lambda session: "commands")
+    monkeypatch.setattr(ctx, "_call_agent_with_retry", lambda agent_call, lm=None: agent_call())
+    ctx._workflow_tool_agent.return_value = MagicMock(final_answer=answer)
+
+
+def test_confident_command_with_tagged_parameters_skips_the_agent(ctx):
+    before = agent_fast_path.fast_path_stats()
+
+    turn = ctx.process_turn("<first_num>2</first_num> plus <second_num>3</second_num>")
+
+    ctx._workflow_tool_agent.assert_not_called()
+    assert turn.command_outputs[0].command_name == "add_two_numbers"
+    assert "5" in turn.answer
+    assert [record["command_name"] for record in ctx.action_log] == ["add_two_numbers"]
+    history = ctx.conversation_history.messages[-1]
+    assert json.loads(history["conversation_traces"])["final_agent_response"] == turn.answer
+    assert agent_fast_path.fast_path_stats()["hits"] == before["hits"] + 1
+
+
+def test_untagged_parameters_fall_back_to_the_agent(ctx, monkeypatch):
+    _agent_answers(ctx, monkeypatch)
+    misses = agent_fast_path._MISSES[agent_fast_path.MISS_PARAMETERS].value
+
+    turn = ctx.process_turn("add two and three")
+
+    ctx._workflow_tool_agent.assert_called_once()
+    assert turn.answer == "Agent answer"
+    assert agent_fast_path._MISSES[agent_fast_path.MISS_PARAMETERS].value == misses + 1
+
+
+def test_ambiguous_prediction_falls_back_to_the_agent(ctx, monkeypatch):
+    _agent_answers(ctx, monkeypatch)
+    monkeypatch.setattr(_FakeRouter, "predictions", ["add_two_numbers", "wildcard"])
+
+    ctx.process_turn("<first_num>2</first_num> plus <second_num>3</second_num>")
+
+    ctx._workflow_tool_agent.assert_called_once()
+
+
+def test_cme_commands_are_left_to_the_agent(ctx, monkeypatch):
+    monkeypatch.setattr(_FakeRouter, "predictions", ["IntentDetection/what_can_i_do"])
+
+    assert agent_fast_path.match_command(ctx.app_workflow, "what can i do") == (
+        None, agent_fast_path.MISS_NOT_ROUTABLE)
+
+
+def test_minimum_confidence_is_enforced(ctx):
+    message = "<first_num>2</first_num> plus <second_num>3</second_num>"
+
+    assert agent_fast_path.match_command(ctx.app_workflow, message, min_confidence=0.99) == (
+        None, agent_fast_path.MISS_LOW_CONFIDENCE)
+    match, _ = agent_fast_path.match_command(ctx.app_workflow, message, min_confidence=0.9)
+    assert match.command_name == "add_two_numbers"
+    assert (match.parameters.first_num, match.parameters.second_num) == (2.0, 3.0)
@@ -719,6 +719,104 @@ def test_pruning_a_carried_forward_source_leaves_the_new_version_readable(
         assert json.load(f)["confidence_threshold"] == 0.71
 
 
+# ---------------------------------------------------------------------
+# Content-addressed blob store
+# ---------------------------------------------------------------------
+
+
+def _blobs(workflow: Path) -> set[str]:
+    root = av.blobs_root(str(workflow))
+    return {blob.name for blob in root.glob("*/*")} if root.is_dir() else set()
+
+
+def _retrain(workflow: Path, previous: str, trained: dict[str, float], carried: list[str]) -> str:
+    """One train run: write *trained*, carry *carried* forward, publish, retain."""
+    version_id = _make_version(workflow, trained)
+    for context_name in carried:
+        assert av.carry_forward_context(str(workflow), previous, version_id, context_name)
+    av.publish_version(str(workflow), version_id)
+    av.retain_current_and_previous(str(workflow), previous)
+    return version_id
+
+
+def test_publish_seals_every_artifact_file_into_a_blob(workflow: Path):
+    version_id = _make_version(workflow, {"*": 0.1, "TodoItem": 0.2})
+    av.publish_version(str(workflow), version_id)
+
+    files = av.manifest_files(av.read_manifest(str(workflow), version_id))
+    vdir = av.version_dir(str(workflow), version_id)
+    assert set(files) == {
+        path.relative_to(vdir).as_posix()
+        for path in vdir.rglob("*")
+        if path.is_file() and path.parent != vdir
+    }
+    for relative, entry in files.items():
+        assert os.path.samefile(vdir / relative, av.blob_path(str(workflow), entry["sha256"]))
+    # Identical files (the two contexts share model.safetensors bytes) are stored once.
+    assert len(_blobs(workflow)) < len(files)
+    assert av.version_size_bytes(str(workflow), version_id) == sum(
+        (vdir / relative).stat().st_size for relative in files
+    )
+
+
+def test_sealing_hashes_only_files_the_manifest_does_not_record(workflow: Path):
+    v1 = _make_version(workflow, {"*": 0.1, "TodoItem": 0.2})
+    av.publish_version(str(workflow), v1)
+    assert av.seal_version(str(workflow), v1) == 0
+
+    v2 = _make_version(workflow, {"*": 0.3})
+    assert av.carry_forward_context(str(workflow), v1, v2, "TodoItem")
+
+    hashed = av.seal_version(str(workflow), v2)
+
+    global_dir = av.version_dir(str(workflow), v2) / "global"
+    assert hashed == sum(path.is_file() for path in global_dir.rglob("*"))
+    (av.version_dir(str(workflow), v2) / "global" / "threshold.json").unlink()
+    (av.version_dir(str(workflow), v2) / "global" / "threshold.json").write_text("{}")
+    assert av.seal_version(str(workflow), v2) == 1
+
+
+def test_disk_use_stays_flat_across_repeated_retrains(workflow: Path):
+    current = _make_version(workflow, {"*": 0.1, "TodoItem": 0.2})
+    av.publish_version(str(workflow), current)
+
+    stored = []
+    for _ in range(4):
+        # A selective retrain that reproduces `*` byte for byte and carries TodoItem.
+        current = _retrain(workflow, current, {"*": 0.1}, ["TodoItem"])
+        stored.append((len(_blobs(workflow)), av.stored_size_bytes(str(workflow))))
+
+    assert len(av.list_versions(str(workflow))) == 2
+    assert len(set(stored)) == 1, stored
+
+
+def test_pruning_collects_only_blobs_no_remaining_version_references(workflow: Path):
+    v1 = _make_version(workflow, {"*": 0.1, "TodoItem": 0.2})
+    av.publish_version(str(workflow), v1)
+    v2 = _make_version(workflow, {"*": 0.3})
+    assert av.carry_forward_context(str(workflow), v1, v2, "TodoItem")
+    av.publish_version(str(workflow), v2)
+    referenced_by_v2 = set(av.blob_refcounts(str(workflow)))
+    before = _blobs(workflow)
+
+    av.prune_versions(str(workflow), version_ids=[v1], dry_run=False)
+
+    assert _blobs(workflow) == set(av.blob_refcounts(str(workflow)))
+    assert _blobs(workflow) < before
+    assert _blobs(workflow) <= referenced_by_v2
+    with open(_legacy_threshold_path(workflow, "TodoItem")) as f:
+        assert json.load(f)["confidence_threshold"] == 0.2
+
+
+def test_an_unsealed_version_is_sized_by_walking_it(workflow: Path):
+    version_id = _make_version(workflow, {"*": 0.1})
+
+    assert av.manifest_files(av.read_manifest(str(workflow), version_id)) is None
+    assert av.version_size_bytes(str(workflow), version_id) == av._dir_size_bytes(
+        av.version_dir(str(workflow), version_id)
+    )
+
+
 # ---------------------------------------------------------------------
 # Expensive-artifact ergonomics (R4)
 # ---------------------------------------------------------------------
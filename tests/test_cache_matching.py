@@ -0,0 +1,155 @@
+"""Tests for the clarification-cache embedding index in fastworkflow.cache_matching."""
+
+import numpy as np
+import pytest
+
+from fastworkflow import cache_matching
+from fastworkflow.utils.rdict_pool import rdict_pool
+
+
+_VECTORS = {
+    "show my orders": [1.0, 0.0, 0.0, 0.0],
+    "list my orders": [0.9, 0.1, 0.0, 0.0],
+    "cancel the order": [0.0, 1.0, 0.0, 0.0],
+    "what is the weather": [0.0, 0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    """Replace the DistilBERT embedding with a fixed lookup table."""
+    def _embedding(text, _pipeline):
+        return np.array([_VECTORS[text]], dtype=np.float32)
+
+    monkeypatch.setattr(cache_matching, "get_embedding", _embedding)
+    monkeypatch.setattr(cache_matching, "_INDEXES", {})
+    monkeypatch.setattr(cache_matching, "_MIGRATED", set())
+    return object()  # stands in for the model pipeline
+
+
+def _cosine(a, b):
+    a, b = np.asarray(a), np.asarray(b)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def test_cache_match_returns_best_label(tmp_path, fake_embeddings):
+    cache_path = str(tmp_path / "cache.db")
+    cache_matching.store_utterance_cache(cache_path, "show my orders", "get_orders", fake_embeddings)
+    cache_matching.store_utterance_cache(cache_path, "cancel the order", "cancel_order", fake_embeddings)
+
+    label, similarity = cache_matching.cache_match(
+        cache_path, "list my orders", fake_embeddings, 0.85, return_details=True)
+
+    assert label == "get_orders"
+    assert similarity == pytest.approx(
+        _cosine(_VECTORS["list my orders"], _VECTORS["show my orders"]), abs=1e-6)
+    assert cache_matching.cache_match(
+        cache_path, "what is the weather", fake_embeddings, 0.85) is None
+
+
+def test_store_updates_resident_index_incrementally(tmp_path, fake_embeddings):
+    cache_path = str(tmp_path / "cache.db")
+    cache_matching.store_utterance_cache(cache_path, "show my orders", "get_orders", fake_embeddings)
+    # Build the resident index, then store again: the append must be visible
+    # without a rebuild.
+    assert cache_matching.cache_match(cache_path, "cancel the order", fake_embeddings) is None
+    index = cache_matching._INDEXES[cache_path]
+
+    cache_matching.store_utterance_cache(cache_path, "cancel the order", "cancel_order", fake_embeddings)
+
+    assert cache_matching._INDEXES[cache_path] is index
+    assert index.keys == [
+        str(cache_matching.mmh3.hash("show my orders")),
+        str(cache_matching.mmh3.hash("cancel the order")),
+    ]
+    assert cache_matching.cache_match(
+        cache_path, "cancel the order", fake_embeddings) == "cancel_order"
+
+
+def test_most_frequent_label_wins(tmp_path, fake_embeddings):
+    cache_path = str(tmp_path / "cache.db")
+    for label in ("get_orders", "list_orders", "list_orders"):
+        cache_matching.store_utterance_cache(cache_path, "show my orders", label, fake_embeddings)
+
+    assert cache_matching.cache_match(
+        cache_path, "show my orders", fake_embeddings) == "list_orders"
+
+
+def test_persisted_index_is_memory_mapped_on_cold_start(tmp_path, fake_embeddings, monkeypatch):
+    cache_path = str(tmp_path / "cache.db")
+    cache_matching.store_utterance_cache(cache_path, "show my orders", "get_orders", fake_embeddings)
+    cache_matching.cache_match(cache_path, "show my orders", fake_embeddings)
+    cache_matching.store_utterance_cache(cache_path, "cancel the order", "cancel_order", fake_embeddings)
+
+    # A fresh process: no resident index, so it is loaded from the sidecar files.
+    monkeypatch.setattr(cache_matching, "_INDEXES", {})
+    assert cache_matching.cache_match(
+        cache_path, "cancel the order", fake_embeddings) == "cancel_order"
+    assert isinstance(cache_matching._INDEXES[cache_path].matrix, np.memmap)
+
+
+def test_stale_index_rebuilds_after_foreign_write(tmp_path, fake_embeddings):
+    cache_path = str(tmp_path / "cache.db")
+    cache_matching.store_utterance_cache(cache_path, "show my orders", "get_orders", fake_embeddings)
+    cache_matching.cache_match(cache_path, "show my orders", fake_embeddings)
+
+    # Simulate another process bumping the revision behind this index's back.
+    index = cache_matching._INDEXES[cache_path]
+    index.revision = -5
+    cache_matching.store_utterance_cache(cache_path, "cancel the order", "cancel_order", fake_embeddings)
+
+    assert cache_matching.cache_match(
+        cache_path, "cancel the order", fake_embeddings) == "cancel_order"
+    with rdict_pool.open(cache_path) as db:
+        assert index.revision == db.get("cache_revision")
+
+
+def test_store_writes_per_utterance_records(tmp_path, fake_embeddings):
+    cache_path = str(tmp_path / "cache.db")
+    utterance_hash = cache_matching.store_utterance_cache(
+        cache_path, "show my orders", "get_orders", fake_embeddings)
+    cache_matching.store_utterance_cache(cache_path, "show my orders", "get_orders")
+
+    with rdict_pool.open(cache_path) as db:
+        assert "cache" not in db
+        meta = db[f"utt_meta:{utterance_hash}"]
+        assert meta["utterance"] == "show my orders"
+        assert meta["command_mapping"]["get_orders"]["frequency"] == 2
+        embedding = np.frombuffer(db[f"utt_emb:{utterance_hash}"], dtype=np.float32)
+        np.testing.assert_array_equal(embedding, _VECTORS["show my orders"])
+
+
+def test_legacy_cache_blob_is_migrated(tmp_path, fake_embeddings):
+    cache_path = str(tmp_path / "cache.db")
+    legacy_hash = str(cache_matching.mmh3.hash("show my orders"))
+    with rdict_pool.open(cache_path) as db:
+        db["cache"] = {
+            legacy_hash: {
+                "embedding": _VECTORS["show my orders"],
+                "utterance": "show my orders",
+                "command_mapping": {
+                    "get_orders": {"frequency": 3, "feedback_date": "2025-01-01T00:00:00"}
+                },
+            }
+        }
+
+    assert cache_matching.cache_match(
+        cache_path, "list my orders", fake_embeddings, 0.85) == "get_orders"
+
+    with rdict_pool.open(cache_path) as db:
+        assert "cache" not in db
+        assert db[f"utt_meta:{legacy_hash}"]["command_mapping"]["get_orders"]["frequency"] == 3
+
+
+def test_the_legacy_check_runs_once_per_cache(tmp_path, fake_embeddings, monkeypatch):
+    cache_path = str(tmp_path / "cache.db")
+    migrations = []
+    migrate = cache_matching._migrate_legacy_cache
+    monkeypatch.setattr(
+        cache_matching, "_migrate_legacy_cache", lambda db: migrations.append(db) or migrate(db))
+
+    cache_matching.store_utterance_cache(cache_path, "show my orders", "get_orders", fake_embeddings)
+    cache_matching.cache_match(cache_path, "show my orders", fake_embeddings)
+    cache_matching.store_utterance_cache(cache_path, "cancel the order", "cancel_order", fake_embeddings)
+
+    assert len(migrations) == 1
@@ -0,0 +1,118 @@
+"""Command catalogs are memoized per context until the command sources change."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+import fastworkflow
+from fastworkflow import command_metadata_api
+from fastworkflow.command_metadata_api import CommandMetadataAPI
+
+
+@pytest.fixture
+def workflow_path(tmp_path, setup_test_environment):
+    path = tmp_path / "hello_world_workflow"
+    shutil.copytree(
+        Path(__file__).parent / "hello_world_workflow", path,
+        ignore=shutil.ignore_patterns("___*"))
+    CommandMetadataAPI.clear_catalog_cache()
+    yield str(path)
+    CommandMetadataAPI.clear_catalog_cache()
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+    build = CommandMetadataAPI._build_enhanced_command_info
+
+    def counting_build(*args):
+        calls.append(args)
+        return build(*args)
+
+    monkeypatch.setattr(CommandMetadataAPI, "_build_enhanced_command_info", counting_build)
+    return calls
+
+
+def _display_text(workflow_path, context_name="*", for_agents=False):
+    return CommandMetadataAPI.get_command_display_text(
+        subject_workflow_path=workflow_path,
+        cme_workflow_path=fastworkflow.get_internal_workflow_path("command_metadata_extraction"),
+        active_context_name=context_name,
+        for_agents=for_agents,
+    )
+
+
+def test_display_texts_share_one_catalog_per_context(workflow_path, builds):
+    text = _display_text(workflow_path)
+    single = CommandMetadataAPI.get_command_display_text_for_command(
+        subject_workflow_path=workflow_path,
+        cme_workflow_path=fastworkflow.get_internal_workflow_path("command_metadata_extraction"),
+        active_context_name="*",
+        qualified_command_name="add_two_numbers",
+    )
+
+    assert "add_two_numbers" in text and "add_two_numbers" in single
+    assert _display_text(workflow_path) is text
+    assert len(builds) == 1
+
+
+def test_changed_command_sources_rebuild_the_catalog(workflow_path, builds):
+    text = _display_text(workflow_path)
+    command_file = Path(workflow_path) / "_commands" / "add_two_numbers.py"
+    command_file.write_text(command_file.read_text() + "\n# edited\n")
+
+    assert _display_text(workflow_path) == text
+    assert len(builds) == 2
+    _display_text(workflow_path)
+    assert len(builds) == 2
+
+
+def test_params_reuse_the_command_directory_until_sources_change(workflow_path, monkeypatch):
+    loads = []
+    load = fastworkflow.command_directory.CommandDirectory.load
+
+    def counting_load(path):
+        loads.append(path)
+        return load(path)
+
+    monkeypatch.setattr(
+        "fastworkflow.command_metadata_api.CommandDirectory.load", counting_load)
+
+    params = CommandMetadataAPI.get_params_for_all_commands(workflow_path)
+    assert CommandMetadataAPI.get_params_for_all_commands(workflow_path) is params
+    assert len(loads) == 1
+
+    (Path(workflow_path) / "_commands" / "subtract.py").write_text("")
+    CommandMetadataAPI.get_params_for_all_commands(workflow_path)
+    assert len(loads) == 2
+
+
+def test_a_catalog_snapshot_fingerprints_the_sources_once(workflow_path, builds, monkeypatch):
+    fingerprints = []
+    fingerprint = command_metadata_api._catalog_fingerprint
+
+    def counting_fingerprint(*paths):
+        fingerprints.append(paths)
+        return fingerprint(*paths)
+
+    monkeypatch.setattr(command_metadata_api, "_catalog_fingerprint", counting_fingerprint)
+    cme_path = fastworkflow.get_internal_workflow_path("command_metadata_extraction")
+
+    with CommandMetadataAPI.catalog_snapshot():
+        text = CommandMetadataAPI.get_suggested_commands_metadata(
+            subject_workflow_path=workflow_path,
+            cme_workflow_path=cme_path,
+            active_context_name="*",
+            suggested_command_names=["add_two_numbers", "IntentDetection/go_up", "missing"],
+        )
+        command_file = Path(workflow_path) / "_commands" / "add_two_numbers.py"
+        command_file.write_text(command_file.read_text() + "\n# edited\n")
+        _display_text(workflow_path)
+
+    assert "add_two_numbers" in text
+    assert fingerprints == [(workflow_path, cme_path)]
+    assert len(builds) == 1
+    # The edit is picked up by the first lookup after the snapshot.
+    _display_text(workflow_path)
+    assert len(builds) == 2
@@ -0,0 +1,75 @@
+"""Unit tests for CommandRouter.predict that do not need trained transformer models."""
+
+import json
+import os
+import pickle
+
+import torch
+from sklearn.preprocessing import LabelEncoder
+
+from fastworkflow import model_pipeline_training
+from fastworkflow.model_pipeline_training import CommandRouter
+
+
+class _FakePipeline:
+    """Stands in for ModelPipeline: returns one confident TinyBERT prediction."""
+
+    def __init__(self, *_, **__):
+        self.calls = []
+
+    def predict_single(self, text, k_val=None):
+        return self.predict_batch([text], k_val=k_val)
+
+    def predict_batch(self, texts, k_val=None):
+        self.calls.append((list(texts), k_val))
+        return {
+            "predictions": [1],
+            "confidences": [0.9],
+            "logits": torch.zeros(1, 3),
+            "used_distil": [False],
+            "top_k_predictions": [[1, 0, 2]],
+            "top_k_scores": [[0.9, 0.05, 0.05]],
+        }
+
+
+def _write_artifacts(model_dir: str) -> None:
+    os.makedirs(model_dir, exist_ok=True)
+    for filename, threshold in (
+        ("threshold.json", 0.6),
+        ("tiny_ambiguous_threshold.json", 0.5),
+        ("large_ambiguous_threshold.json", 0.5),
+    ):
+        with open(os.path.join(model_dir, filename), "w") as f:
+            json.dump({"confidence_threshold": threshold}, f)
+    encoder = LabelEncoder().fit(["add_two_numbers", "wildcard", "what_can_i_do"])
+    with open(os.path.join(model_dir, "label_encoder.pkl"), "wb") as f:
+        pickle.dump(encoder, f)
+
+
+def test_label_encoder_is_loaded_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_pipeline_training, "ModelPipeline", _FakePipeline)
+    model_dir = str(tmp_path / "ctx")
+    _write_artifacts(model_dir)
+
+    router = CommandRouter(model_dir)
+    # Prediction must not go back to disk: remove the artifact to prove it.
+    os.remove(os.path.join(model_dir, "label_encoder.pkl"))
+
+    assert router.predict("add 2 and 3") == ["what_can_i_do"]
+    assert router.predict("add 4 and 5") == ["what_can_i_do"]
+    assert router.modelpipeline.calls[-1] == (["add 4 and 5"], 3)
+
+
+def test_routers_for_different_contexts_keep_their_own_labels(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_pipeline_training, "ModelPipeline", _FakePipeline)
+    first_dir, second_dir = str(tmp_path / "first"), str(tmp_path / "second")
+    _write_artifacts(first_dir)
+    _write_artifacts(second_dir)
+    encoder = LabelEncoder().fit(["a", "b", "c"])
+    with open(os.path.join(second_dir, "label_encoder.pkl"), "wb") as f:
+        pickle.dump(encoder, f)
+
+    first, second = CommandRouter(first_dir), CommandRouter(second_dir)
+
+    assert second.predict("anything") == ["b"]
+    assert first.predict("anything") == ["what_can_i_do"]
@@ -0,0 +1,200 @@
+"""Background conversation summaries: off the turn's critical path, in order per session."""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import fastworkflow
+from fastworkflow import conversation_summarizer
+from fastworkflow.conversation_history_io import extract_turns_from_history
+from fastworkflow.conversation_summarizer import SummaryQueue
+from fastworkflow.workflow_execution_context import WorkflowExecutionContext
+
+
+@pytest.fixture
+def ctx(monkeypatch):
+    fastworkflow.init({
+        "SPEEDDICT_FOLDERNAME": "___workflow_contexts",
+        "CONVERSATION_SUMMARY_ASYNC": "true",
+    })
+    from fastworkflow.command_routing import RoutingRegistry
+
+    RoutingRegistry.clear_registry()
+    conversation_summarizer.set_summary_queue(SummaryQueue(max_workers=2, max_pending=4))
+    context = WorkflowExecutionContext(run_as_agent=True)
+    context.bind_app_workflow(fastworkflow.Workflow.create(
+        str(Path(__file__).parent.joinpath("hello_world_workflow").resolve()),
+        workflow_id_str=f"summary-{uuid.uuid4().hex}",
+    ))
+    monkeypatch.setattr(context, "_ensure_agent_initialized", lambda: None)
+    monkeypatch.setattr(
+        "fastworkflow.workflow_agent.build_query_with_next_steps",
+        lambda user_query, session, **kwargs: user_query,
+    )
+    monkeypatch.setattr("fastworkflow.workflow_agent._what_can_i_do", lambda session: "commands")
+    monkeypatch.setattr(context, "_call_agent_with_retry", lambda agent_call, lm=None: agent_call())
+
+    def agent(user_query, available_commands):
+        context.append_action_log({"command": user_query, "response": "done"})
+        return MagicMock(final_answer=f"answered {user_query}")
+
+    context._workflow_tool_agent = agent
+    yield context
+    context.close()
+    conversation_summarizer.set_summary_queue(None)
+    RoutingRegistry.clear_registry()
+
+
+def test_turn_returns_before_its_summary_and_readers_wait_for_it(ctx, monkeypatch):
+    release = threading.Event()
+
+    def slow_summary(user_query, actions, final_agent_response):
+        release.wait(5)
+        return f"summary of {user_query}", "traces"
+
+    monkeypatch.setattr(ctx, "_extract_conversation_summary", slow_summary)
+
+    turn = ctx.process_turn("add 2 and 3")
+
+    assert turn.answer == "answered add 2 and 3"
+    assert ctx._conversation_history.messages[-1]["conversation summary"] == "add 2 and 3"
+    threading.Timer(0.05, release.set).start()
+    assert ctx.conversation_history.messages[-1] == {
+        "conversation summary": "summary of add 2 and 3",
+        "conversation_traces": "traces",
+        "feedback": None,
+    }
+
+
+def test_the_next_turn_refines_its_query_with_the_previous_summary(ctx, monkeypatch):
+    def slow_summary(user_query, actions, final_agent_response):
+        time.sleep(0.05)
+        return f"summary of {user_query}", "traces"
+
+    monkeypatch.setattr(ctx, "_extract_conversation_summary", slow_summary)
+    refined = []
+    refine = ctx._refine_user_query
+    monkeypatch.setattr(
+        ctx, "_refine_user_query",
+        lambda query, history: refined.append(refine(query, history)) or refined[-1])
+
+    ctx.process_turn("add 2 and 3")
+    ctx.process_turn("now add 4")
+
+    assert "conversation summary: summary of add 2 and 3" in refined[-1]
+
+
+def test_a_failed_summary_keeps_the_placeholder(ctx, monkeypatch):
+    def failing_summary(user_query, actions, final_agent_response):
+        raise RuntimeError("planner unavailable")
+
+    monkeypatch.setattr(ctx, "_extract_conversation_summary", failing_summary)
+
+    ctx.process_turn("add 2 and 3")
+
+    assert ctx.conversation_history.messages[-1]["conversation summary"] == "add 2 and 3"
+
+
+def test_a_sessions_summaries_run_in_submission_order():
+    queue = SummaryQueue(max_workers=4, max_pending=8)
+    finished = []
+
+    def summary(name, seconds):
+        def run():
+            time.sleep(seconds)
+            finished.append(name)
+        return run
+
+    tail = None
+    for name, seconds in (("first", 0.05), ("second", 0.0), ("third", 0.02)):
+        tail = queue.submit(summary(name, seconds), after=tail)
+    tail.result(timeout=5)
+
+    assert finished == ["first", "second", "third"]
+
+
+def test_a_full_queue_makes_the_submitter_wait():
+    queue = SummaryQueue(max_workers=1, max_pending=1)
+    release = threading.Event()
+    queue.submit(lambda: release.wait(5))
+    submitted = threading.Event()
+
+    threading.Thread(target=lambda: (queue.submit(lambda: None), submitted.set())).start()
+
+    assert not submitted.wait(0.05)
+    release.set()
+    assert submitted.wait(5)
+
+
+@pytest.mark.parametrize("replace_history", ["clear", "restore"])
+def test_replacing_the_history_drops_the_pending_summary(ctx, monkeypatch, replace_history):
+    release = threading.Event()
+
+    def slow_summary(user_query, actions, final_agent_response):
+        release.wait(5)
+        return f"summary of {user_query}", "traces"
+
+    monkeypatch.setattr(ctx, "_extract_conversation_summary", slow_summary)
+    ctx.process_turn("add 2 and 3")
+    pending = ctx._summary_tail
+    restored = {"conversation summary": "restored turn", "conversation_traces": None, "feedback": None}
+    expected = [] if replace_history == "clear" else [restored]
+
+    if replace_history == "clear":
+        ctx.clear_conversation_history()
+    else:
+        ctx.apply_serialized_state({"conversation_history_turns": [restored]})
+
+    try:
+        # Readers of the new history do not block on the old session's summary.
+        assert ctx.conversation_history.messages == expected
+        assert ctx._summary_tail is None
+    finally:
+        release.set()
+    pending.result(5)
+    assert ctx.conversation_history.messages == expected
+
+
+def test_saving_the_conversation_does_not_wait_for_its_summary(ctx, monkeypatch, tmp_path):
+    from fastworkflow.run_fastapi_mcp.conversation_store import ConversationStore
+    from fastworkflow.run_fastapi_mcp.utils import save_conversation_incremental
+    from fastworkflow.utils.logging import logger
+
+    release = threading.Event()
+
+    def slow_summary(user_query, actions, final_agent_response):
+        release.wait(5)
+        return f"summary of {user_query}", "traces"
+
+    monkeypatch.setattr(ctx, "_extract_conversation_summary", slow_summary)
+    store = ConversationStore("channel", str(tmp_path))
+    runtime = SimpleNamespace(
+        channel_id="channel", execution_context=ctx,
+        conversation_store=store, active_conversation_id=0)
+    ctx.process_turn("add 2 and 3")
+    pending = ctx._summary_tail
+
+    try:
+        save_conversation_incremental(runtime, extract_turns_from_history, logger)
+        saved = store.get_conversation(runtime.active_conversation_id)["turns"]
+        assert saved[-1]["conversation summary"] == "add 2 and 3"
+        assert not pending.done()
+    finally:
+        release.set()
+
+    # Saved again by the summary worker once the summary is recorded.
+    pending.result(5)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        saved = store.get_conversation(runtime.active_conversation_id)["turns"]
+        if saved[-1]["conversation summary"] == "summary of add 2 and 3":
+            break
+        time.sleep(0.01)
+    assert saved[-1]["conversation_traces"] == "traces"
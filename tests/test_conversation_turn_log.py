@@ -0,0 +1,155 @@
+"""The append-only turn log behind ``ConversationStore``.
+
+The last test is the save-latency benchmark: it saves a 500-turn conversation one
+turn at a time and prints the per-save latency at the start and the end (run with
+``-s`` to see it). It asserts on the deterministic part -- every save writes the
+same number of keys, however long the conversation is.
+"""
+
+import statistics
+import time
+
+import pytest
+
+from fastworkflow.run_fastapi_mcp.conversation_store import ConversationStore
+from fastworkflow.utils.rdict_pool import rdict_pool
+
+
+def _turn(n: int) -> dict:
+    return {
+        "conversation summary": f"turn {n}: the user asked for order #{n} and got it",
+        "conversation_traces": "x" * 1000,
+        "feedback": None,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    yield ConversationStore("channel", str(tmp_path))
+    rdict_pool.close_all()
+
+
+def test_each_turn_is_its_own_key_under_a_small_header(store):
+    turns = [_turn(n) for n in range(1, 4)]
+    for count in range(1, 4):
+        store.save_conversation_turns(1, turns[:count])
+
+    with rdict_pool.open(store.db_path) as db:
+        header = db["conv:1"]
+        assert "turns" not in header
+        assert header["turn_count"] == 3
+        assert [db[f"conv:1:turn:{n}"] for n in (1, 2, 3)] == turns
+
+    assert store.get_conversation(1)["turns"] == turns
+
+
+def test_a_save_rewrites_only_the_last_saved_turn_and_the_new_ones(store):
+    turns = [_turn(n) for n in range(1, 4)]
+    store.save_conversation_turns(1, turns)
+
+    turns[0]["feedback"] = {"nl_feedback": "ignored: earlier turns are final"}
+    turns[2]["feedback"] = {"nl_feedback": "kept"}
+    turns.append(_turn(4))
+    store.save_conversation_turns(1, turns)
+
+    saved = store.get_conversation(1)["turns"]
+    assert saved[0]["feedback"] is None
+    assert saved[2]["feedback"] == {"nl_feedback": "kept"}
+    assert saved[3] == turns[3]
+
+
+def test_rewrite_from_rewrites_turns_summarized_after_they_were_saved(store):
+    turns = [_turn(n) for n in range(1, 4)]
+    store.save_conversation_turns(1, turns)
+
+    turns[0]["conversation summary"] = "summarized late"
+    store.save_conversation_turns(1, turns, rewrite_from=0)
+
+    assert store.get_conversation(1)["turns"][0]["conversation summary"] == "summarized late"
+
+
+def test_a_shorter_turn_list_replaces_the_conversation(store):
+    store.save_conversation_turns(1, [_turn(n) for n in range(1, 6)])
+
+    store.save_conversation_turns(1, [_turn(9)])
+
+    assert store.get_conversation(1)["turns"] == [_turn(9)]
+    with rdict_pool.open(store.db_path) as db:
+        assert db.get("conv:1:turn:2") is None
+
+
+def test_turns_are_read_in_pages(store):
+    turns = [_turn(n) for n in range(1, 121)]
+    store.save_conversation_turns(1, turns)
+
+    assert store.get_conversation_header(1)["turn_count"] == 120
+    assert store.get_conversation_turns(1, offset=100, limit=50) == turns[100:]
+    assert store.get_conversation_turns(1, offset=120) == []
+    assert list(store.iter_conversation_turns(1, page_size=7)) == turns
+    assert store.get_conversation_turns(2) == []
+
+
+def test_a_conversation_saved_inline_is_readable_and_converted_on_save(store):
+    turns = [_turn(n) for n in range(1, 4)]
+    legacy = {"topic": "orders", "summary": "s", "created_at": 1, "updated_at": 1, "turns": turns}
+    with rdict_pool.open(store.db_path) as db:
+        db["meta"] = {"last_conversation_id": 1}
+        db["conv:1"] = legacy
+
+    assert store.get_conversation(1) == legacy
+    assert store.get_conversation_turns(1, offset=1, limit=1) == turns[1:2]
+    assert store.list_conversations(10)[0].topic == "orders"
+
+    store.save_conversation_turns(1, turns + [_turn(4)])
+
+    with rdict_pool.open(store.db_path) as db:
+        assert "turns" not in db["conv:1"]
+    conversation = store.get_conversation(1)
+    assert conversation["topic"] == "orders"
+    assert conversation["turns"] == turns + [_turn(4)]
+
+
+def test_finalizing_keeps_the_turns_and_dumps_them(store):
+    turns = [_turn(n) for n in range(1, 3)]
+    conv_id = store.reserve_next_conversation_id()
+    store.save_conversation_turns(conv_id, turns)
+    store.update_conversation_topic_summary(conv_id, "orders", "summary")
+
+    dumped = store.get_all_conversations_for_dump()
+
+    assert [(c["conversation_id"], c["topic"], c["turns"]) for c in dumped] == [
+        (conv_id, "orders", turns)]
+
+
+@pytest.fixture
+def written_turns(monkeypatch):
+    """The turn indices each save writes, in order."""
+    written = []
+    write_turns = ConversationStore._write_turns
+
+    def recording_write_turns(self, db, conv_id, previous, header, turns, start):
+        written.append(list(range(start, len(turns))))
+        return write_turns(self, db, conv_id, previous, header, turns, start)
+
+    monkeypatch.setattr(ConversationStore, "_write_turns", recording_write_turns)
+    return written
+
+
+def test_benchmark_per_turn_save_latency_is_flat_to_500_turns(store, written_turns):
+    turns = []
+    latencies = []
+    for n in range(1, 501):
+        turns.append(_turn(n))
+        started = time.perf_counter()
+        store.save_conversation_turns(1, turns)
+        latencies.append(time.perf_counter() - started)
+
+    early = statistics.median(latencies[:50])
+    late = statistics.median(latencies[-50:])
+    print(
+        f"\nconversation save latency (median): turns 1-50 {early * 1e6:.0f} us, "
+        f"turns 451-500 {late * 1e6:.0f} us"
+    )
+    assert store.get_conversation_header(1)["turn_count"] == 500
+    # Each save writes the previously last turn (it may have been edited) and the new one.
+    assert written_turns == [[0]] + [[n - 1, n] for n in range(1, 500)]
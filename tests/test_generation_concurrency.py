@@ -0,0 +1,120 @@
+"""Concurrent synthetic-utterance generation must match the sequential path exactly."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import litellm
+import pytest
+
+from fastworkflow.train import generate_synthetic
+from fastworkflow.train.determinism import UtteranceProvenance
+
+COMMAND_NAME = "add_two_numbers"
+PERSONAS = [f"persona {index}" for index in range(6)]
+
+
+def _response(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _batch_index(kwargs) -> int:
+    prompt = kwargs["messages"][0]["content"]
+    return int(prompt.split("[Persona_")[1].split("]")[0])
+
+
+def _slower_for_earlier_batches(**kwargs):
+    """Answers arrive in reverse batch order when batches run concurrently."""
+    index = _batch_index(kwargs)
+    time.sleep(0.02 * (len(PERSONAS) - index))
+    return _response(f"[Persona_{index}]\nphrase {index} alpha\nphrase {index} beta\n")
+
+
+def _generate(completion_fn, max_concurrent):
+    generate_synthetic.set_generation_limiter(
+        generate_synthetic.GenerationRateLimiter(max_concurrent=max_concurrent))
+    provenance = UtteranceProvenance(command_name=COMMAND_NAME, seed=42)
+    utterances = generate_synthetic.generate_utterances_for_personas(
+        ["add 2 and 3"],
+        COMMAND_NAME,
+        PERSONAS,
+        list(range(100, 100 + len(PERSONAS))),
+        provenance,
+        utterances_per_persona=2,
+        personas_per_batch=1,
+        model="test-model",
+        seed=42,
+        completion_fn=completion_fn,
+        _max_retries=1,
+        _retry_base_seconds=0.0,
+    )
+    return utterances, provenance
+
+
+@pytest.fixture(autouse=True)
+def reset_limiter():
+    yield
+    generate_synthetic.set_generation_limiter(None)
+
+
+def test_concurrent_batches_keep_sequential_order_and_attribution():
+    sequential = _generate(_slower_for_earlier_batches, max_concurrent=1)
+    concurrent = _generate(_slower_for_earlier_batches, max_concurrent=4)
+
+    assert concurrent[0] == sequential[0]
+    assert list(concurrent[1].utterance_personas.items()) == list(
+        sequential[1].utterance_personas.items())
+    assert concurrent[0][:2] == ["phrase 1 alpha", "phrase 1 beta"]
+
+
+def test_concurrent_partial_failure_keeps_only_the_batches_before_it():
+    def third_batch_rate_limited(**kwargs):
+        if _batch_index(kwargs) == 3:
+            raise litellm.exceptions.RateLimitError(
+                message="rate limited", llm_provider="test", model="test-model")
+        return _slower_for_earlier_batches(**kwargs)
+
+    sequential = _generate(third_batch_rate_limited, max_concurrent=1)
+    concurrent = _generate(third_batch_rate_limited, max_concurrent=4)
+
+    assert concurrent[0] == sequential[0] == [
+        "phrase 1 alpha", "phrase 1 beta", "phrase 2 alpha", "phrase 2 beta"]
+    assert concurrent[1].fell_back and sequential[1].fell_back
+    assert concurrent[1].fallback_reason == sequential[1].fallback_reason
+
+
+def test_limiter_bounds_requests_in_flight():
+    in_flight = []
+    active = 0
+    lock = threading.Lock()
+
+    def tracking_completion(**kwargs):
+        nonlocal active
+        with lock:
+            active += 1
+            in_flight.append(active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return _response(f"[Persona_{_batch_index(kwargs)}]\nsome phrase\n")
+
+    _generate(tracking_completion, max_concurrent=2)
+
+    assert max(in_flight) == 2
+
+
+def test_token_bucket_spaces_requests_beyond_the_burst():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = generate_synthetic.GenerationRateLimiter(
+        max_concurrent=2, requests_per_minute=60, clock=lambda: now[0], sleep=sleep)
+
+    for _ in range(3):
+        limiter.call(lambda: None)
+
+    assert sleeps == [pytest.approx(1.0)]
@@ -0,0 +1,164 @@
+"""Tests for ONNX export and the pluggable intent-detection inference backends."""
+
+import os
+
+import numpy as np
+import pytest
+import torch
+from transformers import (
+    BertConfig,
+    BertForSequenceClassification,
+    BertTokenizerFast,
+    DistilBertConfig,
+    DistilBertForSequenceClassification,
+    DistilBertTokenizerFast,
+)
+
+from fastworkflow import intent_backends
+from fastworkflow.model_pipeline_training import ModelPipeline
+from fastworkflow.train import onnx_export
+
+_WORDS = (
+    "add two numbers show my orders cancel the order list commands what can i do "
+    "is weather today please return item change address"
+).split()
+_UTTERANCES = [
+    "add two numbers",
+    "show my orders please",
+    "cancel the order",
+    "list commands",
+    "what can i do today",
+    "return the item",
+    "change my address please",
+]
+_NUM_LABELS = 4
+
+
+def _write_vocab(folder) -> str:
+    vocab_path = os.path.join(folder, "vocab.txt")
+    with open(vocab_path, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *_WORDS]))
+    return vocab_path
+
+
+def _save_bert(folder) -> str:
+    os.makedirs(folder)
+    tokenizer = BertTokenizerFast(_write_vocab(folder))
+    model = BertForSequenceClassification(BertConfig(
+        vocab_size=tokenizer.vocab_size, hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64, num_labels=_NUM_LABELS))
+    model.save_pretrained(folder)
+    tokenizer.save_pretrained(folder)
+    return str(folder)
+
+
+def _save_distilbert(folder) -> str:
+    os.makedirs(folder)
+    tokenizer = DistilBertTokenizerFast(_write_vocab(folder))
+    model = DistilBertForSequenceClassification(DistilBertConfig(
+        vocab_size=tokenizer.vocab_size, dim=32, n_layers=2, n_heads=2,
+        hidden_dim=64, num_labels=_NUM_LABELS))
+    model.save_pretrained(folder)
+    tokenizer.save_pretrained(folder)
+    return str(folder)
+
+
+@pytest.fixture(scope="module")
+def exported_models(tmp_path_factory):
+    """A random BERT 'tiny' and DistilBERT 'large' classifier, exported to ONNX.
+
+    Only the tests using this fixture need onnxruntime; the rest run without it.
+    """
+    pytest.importorskip("onnxruntime")
+    torch.manual_seed(0)
+    root = tmp_path_factory.mktemp("intent_models")
+    tiny_path = _save_bert(root / "tinymodel.pth")
+    large_path = _save_distilbert(root / "largemodel.pth")
+    for model_dir in (tiny_path, large_path):
+        onnx_export.export_classifier(model_dir, quantize=True)
+    return tiny_path, large_path
+
+
+def test_export_writes_graphs_inside_the_model_directory(exported_models):
+    for model_dir in exported_models:
+        assert os.path.isfile(os.path.join(model_dir, intent_backends.ONNX_MODEL_FILENAME))
+        assert os.path.isfile(os.path.join(model_dir, intent_backends.ONNX_INT8_MODEL_FILENAME))
+
+
+# 0.0 keeps every sample on the tiny model, 1.0 escalates every sample to the large one.
+@pytest.mark.parametrize("confidence_threshold", [0.0, 1.0])
+def test_onnx_backend_matches_torch_top_k(exported_models, confidence_threshold):
+    tiny_path, large_path = exported_models
+    assert onnx_export.compare_backends(
+        tiny_path, large_path, _UTTERANCES, confidence_threshold) == []
+
+
+@pytest.mark.parametrize("model_index", [0, 1], ids=["tiny", "large"])
+def test_onnx_backend_matches_torch_logits(exported_models, model_index):
+    model_dir = exported_models[model_index]
+    torch_classifier = intent_backends.load_classifier(
+        model_dir, "cpu", intent_backends.TORCH_BACKEND)
+    onnx_classifier = intent_backends.load_classifier(
+        model_dir, "cpu", intent_backends.ONNX_BACKEND)
+
+    assert isinstance(onnx_classifier, intent_backends.OnnxClassifier)
+    expected = torch_classifier.logits(_UTTERANCES)
+    actual = onnx_classifier.logits(_UTTERANCES)
+    assert actual.shape == expected.shape == (len(_UTTERANCES), _NUM_LABELS)
+    np.testing.assert_allclose(actual.numpy(), expected.numpy(), atol=1e-4)
+
+
+def test_onnx_backend_matches_torch_confidences(exported_models):
+    tiny_path, large_path = exported_models
+    results = {
+        backend: ModelPipeline(
+            tiny_path, large_path, confidence_threshold=0.0, device="cpu", backend=backend,
+        ).predict_batch(_UTTERANCES, k_val=3)
+        for backend in (intent_backends.TORCH_BACKEND, intent_backends.ONNX_BACKEND)
+    }
+    expected, actual = results[intent_backends.TORCH_BACKEND], results[intent_backends.ONNX_BACKEND]
+
+    assert actual["predictions"] == expected["predictions"]
+    np.testing.assert_allclose(actual["confidences"], expected["confidences"], atol=1e-5)
+    np.testing.assert_allclose(actual["top_k_scores"], expected["top_k_scores"], atol=1e-5)
+
+
+def test_onnx_backend_matches_torch_cls_embedding(exported_models):
+    tiny_path, large_path = exported_models
+    embeddings = {
+        backend: ModelPipeline(tiny_path, large_path, device="cpu", backend=backend).embed_cls(
+            _UTTERANCES[:3])
+        for backend in (intent_backends.TORCH_BACKEND, intent_backends.ONNX_BACKEND)
+    }
+    np.testing.assert_allclose(
+        embeddings[intent_backends.ONNX_BACKEND],
+        embeddings[intent_backends.TORCH_BACKEND],
+        atol=1e-4,
+    )
+
+
+def test_int8_backend_returns_batch_shaped_results(exported_models):
+    tiny_path, large_path = exported_models
+    pipeline = ModelPipeline(
+        tiny_path, large_path, device="cpu", backend=intent_backends.ONNX_INT8_BACKEND)
+
+    assert isinstance(pipeline.tiny_classifier, intent_backends.OnnxClassifier)
+    results = pipeline.predict_batch(_UTTERANCES, k_val=3)
+    assert len(results["top_k_predictions"]) == len(_UTTERANCES)
+    assert all(len(top_k) == 3 for top_k in results["top_k_predictions"])
+
+
+def test_missing_graph_falls_back_to_torch(tmp_path):
+    model_dir = _save_bert(tmp_path / "tinymodel.pth")
+
+    classifier = intent_backends.load_classifier(
+        model_dir, "cpu", intent_backends.ONNX_BACKEND)
+
+    assert isinstance(classifier, intent_backends.TorchClassifier)
+
+
+def test_unknown_backend_is_rejected(monkeypatch):
+    monkeypatch.setitem(
+        intent_backends.fastworkflow._env_vars, "INTENT_DETECTION_BACKEND", "tensorrt")
+    with pytest.raises(ValueError, match="INTENT_DETECTION_BACKEND"):
+        intent_backends.get_backend_name()
@@ -0,0 +1,151 @@
+"""Tests for cross-request micro-batching of intent-detection inference."""
+
+import gc
+import threading
+import weakref
+
+import torch
+
+from fastworkflow import intent_batching
+from fastworkflow.intent_batching import PredictionBatcher, _BATCH_SIZE
+
+
+class _RecordingPipeline:
+    """predict_batch stand-in that labels each text with its length."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def predict_batch(self, texts, batch_size=32, k_val=None):
+        with self._lock:
+            self.calls.append((list(texts), k_val))
+        return {
+            "predictions": [len(text) for text in texts],
+            "confidences": [0.5] * len(texts),
+            "logits": torch.arange(len(texts), dtype=torch.float32).unsqueeze(1),
+            "used_distil": [False] * len(texts),
+            "top_k_predictions": [[len(text), 0] for text in texts],
+            "top_k_scores": [[0.5, 0.1] for _ in texts],
+        }
+
+
+def test_concurrent_predictions_share_batches():
+    pipeline = _RecordingPipeline()
+    batcher = PredictionBatcher(pipeline, window_ms=200, max_batch_size=8)
+    texts = ["a" * length for length in range(1, 9)]
+    results = {}
+    start = threading.Barrier(len(texts))
+
+    def _predict(text):
+        start.wait()
+        results[text] = batcher.predict(text, k_val=2)
+
+    threads = [threading.Thread(target=_predict, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(pipeline.calls) < len(texts)
+    assert sorted(text for call, _ in pipeline.calls for text in call) == sorted(texts)
+    for text, result in results.items():
+        # Each caller gets a batch-of-one shaped slice of its own row.
+        assert result["predictions"] == [len(text)]
+        assert result["top_k_predictions"] == [[len(text), 0]]
+        assert result["logits"].shape == (1, 1)
+
+
+def test_requests_with_different_k_are_not_mixed():
+    pipeline = _RecordingPipeline()
+    batcher = PredictionBatcher(pipeline, window_ms=50, max_batch_size=8)
+    results = []
+    threads = [
+        threading.Thread(target=lambda k=k: results.append(batcher.predict("abc", k_val=k)))
+        for k in (2, 3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert {k for _, k in pipeline.calls} == {2, 3}
+    assert len(results) == 2
+
+
+def test_errors_propagate_to_every_caller():
+    class _Failing:
+        def predict_batch(self, texts, batch_size=32, k_val=None):
+            raise RuntimeError("boom")
+
+    batcher = PredictionBatcher(_Failing(), window_ms=1)
+    try:
+        batcher.predict("hello")
+    except RuntimeError as exc:
+        assert str(exc) == "boom"
+    else:
+        raise AssertionError("expected the pipeline error to reach the caller")
+
+
+def test_batch_size_histogram_is_recorded():
+    before = _BATCH_SIZE.count
+    PredictionBatcher(_RecordingPipeline(), window_ms=1).predict("hello")
+    assert _BATCH_SIZE.count == before + 1
+
+
+def test_batching_is_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("INTENT_BATCH_WINDOW_MS", raising=False)
+    assert PredictionBatcher.from_env(_RecordingPipeline()) is None
+
+
+def test_close_stops_the_worker_and_later_predictions_run_unbatched():
+    pipeline = _RecordingPipeline()
+    batcher = PredictionBatcher(pipeline, window_ms=1)
+    batcher.predict("warm")
+    worker = batcher._worker
+
+    batcher.close()
+    worker.join(timeout=5)
+
+    assert not worker.is_alive()
+    assert batcher.predict("late", k_val=2)["predictions"] == [4]
+    assert pipeline.calls[-1] == (["late"], 2)
+    assert not batcher._worker.is_alive()
+
+
+def test_an_idle_worker_exits_and_lets_the_pipeline_go(monkeypatch):
+    monkeypatch.setattr(intent_batching, "_IDLE_EXIT_SECONDS", 0.01)
+    pipeline = _RecordingPipeline()
+    batcher = PredictionBatcher(pipeline, window_ms=1)
+    batcher.predict("warm")
+    worker = batcher._worker
+
+    worker.join(timeout=5)
+
+    assert not worker.is_alive()
+    assert batcher._worker is None
+    # The next prediction starts a fresh worker.
+    assert batcher.predict("again")["predictions"] == [5]
+    worker = batcher._worker
+    worker.join(timeout=5)
+    pipeline_ref = weakref.ref(pipeline)
+    del batcher, pipeline, worker
+    gc.collect()
+    assert pipeline_ref() is None
+
+
+def test_evicting_a_pipeline_closes_its_batcher(tmp_path, monkeypatch):
+    from fastworkflow.model_pipeline_training import ModelPipeline, evict_cached_models
+
+    pipeline = object.__new__(ModelPipeline)
+    pipeline.batcher = PredictionBatcher(_RecordingPipeline(), window_ms=1)
+    pipeline.batcher.predict("warm")
+    worker = pipeline.batcher._worker
+    key = (str(tmp_path / "v1" / "tinymodel.pth"), "distil", 0.65, "cpu", "torch")
+    monkeypatch.setitem(ModelPipeline._instances_cache, key, pipeline)
+
+    assert evict_cached_models(tmp_path / "v1") == 1
+
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert pipeline.batcher._closed
@@ -0,0 +1,123 @@
+"""Hot-swapping intent model versions: background load, per-turn pinning, retirement."""
+
+import pytest
+
+from fastworkflow import intent_model_registry, intent_preload
+from fastworkflow.model_pipeline_training import CommandRouter, ModelPipeline
+from fastworkflow.train import artifact_versioning as av
+
+
+def _publish(workflow, contexts=("global", "TodoItem")) -> str:
+    version_id = av.new_version_id()
+    for folder in contexts:
+        context_dir = av.context_artifact_dir(str(workflow), version_id, folder)
+        (context_dir / "threshold.json").write_text(f'{{"version": "{version_id}"}}')
+    av.write_manifest(str(workflow), version_id)
+    av.publish_version(str(workflow), version_id)
+    return version_id
+
+
+def _compat_path(workflow, folder: str) -> str:
+    return f"{workflow}/___command_info/{folder}"
+
+
+def _version_path(workflow, version_id: str, folder: str) -> str:
+    return str(av.version_dir(str(workflow), version_id) / folder)
+
+
+@pytest.fixture
+def workflow(tmp_path):
+    workflow = tmp_path / "workflow"
+    workflow.mkdir()
+    return workflow.resolve()
+
+
+@pytest.fixture
+def routers(monkeypatch):
+    """The router cache, with a warm-up that caches a stand-in router per path."""
+    cache = {}
+    monkeypatch.setattr(CommandRouter, "_instances_cache", cache)
+    monkeypatch.setattr(ModelPipeline, "_instances_cache", {})
+    monkeypatch.setattr(
+        intent_preload, "_load_and_warm_up", lambda path: cache.setdefault(path, object()))
+    return cache
+
+
+@pytest.fixture
+def registry(workflow, routers):
+    v1 = _publish(workflow)
+    registry = intent_model_registry.watch_workflow(str(workflow), interval_seconds=0)
+    assert registry.serving == v1
+    yield registry
+    intent_model_registry.stop_watching()
+
+
+def test_compatibility_paths_resolve_into_the_serving_version(workflow, registry):
+    resolve = intent_model_registry.resolve_artifact_path
+
+    assert resolve(_compat_path(workflow, "TodoItem")) == _version_path(
+        workflow, registry.serving, "TodoItem")
+    assert resolve(str(workflow / "elsewhere" / "TodoItem")) == str(
+        workflow / "elsewhere" / "TodoItem")
+
+
+def test_unwatched_workflows_keep_their_compatibility_paths(workflow, routers):
+    _publish(workflow)
+
+    path = _compat_path(workflow, "TodoItem")
+    assert intent_model_registry.resolve_artifact_path(path) == path
+
+
+def test_a_published_version_is_warmed_up_before_it_is_swapped_in(workflow, registry, routers):
+    intent_model_registry.resolve_artifact_path(_compat_path(workflow, "TodoItem"))
+    v2 = _publish(workflow, contexts=("global", "TodoItem", "TodoList"))
+
+    assert registry.poll() is True
+
+    assert registry.serving == v2
+    # What was in use, plus global; TodoList stays lazy as it would at startup.
+    assert set(routers) == {
+        _version_path(workflow, v2, "global"), _version_path(workflow, v2, "TodoItem")}
+    assert registry.poll() is False
+
+
+def test_a_turn_keeps_its_version_and_the_old_one_retires_after_it(workflow, registry, routers):
+    v1 = registry.serving
+    old_router = routers[_version_path(workflow, v1, "TodoItem")] = object()
+
+    with intent_model_registry.turn_lease(str(workflow)):
+        v2 = _publish(workflow)
+        assert registry.poll() is True
+        assert intent_model_registry.resolve_artifact_path(
+            _compat_path(workflow, "TodoItem")) == _version_path(workflow, v1, "TodoItem")
+        assert routers[_version_path(workflow, v1, "TodoItem")] is old_router
+
+    assert _version_path(workflow, v1, "TodoItem") not in routers
+    assert intent_model_registry.resolve_artifact_path(
+        _compat_path(workflow, "TodoItem")) == _version_path(workflow, v2, "TodoItem")
+
+
+def test_an_idle_swap_retires_the_old_version_at_once(workflow, registry, routers):
+    routers[_version_path(workflow, registry.serving, "global")] = object()
+
+    _publish(workflow)
+    registry.poll()
+
+    assert all(registry.serving in path for path in routers)
+
+
+def test_a_version_that_fails_to_load_is_not_swapped_in(workflow, registry, routers, monkeypatch):
+    v1 = registry.serving
+    attempts = []
+
+    def failing_load(path):
+        attempts.append(path)
+        raise FileNotFoundError("label_encoder.pkl")
+
+    monkeypatch.setattr(intent_preload, "_load_and_warm_up", failing_load)
+    _publish(workflow)
+
+    assert registry.poll() is False
+    assert registry.poll() is False
+    assert registry.serving == v1
+    assert len(attempts) == 1
@@ -0,0 +1,81 @@
+"""Tests for the startup preloading of intent-detection models."""
+
+import pytest
+
+from fastworkflow import intent_preload
+from fastworkflow.train.selective_training import REQUIRED_CONTEXT_ARTIFACTS
+
+_MB = 2**20
+
+
+def _write_context(command_info, name: str, weight_mb: float = 1.0, complete: bool = True):
+    folder = command_info / name
+    for artifact in REQUIRED_CONTEXT_ARTIFACTS:
+        if not complete and artifact == "threshold.json":
+            continue
+        if artifact.endswith(".pth"):
+            (folder / artifact).mkdir(parents=True)
+            (folder / artifact / "model.safetensors").write_bytes(b"\0" * int(weight_mb * _MB))
+        else:
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / artifact).write_text("{}")
+
+
+@pytest.fixture
+def workflow(tmp_path):
+    command_info = tmp_path / "___command_info"
+    _write_context(command_info, "TodoList")
+    _write_context(command_info, "global")
+    _write_context(command_info, "TodoItem")
+    _write_context(command_info, "Interrupted", complete=False)
+    (command_info / "utterance_cache").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def warmed_up(monkeypatch):
+    paths = []
+    monkeypatch.setattr(intent_preload, "_load_and_warm_up", paths.append)
+    return paths
+
+
+def test_only_complete_contexts_are_preloaded_global_first(workflow):
+    assert intent_preload.trained_context_folders(str(workflow)) == [
+        "global", "TodoItem", "TodoList"]
+
+
+def test_preload_warms_up_the_paths_the_router_cache_is_keyed_on(workflow, warmed_up):
+    report = intent_preload.preload_intent_models(str(workflow), memory_budget_mb=0)
+
+    assert sorted(report.loaded) == ["TodoItem", "TodoList", "global"]
+    assert sorted(warmed_up) == sorted(
+        f"{workflow}/___command_info/{name}" for name in ("TodoItem", "TodoList", "global"))
+    assert report.estimated_mb == pytest.approx(6.0)
+
+
+def test_memory_budget_leaves_later_contexts_lazy(workflow, warmed_up):
+    report = intent_preload.preload_intent_models(str(workflow), memory_budget_mb=4.5)
+
+    assert sorted(report.loaded) == ["TodoItem", "global"]
+    assert report.over_budget == ["TodoList"]
+    assert len(warmed_up) == 2
+
+
+def test_second_preload_does_not_warm_up_again(workflow, warmed_up):
+    intent_preload.preload_intent_models(str(workflow))
+    report = intent_preload.preload_intent_models(str(workflow))
+
+    assert len(warmed_up) == 3
+    assert sorted(report.loaded) == ["TodoItem", "TodoList", "global"]
+
+
+def test_a_failing_context_does_not_stop_the_others(workflow, monkeypatch):
+    def load(path):
+        if path.endswith("TodoItem"):
+            raise FileNotFoundError("label_encoder.pkl")
+
+    monkeypatch.setattr(intent_preload, "_load_and_warm_up", load)
+    report = intent_preload.preload_intent_models(str(workflow))
+
+    assert sorted(report.loaded) == ["TodoList", "global"]
+    assert list(report.failed) == ["TodoItem"]
@@ -0,0 +1,42 @@
+"""Tests for the in-process metrics registry."""
+
+import pytest
+
+from fastworkflow.utils.metrics import MetricsRegistry
+
+
+def test_registry_returns_the_same_metric_for_the_same_name_and_labels():
+    registry = MetricsRegistry()
+    first = registry.counter("requests_total", "Requests", labels={"pool": "agent"})
+    first.inc()
+    assert registry.counter("requests_total", "Requests", labels={"pool": "agent"}) is first
+    assert registry.counter("requests_total", "Requests", labels={"pool": "action"}) is not first
+
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests", labels={"pool": "agent"})
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("wait_seconds", "Wait", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(6.05)
+    assert list(snapshot["buckets"].values()) == [1, 3, 4]
+
+
+def test_render_uses_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.gauge("active_turns", "Turns executing", labels={"pool": "agent"}).set(2)
+    registry.histogram("wait_seconds", "Wait", buckets=(1.0,)).observe(0.5)
+
+    text = registry.render()
+
+    assert "# TYPE active_turns gauge" in text
+    assert 'active_turns{pool="agent"} 2' in text
+    assert 'wait_seconds_bucket{le="1.0"} 1' in text
+    assert 'wait_seconds_bucket{le="+Inf"} 1' in text
+    assert "wait_seconds_count 1" in text
@@ -0,0 +1,108 @@
+"""Fitting contexts in worker processes must produce what fitting them in turn does."""
+
+import json
+
+import pytest
+import torch
+from safetensors.torch import load_file
+from transformers import BertConfig, BertModel, BertTokenizerFast
+
+from fastworkflow import model_pipeline_training as mpt
+
+_WORDS = "add two numbers show my orders cancel the order list commands please now".split()
+_ROWS = {
+    "Orders": [
+        ("show my orders", "show_orders"), ("show orders now", "show_orders"),
+        ("please show my orders", "show_orders"), ("cancel the order", "cancel_order"),
+        ("cancel my order", "cancel_order"), ("please cancel the order", "cancel_order"),
+        ("list commands", "list_commands"), ("list commands now", "list_commands"),
+        ("please list commands", "list_commands"),
+    ],
+    "Calculator": [
+        ("add two numbers", "add"), ("add numbers now", "add"), ("please add two", "add"),
+        ("list commands", "list_commands"), ("list commands please", "list_commands"),
+        ("now list commands", "list_commands"),
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def base_model(tmp_path_factory):
+    """A tiny random BERT saved locally, standing in for both pretrained checkpoints."""
+    folder = tmp_path_factory.mktemp("base_model")
+    vocab_path = folder / "vocab.txt"
+    vocab_path.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *_WORDS]))
+    tokenizer = BertTokenizerFast(str(vocab_path))
+    torch.manual_seed(0)
+    BertModel(BertConfig(
+        vocab_size=tokenizer.vocab_size, hidden_size=16, num_hidden_layers=1,
+        num_attention_heads=2, intermediate_size=32)).save_pretrained(folder)
+    tokenizer.save_pretrained(folder)
+    return str(folder)
+
+
+def _jobs(root, base_model):
+    return [
+        mpt.ContextFitJob(
+            context_name=name,
+            artifact_dir=str(root / name),
+            utterance_command_tuples=rows,
+            seed=42,
+            tiny_model_name=base_model,
+            large_model_name=base_model,
+        )
+        for name, rows in _ROWS.items()
+    ]
+
+
+def _artifacts(root, context_name):
+    folder = root / context_name
+    return (
+        json.loads((folder / "threshold.json").read_text()),
+        load_file(str(folder / "tinymodel.pth" / "model.safetensors")),
+        load_file(str(folder / "largemodel.pth" / "model.safetensors")),
+    )
+
+
+@pytest.fixture
+def one_torch_thread():
+    # Reductions on a different thread count round differently.
+    threads = torch.get_num_threads()
+    torch.set_num_threads(1)
+    yield
+    torch.set_num_threads(threads)
+
+
+def test_worker_processes_train_the_same_models_as_sequential_fitting(
+    tmp_path, base_model, one_torch_thread
+):
+    sequential = mpt.fit_contexts(_jobs(tmp_path / "sequential", base_model), max_workers=1)
+    parallel = mpt.fit_contexts(
+        _jobs(tmp_path / "parallel", base_model), max_workers=2, torch_threads=1)
+
+    assert [report.context for report in parallel] == ["Orders", "Calculator"]
+    assert [r.in_distribution_f1 for r in parallel] == [r.in_distribution_f1 for r in sequential]
+    for name in _ROWS:
+        expected = _artifacts(tmp_path / "sequential", name)
+        actual = _artifacts(tmp_path / "parallel", name)
+        assert actual[0] == expected[0]
+        for expected_weights, actual_weights in zip(expected[1:], actual[1:]):
+            assert actual_weights.keys() == expected_weights.keys()
+            for key, tensor in expected_weights.items():
+                torch.testing.assert_close(actual_weights[key], tensor, rtol=0, atol=0)
+
+
+def test_a_context_trains_the_same_whatever_was_fitted_before_it(
+    tmp_path, base_model, one_torch_thread
+):
+    both = _jobs(tmp_path / "both", base_model)
+    alone = [job for job in _jobs(tmp_path / "alone", base_model) if job.context_name == "Calculator"]
+
+    mpt.fit_contexts(both, max_workers=1)
+    mpt.fit_contexts(alone, max_workers=1)
+
+    expected = _artifacts(tmp_path / "both", "Calculator")
+    actual = _artifacts(tmp_path / "alone", "Calculator")
+    assert actual[0] == expected[0]
+    for key, tensor in expected[1].items():
+        torch.testing.assert_close(actual[1][key], tensor, rtol=0, atol=0)
@@ -0,0 +1,121 @@
+"""Concurrent DSPy parameter-example generation in the train CLI."""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+import fastworkflow
+from fastworkflow.train import __main__ as train_cli
+from fastworkflow.train import generate_synthetic, param_example_cache
+from fastworkflow.utils.generate_param_examples import param_example_fingerprint
+
+COMMANDS = [f"command_{index}" for index in range(6)]
+CACHED = {"command_1", "command_4"}
+
+
+class _Params(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def workflow(tmp_path, monkeypatch):
+    monkeypatch.setitem(fastworkflow._env_vars, "LLM_SYNDATA_GEN", "test-model")
+    monkeypatch.setitem(fastworkflow._env_vars, "TRAINING_SEED", "42")
+    monkeypatch.setattr(
+        train_cli, "_get_parameter_models",
+        lambda workflow: {command_name: _Params for command_name in COMMANDS})
+    cache = param_example_cache.ParamExampleCache(str(tmp_path))
+    for command_name in CACHED:
+        fingerprint = param_example_fingerprint(
+            _Params.model_fields, command_name, train_cli._DSPY_NUM_EXAMPLES,
+            train_cli._DSPY_VALIDATION_THRESHOLD, "test-model")
+        cache.store(fingerprint, 42, [{"command": f"cached {command_name}"}])
+    param_example_cache.set_param_example_cache(cache)
+    yield SimpleNamespace(folderpath=str(tmp_path))
+    param_example_cache.set_param_example_cache(None)
+    generate_synthetic.set_generation_limiter(None)
+
+
+def _written(workflow, command_name):
+    path = f"{workflow.folderpath}/___command_info/{command_name}_param_labeled.json"
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_cached_commands_skip_the_pool_and_the_rest_share_the_limiter(workflow, monkeypatch):
+    generated_on = {}
+    in_flight = []
+    active = 0
+    lock = threading.Lock()
+
+    def fake_generate(field_annotations, command_name, num_examples, validation_threshold):
+        nonlocal active
+        if command_name in CACHED:
+            entry = param_example_cache.get_param_example_cache().lookup(
+                param_example_fingerprint(
+                    field_annotations, command_name, num_examples,
+                    validation_threshold, "test-model"), 42)
+            generated_on[command_name] = threading.current_thread()
+            return entry.valid_examples, []
+        with lock:
+            active += 1
+            in_flight.append(active)
+        # Later commands finish first when they run concurrently.
+        time.sleep(0.01 * (len(COMMANDS) - COMMANDS.index(command_name)))
+        with lock:
+            active -= 1
+        generated_on[command_name] = threading.current_thread()
+        return [{"command": f"generated {command_name}"}], []
+
+    monkeypatch.setattr(train_cli, "generate_dspy_examples", fake_generate)
+    generate_synthetic.set_generation_limiter(
+        generate_synthetic.GenerationRateLimiter(max_concurrent=2))
+
+    train_cli._generate_dspy_examples_helper(workflow, max_workers=4)
+
+    for command_name in COMMANDS:
+        source = "cached" if command_name in CACHED else "generated"
+        assert _written(workflow, command_name)["valid_examples"] == [
+            {"command": f"{source} {command_name}"}]
+    assert all(generated_on[name] is threading.main_thread() for name in CACHED)
+    assert all(
+        generated_on[name] is not threading.main_thread()
+        for name in set(COMMANDS) - CACHED)
+    assert max(in_flight) == 2
+    assert param_example_cache.get_param_example_cache().stats["hit"] == len(CACHED)
+
+
+def test_a_failed_generation_is_raised_after_earlier_commands_are_written(workflow, monkeypatch):
+    def fake_generate(field_annotations, command_name, num_examples, validation_threshold):
+        if command_name == "command_3":
+            raise RuntimeError("LLM unavailable")
+        return [{"command": command_name}], []
+
+    monkeypatch.setattr(train_cli, "generate_dspy_examples", fake_generate)
+    generate_synthetic.set_generation_limiter(
+        generate_synthetic.GenerationRateLimiter(max_concurrent=1))
+
+    with pytest.raises(RuntimeError, match="LLM unavailable"):
+        train_cli._generate_dspy_examples_helper(workflow)
+
+    assert _written(workflow, "command_2")["valid_examples"] == [{"command": "command_2"}]
+
+
+def test_timing_summary_reports_cache_hits_and_generation_latency():
+    timings = [
+        train_cli._ParamExampleTiming("a", 0.01, cached=True),
+        train_cli._ParamExampleTiming("b", 2.0, cached=False),
+        train_cli._ParamExampleTiming("c", 5.0, cached=False),
+        train_cli._ParamExampleTiming("d", 3.0, cached=False),
+    ]
+
+    summary = train_cli._format_param_example_timings(timings, wall_seconds=5.2)
+
+    assert summary == (
+        "DSPy parameter examples for 4 command(s) in 5.2s: 1 cached, 3 generated "
+        "(latency p50 3.0s, slowest 5.0s for 'c')"
+    )
@@ -0,0 +1,97 @@
+"""Tests for the per-command cache of compiled DSPy parameter extractors."""
+
+import json
+import os
+
+import dspy
+import pytest
+from dspy.utils import DummyLM
+from pydantic import BaseModel, Field
+
+import fastworkflow
+from fastworkflow.utils import signatures
+
+
+class _Params(BaseModel):
+    name: str = Field(description="The name of the person to call")
+
+
+def _write_trainset(path, names):
+    with open(path, "w") as f:
+        json.dump({"valid_examples": [
+            {"fields": {"statement": f"call {name}", "name": name}, "inputs": ["statement"]}
+            for name in names
+        ]}, f)
+
+
+@pytest.fixture
+def trainset_dir(tmp_path, monkeypatch):
+    monkeypatch.setitem(fastworkflow._env_vars, "NOT_FOUND", "NOT_FOUND")
+    monkeypatch.setitem(fastworkflow._env_vars, "PARAMETER_EXTRACTION_ERROR_MSG", "{error}")
+    monkeypatch.setattr(
+        signatures, "get_route_layer_filepath_model",
+        lambda workflow_folderpath, filename: os.path.join(workflow_folderpath, filename))
+    monkeypatch.setattr(signatures, "_param_extractor_cache", {})
+    _write_trainset(tmp_path / "call_param_labeled.json", ["bob"])
+    return str(tmp_path)
+
+
+@pytest.fixture
+def trainset_loads(monkeypatch):
+    loads = []
+    get_trainset = signatures.get_trainset
+
+    def counting_get_trainset(subject_command_name, workflow_folderpath):
+        loads.append(subject_command_name)
+        return get_trainset(subject_command_name, workflow_folderpath)
+
+    monkeypatch.setattr(signatures, "get_trainset", counting_get_trainset)
+    return loads
+
+
+def test_extractor_is_compiled_once_per_command(trainset_dir, trainset_loads):
+    extractor = signatures.InputForParamExtraction(command="call alice")
+
+    first = signatures._get_param_extractor(extractor, _Params, "call", trainset_dir)
+    second = signatures._get_param_extractor(extractor, _Params, "call", trainset_dir)
+
+    assert first is second
+    assert trainset_loads == ["call"]
+
+
+def test_rewritten_trainset_recompiles_the_extractor(trainset_dir, trainset_loads):
+    extractor = signatures.InputForParamExtraction(command="call alice")
+    first = signatures._get_param_extractor(extractor, _Params, "call", trainset_dir)
+
+    _write_trainset(os.path.join(trainset_dir, "call_param_labeled.json"), ["bob", "carol"])
+    second = signatures._get_param_extractor(extractor, _Params, "call", trainset_dir)
+
+    assert second is not first
+    assert [len(predictor.demos) for predictor in second.predictors()] == [2]
+    assert trainset_loads == ["call", "call"]
+
+
+def test_extract_parameters_reuses_the_compiled_extractor(trainset_dir, trainset_loads, monkeypatch):
+    lm = DummyLM([{"reasoning": "named", "name": "alice"}] * 4, adapter=dspy.JSONAdapter())
+    monkeypatch.setattr(signatures, "_get_param_extraction_lm", lambda: lm)
+    extractor = signatures.InputForParamExtraction(command="call alice")
+
+    results = [extractor.extract_parameters(_Params, "call", trainset_dir) for _ in range(2)]
+
+    assert [result.name for result in results] == ["alice", "alice"]
+    assert trainset_loads == ["call"]
+
+
+def test_unresolvable_trainset_path_compiles_without_the_cache(trainset_dir, trainset_loads, monkeypatch):
+    def missing_routing_path(workflow_folderpath, filename):
+        raise FileNotFoundError("no routing definition")
+
+    monkeypatch.setattr(signatures, "get_route_layer_filepath_model", missing_routing_path)
+    extractor = signatures.InputForParamExtraction(command="call alice")
+
+    first = signatures._get_param_extractor(extractor, _Params, "call", trainset_dir)
+    second = signatures._get_param_extractor(extractor, _Params, "call", trainset_dir)
+
+    assert first is not second
+    assert [len(predictor.demos) for predictor in first.predictors()] == [0]
+    assert trainset_loads == ["call", "call"]
@@ -0,0 +1,54 @@
+"""RdictPool opens databases without holding the pool-wide lock."""
+
+import threading
+
+from fastworkflow.utils import rdict_pool as rdict_pool_module
+from fastworkflow.utils.rdict_pool import RdictPool
+
+
+def test_a_slow_open_does_not_block_other_paths(tmp_path, monkeypatch):
+    slow_open_started = threading.Event()
+    release_slow_open = threading.Event()
+    real_rdict = rdict_pool_module.Rdict
+
+    def rdict(path):
+        if path.endswith("slow"):
+            slow_open_started.set()
+            release_slow_open.wait(5)
+        return real_rdict(path)
+
+    monkeypatch.setattr(rdict_pool_module, "Rdict", rdict)
+    pool = RdictPool(max_idle_handles=4)
+    slow = threading.Thread(target=pool.acquire, args=(str(tmp_path / "slow"),))
+    slow.start()
+    try:
+        assert slow_open_started.wait(5)
+        with pool.open(str(tmp_path / "fast")) as db:
+            db["key"] = "value"
+    finally:
+        release_slow_open.set()
+        slow.join(5)
+
+    pool.release(str(tmp_path / "slow"))
+    assert pool.metrics()["opens"] == 2
+    pool.close_all()
+
+
+def test_concurrent_acquires_of_one_path_share_a_single_open(tmp_path):
+    pool = RdictPool(max_idle_handles=4)
+    path = str(tmp_path / "shared")
+    handles = []
+    threads = [
+        threading.Thread(target=lambda: handles.append(pool.acquire(path)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len({id(db) for db in handles}) == 1
+    assert pool.metrics()["opens"] == 1
+    for _ in handles:
+        pool.release(path)
+    pool.close_all()
@@ -482,6 +482,18 @@ def test_a_changed_seed_forces_a_full_retrain(baseline):
     assert any("seed changed" in reason for reason in plan.global_reasons)
 
 
+def test_shared_backbone_mode_forces_a_full_retrain(baseline, monkeypatch):
+    """Heads fitted on an earlier backbone cannot sit on the one this run trains."""
+    workflow_path, version_id = baseline
+    monkeypatch.setitem(
+        fastworkflow._env_vars, "INTENT_DETECTION_SHARED_BACKBONE", "true")
+
+    plan = _plan(workflow_path, version_id)
+
+    assert plan.is_full_retrain
+    assert plan.contexts_carried_forward == []
+
+
 def test_an_unreadable_baseline_signature_forces_a_full_retrain(baseline):
     """A corrupt baseline is an inability to check, which is not a passing check."""
     workflow_path, version_id = baseline
@@ -0,0 +1,84 @@
+"""Tests for the shared encoder backbone and its per-context classification heads."""
+
+import os
+
+import torch
+from transformers import BertConfig, BertModel, BertTokenizerFast
+
+from fastworkflow import intent_backends, shared_backbone
+from fastworkflow.train.artifact_versioning import SHARED_BACKBONE_FOLDERNAME
+
+_WORDS = "add two numbers show my orders cancel the order list commands".split()
+_UTTERANCES = ["add two numbers", "show my orders", "cancel the order"]
+
+
+def _save_backbone(root) -> str:
+    """A random BERT encoder saved where training puts the shared tiny backbone."""
+    folder = root / SHARED_BACKBONE_FOLDERNAME / "tinymodel.pth"
+    os.makedirs(folder)
+    vocab_path = folder / "vocab.txt"
+    vocab_path.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *_WORDS]))
+    tokenizer = BertTokenizerFast(str(vocab_path))
+    BertModel(BertConfig(
+        vocab_size=tokenizer.vocab_size, hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64)).save_pretrained(folder)
+    tokenizer.save_pretrained(folder)
+    return str(folder)
+
+
+def _save_head(root, context_name: str, backbone_path: str, num_labels: int) -> str:
+    head_path = str(root / context_name / "tinymodel.pth")
+    head = shared_backbone.HeadModel(backbone_path, num_labels, "cpu")
+    head.save_pretrained(head_path)
+    return head_path
+
+
+def test_head_directory_loads_as_head_classifier_with_training_logits(tmp_path):
+    torch.manual_seed(0)
+    backbone_path = _save_backbone(tmp_path)
+    head = shared_backbone.HeadModel(backbone_path, 3, "cpu")
+    head_path = str(tmp_path / "Ctx" / "tinymodel.pth")
+    head.save_pretrained(head_path)
+
+    classifier = intent_backends.load_classifier(head_path, "cpu")
+
+    assert isinstance(classifier, shared_backbone.HeadClassifier)
+    assert classifier.num_labels == 3
+    encodings = classifier.tokenizer(_UTTERANCES, padding=True, return_tensors="pt")
+    with torch.no_grad():
+        expected = head(encodings["input_ids"], attention_mask=encodings["attention_mask"]).logits
+    torch.testing.assert_close(classifier.logits(_UTTERANCES), expected, atol=1e-5, rtol=1e-5)
+
+
+def test_heads_share_one_backbone_and_one_encoder_pass(tmp_path, monkeypatch):
+    backbone_path = _save_backbone(tmp_path)
+    heads = [
+        intent_backends.load_classifier(
+            _save_head(tmp_path, name, backbone_path, num_labels), "cpu")
+        for name, num_labels in (("Child", 4), ("Parent", 2))
+    ]
+    assert heads[0].backbone is heads[1].backbone
+
+    backbone = heads[0].backbone
+    calls = []
+    encode = backbone.embed_encoded
+    monkeypatch.setattr(
+        backbone, "embed_encoded", lambda *args: calls.append(args) or encode(*args))
+
+    logits = shared_backbone.score_heads("list commands", heads)
+
+    assert [row.shape[0] for row in logits] == [4, 2]
+    assert len(calls) == 1
+
+
+def test_head_reached_through_a_compat_symlink_uses_its_own_versions_backbone(tmp_path):
+    version = tmp_path / "versions" / "v1"
+    backbone_path = _save_backbone(version)
+    head_path = _save_head(version, "Ctx", backbone_path, 2)
+    compat = tmp_path / "Ctx"
+    os.symlink(version / "Ctx", compat)
+
+    resolved = shared_backbone.resolve_backbone_path(str(compat / "tinymodel.pth"))
+
+    assert os.path.realpath(resolved) == os.path.realpath(backbone_path)
+    assert shared_backbone.is_head_dir(head_path)
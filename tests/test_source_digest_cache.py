@@ -0,0 +1,164 @@
+"""The stat-keyed source digest cache behind ``compute_command_fingerprints``.
+
+The last test is the cold/warm benchmark on ``examples/retail_workflow``: it prints
+both timings (run with ``-s`` to see them) and asserts on the deterministic part --
+a warm run with nothing changed reads no source file at all.
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+from dotenv import dotenv_values
+
+import fastworkflow
+from fastworkflow.command_context_model import CommandContextModel
+from fastworkflow.command_routing import RoutingDefinition, RoutingRegistry
+from fastworkflow.train import selective_training as st
+
+RETAIL_WORKFLOW_PATH = os.path.join("fastworkflow", "examples", "retail_workflow")
+AN_HOUR_AGO_NS = time.time_ns() - 3600 * 10**9
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    """Every path actually read and hashed, in order."""
+    reads = []
+    sha256_file = st._sha256_file
+
+    def counting_sha256_file(path):
+        reads.append(path)
+        return sha256_file(path)
+
+    monkeypatch.setattr(st, "_sha256_file", counting_sha256_file)
+    return reads
+
+
+@pytest.fixture
+def workflow(tmp_path):
+    return str(tmp_path / "workflow")
+
+
+def _write(path, text, mtime_ns=AN_HOUR_AGO_NS):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_an_unchanged_file_is_hashed_once_across_runs(workflow, tmp_path, hashed):
+    source = _write(tmp_path / "command.py", "utterances = ['a']")
+
+    first = st.SourceDigestCache.load(workflow)
+    sha = first.digest(source)
+    first.save()
+    second = st.SourceDigestCache.load(workflow)
+
+    assert second.digest(source) == sha
+    assert (second.hits, second.misses) == (1, 0)
+    assert hashed == [source]
+
+
+@pytest.mark.parametrize("edit", ["content", "same_size_rename_over"])
+def test_a_changed_file_is_rehashed(workflow, tmp_path, hashed, edit):
+    source = _write(tmp_path / "command.py", "utterances = ['a']")
+    cache = st.SourceDigestCache.load(workflow)
+    before = cache.digest(source)
+    cache.save()
+
+    if edit == "content":
+        _write(tmp_path / "command.py", "utterances = ['a', 'b']")
+    else:
+        # Same size and same mtime: only the inode tells the two files apart.
+        replacement = _write(tmp_path / "replacement.py", "utterances = ['b']")
+        os.replace(replacement, source)
+
+    after = st.SourceDigestCache.load(workflow).digest(source)
+
+    assert after != before
+    assert after == st._sha256_file(source)
+    assert len(hashed) == 3
+
+
+def test_a_recently_modified_file_is_not_persisted(workflow, tmp_path, hashed):
+    source = _write(tmp_path / "command.py", "utterances = ['a']", mtime_ns=time.time_ns())
+
+    cache = st.SourceDigestCache.load(workflow)
+    cache.digest(source)
+    cache.save()
+    st.SourceDigestCache.load(workflow).digest(source)
+
+    assert hashed == [source, source]
+
+
+def test_a_corrupt_cache_file_is_an_empty_cache(workflow, tmp_path, hashed):
+    source = _write(tmp_path / "command.py", "utterances = ['a']")
+    cache = st.SourceDigestCache.load(workflow)
+    Path(cache.path).write_text("{not json")
+
+    assert st.SourceDigestCache.load(workflow).digest(source) == st._sha256_file(source)
+    assert len(hashed) == 2
+
+
+def test_entries_not_looked_up_are_dropped_on_save(workflow, tmp_path):
+    kept = _write(tmp_path / "kept.py", "kept")
+    deleted = _write(tmp_path / "deleted.py", "deleted")
+    cache = st.SourceDigestCache.load(workflow)
+    cache.digest(kept)
+    cache.digest(deleted)
+    cache.save()
+
+    cache = st.SourceDigestCache.load(workflow)
+    cache.digest(kept)
+    cache.save()
+
+    entries = json.loads(open(cache.path).read())["entries"]
+    assert list(entries) == [os.path.abspath(kept)]
+
+
+def test_unreadable_file_has_no_digest(workflow, tmp_path):
+    cache = st.SourceDigestCache.load(workflow)
+
+    assert cache.digest(str(tmp_path / "missing.py")) is None
+
+
+@pytest.fixture
+def retail_workflow(tmp_path):
+    example_env = os.path.join("fastworkflow", "examples", "fastworkflow.env")
+    fastworkflow.init(env_vars=dotenv_values(example_env))
+    workflow_path = str(tmp_path / "retail_workflow")
+    # copytree keeps the sources' mtimes, so none of them is racy.
+    shutil.copytree(
+        RETAIL_WORKFLOW_PATH,
+        workflow_path,
+        ignore=shutil.ignore_patterns(
+            "___command_info", "___workflow_contexts", "___convo_info", "__pycache__"),
+    )
+    RoutingRegistry.clear_registry()
+    CommandContextModel.load(workflow_path)
+    RoutingDefinition.build(workflow_path)
+    yield workflow_path
+    RoutingRegistry.clear_registry()
+
+
+def test_benchmark_cold_and_warm_fingerprints_on_retail_workflow(retail_workflow, hashed):
+    started = time.perf_counter()
+    cold = st.compute_command_fingerprints(retail_workflow)
+    cold_seconds = time.perf_counter() - started
+    cold_reads = len(hashed)
+
+    hashed.clear()
+    started = time.perf_counter()
+    warm = st.compute_command_fingerprints(retail_workflow)
+    warm_seconds = time.perf_counter() - started
+
+    print(
+        f"\nretail_workflow fingerprints: {len(cold)} commands; "
+        f"cold {cold_seconds * 1000:.1f} ms ({cold_reads} files hashed), "
+        f"warm {warm_seconds * 1000:.1f} ms ({len(hashed)} files hashed)"
+    )
+    assert warm == cold
+    assert cold_reads > 0
+    assert hashed == []
@@ -0,0 +1,154 @@
+"""The vectorized threshold sweeps must pick what the per-threshold loops picked."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+from sklearn.metrics import f1_score
+
+from fastworkflow import model_pipeline_training as mpt
+
+_NUM_SAMPLES = 60
+_NUM_CLASSES = 6
+
+
+class _TableModel:
+    """Returns a fixed row of logits per sample; ``input_ids[:, 0]`` is the sample index."""
+
+    def __init__(self, logits: torch.Tensor):
+        self.table = logits
+        self.calls = 0
+
+    def eval(self):
+        return self
+
+    def __call__(self, input_ids, attention_mask=None):
+        self.calls += 1
+        return SimpleNamespace(logits=self.table[input_ids[:, 0]])
+
+
+class _TableClassifier:
+    def __init__(self, logits: torch.Tensor, texts: list[str]):
+        self.table = logits
+        self.rows = {text: row for row, text in enumerate(texts)}
+
+    def logits(self, texts):
+        return self.table[[self.rows[text] for text in texts]]
+
+
+class _Pipeline:
+    """The parts of ModelPipeline that ``evaluate`` needs, over fixed logits."""
+
+    predict_batch = mpt.ModelPipeline.predict_batch
+    evaluate = mpt.ModelPipeline.evaluate
+    calculate_ndcg_at_k = mpt.ModelPipeline.calculate_ndcg_at_k
+
+    def __init__(self, tiny_logits, distil_logits, texts):
+        self.tiny_classifier = _TableClassifier(tiny_logits, texts)
+        self.distil_classifier = _TableClassifier(distil_logits, texts)
+        self.device = "cpu"
+        self.confidence_threshold = 0.65
+        self.k_val = 3
+
+
+def _loader(labels: torch.Tensor, texts: list[str], batch_size: int = 7):
+    batches = []
+    for start in range(0, len(labels), batch_size):
+        indices = torch.arange(start, min(start + batch_size, len(labels)))
+        encodings = {"input_ids": indices[:, None], "attention_mask": torch.ones(len(indices), 1)}
+        batches.append((encodings, labels[indices], texts[start:start + len(indices)]))
+    return batches
+
+
+@pytest.fixture(params=[0, 1, 2])
+def data(request):
+    generator = torch.Generator().manual_seed(request.param)
+    labels = torch.randint(0, _NUM_CLASSES, (_NUM_SAMPLES,), generator=generator)
+    texts = [f"utterance {i}" for i in range(_NUM_SAMPLES)]
+
+    def noisy_logits(signal):
+        logits = torch.randn(_NUM_SAMPLES, _NUM_CLASSES, generator=generator)
+        logits[torch.arange(_NUM_SAMPLES), labels] += signal
+        return logits
+
+    return SimpleNamespace(
+        labels=labels, texts=texts, loader=_loader(labels, texts),
+        tiny_logits=noisy_logits(1.5), distil_logits=noisy_logits(3.0))
+
+
+def _reference_confidence_threshold(model, loader, min_threshold=0.2, max_top3_usage=0.3,
+                                    step_size=0.01, k_val=3):
+    """The per-threshold loop the sweep replaced: one pass over the loader per threshold."""
+    stats = mpt.analyze_model_confidence(model, loader, "cpu")[0]
+    best_score, optimal_threshold = 0, None
+    for threshold in np.arange(min_threshold, min(stats['successful']['max'], 0.95), step_size):
+        true_labels, predicted_labels, top3_count, total = [], [], 0, 0
+        for encodings, labels, _ in loader:
+            probs = torch.softmax(model(encodings['input_ids']).logits, dim=1)
+            top_probs, top_preds = torch.topk(probs, k=k_val, dim=1)
+            total += labels.size(0)
+            for i in range(labels.size(0)):
+                if top_probs[i, 0] >= threshold:
+                    pred = top_preds[i, 0]
+                else:
+                    top3_count += 1
+                    pred = labels[i] if labels[i] in top_preds[i] else top_preds[i, 0]
+                true_labels.append(labels[i].item())
+                predicted_labels.append(pred.item())
+        f1 = f1_score(true_labels, predicted_labels, average='weighted')
+        top3_usage = top3_count / total
+        score = f1 if top3_usage <= max_top3_usage else f1 * (1 - 2 * (top3_usage - max_top3_usage))
+        if score > best_score and top3_usage <= max_top3_usage:
+            best_score, optimal_threshold = score, threshold
+    return optimal_threshold, best_score
+
+
+def _reference_cascade_threshold(tiny_stats, loader, pipeline):
+    """The per-threshold loop the sweep replaced: a full ``evaluate`` per threshold."""
+    results = []
+    for threshold in np.linspace(tiny_stats['failed']['mean'], tiny_stats['successful']['mean'], 20):
+        pipeline.confidence_threshold = threshold
+        f1, ndcg, stats = pipeline.evaluate(loader)
+        results.append({'threshold': threshold, 'f1': f1, 'ndcg': ndcg,
+                        'distil_usage': stats['distil_percentage']})
+    best = max(results, key=lambda x: x['f1'] * x['ndcg'] * (1 - 0.15 * (x['distil_usage'] / 100)))
+    return best, results
+
+
+def test_confidence_threshold_sweep_matches_the_per_threshold_loop(data):
+    model = _TableModel(data.tiny_logits)
+    expected_threshold, expected_score = _reference_confidence_threshold(model, data.loader)
+
+    model.calls = 0
+    threshold, metrics = mpt.find_optimal_confidence_threshold(
+        model, data.loader, "cpu", min_threshold=0.2)
+
+    assert threshold == expected_threshold
+    assert metrics['combined_score'] == pytest.approx(expected_score)
+    assert model.calls == len(data.loader)
+
+
+def test_confidence_threshold_sweep_reuses_given_model_outputs(data):
+    model = _TableModel(data.tiny_logits)
+    outputs = mpt.collect_model_outputs(model, data.loader, "cpu")
+
+    model.calls = 0
+    threshold, _ = mpt.find_optimal_confidence_threshold(
+        model, data.loader, "cpu", min_threshold=0.2, model_outputs=outputs)
+
+    assert model.calls == 0
+    assert threshold == _reference_confidence_threshold(model, data.loader)[0]
+
+
+def test_cascade_threshold_sweep_matches_evaluate_per_threshold(data):
+    tiny_stats = mpt.analyze_model_confidence(_TableModel(data.tiny_logits), data.loader, "cpu")[0]
+    expected_best, expected_results = _reference_cascade_threshold(
+        tiny_stats, data.loader, _Pipeline(data.tiny_logits, data.distil_logits, data.texts))
+
+    best, results = mpt.find_optimal_threshold(
+        tiny_stats, data.loader, _Pipeline(data.tiny_logits, data.distil_logits, data.texts))
+
+    assert best['threshold'] == expected_best['threshold']
+    for key in ("threshold", "f1", "ndcg", "distil_usage"):
+        assert [r[key] for r in results] == pytest.approx([float(r[key]) for r in expected_results])
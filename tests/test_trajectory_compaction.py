@@ -0,0 +1,84 @@
+"""Token-budgeted trajectory compaction for fastWorkflowReAct."""
+
+from __future__ import annotations
+
+import dspy
+import pytest
+
+from fastworkflow.utils.react import fastWorkflowReAct
+from fastworkflow.utils.trajectory_compaction import TrajectoryCompactor, count_tokens
+
+
+def _trajectory(steps: int, observation_chars: int = 2000) -> dict:
+    trajectory = {}
+    for idx in range(steps):
+        trajectory[f"thought_{idx}"] = f"thinking about step {idx}"
+        trajectory[f"tool_name_{idx}"] = "execute_workflow_query"
+        trajectory[f"tool_args_{idx}"] = {"command": f"command {idx}"}
+        trajectory[f"observation_{idx}"] = f"result {idx} " + "x" * observation_chars
+    return trajectory
+
+
+def _full_text(trajectory: dict) -> str:
+    react = fastWorkflowReAct.__new__(fastWorkflowReAct)
+    return react._format_trajectory(trajectory)
+
+
+@pytest.fixture(autouse=True)
+def no_lm():
+    with dspy.context(lm=None, adapter=dspy.ChatAdapter()):
+        yield
+
+
+def test_a_trajectory_within_budget_is_formatted_unchanged():
+    trajectory = _trajectory(3)
+    compactor = TrajectoryCompactor(budget_tokens=100_000)
+
+    assert compactor.format(trajectory) == _full_text(trajectory)
+    assert compactor.tokens_saved == 0
+
+
+def test_older_observations_are_elided_first():
+    trajectory = _trajectory(4)
+    full_tokens = count_tokens(None, _full_text(trajectory))
+    compactor = TrajectoryCompactor(budget_tokens=full_tokens - 400, keep_recent_steps=2)
+
+    text = compactor.format(trajectory)
+
+    assert count_tokens(None, text) <= full_tokens - 400
+    assert "[elided to fit the token budget" in text
+    # Every step is still there, and the recent ones are untouched.
+    assert all(f"thinking about step {idx}" in text for idx in range(4))
+    assert trajectory["observation_3"] in text and trajectory["observation_2"] in text
+    assert trajectory["observation_0"] not in text
+    assert compactor.tokens_saved > 0
+
+
+def test_oldest_steps_are_dropped_when_eliding_is_not_enough():
+    trajectory = _trajectory(4)
+    recent = {key: value for key, value in trajectory.items() if key[-1] in "23"}
+    compactor = TrajectoryCompactor(
+        budget_tokens=count_tokens(None, _full_text(recent)) + 20, keep_recent_steps=2)
+
+    text = compactor.format(trajectory)
+
+    assert "thinking about step 0" not in text
+    assert trajectory["observation_3"] in text
+    # The trajectory itself is never modified.
+    assert len(trajectory) == 16
+
+
+def test_entries_are_formatted_once(monkeypatch):
+    trajectory = _trajectory(2)
+    compactor = TrajectoryCompactor(budget_tokens=100_000)
+    compactor.format(trajectory)
+
+    formatted = []
+    format_entry = compactor._format_entry
+    monkeypatch.setattr(
+        compactor, "_format_entry",
+        lambda adapter, model, key, value: formatted.append(key) or format_entry(adapter, model, key, value))
+    trajectory["thought_2"] = "one more step"
+    compactor.format(trajectory)
+
+    assert formatted == ["thought_2"]
@@ -0,0 +1,98 @@
+"""Bounded turn pools: admission, load shedding and queue-depth accounting."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from fastworkflow.run_fastapi_mcp.turn_executor import (
+    TurnPool,
+    TurnPoolClosedError,
+    TurnPoolFullError,
+    TurnPools,
+    get_turn_pools,
+    set_turn_pools,
+    shutdown_turn_pools,
+    turn_pool_http_exception,
+)
+
+
+@pytest.fixture
+def pool():
+    turn_pool = TurnPool("test", workers=1, max_queued=1)
+    yield turn_pool
+    turn_pool.shutdown()
+
+
+def test_a_full_pool_sheds_turns_with_429(pool):
+    async def scenario():
+        release = threading.Event()
+        running = asyncio.ensure_future(pool.run(lambda: release.wait(5)))
+        queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        assert pool.stats() == {"active": 1, "queued": 1, "capacity": 2}
+
+        with pytest.raises(TurnPoolFullError) as shed:
+            await pool.run(lambda: "shed")
+        assert turn_pool_http_exception(shed.value).status_code == 429
+
+        release.set()
+        assert await queued == "queued"
+        await running
+
+    asyncio.run(scenario())
+    assert pool.stats() == {"active": 0, "queued": 0, "capacity": 2}
+
+
+def test_a_shut_down_pool_sheds_turns_with_503(pool):
+    pool.shutdown()
+
+    with pytest.raises(TurnPoolClosedError) as shed:
+        pool.admit()
+    assert turn_pool_http_exception(shed.value).status_code == 503
+
+
+def test_turns_submitted_after_server_shutdown_are_shed_with_503():
+    set_turn_pools(TurnPools(agent=TurnPool("a", 1, 1), fast=TurnPool("f", 1, 1)))
+    try:
+        shutdown_turn_pools()
+
+        with pytest.raises(TurnPoolClosedError) as shed:
+            get_turn_pools().for_kind("invoke_agent").admit()
+        assert turn_pool_http_exception(shed.value).status_code == 503
+    finally:
+        set_turn_pools(None)
+
+
+def test_a_turn_admitted_before_shutdown_is_shed_when_it_runs(pool):
+    ticket = pool.admit()
+    pool.shutdown()
+
+    with pytest.raises(TurnPoolClosedError):
+        asyncio.run(ticket.run(lambda: "never runs"))
+    ticket.release()
+
+    assert pool.stats() == {"active": 0, "queued": 0, "capacity": 2}
+
+
+def test_an_admitted_turn_that_never_runs_gives_its_slot_back(pool):
+    ticket = pool.admit()
+    assert pool.stats()["queued"] == 1
+
+    ticket.release()
+    ticket.release()
+
+    assert pool.stats() == {"active": 0, "queued": 0, "capacity": 2}
+
+
+def test_agent_turns_and_fast_turns_use_separate_pools():
+    pools = TurnPools(agent=TurnPool("a", 1, 0), fast=TurnPool("f", 1, 0))
+    try:
+        assert pools.for_kind("invoke_agent") is pools.agent
+        assert pools.for_kind("invoke_assistant") is pools.fast
+        assert pools.for_kind("perform_action") is pools.fast
+        assert pools.for_kind("initialize_startup") is pools.fast
+    finally:
+        pools.shutdown()
@@ -0,0 +1,143 @@
+"""Bounded turn registry: TTL after completion, LRU caps and compact replay records."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import fastworkflow
+from fastworkflow.run_fastapi_mcp.turns import (
+    ExecState,
+    TraceDigest,
+    TurnRegistry,
+    _now,
+    render_turn_response,
+)
+from fastworkflow.utils.metrics import metrics
+
+TRACES = [
+    {"direction": "agent_to_workflow", "command_name": "add", "timestamp_ms": 1},
+    {"direction": "workflow_to_agent", "command_name": "add", "timestamp_ms": 2},
+]
+
+
+async def _finish(registry: TurnRegistry, channel_id: str, answer: str = "ok", traces=()):
+    """Run a turn through the registry the way ``_run_turn`` does, without a pool."""
+    execn = await registry.start_or_get_active(
+        channel_id, kind="assistant", idempotency_key=channel_id, run_turn=lambda execn: None)
+    execn.result = fastworkflow.TurnOutput(
+        turn_key=execn.turn_key, status=fastworkflow.TurnStatus.COMPLETED, answer=answer)
+    execn.traces = list(traces)
+    execn.trace_digest = TraceDigest.of(execn.traces)
+    execn.finished_at = _now()
+    execn.exec_state = ExecState.DONE
+    await registry.complete(execn)
+    return execn
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_a_finished_turn_is_evicted_after_its_ttl():
+    registry = TurnRegistry(ttl_seconds=60, max_completed=10, max_bytes=1 << 20)
+    execn = _run(_finish(registry, "c1"))
+
+    assert registry.get(execn.turn_key) is execn
+    assert registry.evict_terminal(_now() + timedelta(seconds=59)) == 0
+    assert registry.evict_terminal(_now() + timedelta(seconds=61)) == 1
+    assert registry.get(execn.turn_key) is None
+    assert registry.stats() == {"live": 0, "completed": 0, "completed_bytes": 0}
+
+
+def test_an_expired_record_is_not_returned_before_a_sweep():
+    registry = TurnRegistry(ttl_seconds=0, max_completed=10, max_bytes=1 << 20)
+    execn = _run(_finish(registry, "c1"))
+
+    assert registry.get(execn.turn_key) is None
+
+
+def test_the_count_cap_evicts_the_least_recently_fetched_record():
+    registry = TurnRegistry(ttl_seconds=600, max_completed=2, max_bytes=1 << 20)
+
+    async def scenario():
+        first = await _finish(registry, "c1")
+        second = await _finish(registry, "c2")
+        registry.get(first.turn_key)
+        third = await _finish(registry, "c3")
+        return first, second, third
+
+    first, second, third = _run(scenario())
+
+    assert registry.get(second.turn_key) is None
+    assert registry.get(first.turn_key) is first
+    assert registry.get(third.turn_key) is third
+
+
+def test_the_byte_cap_bounds_retained_records():
+    registry = TurnRegistry(ttl_seconds=600, max_completed=1000, max_bytes=20_000)
+
+    async def scenario():
+        return [await _finish(registry, f"c{i}", answer="x" * 4000) for i in range(20)]
+
+    turns = _run(scenario())
+
+    stats = registry.stats()
+    assert stats["completed_bytes"] <= 20_000
+    assert 0 < stats["completed"] < 20
+    assert registry.get(turns[-1].turn_key) is turns[-1]
+    assert registry.get(turns[0].turn_key) is None
+
+
+def test_live_turns_are_never_evicted():
+    registry = TurnRegistry(ttl_seconds=0, max_completed=0, max_bytes=0)
+
+    async def scenario():
+        live = await registry.start_or_get_active(
+            "busy", kind="assistant", idempotency_key="busy", run_turn=lambda execn: None)
+        await _finish(registry, "c1")
+        return live
+
+    live = _run(scenario())
+
+    assert registry.get(live.turn_key) is live
+    assert registry.has_active("busy")
+    assert registry.stats() == {"live": 1, "completed": 0, "completed_bytes": 0}
+
+
+def test_a_replay_carries_the_trace_digest_instead_of_the_events():
+    registry = TurnRegistry(ttl_seconds=600, max_completed=10, max_bytes=1 << 20)
+    execn = _run(_finish(registry, "c1", traces=TRACES))
+    size_with_events = registry.stats()["completed_bytes"]
+
+    _, first = render_turn_response(execn)
+    registry.release_traces(execn)
+    _, replay = render_turn_response(registry.get(execn.turn_key))
+
+    assert first["traces"] == TRACES
+    assert "traces" not in replay
+    assert replay["trace_digest"] == {
+        "count": 2, "sha256": TraceDigest.of(TRACES).sha256}
+    assert replay["answer"] == first["answer"] == "ok"
+    assert registry.stats()["completed_bytes"] < size_with_events
+
+
+def test_registry_gauges_track_live_completed_and_evicted_turns():
+    evicted = metrics.counter(
+        "fastworkflow_turn_registry_evicted_total",
+        "Replay records evicted from the turn registry",
+        labels={"reason": "count"},
+    )
+    before = evicted.value
+    registry = TurnRegistry(ttl_seconds=600, max_completed=1, max_bytes=1 << 20)
+
+    async def scenario():
+        await _finish(registry, "c1")
+        await _finish(registry, "c2")
+
+    _run(scenario())
+
+    rendered = metrics.render()
+    assert "fastworkflow_turn_registry_live 0" in rendered
+    assert "fastworkflow_turn_registry_completed 1" in rendered
+    assert evicted.value == before + 1
@@ -0,0 +1,85 @@
+"""Agent turn setup: the catalog renders alongside the planner, and stages are timed."""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+import fastworkflow
+from fastworkflow import turn_setup
+from fastworkflow.workflow_execution_context import WorkflowExecutionContext
+
+
+@pytest.fixture
+def ctx(monkeypatch):
+    fastworkflow.init({"SPEEDDICT_FOLDERNAME": "___workflow_contexts"})
+    from fastworkflow.command_routing import RoutingRegistry
+
+    RoutingRegistry.clear_registry()
+    context = WorkflowExecutionContext(run_as_agent=True)
+    context.bind_app_workflow(fastworkflow.Workflow.create(
+        str(Path(__file__).parent.joinpath("hello_world_workflow").resolve()),
+        workflow_id_str=f"turn-setup-{uuid.uuid4().hex}",
+    ))
+    monkeypatch.setattr(context, "_ensure_agent_initialized", lambda: None)
+    monkeypatch.setattr(context, "_call_agent_with_retry", lambda agent_call, lm=None: agent_call())
+    monkeypatch.setattr(
+        context, "_extract_conversation_summary",
+        lambda user_query, actions, final: ("summary", "{}"))
+    context._workflow_tool_agent = lambda user_query, available_commands: MagicMock(
+        final_answer=f"{user_query} with {available_commands}")
+    yield context
+    context.close()
+    RoutingRegistry.clear_registry()
+
+
+def test_catalog_renders_while_the_planner_runs(ctx, monkeypatch):
+    catalog_started = threading.Event()
+
+    def catalog(session):
+        catalog_started.set()
+        return session.get_active_workflow().folderpath.split("/")[-1]
+
+    def planner(user_query, session, **kwargs):
+        # Only returns once the catalog is being built on another thread.
+        assert catalog_started.wait(5)
+        return f"planned {user_query}"
+
+    monkeypatch.setattr("fastworkflow.workflow_agent._what_can_i_do", catalog)
+    monkeypatch.setattr("fastworkflow.workflow_agent.build_query_with_next_steps", planner)
+
+    turn = ctx.process_turn("add 2 and 3")
+
+    assert turn.answer == "planned add 2 and 3 with hello_world_workflow"
+
+
+def test_turn_result_reports_each_stage(ctx, monkeypatch):
+    monkeypatch.setattr(
+        "fastworkflow.workflow_agent.build_query_with_next_steps",
+        lambda user_query, session, **kwargs: user_query,
+    )
+    monkeypatch.setattr("fastworkflow.workflow_agent._what_can_i_do", lambda session: "commands")
+
+    turn_result = ctx._build_turn_result(ctx._execute_message("add 2 and 3"))
+
+    assert set(turn_result.stage_timings_ms) == set(turn_setup.STAGES)
+    assert all(ms >= 0 for ms in turn_result.stage_timings_ms.values())
+
+
+def test_a_staged_call_still_waiting_for_a_worker_runs_inline(monkeypatch):
+    release = threading.Event()
+    executor = turn_setup.get_executor()
+    blockers = [executor.submit(release.wait, 5) for _ in range(executor._max_workers)]
+    timings: dict[str, int] = {}
+    try:
+        call = turn_setup.StagedCall(timings, "catalog", threading.get_ident)
+        assert call.result() == threading.get_ident()
+        assert "catalog" in timings
+    finally:
+        release.set()
+        for blocker in blockers:
+            blocker.result()
@@ -305,3 +305,94 @@ def test_escalation_signals_are_reported_for_diagnostics():
     assert not CommandNamePrediction.escalation_signals_in(
         ["ReviewTicket/certify_approve"]
     )
+
+
+# ---------------------------------------------------------------------------
+# Single-pass escalation through the ancestor contexts
+# ---------------------------------------------------------------------------
+
+
+def _todo_list_cme_workflow(tmp_path) -> fastworkflow.Workflow:
+    workflow_path = tmp_path / "todo_list_workflow"
+    shutil.copytree(
+        os.path.join(os.path.dirname(__file__), "todo_list_workflow"),
+        workflow_path,
+        ignore=shutil.ignore_patterns(
+            "___command_info",
+            "___workflow_contexts",
+            "___convo_info",
+            "__pycache__",
+        ),
+    )
+    app_workflow = fastworkflow.Workflow.create(
+        workflow_folderpath=str(workflow_path),
+        workflow_id_str=f"wildcard-escalate-{tmp_path.name}",
+    )
+    return fastworkflow.Workflow.create(
+        workflow_folderpath=fastworkflow.get_internal_workflow_path(
+            "command_metadata_extraction"
+        ),
+        parent_workflow_id=app_workflow.id,
+        workflow_context={"app_workflow": app_workflow},
+    )
+
+
+def test_predict_escalation_scores_every_ancestor_once_and_picks_the_nearest(
+    tmp_path, monkeypatch, setup_test_environment
+):
+    predictions_by_context = {
+        "TodoList": [WILDCARD_LABEL],
+        "TodoListManager": ["TodoListManager/create_todo_list"],
+        "TodoItem": ["TodoItem/assign_to"],
+    }
+    predict_calls = []
+
+    class PredictingRouter:
+        def __init__(self, model_artifact_path):
+            self.context_name = os.path.basename(model_artifact_path)
+            self.tiny_path = f"{model_artifact_path}/tinymodel.pth"
+            self.modelpipeline = self
+            self.tiny_classifier = None
+
+        def predict(self, command):
+            predict_calls.append(self.context_name)
+            return predictions_by_context[self.context_name]
+
+    monkeypatch.setattr(intent_detection, "CommandRouter", PredictingRouter)
+    prediction = CommandNamePrediction(_todo_list_cme_workflow(tmp_path))
+
+    index, output = prediction.predict_escalation(
+        ["TodoList", "TodoListManager", "TodoItem"],
+        "make me a new shopping list",
+        fastworkflow.NLUPipelineStage.INTENT_DETECTION,
+    )
+
+    assert (index, output.command_name) == (1, "TodoListManager/create_todo_list")
+    # One look-ahead prediction per ancestor; the in-order walk reuses them.
+    assert sorted(predict_calls) == ["TodoItem", "TodoList", "TodoListManager"]
+
+
+def test_predict_escalation_ignores_unloadable_contexts_beyond_the_match(
+    tmp_path, monkeypatch, setup_test_environment
+):
+    class PredictingRouter:
+        def __init__(self, model_artifact_path):
+            if model_artifact_path.endswith("TodoItem"):
+                raise FileNotFoundError(model_artifact_path)
+            self.tiny_path = f"{model_artifact_path}/tinymodel.pth"
+            self.modelpipeline = self
+            self.tiny_classifier = None
+
+        def predict(self, command):
+            return ["TodoList/get_properties"]
+
+    monkeypatch.setattr(intent_detection, "CommandRouter", PredictingRouter)
+    prediction = CommandNamePrediction(_todo_list_cme_workflow(tmp_path))
+
+    index, output = prediction.predict_escalation(
+        ["TodoList", "TodoItem"],
+        "show the list properties",
+        fastworkflow.NLUPipelineStage.INTENT_DETECTION,
+    )
+
+    assert (index, output.command_name) == (0, "TodoList/get_properties")